@@ -11,6 +11,7 @@ DEPICT software (Pers, TH, et al., 2015)
 import sys,os,re,json,argparse,time,logging
 #
 from ... import amp
+from ...util import rest
 #
 API_HOST='public.type2diabeteskb.org'
 API_BASE_PATH='/dccservices'
@@ -30,11 +31,15 @@ if __name__=='__main__':
   parser.add_argument("--skip", type=int, default=0)
   parser.add_argument("--nmax", type=int, default=0)
   parser.add_argument("--o", dest="ofile", help="output (TSV)")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   BASE_URL = 'http://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w") if args.ofile else sys.stdout
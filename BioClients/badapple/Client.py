@@ -6,6 +6,7 @@
 import sys,os,re,argparse,time,logging
 #
 from .. import badapple
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -25,12 +26,16 @@ Example scaffold IDs: 46,50
   parser.add_argument("--max_rings", type=int, default=10, help="max rings")
   parser.add_argument("--api_host", default=badapple.API_HOST)
   parser.add_argument("--api_base_path", default=badapple.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", action="count", default=0)
 
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile,"w") if args.ofile else sys.stdout
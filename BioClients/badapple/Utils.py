@@ -4,6 +4,8 @@
 ###
 import sys,os,io,re,time,requests,urllib,json,logging
 import pandas as pd
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST='chiltepin.health.unm.edu'
 API_BASE_PATH='/badapple2/api/v1'
@@ -19,13 +21,14 @@ def GetCompound2Scaffolds(smis, database, max_rings, base_url=BASE_URL, fout=Non
   url = f"{base_url}/compound_search/get_associated_scaffolds_ordered"
   params['database'] = database
   params['max_rings'] = max_rings
+  dfb = util_pandas.FrameBuilder()
   for smi_this in smis:
     vals = re.split(r'\s+', smi_this, 1)
     if len(vals)>1:
       params['SMILES'],params['Names'] = vals
     else:
       params['SMILES'],params['Names'] = smi_this, "Unspecified"
-    response = requests.get(url, params=params, headers=headers)
+    response = rest.GetSession().get(url, params=params, headers=headers)
     results = response.json()
     logging.debug(json.dumps(results, indent=2))
     scafs = results[0]["scaffolds"]
@@ -35,9 +38,10 @@ def GetCompound2Scaffolds(smis, database, max_rings, base_url=BASE_URL, fout=Non
         scaf_this[tag] = scaf[tag] if tag in scaf else ""
       df_this = pd.DataFrame([scaf_this])
       if fout is not None: df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=1
   logging.info(f"Compounds: {len(smis)}; Scaffolds: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -47,9 +51,10 @@ def GetScaffoldInfo(ids, database, base_url=BASE_URL, fout=None):
   headers = {'Accept': 'application/json'}
   url = f"{base_url}/scaffold_search/get_scaffold_info"
   params['database'] = database
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     params['scafid'] = id_this
-    response = requests.get(url, params=params, headers=headers)
+    response = rest.GetSession().get(url, params=params, headers=headers)
     results = response.json()
     logging.debug(json.dumps(results, indent=2))
     scaf = results
@@ -58,9 +63,10 @@ def GetScaffoldInfo(ids, database, base_url=BASE_URL, fout=None):
       scaf_this[tag] = scaf[tag] if tag in scaf else ""
     df_this = pd.DataFrame([scaf_this])
     if fout is not None: df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=1
   logging.info(f"Scaffolds: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -70,9 +76,10 @@ def GetScaffold2Compounds(ids, database, base_url=BASE_URL, fout=None):
   headers = {'Accept': 'application/json'}
   url = f"{base_url}/scaffold_search/get_associated_compounds"
   params['database'] = database
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     params['scafid'] = id_this
-    response = requests.get(url, params=params, headers=headers)
+    response = rest.GetSession().get(url, params=params, headers=headers)
     results = response.json()
     logging.debug(json.dumps(results, indent=2))
     cpds = results
@@ -82,9 +89,10 @@ def GetScaffold2Compounds(ids, database, base_url=BASE_URL, fout=None):
         cpd_this[tag] = cpd[tag] if tag in cpd else ""
       df_this = pd.DataFrame([cpd_this])
       if fout is not None: df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=1
   logging.info(f"Scaffolds: {len(ids)}; Compounds: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -94,9 +102,10 @@ def GetScaffold2Drugs(ids, database, base_url=BASE_URL, fout=None):
   headers = {'Accept': 'application/json'}
   url = f"{base_url}/scaffold_search/get_associated_drugs"
   params['database'] = database
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     params['scafid'] = id_this
-    response = requests.get(url, params=params, headers=headers)
+    response = rest.GetSession().get(url, params=params, headers=headers)
     results = response.json()
     logging.debug(json.dumps(results, indent=2))
     cpds = results
@@ -106,9 +115,10 @@ def GetScaffold2Drugs(ids, database, base_url=BASE_URL, fout=None):
         cpd_this[tag] = cpd[tag] if tag in cpd else ""
       df_this = pd.DataFrame([cpd_this])
       if fout is not None: df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=1
   logging.info(f"Scaffolds: {len(ids)}; Drugs: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
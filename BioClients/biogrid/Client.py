@@ -27,6 +27,7 @@ import sys,os,re,json,argparse,time,yaml,logging
 #
 from .. import biogrid
 from ..util import yaml as util_yaml
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -51,6 +52,8 @@ if __name__=='__main__':
   parser.add_argument("--api_base_path", default=biogrid.API_BASE_PATH)
   parser.add_argument("--api_key", help="has precedence over param_file")
   parser.add_argument("--param_file", default=os.environ['HOME']+"/.biogrid.yaml")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
@@ -68,6 +71,8 @@ if __name__=='__main__':
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = f"https://{args.api_host}{args.api_base_path}"
 
   fout = open(args.ofile, "w") if args.ofile else sys.stdout
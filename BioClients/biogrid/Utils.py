@@ -6,6 +6,8 @@ See: http://wiki.thebiogrid.org/doku.php/biogridrest
 ###
 import sys,os,re,json,time,logging,requests,tqdm
 import pandas as pd
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST="webservice.thebiogrid.org"
 API_BASE_PATH=""
@@ -14,7 +16,7 @@ API_BASE_URL=f"https://{API_HOST}{API_BASE_PATH}"
 ##############################################################################
 def ListOrganisms(params, base_url=API_BASE_URL, fout=None):
   url = f"{base_url}/organisms/?accesskey={params['API_KEY']}&format=json"
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   organisms = response.json()
   logging.debug(json.dumps(organisms, indent=2))
   df = pd.DataFrame.from_dict(organisms, orient="index")
@@ -27,7 +29,7 @@ def ListOrganisms(params, base_url=API_BASE_URL, fout=None):
 ##############################################################################
 def ListIdTypes(params, base_url=API_BASE_URL, fout=None):
   url = f"{base_url}/identifiers/?accesskey={params['API_KEY']}&format=json"
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   idtypes = response.json()
   logging.debug(json.dumps(idtypes, indent=2))
   df = pd.DataFrame.from_dict(idtypes, orient="index")
@@ -39,9 +41,10 @@ def ListIdTypes(params, base_url=API_BASE_URL, fout=None):
 ##############################################################################
 def GetInteractions(params, ids, base_url=API_BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url = f"{base_url}/interactions/{id_this}?accesskey={params['API_KEY']}&format=json"
-    response = requests.get(url)
+    response = rest.GetSession().get(url)
     result = response.json()
     logging.debug(json.dumps(result, indent=2, sort_keys=False)+'\n')
     intr = result[id_this]
@@ -52,10 +55,11 @@ def GetInteractions(params, ids, base_url=API_BASE_URL, fout=None):
           logging.info(f"Ignoring field: {tag}")
           tags.remove(tag)
     df_this = pd.DataFrame({tag:[intr[tag]] for tag in tags})
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -74,9 +78,10 @@ def SearchInteractions(params, ids, search_params, base_url=API_BASE_URL, fout=N
     url+=f"&additionalIdentifierTypes={'|'.join(search_params['addl_idtypes'])}"
   if search_params['human']:
     url+=f"&taxId=9606"
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_this = url+f"&start={skip}&max={chunk}"
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     if response.status_code!=200:
       logging.debug(f"Status code: {response.status_code}")
       break
@@ -91,11 +96,12 @@ def SearchInteractions(params, ids, search_params, base_url=API_BASE_URL, fout=N
             logging.info(f"Ignoring field: {tag}")
             tags.remove(tag)
       df_this = pd.DataFrame({tag:[intr[tag]] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
     skip+=chunk
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
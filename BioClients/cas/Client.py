@@ -6,6 +6,7 @@ Utility app for the CAS REST API.
 import sys,os,re,argparse,time,logging
 #
 from .. import cas
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -19,11 +20,15 @@ if __name__=='__main__':
   parser.add_argument("--api_base_path", default=cas.API_BASE_PATH)
   parser.add_argument("--skip", type=int, default=0)
   parser.add_argument("--nmax", type=int, default=0)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = 'https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w") if args.ofile else sys.stdout
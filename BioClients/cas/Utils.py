@@ -7,6 +7,8 @@ import sys,os,io,re,csv,json,time,logging,tempfile,tqdm
 import requests
 import urllib.request,urllib.parse
 import pandas as pd
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 #
 API_HOST='commonchemistry.cas.org'
@@ -17,12 +19,13 @@ BASE_URL="https://"+API_HOST+API_BASE_PATH
 #############################################################################
 def GetRN2Details(ids, base_url=BASE_URL, fout=None):
   n_out=0; n_err=0; tags=None; df=None; tq=None;
+  dfb = util_pandas.FrameBuilder()
   for i,id_this in enumerate(ids):
     uri = urllib.parse.quote(f"substance/pt/{id_this}")
     url = (base_url+f"/detail?uri={uri}")
     if tq is None: tq = tqdm.tqdm(total=len(ids), unit="mols")
     tq.update(n=1)
-    response = requests.get(url, headers={"Accept": "application/json"})
+    response = rest.GetSession().get(url, headers={"Accept": "application/json"})
     logging.debug(response.text)
     if response.status_code==requests.codes.not_found:
       continue
@@ -47,8 +50,9 @@ def GetRN2Details(ids, base_url=BASE_URL, fout=None):
     if fout is not None:
       df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
     else:
-      df = pd.concat([df, df_this])
+      dfb.append(df_this)
     n_out+=1
   tq.close()
   logging.info(f"Input IDs: {len(ids)}; Output records: {n_out}")
+  df = dfb.frame(df)
   return df
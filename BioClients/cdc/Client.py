@@ -7,6 +7,7 @@
 import sys,os,argparse,re,time,logging
 #
 from .. import cdc
+from ..util import rest
 #
 #############################################################################
 if __name__=='__main__':
@@ -20,11 +21,15 @@ if __name__=='__main__':
   parser.add_argument("--o", dest="ofile", help="output (TSV)")
   parser.add_argument("--api_host", default=API_HOST)
   parser.add_argument("--api_base_path", default=API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   api_base_url='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
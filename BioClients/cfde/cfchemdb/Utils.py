@@ -5,6 +5,7 @@ CFChemDb utility functions.
 import os,sys,re,json,logging,yaml,tqdm
 import pandas as pd
 import psycopg2,psycopg2.extras
+from ...util import pandas as util_pandas
 
 NCHUNK=100
 
@@ -38,12 +39,14 @@ def ListColumns(dbcon, dbschema="public", fout=None):
   df=None;
   sql1 = (f"SELECT table_name FROM information_schema.tables WHERE table_schema = '{dbschema}'")
   df1 = pd.read_sql(sql1, dbcon)
+  dfb = util_pandas.FrameBuilder()
   for tname in df1.table_name:
     sql2 = (f"SELECT column_name,data_type FROM information_schema.columns WHERE table_schema = '{dbschema}' AND table_name = '{tname}'")
     df_this = pd.read_sql(sql2, dbcon)
     df_this["schema"] = dbschema
     df_this["table"] = tname
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   df = df[["schema", "table", "column_name", "data_type"]]
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
@@ -64,12 +67,14 @@ def ListTablesRowCounts(dbcon, dbschema="public", fout=None):
   df=None;
   sql1 = (f"SELECT table_name FROM information_schema.tables WHERE table_schema = '{dbschema}'")
   df1 = pd.read_sql(sql1, dbcon)
+  dfb = util_pandas.FrameBuilder()
   for tname in df1.table_name:
     sql2 = (f"SELECT COUNT(*) AS rowcount FROM {dbschema}.{tname}")
     df_this = pd.read_sql(sql2, dbcon)
     df_this["schema"] = dbschema
     df_this["table"] = tname
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   df = df[["schema", "table", "rowcount"]]
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
@@ -97,12 +102,14 @@ def ListStructures2Smiles(dbcon, dbschema="public", fout=None):
 def GetStructure(dbcon, ids, fout=None):
   df=None; n_out=0;
   sql = ("""SELECT id,name,cansmi FROM mols WHERE id = '{}'""")
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
     if fout is not None: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: df = df_this if df is None else pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {n_out}/{len(ids)}")
   return df
@@ -112,6 +119,7 @@ def GetStructureBySmiles(dbcon, smis, fout=None):
   """Casting smiles to MOL canonicalizes molecular graph for isomorphism eval."""
   df=None; n_out=0; n_not_found=0;
   sql = ("""SELECT id,name,cansmi FROM mols WHERE mols.molecule = '{}'::MOL""")
+  dfb = util_pandas.FrameBuilder()
   for smi_this in smis:
     smi_this = re.sub(r'\s.*$', '', smi_this)
     logging.debug(sql.format(smi_this))
@@ -121,11 +129,12 @@ def GetStructureBySmiles(dbcon, smis, fout=None):
       logging.error(f"{e}")
       continue
     if fout is not None: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: df = df_this if df is None else pd.concat([df, df_this])
+    else: dfb.append(df_this)
     if df_this.shape[0]==0:
       n_not_found+=1
     n_out+=df_this.shape[0]
   logging.info(f"n_found: {len(smis)-n_not_found}/{len(smis)}; n_not_found: {n_not_found}/{len(smis)}; n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -10,6 +10,7 @@ import sys,os,re,json,argparse,time,logging
 import pandas as pd
 #
 from .. import chebi
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -39,11 +40,15 @@ Example entity IDs: 16737, 30273,33246,24433\
   parser.add_argument("--nmax", type=int, default=None)
   parser.add_argument("--api_host", default=chebi.API_HOST)
   parser.add_argument("--api_base_path", default=chebi.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v","--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, 'w') if args.ofile else sys.stdout
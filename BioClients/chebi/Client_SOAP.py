@@ -16,6 +16,8 @@ import time,urllib.parse
 import requests
 import collections
 import xmltodict
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 NCHUNK=100
 #
@@ -26,8 +28,9 @@ BASE_URL="https://"+API_HOST+API_BASE_PATH
 ##############################################################################
 def GetEntity(ids, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_url}/getCompleteEntity?chebiId={id_this}")
+    response = rest.GetSession().get(f"{base_url}/getCompleteEntity?chebiId={id_this}")
     rval_dict = xmltodict.parse(response.content)
     logging.debug(json.dumps(rval_dict, indent=2))
     try:
@@ -39,17 +42,19 @@ def GetEntity(ids, base_url=BASE_URL, fout=None):
     if not tags:
       tags = [tag for tag in result.keys() if type(result[tag]) not in (list, dict, collections.OrderedDict)]
     df_this = pd.DataFrame({tag:[result[tag] if tag in result else ''] for tag in tags})
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def GetEntityChildren(ids, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_url}/getOntologyChildren?chebiId={id_this}")
+    response = rest.GetSession().get(f"{base_url}/getOntologyChildren?chebiId={id_this}")
     rval_dict = xmltodict.parse(response.content)
     logging.debug(json.dumps(rval_dict, indent=2))
     try:
@@ -64,17 +69,19 @@ def GetEntityChildren(ids, base_url=BASE_URL, fout=None):
       if not tags:
         tags = [tag for tag in child.keys() if type(child[tag]) not in (list, dict, collections.OrderedDict)]
       df_this = pd.DataFrame({tag:[child[tag] if tag in child else ''] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def GetEntityParents(ids, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_url}/getOntologyParents?chebiId={id_this}")
+    response = rest.GetSession().get(f"{base_url}/getOntologyParents?chebiId={id_this}")
     rval_dict = xmltodict.parse(response.content)
     logging.debug(json.dumps(rval_dict, indent=2))
     try:
@@ -89,10 +96,11 @@ def GetEntityParents(ids, base_url=BASE_URL, fout=None):
       if not tags:
         tags = [tag for tag in parent.keys() if type(parent[tag]) not in (list, dict, collections.OrderedDict)]
       df_this = pd.DataFrame({tag:[parent[tag] if tag in parent else ''] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -115,11 +123,15 @@ if __name__=='__main__':
   parser.add_argument("--nmax", type=int, default=None)
   parser.add_argument("--api_host", default=API_HOST)
   parser.add_argument("--api_base_path", default=API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v","--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, 'w') if args.ofile else sys.stdout
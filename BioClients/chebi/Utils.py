@@ -6,6 +6,8 @@ https://www.ebi.ac.uk/chebi/backend/api/docs/
 ###
 import sys,os,re,json,time,urllib.parse,logging,requests,collections
 import pandas as pd
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST="www.ebi.ac.uk"
 API_BASE_PATH="/chebi/backend/api/public"
@@ -16,44 +18,49 @@ NCHUNK=100
 ##############################################################################
 def ListSources(base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
-  response = requests.get(f"{base_url}/advanced_search/sources_list", headers={"Accept":"application/json"})
+  response = rest.GetSession().get(f"{base_url}/advanced_search/sources_list", headers={"Accept":"application/json"})
   result = response.json()
   logging.debug(json.dumps(result, indent=2))
+  dfb = util_pandas.FrameBuilder()
   for source in result:
     if not tags:
       tags = [tag for tag in source.keys() if type(source[tag]) not in (list, dict, collections.OrderedDict)]
     df_this = pd.DataFrame({tag:[source[tag] if tag in source else ''] for tag in tags})
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def GetEntity(ids, include_parents=False, include_children=False, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = f"{base_url}/compound/{id_this}"
     url_this = f"{url_this}/?{'true' if include_parents else 'false'}&{'true' if include_children else 'false'}"
-    response = requests.get(url_this, headers={"Accept":"application/json"})
+    response = rest.GetSession().get(url_this, headers={"Accept":"application/json"})
     result = response.json()
     if result is None: continue
     logging.debug(json.dumps(result, indent=2))
     if not tags:
       tags = [tag for tag in result.keys() if type(result[tag]) not in (list, dict, collections.OrderedDict)]
     df_this = pd.DataFrame({tag:[result[tag] if tag in result else ''] for tag in tags})
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def GetEntityNames(ids, base_url=BASE_URL, fout=None):
   n_out=0; df=None; tags_entity=None; tags_name = ["name", "status", "type", "source", "ascii_name", "adapted", "language_code"]
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = f"{base_url}/compound/{id_this}"
-    response = requests.get(url_this, headers={"Accept":"application/json"})
+    response = rest.GetSession().get(url_this, headers={"Accept":"application/json"})
     result = response.json()
     if result is None: continue
     logging.debug(json.dumps(result, indent=2))
@@ -70,19 +77,21 @@ def GetEntityNames(ids, base_url=BASE_URL, fout=None):
       df_this_name = pd.DataFrame({tag:[name[tag] if tag in name else ''] for tag in tags_name})
       df_this = pd.concat([df_this_entity, df_this_name], axis=1)
     
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
 
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def GetEntityDatabaseAccessions(ids, base_url=BASE_URL, fout=None):
   n_out=0; df=None; tags_entity=None; tags_dbacc = ["id", "accession_number", "type", "source_name", "url", "prefix"]
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = f"{base_url}/compound/{id_this}"
-    response = requests.get(url_this, headers={"Accept":"application/json"})
+    response = rest.GetSession().get(url_this, headers={"Accept":"application/json"})
     result = response.json()
     if result is None: continue
     logging.debug(json.dumps(result, indent=2))
@@ -104,20 +113,22 @@ def GetEntityDatabaseAccessions(ids, base_url=BASE_URL, fout=None):
     
       df_this = pd.concat([df_this_entity, df_this_acc], axis=1)
     
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
 
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def GetCompoundData(ids, base_url=BASE_URL, fout=None):
   n_out=0; df=None; tags_entity=None; tags_chemical = ["formula", "charge", "mass", "monoisotopic_mass"]
   tags_structure = ["id", "smiles", "standard_inchi", "standard_inchi_key", "wurcs", "is_r_group"]
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = f"{base_url}/compound/{id_this}"
-    response = requests.get(url_this, headers={"Accept":"application/json"})
+    response = rest.GetSession().get(url_this, headers={"Accept":"application/json"})
     result = response.json()
     if result is None: continue
     logging.debug(json.dumps(result, indent=2))
@@ -135,11 +146,12 @@ def GetCompoundData(ids, base_url=BASE_URL, fout=None):
       df_this_structure = df_this_structure [['structure_id'] + [col for col in df_this_structure.columns if col != 'structure_id']]
     df_this = pd.concat([df_this_entity, df_this_chemical, df_this_structure], axis=1)
 
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
 
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -148,9 +160,10 @@ def Search(query, base_url=BASE_URL, fout=None):
   tags_source=[ "chebi_accession", "name", "ascii_name", "stars", "default_structure", "definition", "monoisotopicmass", "charge", "formula", "smiles", "mass", "structures", ];
   url = f"{base_url}/es_search/?term={query}&size={NCHUNK}"
   i_page=1;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_this = f"{url}&page={i_page}"
-    response = requests.get(url_this, headers={"Accept":"application/json"})
+    response = rest.GetSession().get(url_this, headers={"Accept":"application/json"})
     rval = response.json()
     logging.debug(json.dumps(rval, indent=2))
     results = rval["results"] 
@@ -159,12 +172,13 @@ def Search(query, base_url=BASE_URL, fout=None):
     for result in results:
       source_data = result["_source"] if "_source" in result else {}
       df_this = pd.DataFrame({tag:[source_data[tag] if tag in source_data else ''] for tag in tags_source})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
     if n_out >= n_total: break
     i_page+=1
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -8,6 +8,7 @@ See: http://slapfordrugtargetprediction.wikispaces.com/API
 import sys,os,re,argparse,time,logging
 #
 from ... import chem2bio2rdf as c2b2r
+from ...util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -37,11 +38,15 @@ Examples: CIDs: 5591 TIDs: PPARG
   parser.add_argument("--tid_nmax", type=int, default=None)
   parser.add_argument("--api_host", default=API_HOST)
   parser.add_argument("--api_base_path", default=API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = 'http://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w") if args.ofile else sys.stdout
@@ -40,6 +40,9 @@ import sys,os,re,json,argparse,time,logging
 import pandas as pd
 #
 from .. import chembl
+from ..util import rest
+from ..util import parallel
+from ..util import sink as util_sink
 #
 ##############################################################################
 if __name__=='__main__':
@@ -76,9 +79,10 @@ if __name__=='__main__':
   parser.add_argument("op", choices=ops, help='OPERATION (select one)')
   parser.add_argument("--ids", help="input IDs (e.g. mol, assay, target, document)")
   parser.add_argument("--i", dest="ifile", help="input file, IDs")
-  parser.add_argument("--o", dest="ofile", help="output (TSV)")
+  parser.add_argument("--o", dest="ofile", help="output (TSV; get_activity_by_*: also *.tsv.gz, *.jsonl, *.parquet)")
   parser.add_argument("--skip", type=int, default=0)
   parser.add_argument("--nmax", type=int, default=None)
+  parser.add_argument("--concurrency", type=int, default=1, help="max requests in flight")
   parser.add_argument("--dev_phase", type=int, choices=list(range(5)), default=None, help="molecule development phase")
   parser.add_argument("--assay_source", help="source_id")
   parser.add_argument("--assay_type", help="{0}".format(str(assay_types)))
@@ -86,14 +90,23 @@ if __name__=='__main__':
   parser.add_argument("--include_phenotypic", action="store_true", help="else pChembl required")
   parser.add_argument("--api_host", default=chembl.API_HOST)
   parser.add_argument("--api_base_path", default=chembl.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v","--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
+  if args.concurrency>rest.REST_POOL_MAXSIZE: rest.ConfigureSession(pool_maxsize=args.concurrency)
+
   base_url='https://'+args.api_host+args.api_base_path
 
-  fout = open(args.ofile, 'w') if args.ofile else sys.stdout
+  if args.op.startswith("get_activity_by_"):
+    fout = util_sink.Open(args.ofile)
+  else:
+    fout = open(args.ofile, 'w') if args.ofile else sys.stdout
 
   ids=[]
   if args.ifile:
@@ -174,7 +187,7 @@ if __name__=='__main__':
     chembl.GetDrugIndications(ids, args.skip, args.nmax, base_url, fout)
 
   elif args.op == "get_target":
-    chembl.GetTarget(ids, base_url, fout)
+    chembl.GetTarget(ids, base_url, fout, args.concurrency)
 
   elif args.op == "get_target_components":
     chembl.GetTargetComponents(ids, args.skip, args.nmax, base_url, fout)
@@ -196,3 +209,7 @@ if __name__=='__main__':
 
   else:
     parser.error(f"Invalid operation: {args.op}")
+
+  if isinstance(fout, util_sink.RecordSink): fout.close()
+
+  if parallel.ReportFailures(): sys.exit(1)
@@ -144,12 +144,16 @@ get_structure: get Inchi, InchiKey from src_id,
   parser.add_argument("--src_id", help="from-source ID code")
   parser.add_argument("--dst_id", help="to-source ID code")
   parser.add_argument("--api_base_path", default=API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
 
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   BASE_URL='https://'+API_HOST+API_BASE_PATH
 
   if args.ofile:
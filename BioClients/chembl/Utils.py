@@ -7,6 +7,10 @@ http://chembl.blogspot.com/2015/02/using-new-chembl-web-services.html
 ###
 import sys,os,re,json,time,requests,urllib.parse,logging,tqdm
 import pandas as pd
+from ..util import rest
+from ..util import parallel
+from ..util import pandas as util_pandas
+from ..util import sink as util_sink
 #
 NCHUNK=100
 #
@@ -16,7 +20,7 @@ BASE_URL="https://"+API_HOST+API_BASE_PATH
 #
 ##############################################################################
 def Status(base_url=BASE_URL, fout=None):
-  response = requests.get(f"{base_url}/status.json")
+  response = rest.GetSession().get(f"{base_url}/status.json")
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   df = pd.DataFrame({tag:(result[tag] if tag in result else "") for tag in result.keys()})
@@ -30,7 +34,7 @@ def GetTargetByUniprot(ids, base_url=BASE_URL, fout=None):
   fout.write("UniprotId\ttarget_chembl_id\n")
   for id_this in ids:
     id_chembl=None
-    response = requests.get(f"{base_url}/target.json?target_components__accession={id_this}")
+    response = rest.GetSession().get(f"{base_url}/target.json?target_components__accession={id_this}")
     result = response.json()
     targets = result["targets"] if "targets" in result else []
     for target in targets:
@@ -46,15 +50,17 @@ def GetTargetByUniprot(ids, base_url=BASE_URL, fout=None):
 
 #############################################################################
 def GetActivity(ids, resource, pmin, skip=0, nmax=None, api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
-  '''Get activity data and necessary references only, due to size concerns.  resource = assay|target|molecule.  Filter on pChEMBL value, standardized negative log molar half-max response activity.'''
+  '''Get activity data and necessary references only, due to size concerns.  resource = assay|target|molecule.  Filter on pChEMBL value, standardized negative log molar half-max response activity.  Output fout may be a file handle or util.sink (TSV/JSONL/Parquet).'''
   n_act=0; n_out=0; n_pval=0; n_pval_ok=0; tags=None; df=None; tq=None;
+  dfb = util_pandas.FrameBuilder()
+  sink = util_sink.Wrap(fout)
   for i,id_this in enumerate(ids):
     if i<skip: continue
     if not tq: tq = tqdm.tqdm(total=len(ids)-skip, unit=resource+"s")
     tq.update()
     url_next = (f"{api_base_path}/activity.json?{resource}_chembl_id={id_this}&limit={NCHUNK}")
     while True:
-      response = requests.get("https://"+api_host+url_next)
+      response = rest.GetSession().get("https://"+api_host+url_next)
       if response.status_code != 200:
         logging.error(f"status_code: {response.status_code}")
         break
@@ -84,17 +90,19 @@ def GetActivity(ids, resource, pmin, skip=0, nmax=None, api_host=API_HOST, api_b
           except:
             logging.debug(f"[{n_act}] pVal missing.")
         if pval_ok:
-          if fout is None: df = pd.concat([df, df_this])
-          else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
+          if sink is None: dfb.append(df_this)
+          else: sink.write(df_this)
           n_out+=df_this.shape[0]
       total_count = result["page_meta"]["total_count"] if "page_meta" in result and "total_count" in result["page_meta"] else None
       url_next = result["page_meta"]["next"] if "page_meta" in result and "next" in result["page_meta"] else None
       if not url_next: break
     if nmax and i>=(nmax-skip): break
   if tq is not None: tq.close()
+  if sink is not None: sink.flush()
   logging.info(f"n_qry: {len(ids)}; n_act: {n_act}; n_out: {n_out}")
   if pmin is not None:
     logging.info(f"n_pval: {n_pval}; n_pval_ok: {n_pval_ok}; pVals missing: {n_act-n_pval}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -102,7 +110,7 @@ def GetActivityProperties(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
   n_out=0; df=None; tags=None;
   for i,id_this in enumerate(ids):
     if i<skip: continue
-    response = requests.get(f"{base_url}/activity/{id_this}.json")
+    response = rest.GetSession().get(f"{base_url}/activity/{id_this}.json")
     result = response.json()
     assay_chembl_id = result["assay_chembl_id"] if "assay_chembl_id" in result else ""
     molecule_chembl_id = result["molecule_chembl_id"] if "molecule_chembl_id" in result else ""
@@ -124,7 +132,7 @@ def ListTargets(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fout
   n_tgt=0; n_cmt=0; n_out=0; tags=None; df=None; tq=None;
   url_next = (f"{api_base_path}/target.json?limit={NCHUNK}&offset={skip}")
   while True:
-    response = requests.get("https://"+api_host+url_next)
+    response = rest.GetSession().get("https://"+api_host+url_next)
     result = response.json()
     tgts = result["targets"] if result and "targets" in result else []
     for tgt in tgts:
@@ -160,14 +168,14 @@ def ListTargets(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fout
   logging.info(f"n_targets: {n_tgt}; n_target_components: {n_cmt}; n_out: {n_out}")
 
 #############################################################################
-def GetTarget(ids, base_url=BASE_URL, fout=None):
+def GetTarget(ids, base_url=BASE_URL, fout=None, concurrency=1):
   '''One row per target.  If one-component, single protein, include UniProt accession, and gene symbol.'''
   n_tgt=0; n_cmt=0; n_out=0; tags=None; df=None; tq=None;
   tags_tgt = ["target_chembl_id", "target_type", "organism", "tax_id", "pref_name", "species_group_flag"]
   tags_cmt = ["accession", "gene_symbol"]
-      
-  for id_this in ids:
-    response = requests.get(f"{base_url}/target/{id_this}.json")
+  session = rest.GetSession()
+  for id_this,response in parallel.MapOrdered(lambda id_this: session.get(f"{base_url}/target/{id_this}.json"), ids, concurrency):
+    if response is None: continue
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       continue
@@ -201,11 +209,12 @@ def GetTarget(ids, base_url=BASE_URL, fout=None):
 #############################################################################
 def GetTargetComponents(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
   n_tgt=0; n_out=0; tgt_tags=[]; cmt_tags=[]; df=None; tq=None;
+  dfb = util_pandas.FrameBuilder()
   for i,id_this in enumerate(ids):
     if i<skip: continue
     if not tq: tq = tqdm.tqdm(total=len(ids)-skip, unit="tgts")
     tq.update()
-    response = requests.get(f"{base_url}/target/{id_this}.json")
+    response = rest.GetSession().get(f"{base_url}/target/{id_this}.json")
     result = response.json()
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
@@ -227,23 +236,25 @@ def GetTargetComponents(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
 	pd.DataFrame({tag:[(result[tag] if tag in result else None)] for tag in tgt_tags}),
 	pd.DataFrame({tag:[(cmt[tag] if tag in cmt else None)] for tag in cmt_tags})],
 	axis=1)
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
     if nmax and i>=(nmax-skip): break
   if tq is not None: tq.close()
   logging.info(f"n_qry: {len(ids)}; n_targets: {n_tgt}; n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def GetDocument(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
   n_pmid=0; n_doi=0; n_out=0; tags=None; df=None; tq=None;
+  dfb = util_pandas.FrameBuilder()
   for i,id_this in enumerate(ids):
     if i<skip: continue
     if not tq: tq = tqdm.tqdm(total=len(ids)-skip, unit="docs")
     tq.update()
     try:
-      response = requests.get(f"{base_url}/document/{id_this}.json")
+      response = rest.GetSession().get(f"{base_url}/document/{id_this}.json")
     except Exception as e:
       logging.error(f"{type(e)=}: {e=}")
       continue
@@ -257,19 +268,21 @@ def GetDocument(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
     if "pubmed_id" in tags and result["pubmed_id"]: n_pmid+=1
     if "doi" in tags and result["doi"]: n_doi+=1
     df_this = pd.DataFrame({tag:[(result[tag] if tag in result else None)] for tag in tags})
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out+=df_this.shape[0]
   if tq is not None: tq.close()
   logging.info(f"n_qry: {len(ids)}; n_pmid: {n_pmid}; n_doi: {n_doi}; n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def ListSources(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
   n_out=0; df=None; tags=None;
   url_next = f"{api_base_path}/source.json"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       continue
@@ -280,20 +293,22 @@ def ListSources(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
         tags = [tag for tag in list(source.keys()) if type(source[tag]) not in (dict, list)]
       logging.debug(json.dumps(source, sort_keys=True, indent=2))
       df_this = pd.DataFrame({tag:[(source[tag] if tag in source else None)] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
     url_next = result["page_meta"]["next"] if "page_meta" in result and "next" in result["page_meta"] else None
     if not url_next: break
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def ListCellLines(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
   n_clo=0; n_efo=0; n_out=0; df=None; tags=None;
   url_next = f"{api_base_path}/cell_line.json"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       continue
@@ -305,7 +320,7 @@ def ListCellLines(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
         tags = [tag for tag in list(cell.keys()) if type(cell[tag]) not in (dict, list)]
       logging.debug(json.dumps(cell, sort_keys=True, indent=2))
       df_this = pd.DataFrame({tag:[(cell[tag] if tag in cell else None)] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
       if "clo_id" in cell and cell["clo_id"]: n_clo+=1
@@ -313,14 +328,16 @@ def ListCellLines(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
     url_next = result["page_meta"]["next"] if "page_meta" in result and "next" in result["page_meta"] else None
     if not url_next: break
   logging.info(f"n_out: {n_out}; n_clo: {n_clo}; n_efo: {n_efo}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def ListOrganisms(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
   n_out=0; df=None; tags=None;
   url_next = f"{api_base_path}/organism.json"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       continue
@@ -332,20 +349,22 @@ def ListOrganisms(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
         tags = [tag for tag in list(org.keys()) if type(org[tag]) not in (dict, list)]
       logging.debug(json.dumps(org, sort_keys=True, indent=2))
       df_this = pd.DataFrame({tag:[(org[tag] if tag in org else None)] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
     url_next = result["page_meta"]["next"] if "page_meta" in result and "next" in result["page_meta"] else None
     if not url_next: break
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def ListProteinClasses(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
   n_out=0; df=None; tags=None;
   url_next = f"{api_base_path}/protein_class.json"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       continue
@@ -357,12 +376,13 @@ def ListProteinClasses(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None
         tags = [tag for tag in list(pcl.keys()) if type(pcl[tag]) not in (dict, list)]
       logging.debug(json.dumps(pcl, sort_keys=True, indent=2))
       df_this = pd.DataFrame({tag:[(pcl[tag] if tag in pcl else None)] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
     url_next = result["page_meta"]["next"] if "page_meta" in result and "next" in result["page_meta"] else None
     if not url_next: break
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -371,8 +391,9 @@ def ListDrugIndications(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PA
   n_out=0; tags=None; df=None; tq=None; efos=set(); ref_types=set();
   tags_ind_ref = ["ref_type", "ref_id", "ref_url"]
   url_next = f"{api_base_path}/drug_indication.json?limit={NCHUNK}&offset={skip}"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       break
@@ -392,7 +413,7 @@ def ListDrugIndications(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PA
 		pd.DataFrame({tag:[(din[tag] if tag in din else None)] for tag in tags}),
 		pd.DataFrame({tag:[(ind_ref[tag] if tag in ind_ref else None)] for tag in tags_ind_ref}),
 		], axis=1)
-        if fout is None: df = pd.concat([df, df_this])
+        if fout is None: dfb.append(df_this)
         else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=1
       if tq is not None: tq.update()
@@ -405,16 +426,18 @@ def ListDrugIndications(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PA
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}; n_efo: {len(efos)}")
   logging.info(f"ref_types: {list(ref_types)}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def GetDrugIndications(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None; tq=None; efos=set(); ref_types=set();
   tags_ind_ref = ["ref_type", "ref_id", "ref_url"]
+  dfb = util_pandas.FrameBuilder()
   for i,id_this in enumerate(ids):
     if not tq: tq = tqdm.tqdm(total=len(ids)-skip)
     if i<skip: continue
-    response = requests.get(f"{base_url}/drug_indication.json?molecule_chembl_id={id_this}")
+    response = rest.GetSession().get(f"{base_url}/drug_indication.json?molecule_chembl_id={id_this}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       break
@@ -434,7 +457,7 @@ def GetDrugIndications(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
 		pd.DataFrame({tag:[(din[tag] if tag in din else None)] for tag in tags}),
 		pd.DataFrame({tag:[(ind_ref[tag] if tag in ind_ref else None)] for tag in tags_ind_ref}),
 		], axis=1)
-        if fout is None: df = pd.concat([df, df_this])
+        if fout is None: dfb.append(df_this)
         else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=1
       if tq is not None: tq.update()
@@ -443,14 +466,16 @@ def GetDrugIndications(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}; n_efo: {len(efos)}")
   logging.info(f"ref_types: {list(ref_types)}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def ListTissues(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
   n_bto=0; n_efo=0; n_caloha=0; n_uberon=0; n_out=0; tags=None; df=None; tq=None;
   url_next = f"{api_base_path}/tissue.json"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       break
@@ -462,7 +487,7 @@ def ListTissues(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
         tags = [tag for tag in list(tissue.keys()) if type(tissue[tag]) not in (dict, list)]
       logging.debug(json.dumps(tissue, sort_keys=True, indent=2))
       df_this = pd.DataFrame({tag:[(tissue[tag] if tag in tissue else None)] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
       if "bto_id" in tissue and tissue["bto_id"]: n_bto+=1
@@ -476,14 +501,16 @@ def ListTissues(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
     if not url_next: break
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}; n_bto: {n_bto}; n_efo: {n_efo}; n_caloha: {n_caloha}; n_uberon: {n_uberon}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def ListMechanisms(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
   n_out=0; tags=None; df=None; tq=None;
   url_next = f"{api_base_path}/mechanism.json"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       break
@@ -495,7 +522,7 @@ def ListMechanisms(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
         tags = [tag for tag in list(mech.keys()) if type(mech[tag]) not in (dict, list)]
       logging.debug(json.dumps(mech, sort_keys=True, indent=2))
       df_this = pd.DataFrame({tag:[(mech[tag] if tag in mech else None)] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
       if tq is not None: tq.update()
@@ -505,14 +532,16 @@ def ListMechanisms(api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
     if not url_next: break
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def ListDocuments(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
   n_pmid=0; n_doi=0; n_out=0; n_err=0; tags=None; df=None; tq=None;
   url_next = f"{api_base_path}/document.json?limit={NCHUNK}&offset={skip}"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       break
@@ -526,7 +555,7 @@ def ListDocuments(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fo
       if "pubmed_id" in tags and doc["pubmed_id"]: n_pmid+=1
       if "doi" in tags and doc["doi"]: n_doi+=1
       df_this = pd.DataFrame({tag:[(doc[tag] if tag in doc else None)] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
       if tq is not None: tq.update()
@@ -538,13 +567,15 @@ def ListDocuments(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fo
     if not url_next: break
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}; n_pmid: {n_pmid}; n_doi: {n_doi}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def GetAssay(ids, base_url=BASE_URL, fout=None):
   n_out=0; df=None; tags=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_url}/assay/{id_this}.json")
+    response = rest.GetSession().get(f"{base_url}/assay/{id_this}.json")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       continue
@@ -552,10 +583,11 @@ def GetAssay(ids, base_url=BASE_URL, fout=None):
     if not tags:
       tags = [tag for tag in list(result.keys()) if type(result[tag]) not in (dict, list)]
     df_this = pd.DataFrame({tag:[(result[tag] if tag in result else None)] for tag in tags})
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out+=df_this.shape[0]
   logging.info(f"n_in: {len(ids)}; n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -563,8 +595,9 @@ def ListAssays(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fout=
   n_ass=0; n_out=0; tags=None; df=None; tq=None;
   url_next = (f"{api_base_path}/assay.json?offset={skip}&limit={NCHUNK}")
   t0 = time.time()
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get("https://"+api_host+url_next)
+    response = rest.GetSession().get("https://"+api_host+url_next)
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       continue
@@ -575,7 +608,7 @@ def ListAssays(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fout=
       if not tags:
         tags = [tag for tag in list(assay.keys()) if type(assay[tag]) not in (dict, list)]
       df_this = pd.DataFrame({tag:[(assay[tag] if tag in assay else None)] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
       if tq is not None: tq.update()
@@ -588,6 +621,7 @@ def ListAssays(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fout=
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}")
   logging.info(f"""Elapsed time: {time.strftime('%Hh:%Mm:%Ss', time.gmtime(time.time()-t0))}""")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -597,8 +631,9 @@ def SearchAssays(asrc, atype, skip, nmax, api_host=API_HOST, api_base_path=API_B
   url_next = f"{api_base_path}/assay.json?offset={skip}&limit={NCHUNK}"
   if asrc: url_next+=(f"&src_id={asrc}")
   if atype: url_next+=(f"&assay_type={atype}")
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       break
@@ -609,7 +644,7 @@ def SearchAssays(asrc, atype, skip, nmax, api_host=API_HOST, api_base_path=API_B
       if not tags:
         tags = [tag for tag in list(assay.keys()) if type(assay[tag]) not in (dict, list)]
       df_this = pd.DataFrame({tag:[(assay[tag] if tag in assay else None)] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
       if tq is not None: tq.update()
@@ -621,14 +656,16 @@ def SearchAssays(asrc, atype, skip, nmax, api_host=API_HOST, api_base_path=API_B
     if not url_next: break
   if tq is not None: tq.close()
   logging.info(f"n_assay: {n_ass}; n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def GetMolecule(ids, base_url=BASE_URL, fout=None):
   '''Ignore molecule_synonyms.'''
   n_out=0; mol_tags=None; struct_tags=None; prop_tags=None; df=None; tq=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_url}/molecule/{id_this}.json")
+    response = rest.GetSession().get(f"{base_url}/molecule/{id_this}.json")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       continue
@@ -659,11 +696,12 @@ def GetMolecule(ids, base_url=BASE_URL, fout=None):
 	pd.DataFrame({tag:[(molecule_structures[tag] if tag in molecule_structures else None)] for tag in struct_tags}),
 	pd.DataFrame({tag:[(molecule_properties[tag] if tag in molecule_properties else None)] for tag in prop_tags}),
 	pd.DataFrame({"parent_chembl_id":[parent_chembl_id]})], axis=1)
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out+=df_this.shape[0]
   if tq is not None: tq.close()
   logging.info(f"n_in: {len(ids)}; n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -673,8 +711,9 @@ def ListMolecules(dev_phase, skip, nmax, api_host=API_HOST, api_base_path=API_BA
   url_next = f"{api_base_path}/molecule.json?limit={NCHUNK}"
   if skip: url_next += f"&offset={skip}"
   if dev_phase: url_next += f"&max_phase={dev_phase}"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       break
@@ -696,7 +735,7 @@ def ListMolecules(dev_phase, skip, nmax, api_host=API_HOST, api_base_path=API_BA
 	pd.DataFrame({tag:[(mol["molecule_structures"][tag] if tag in mol["molecule_structures"] else None)] for tag in struct_tags}),
 	pd.DataFrame({tag:[(mol["molecule_properties"][tag] if tag in mol["molecule_properties"] else None)] for tag in prop_tags}),
 	pd.DataFrame({"parent_chembl_id":[parent_chembl_id]})], axis=1)
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
       if nmax and n_mol>=nmax: break
@@ -707,14 +746,16 @@ def ListMolecules(dev_phase, skip, nmax, api_host=API_HOST, api_base_path=API_BA
     if not url_next: break
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def ListDrugs(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fout=None):
   n_mol=0; n_out=0; n_err=0; tags=None; struct_tags=None; prop_tags=None; df=None; tq=None;
   url_next = f"{api_base_path}/drug.json?limit={NCHUNK}&offset={skip}"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(f"https://{api_host}{url_next}")
+    response = rest.GetSession().get(f"https://{api_host}{url_next}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       break
@@ -736,7 +777,7 @@ def ListDrugs(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fout=N
 	pd.DataFrame({tag:[(mol["molecule_structures"][tag] if tag in mol["molecule_structures"] else None)] for tag in struct_tags}),
 	pd.DataFrame({tag:[(mol["molecule_properties"][tag] if tag in mol["molecule_properties"] else None)] for tag in prop_tags}),
 	pd.DataFrame({"parent_chembl_id":[parent_chembl_id]})], axis=1)
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
       if tq is not None: tq.update()
@@ -748,6 +789,7 @@ def ListDrugs(skip, nmax, api_host=API_HOST, api_base_path=API_BASE_PATH, fout=N
     if not url_next: break
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -755,8 +797,9 @@ def SearchMoleculeByName(ids, base_url=BASE_URL, fout=None):
   """IDs should be names/synonyms."""
   n_out=0; n_notfound=0; df=None; synonym_tags=None;
   tags = ["molecule_chembl_id"]
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_url}/molecule/search?q={urllib.parse.quote(id_this)}", headers={"Accept":"application/json"})
+    response = rest.GetSession().get(f"{base_url}/molecule/search?q={urllib.parse.quote(id_this)}", headers={"Accept":"application/json"})
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       n_notfound+=1
@@ -777,20 +820,22 @@ def SearchMoleculeByName(ids, base_url=BASE_URL, fout=None):
       df_this = pd.concat([
 	pd.DataFrame({"molecule_chembl_id":[molecule_chembl_id]}),
 	pd.DataFrame({tag:[(synonum[tag] if tag in synonum else None)] for tag in synonym_tags})], axis=1)
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
   logging.info(f"n_in: {len(ids)}; n_found: {len(ids)-n_notfound}; n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def GetMoleculeByInchikey(ids, base_url=BASE_URL, fout=None):
   """Requires InChI key, e.g. "GHBOEFUAGSHXPO-XZOTUCIWSA-N"."""
   n_out=0; tags=[]; struct_tags=[]; df=None; tq=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     if not tq: tq = tqdm.tqdm(total=len(ids), unit="mols")
     tq.update()
-    response = requests.get(f"{base_url}/molecule/{id_this}.json")
+    response = rest.GetSession().get(f"{base_url}/molecule/{id_this}.json")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       continue
@@ -807,11 +852,12 @@ def GetMoleculeByInchikey(ids, base_url=BASE_URL, fout=None):
 	pd.DataFrame({tag:[(mol[tag] if tag in mol else None)] for tag in tags}),
 	pd.DataFrame({tag:[(struct[tag] if tag in struct else None)] for tag in struct_tags})],
 	axis=1)
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out+=df_this.shape[0]
   if tq is not None: tq.close()
   logging.info(f"n_qry: {len(ids)}; n_out: {n_out}; n_not_found: {len(ids)-n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
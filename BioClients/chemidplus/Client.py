@@ -9,6 +9,7 @@ https://chem.nlm.nih.gov/api/v2/api-docs
 import sys,os,re,argparse,time,logging
 #
 from .. import chemidplus
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -25,11 +26,15 @@ if __name__=='__main__':
   parser.add_argument("--api_base_path", default=chemidplus.API_BASE_PATH)
   parser.add_argument("--skip", type=int, default=0)
   parser.add_argument("--nmax", type=int, default=0)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = 'https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w") if args.ofile else sys.stdout
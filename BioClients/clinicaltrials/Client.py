@@ -9,6 +9,8 @@ https://clinicaltrials.gov/data-api/about-api/csv-download
 import sys,os,re,json,argparse,time,logging
 
 from .. import clinicaltrials
+from ..util import rest
+from ..util import parallel
 #
 #############################################################################
 if __name__=='__main__':
@@ -28,13 +30,20 @@ https://clinicaltrials.gov/find-studies/constructing-complex-search-queries
   parser.add_argument("--ids", help="Input NCT_IDs (comma-separated)")
   parser.add_argument("--query_cond", help="Search query condition")
   parser.add_argument("--query_term", help="Search query term")
+  parser.add_argument("--concurrency", type=int, default=1, help="max requests in flight")
   parser.add_argument("--api_host", default=clinicaltrials.API_HOST)
   parser.add_argument("--api_base_path", default=clinicaltrials.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
+  if args.concurrency>rest.REST_POOL_MAXSIZE: rest.ConfigureSession(pool_maxsize=args.concurrency)
+
   api_base_url = 'https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
@@ -69,9 +78,11 @@ https://clinicaltrials.gov/find-studies/constructing-complex-search-queries
     clinicaltrials.SearchStudies(args.query_cond, args.query_term, api_base_url, fout)
 
   elif args.op == "get_studies":
-    clinicaltrials.GetStudies(ids, api_base_url, fout)
+    clinicaltrials.GetStudies(ids, api_base_url, fout, args.concurrency)
 
   else:
     parser.error(f"Invalid operation: {args.op}")
 
   logging.info(f"Elapsed time: {time.strftime('%Hh:%Mm:%Ss',time.gmtime(time.time()-t0))}")
+
+  if parallel.ReportFailures(): sys.exit(1)
@@ -10,6 +10,9 @@ https://clinicaltrials.gov/find-studies/constructing-complex-search-queries
 import sys,os,re,time,json,logging,requests,tqdm
 import urllib,urllib.parse
 import pandas as pd
+from ..util import rest
+from ..util import parallel
+from ..util import pandas as util_pandas
 #
 API_HOST='clinicaltrials.gov'
 API_BASE_PATH='/api/v2'
@@ -18,7 +21,7 @@ API_PAGE_SIZE=50
 #
 ##############################################################################
 def Version(base_url=API_BASE_URL, fout=None):
-  response = requests.get(f"{base_url}/version")
+  response = rest.GetSession().get(f"{base_url}/version")
   result = response.json()
   df = pd.DataFrame(result, index=[0])
   if fout is not None: df.to_csv(fout, sep="\t", index=False)
@@ -26,7 +29,7 @@ def Version(base_url=API_BASE_URL, fout=None):
 
 ##############################################################################
 def ListStudyFields(base_url=API_BASE_URL, fout=None):
-  response = requests.get(f"{base_url}/studies/metadata")
+  response = rest.GetSession().get(f"{base_url}/studies/metadata")
   logging.debug(response.text)
   result = response.json()
   df = pd.DataFrame(result)
@@ -37,10 +40,11 @@ def ListStudyFields(base_url=API_BASE_URL, fout=None):
 ##############################################################################
 def ListSearchAreas(base_url=API_BASE_URL, fout=None):
   n_out=0; df=None;
-  response = requests.get(f"{base_url}/studies/search-areas")
+  response = rest.GetSession().get(f"{base_url}/studies/search-areas")
   logging.debug(response.text)
   result = response.json()
   areas = result[0]["areas"]
+  dfb = util_pandas.FrameBuilder()
   for area in areas:
     name = area["name"]
     param = area["param"] if "param" in area else None
@@ -51,18 +55,20 @@ def ListSearchAreas(base_url=API_BASE_URL, fout=None):
 	"parts":[";".join(parts)],
 	})
     if fout is not None: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=1
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def ListEnums(base_url=API_BASE_URL, fout=None):
   n_out=0; df=None;
-  response = requests.get(f"{base_url}/studies/enums")
+  response = rest.GetSession().get(f"{base_url}/studies/enums")
   logging.debug(response.text)
   result = response.json()
   enums = result
+  dfb = util_pandas.FrameBuilder()
   for enum in enums:
     values = [value["value"] for value in enum["values"]]
     legacyValues = [value["legacyValue"] for value in enum["values"]]
@@ -73,9 +79,10 @@ def ListEnums(base_url=API_BASE_URL, fout=None):
 	"legacyValue":legacyValues,
 	})
     if fout is not None: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -84,11 +91,12 @@ def SearchStudies(query_cond, query_term, base_url=API_BASE_URL, fout=None):
   url_base = f"{base_url}/studies?pageSize={API_PAGE_SIZE}"
   if query_cond: url_base += f"&query.cond={urllib.parse.quote(query_cond)}"
   if query_term: url_base += f"&query.term={urllib.parse.quote(query_term)}"
+  dfb = util_pandas.FrameBuilder()
   while True:
     url = url_base
     if not totalCount: url += "&countTotal=true"
     if nextPageToken: url += f"&pageToken={nextPageToken}"
-    response = requests.get(url)
+    response = rest.GetSession().get(url)
     result = response.json()
     if not totalCount: totalCount = result["totalCount"]
     logging.debug(f"totalCount: {totalCount}")
@@ -98,32 +106,37 @@ def SearchStudies(query_cond, query_term, base_url=API_BASE_URL, fout=None):
       logging.debug(json.dumps(study, indent=2))
       tq.update()
       df_this = Study2DataFrame(study)
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
     nextPageToken = result["nextPageToken"] if "nextPageToken" in result else None
     if not nextPageToken: break
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
-def GetStudies(ids, base_url=API_BASE_URL, fout=None):
+def GetStudies(ids, base_url=API_BASE_URL, fout=None, concurrency=1):
   n_out=0; df=None; tq=None;
-  for id_this in ids:
+  session = rest.GetSession()
+  dfb = util_pandas.FrameBuilder()
+  for id_this,response in parallel.MapOrdered(lambda id_this: session.get(f"{base_url}/studies/{id_this}"), ids, concurrency):
     if not tq: tq = tqdm.tqdm(total=len(ids))
-    url = f"{base_url}/studies/{id_this}"
-    response = requests.get(url)
+    if response is None:
+      tq.update()
+      continue
     result = response.json()
     study = result
     tq.update()
     logging.debug(json.dumps(study, indent=2))
     df_this = Study2DataFrame(study)
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out+=1
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -63,9 +63,13 @@ if __name__=='__main__':
   parser.add_argument("--o", dest="ofile", help="output (CSV|TSV)")
   parser.add_argument("--api_host", default=API_HOST)
   parser.add_argument("--api_base_path", default=API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url='https://'+args.api_host+args.api_base_path
 
   if len(set(fields_vals) - set(fields_allowed))>0:
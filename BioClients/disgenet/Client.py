@@ -7,6 +7,7 @@ import sys,os,re,argparse,time,logging
 #
 from .. import disgenet
 from ..util import yaml as util_yaml
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -30,12 +31,16 @@ Example IDs: C0019829 (UMLS CUI); 351 (NCBI Gene ID) """)
   #parser.add_argument("--user_password")
   parser.add_argument("--api_key")
   parser.add_argument("--param_file", default=os.environ['HOME']+"/.disgenet.yaml")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", action="count", default=0)
 
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   if os.path.isfile(args.param_file):
     params = util_yaml.ReadParamFile(args.param_file)
   #if args.user_email: params['EMAIL'] = args.user_email 
@@ -7,6 +7,8 @@
 ###
 import sys,os,io,re,time,requests,json,logging
 import pandas as pd
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST='api.disgenet.com'
 API_BASE_PATH='/api/v1'
@@ -91,7 +93,7 @@ def GetApiKey(session, user_email, user_password, base_url=BASE_URL):
 def GetVersion(api_key, base_url=BASE_URL, fout=None):
   headers={'Authorization': api_key, 'Accept': 'application/json'}
   url = f"{base_url}/public/version"
-  response = requests.get(url, headers=headers)
+  response = rest.GetSession().get(url, headers=headers)
   #logging.debug(response.text)
   results = response.json()["payload"]
   logging.debug(json.dumps(results, indent=2))
@@ -105,9 +107,10 @@ def GetDiseaseGDAs(ids, source, api_key, base_url=BASE_URL, fout=None):
   headers={'Authorization': api_key, 'Accept': 'application/json'}
   url = f"{base_url}/gda/summary"
   params = {'source': source}
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     params['disease'] = f"{id_this}"
-    response = requests.get(url, params=params, headers=headers)
+    response = rest.GetSession().get(url, params=params, headers=headers)
     results = response.json()
     logging.debug(json.dumps(results, indent=2))
     gdas = results["payload"]
@@ -116,9 +119,10 @@ def GetDiseaseGDAs(ids, source, api_key, base_url=BASE_URL, fout=None):
         tags = [tag for tag in gda.keys() if type(gda[tag]) not in (list,dict)]
       df_this = pd.DataFrame({tag:[gda[tag] if tag in gda else ""] for tag in tags})
       if fout is not None: df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=1
   logging.info(f"IDs: {len(ids)}; GDAs: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -128,17 +132,18 @@ def GetDiseases(ids, dtype, dclasses, nmax, api_key, base_url=BASE_URL, fout=Non
   headers={'Authorization': api_key, 'Accept': 'application/json'}
   url = f"{base_url}/entity/disease"
   params = {}
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     params['disease'] = f"{id_this}"
     if dtype is not None: params['type'] = dtype
     if dclasses is not None: params['dis_class_list'] = dclasses
-    response = requests.get(url, params=params, headers=headers)
+    response = rest.GetSession().get(url, params=params, headers=headers)
     if not response.ok:
       if response.status_code == 429:
         while response.ok is False:
           logging.info("Query limit reached; waiting {}s...".format(response.headers['x-rate-limit-retry-after-seconds']))
           time.sleep(int(response.headers['x-rate-limit-retry-after-seconds']))
-          response = requests.get(url, params=params, headers=headers)
+          response = rest.GetSession().get(url, params=params, headers=headers)
           if response.ok is True:
             break
           else:
@@ -162,9 +167,10 @@ def GetDiseases(ids, dtype, dclasses, nmax, api_key, base_url=BASE_URL, fout=Non
       df_this = pd.DataFrame(d, index=[0])
       if df_this is None: continue
       if fout is not None: df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=df_this.shape[0]
   logging.info(f"Diseases: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -174,6 +180,7 @@ def GetGeneGDAs(ids, geneid_type, source, api_key, base_url=BASE_URL, fout=None)
   headers={'Authorization': api_key, 'Accept': 'application/json'}
   url = f"{base_url}/gda/summary"
   params = {'source': source}
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     if geneid_type == "ncbi":
       params["gene_ncbi_id"] = id_this
@@ -183,7 +190,7 @@ def GetGeneGDAs(ids, geneid_type, source, api_key, base_url=BASE_URL, fout=None)
       params["uniprot_id"] = id_this
     else:
       params["gene_symbol"] = id_this
-    response = requests.get(url, params=params, headers=headers)
+    response = rest.GetSession().get(url, params=params, headers=headers)
     results = response.json()
     logging.debug(json.dumps(results, indent=2))
     gdas = results["payload"]
@@ -196,9 +203,10 @@ def GetGeneGDAs(ids, geneid_type, source, api_key, base_url=BASE_URL, fout=None)
             logging.info(f"Ignoring field: {tag}")
       df_this = pd.DataFrame({tag:[gda[tag] if tag in gda else ""] for tag in tags})
       if fout is not None: df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=1
   logging.info(f"IDs: {len(ids)}; GDAs: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
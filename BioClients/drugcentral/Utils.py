@@ -5,6 +5,7 @@ DrugCentral db utility functions.
 import os,sys,re,json,logging,yaml,tqdm
 import pandas as pd
 import psycopg2,psycopg2.extras
+from ..util import pandas as util_pandas
 
 NCHUNK=100
 
@@ -38,12 +39,14 @@ def ListColumns(dbcon, dbschema="public", fout=None):
   df=None;
   sql1 = (f"SELECT table_name FROM information_schema.tables WHERE table_schema = '{dbschema}'")
   df1 = pd.read_sql(sql1, dbcon)
+  dfb = util_pandas.FrameBuilder()
   for tname in df1.table_name:
     sql2 = (f"SELECT column_name,data_type FROM information_schema.columns WHERE table_schema = '{dbschema}' AND table_name = '{tname}'")
     df_this = pd.read_sql(sql2, dbcon)
     df_this["schema"] = dbschema
     df_this["table"] = tname
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   df = df[["schema", "table", "column_name", "data_type"]]
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
@@ -64,12 +67,14 @@ def ListTablesRowCounts(dbcon, dbschema="public", fout=None):
   df=None;
   sql1 = (f"SELECT table_name FROM information_schema.tables WHERE table_schema = '{dbschema}'")
   df1 = pd.read_sql(sql1, dbcon)
+  dfb = util_pandas.FrameBuilder()
   for tname in df1.table_name:
     sql2 = (f"SELECT COUNT(*) AS rowcount FROM {dbschema}.{tname}")
     df_this = pd.read_sql(sql2, dbcon)
     df_this["schema"] = dbschema
     df_this["table"] = tname
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   df = df[["schema", "table", "rowcount"]]
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
@@ -110,11 +115,13 @@ WHERE
 """
   logging.debug(f"SQL: {sql}")
   df_itr = pd.read_sql(sql, dbcon, chunksize=NCHUNK)
+  dfb = util_pandas.FrameBuilder()
   for df_this in df_itr:
     if fout is not None: df_this.to_csv(fout, sep="\t", index=False)
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -192,14 +199,16 @@ FROM
 	JOIN structures s ON s.id=identifier.struct_id
 """
   df_itr = pd.read_sql(sql, dbcon, chunksize=NCHUNK)
+  dfb = util_pandas.FrameBuilder()
   for df_this in df_itr:
     if not quiet and tq is None: tq = tqdm.tqdm(total=N_row)
     if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0), index=False)
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     if tq is not None: tq.update(df_this.shape[0])
     n_out += df_this.shape[0]
   if tq is not None: tq.close()
   logging.info(f"rows: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -245,10 +254,12 @@ WHERE
 AND
 	omop.relationship_name = 'indication'
 """)
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -319,6 +330,7 @@ JOIN drug_class drug_class2 ON drug_class2.name = ddi.drug_class2
 def SearchProducts(dbcon, terms, fout=None):
   """Search names via Pg regular expression (SIMILAR TO)."""
   df=None;
+  dfb = util_pandas.FrameBuilder()
   for term in terms:
     sql= f"""\
 SELECT DISTINCT
@@ -341,7 +353,8 @@ WHERE
 """
     logging.debug(f"SQL: {sql}")
     df_this = pd.read_sql(sql, dbcon)
-    df = pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   logging.info(f"n_out: {df.shape[0]}")
   if fout is not None: df.to_csv(fout, sep="\t", index=False)
   else: return df
@@ -350,6 +363,7 @@ WHERE
 def SearchIndications(dbcon, terms, fout=None):
   """Search names via Pg regular expression (SIMILAR TO)."""
   df=None;
+  dfb = util_pandas.FrameBuilder()
   for term in terms:
     sql=f"""\
 SELECT DISTINCT
@@ -369,7 +383,8 @@ WHERE
 """
     logging.debug(f"SQL: {sql}")
     df_this = pd.read_sql(sql, dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -397,10 +412,12 @@ WHERE
 	omop.relationship_name = 'indication'
 	AND omop.concept_id = {}
 """
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -409,10 +426,12 @@ WHERE
 def GetStructure(dbcon, ids, fout=None):
   df=None;
   sql = ("""SELECT id,name,cas_reg_no,smiles,inchikey,inchi,cd_formula AS formula,cd_molweight AS molweight FROM structures WHERE id = '{}'""")
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -460,6 +479,7 @@ def GetDrugPage(dbcon, struct_id, fout=None):
 def GetDrugSummary(dbcon, ids, fout):
   """Structure, with IDs, names, xrefs, and ATCs, products; TSV output."""
   n_out=0; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     drug = GetDrugPage(dbcon, id_this)
     pubchem_cid=None; chembl_id=None; drugbank_id=None;
@@ -480,7 +500,7 @@ def GetDrugSummary(dbcon, ids, fout):
     targets = drug["targets"] if "targets" in drug else []
     indications = drug["indications"] if "indications" in drug else []
     dcid = drug["id"] if "id" in drug else None
-    df = pd.concat([df, pd.DataFrame({
+    dfb.append(pd.DataFrame({
 	"drugcentral_id":[dcid],
 	"drugcentral_url":[f"https://drugcentral.org/drugcard/{dcid}"],
 	"name":[drug["name"] if "name" in drug else None],
@@ -497,7 +517,8 @@ def GetDrugSummary(dbcon, ids, fout):
 	"product_count":pd.Series([len(products)]).astype(int),
 	"target_count":pd.Series([len(targets)]).astype(int),
 	"indication_count":pd.Series([len(indications)]).astype(int),
-	})])
+	}))
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -522,10 +543,12 @@ WHERE
 """)
   if xref_type is not None:
     sql += f" AND identifier.id_type = '{xref_type}'"
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -534,10 +557,12 @@ WHERE
 def GetStructureBySynonym(dbcon, ids, fout=None):
   df=None;
   sql = ("""SELECT str.id, str.name structure_name, syn.name synonym FROM structures AS str JOIN synonyms AS syn ON syn.id=str.id WHERE syn.name = '{}'""")
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -546,10 +571,12 @@ def GetStructureBySynonym(dbcon, ids, fout=None):
 def GetStructureXrefs(dbcon, ids, fout=None):
   df=None;
   sql = ("""SELECT struct_id, id_type AS xref_type, identifier AS xref FROM identifier WHERE struct_id = '{}'""")
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -580,10 +607,12 @@ JOIN
 WHERE 
 	s.id = '{}'
 """
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -612,10 +641,12 @@ FROM
 WHERE 
 	s.id = '{}'
 """
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -652,13 +683,15 @@ FROM
 WHERE
 	atf.struct_id = {}
 """
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -706,14 +739,16 @@ ORDER BY
 	id
 """
   df_itr = pd.read_sql(sql, dbcon, chunksize=NCHUNK)
+  dfb = util_pandas.FrameBuilder()
   for df_this in df_itr:
     if not quiet and tq is None: tq = tqdm.tqdm(total=N_row)
     if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0), index=False)
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     if tq is not None: tq.update(df_this.shape[0])
     n_out += df_this.shape[0]
   if tq is not None: tq.close()
   logging.info(f"rows: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -731,10 +766,12 @@ JOIN
 WHERE 
 	s.id = '{}'
 """
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -767,10 +804,12 @@ JOIN
 WHERE 
 	s.id = '{}'
 """
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = df_this if df is None else pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -798,10 +837,12 @@ JOIN
 WHERE 
 	p.id = '{}'
 """
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug(sql.format(id_this))
     df_this = pd.read_sql(sql.format(id_this), dbcon)
-    df = pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -7,6 +7,7 @@ https://identifiers.org
 import sys,os,re,json,argparse,time,logging
 
 from ... import emblebi
+from ...util import rest
 #
 #############################################################################
 if __name__=='__main__':
@@ -32,11 +33,15 @@ Example IDs: taxonomy:9606
   parser.add_argument("--registry_api_host", default=emblebi.identifiers.REGISTRY_API_HOST)
   parser.add_argument("--registry_api_base_path", default=emblebi.identifiers.REGISTRY_API_BASE_PATH)
   parser.add_argument("--search_logic", choices=("containing", "exact"), default="containing")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   resolver_api_base_url = 'https://'+args.resolver_api_host+args.resolver_api_base_path
   registry_api_base_url = 'https://'+args.registry_api_host+args.registry_api_base_path
 
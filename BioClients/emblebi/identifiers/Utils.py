@@ -4,6 +4,8 @@
 import sys,os,re,time,json,logging,requests,tqdm
 import urllib,urllib.parse
 import pandas as pd
+from ...util import rest
+from ...util import pandas as util_pandas
 #
 RESOLVER_API_HOST='resolver.api.identifiers.org'
 RESOLVER_API_BASE_PATH=''
@@ -18,8 +20,9 @@ NCHUNK=100
 ##############################################################################
 def Resolve(ids, base_url=RESOLVER_API_BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_url}/{id_this}")
+    response = rest.GetSession().get(f"{base_url}/{id_this}")
     logging.debug(response.text)
     results = response.json()
     resources = results['payload']['resolvedResources']
@@ -31,19 +34,21 @@ def Resolve(ids, base_url=RESOLVER_API_BASE_URL, fout=None):
             logging.info(f"Ignoring field: {tag}")
             tags.remove(tag)
       df_this = pd.DataFrame({tag:[resource[tag]] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def ListEntities(entityname, base_url=REGISTRY_API_BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
   page=0; size=NCHUNK;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_this = f"{base_url}/{entityname}s?page={page}&size={size}"
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     logging.debug(response.text)
     if response.status_code!=200: break
     results = response.json()
@@ -57,11 +62,12 @@ def ListEntities(entityname, base_url=REGISTRY_API_BASE_URL, fout=None):
             logging.info(f"Ignoring field: {tag}")
             tags.remove(tag)
       df_this = pd.DataFrame({tag:[thing[tag]] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
     page+=1
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -79,9 +85,10 @@ def SearchEntities(query, search_logic, entityname, base_url=REGISTRY_API_BASE_U
   n_out=0; tags=None; df=None;
   page=0; size=NCHUNK;
   url = f"{base_url}/{entityname}s/search/findByName?name={urllib.parse.quote(query)}" if search_logic=="exact" else f"{base_url}/{entityname}s/search/findByNameContaining?nameContent={urllib.parse.quote(query)}"
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_this = f"{url}&page={page}&size={size}"
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     logging.debug(response.text)
     if response.status_code!=200: break
     results = response.json()
@@ -95,11 +102,12 @@ def SearchEntities(query, search_logic, entityname, base_url=REGISTRY_API_BASE_U
             logging.info(f"Ignoring field: {tag}")
             tags.remove(tag)
       df_this = pd.DataFrame({tag:[thing[tag]] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
     page+=1
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
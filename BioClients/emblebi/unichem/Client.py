@@ -7,6 +7,7 @@ UCI is UniChem Compound Id
 import sys,os,re,json,argparse,time,logging
 
 from ... import emblebi
+from ...util import rest
 #
 #############################################################################
 if __name__=='__main__':
@@ -28,11 +29,15 @@ Example InChIkey: LCNDUGHNYMJGIW-UHFFFAOYSA-N
   parser.add_argument("--api_base_path", default=emblebi.unichem.API_BASE_PATH)
   parser.add_argument("--skip", type=int, help="")
   parser.add_argument("--nmax", type=int, help="")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   api_base_url = 'https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
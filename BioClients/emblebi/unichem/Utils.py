@@ -7,6 +7,8 @@ https://chembl.gitbook.io/unichem/webservices
 import sys,os,re,time,json,logging,requests,tqdm
 import urllib,urllib.parse
 import pandas as pd
+from ...util import rest
+from ...util import pandas as util_pandas
 #
 API_HOST='www.ebi.ac.uk'
 API_BASE_PATH='/unichem/api/v1'
@@ -17,9 +19,10 @@ HEADERS = {"Accept":"application/json", "Content-Type":"application/json"}
 ##############################################################################
 def ListSources(base_url=API_BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
-  response = requests.get(f"{base_url}/sources")
+  response = rest.GetSession().get(f"{base_url}/sources")
   logging.debug(response.text)
   result = response.json()
+  dfb = util_pandas.FrameBuilder()
   for source in result['sources']:
     if not tags:
       tags = list(source.keys())
@@ -28,10 +31,11 @@ def ListSources(base_url=API_BASE_URL, fout=None):
           logging.info(f"Ignoring field: {tag}")
           tags.remove(tag)
     df_this = pd.DataFrame({tag:[source[tag]] for tag in tags})
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -39,12 +43,13 @@ def GetFromSourceId(ids, src_id_in, src_id_out=None, skip=None, nmax=None, base_
   n_out=0; df=None;
   compound_tags=None; source_tags=None;
   query = {"sourceID":src_id_in, "type":"sourceID"}
+  dfb = util_pandas.FrameBuilder()
   for i in tqdm.trange(len(ids)):
     if skip is not None and i<skip: continue
     id_this = ids[i]
     query["compound"] = id_this
     try:
-      response = requests.post(f"{base_url}/compounds", data=json.dumps(query), headers=HEADERS)
+      response = rest.GetSession().post(f"{base_url}/compounds", data=json.dumps(query), headers=HEADERS)
     except Exception as e:
       logging.error(str(e))
       continue
@@ -76,12 +81,13 @@ def GetFromSourceId(ids, src_id_in, src_id_out=None, skip=None, nmax=None, base_
         df_this = pd.DataFrame({'src_id_in':[src_id_in], 'src_compound_id_in':[id_this]})
         df_this = pd.concat([df_this, pd.DataFrame({f"compound_{tag}":[compound[tag]] for tag in compound_tags})], axis=1)
         df_this = pd.concat([df_this, pd.DataFrame({f"source_{tag}":[source[tag]] for tag in source_tags})], axis=1)
-        if fout is None: df = pd.concat([df, df_this])
+        if fout is None: dfb.append(df_this)
         else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
         n_out += df_this.shape[0]
     if nmax is not None:
       if i>=(nmax if skip is None else nmax+skip): break
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -90,11 +96,12 @@ def GetFromInchi(ids, inchi_rep, search_components=False, src_id_in=None, src_id
   compound_tags=None; source_tags=None;
   query = {"searchComponents":search_components, "type":inchi_rep}
   if src_id_in is not None: query["sourceID"] = src_id_in
+  dfb = util_pandas.FrameBuilder()
   for i in tqdm.trange(len(ids)):
     if skip is not None and i<skip: continue
     id_this = ids[i]
     query["compound"] = id_this
-    response = requests.post(f"{base_url}/connectivity", data=json.dumps(query), headers=HEADERS)
+    response = rest.GetSession().post(f"{base_url}/connectivity", data=json.dumps(query), headers=HEADERS)
     if response.status_code!=200:
       logging.debug(f"Status code: {response.status_code}")
       continue
@@ -121,11 +128,12 @@ def GetFromInchi(ids, inchi_rep, search_components=False, src_id_in=None, src_id
           continue
       df_this = pd.DataFrame({f"searchedCompound_{tag}":[compound[tag]] for tag in compound_tags})
       df_this = pd.concat([df_this, pd.DataFrame({f"source_{tag}":[source[tag]] for tag in source_tags})], axis=1)
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
     if nmax is not None:
       if i>=(nmax if skip is None else nmax+skip): break
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
@@ -9,6 +9,8 @@ https://rest.ensembl.org/documentation/info/vep_id_get
 import sys,os,re,argparse,time,json,logging
 
 from .. import ensembl
+from ..util import rest
+from ..util import parallel
 #
 ##############################################################################
 if __name__=='__main__':
@@ -22,6 +24,9 @@ if __name__=='__main__':
   parser.add_argument("--o", dest="ofile", help="output (TSV)")
   parser.add_argument("--skip", type=int, default=0)
   parser.add_argument("--nmax", type=int)
+  parser.add_argument("--concurrency", type=int, default=1, help="max requests in flight")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   parser.add_argument("-q", "--quiet", action="count", default=0)
   args = parser.parse_args()
@@ -29,6 +34,10 @@ if __name__=='__main__':
   # logging.PROGRESS = 15 (custom)
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>0 else logging.ERROR if args.quiet else 15))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
+  if args.concurrency>rest.REST_POOL_MAXSIZE: rest.ConfigureSession(pool_maxsize=args.concurrency)
+
   base_url = 'http://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w") if args.ofile else sys.stdout
@@ -57,7 +66,7 @@ if __name__=='__main__':
     ensembl.ListSpecies(base_url, fout)
 
   elif args.op=='get_info':
-    ensembl.GetInfo(ids, args.skip, args.nmax, base_url, fout)
+    ensembl.GetInfo(ids, args.skip, args.nmax, base_url, fout, args.concurrency)
 
   elif args.op=='get_xrefs':
     ensembl.GetXrefs(ids, args.skip, args.nmax, base_url, fout)
@@ -72,3 +81,5 @@ if __name__=='__main__':
     parser.error(f'Invalid operation: {args.op}')
 
   logging.info(('%s: elapsed time: %s'%(os.path.basename(sys.argv[0]), time.strftime('%Hh:%Mm:%Ss', time.gmtime(time.time()-t0)))))
+
+  if parallel.ReportFailures(): sys.exit(1)
@@ -6,6 +6,9 @@ http://rest.ensembl.org/documentation/info/lookup
 import sys,os,re,time,json,logging,tqdm
 import pandas as pd
 import requests
+from ..util import rest
+from ..util import parallel
+from ..util import pandas as util_pandas
 #
 API_HOST='rest.ensembl.org'
 API_BASE_PATH=''
@@ -17,9 +20,9 @@ def ShowVersion(base_url=BASE_URL, fout=None):
   df = pd.DataFrame({
       "param": ["EnsEMBL REST API version", "EnsEMBL software API version", "EnsEMBL genomes version"],
       "value": [
-          requests.get(base_url+'/info/rest?content-type=application/json').json()['release'],
-          requests.get(base_url+'/info/software?content-type=application/json').json()['release'],
-          requests.get(base_url+'/info/eg_version?content-type=application/json').json()['version']
+          rest.GetSession().get(base_url+'/info/rest?content-type=application/json').json()['release'],
+          rest.GetSession().get(base_url+'/info/software?content-type=application/json').json()['release'],
+          rest.GetSession().get(base_url+'/info/eg_version?content-type=application/json').json()['version']
           ]})
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
@@ -28,29 +31,27 @@ def ShowVersion(base_url=BASE_URL, fout=None):
 ##############################################################################
 def ListSpecies(base_url=BASE_URL, fout=None):
   tags=None; df=pd.DataFrame();
-  rval = requests.get(base_url+'/info/species?content-type=application/json').json()
+  rval = rest.GetSession().get(base_url+'/info/species?content-type=application/json').json()
   specs = rval["species"]
+  dfb = util_pandas.FrameBuilder()
   for spec in specs:
     if not tags: tags = list(spec.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[spec[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:spec[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
 
 ##############################################################################
-def GetInfo(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
+def GetInfo(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None, concurrency=1):
   n_out=0; n_err=0; tags=[]; df=None; tq=None;
   quiet = bool(logging.getLogger().getEffectiveLevel()>15)
-  for i,id_this in enumerate(ids):
-    if i<skip: continue
+  session = rest.GetSession()
+  dfb = util_pandas.FrameBuilder()
+  for i,(id_this,rval) in enumerate(parallel.MapOrdered(lambda id_this: session.get(base_url+'/lookup/id/'+id_this+'?content-type=application/json&expand=0', headers={"Content-Type":"application/json"}), ids[skip:], concurrency), start=skip):
     if tq is None and not quiet: tq = tqdm.tqdm(total=len(ids)-skip)
     if tq is not None: tq.update()
-    url_this = base_url+'/lookup/id/'+id_this+'?content-type=application/json&expand=0'
-    logging.debug(url_this)
-    try:
-      rval = requests.get(url_this, headers={"Content-Type":"application/json"})
-    except Exception as e:
-      logging.error(f"{e}")
+    if rval is None:
       n_err+=1
       continue
     if not rval.ok:
@@ -65,22 +66,24 @@ def GetInfo(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
     if fout is not None:
       df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += 1
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     if nmax and i>=(nmax-skip): break
   if tq is not None: tq.close()
   logging.info(f"n_ids: {len(ids)}; n_out: {n_out}; n_err: {n_err}")
+  df = dfb.frame(df)
   if fout is None: return df
 
 ##############################################################################
 def GetXrefs(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
   n_out=0; n_err=0; tags=None; dbcounts={}; df=pd.DataFrame(); tq=None;
   quiet = bool(logging.getLogger().getEffectiveLevel()>15)
+  dfb = util_pandas.FrameBuilder()
   for i,id_this in enumerate(ids):
     if i<skip: continue
     if tq is None and not quiet: tq = tqdm.tqdm(total=len(ids)-skip)
     if tq is not None: tq.update()
     url_this = base_url+'/xrefs/id/'+id_this
-    rval = requests.get(url_this, headers={"Content-Type":"application/json"})
+    rval = rest.GetSession().get(url_this, headers={"Content-Type":"application/json"})
     if not rval.ok:
       logging.error(f'{rval.status_code} : "{id_this}"')
       n_err+=1
@@ -93,7 +96,7 @@ def GetXrefs(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
       dbcounts[dbname]+=1
       if not tags: tags = list(xref.keys())
       df_this =  pd.DataFrame({tags[j]:([str(xref[tags[j]])] if tags[j] in xref else ['']) for j in range(len(tags))})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False)
       n_out+=1
     if nmax and i>=(nmax-skip): break
@@ -101,18 +104,20 @@ def GetXrefs(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
   for key in sorted(dbcounts.keys()):
     logging.info(f"Xref counts, db = {key:12s}: {dbcounts[key]:5d}")
   logging.info(f"n_ids: {len(ids)}; n_out: {n_out}; n_err: {n_err}")
+  df = dfb.frame(df)
   if fout is None: return df
 
 ##############################################################################
 def GetVariantEffectPredictions(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
   n_out=0; n_err=0; tags=None; tags_tc=None; dbcounts={}; df=pd.DataFrame(); tq=None;
   quiet = bool(logging.getLogger().getEffectiveLevel()>15)
+  dfb = util_pandas.FrameBuilder()
   for i,id_this in enumerate(ids):
     if i<skip: continue
     if tq is None and not quiet: tq = tqdm.tqdm(total=len(ids)-skip)
     if tq is not None: tq.update()
     url_this = base_url+'/vep/human/id/'+id_this
-    rval = requests.get(url_this, headers={"Content-Type":"application/json"})
+    rval = rest.GetSession().get(url_this, headers={"Content-Type":"application/json"})
     if not rval.ok:
       logging.error(f'{rval.status_code} : "{id_this}"')
       n_err+=1
@@ -135,12 +140,13 @@ def GetVariantEffectPredictions(ids, skip=0, nmax=None, base_url=BASE_URL, fout=
       logging.debug(f"tags_tc: {tags_tc}")
       df_this_tc = pd.DataFrame({tag:([str(tc[tag])] if tag in tc else ['']) for tag in tags_tc})
       df_this = pd.concat([df_this_base, df_this_tc], axis=1)
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False)
       n_out+=1
     if nmax and i>=(nmax-skip): break
   if tq is not None: tq.close()
   logging.info(f"n_ids: {len(ids)}; n_out: {n_out}; n_err: {n_err}")
+  df = dfb.frame(df)
   if fout is None: return df
 
 ##############################################################################
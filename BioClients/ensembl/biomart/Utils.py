@@ -6,6 +6,7 @@ https://m.ensembl.org/info/data/biomart/biomart_restful.html
 import sys,os,re,time,json,logging,tqdm,io
 import pandas as pd
 import requests, urllib.parse
+from ...util import rest
 #
 API_HOST='www.ensembl.org'
 API_BASE_PATH='/biomart/martservice'
@@ -58,7 +59,7 @@ ENSG2NCBIHGNC_xml="""\
 def XMLQuery(xmltxt, base_url=BASE_URL, fout=None):
   url_this = base_url+f"?query={urllib.parse.quote(xmltxt)}"
   logging.debug(url_this)
-  rval = requests.get(url_this)
+  rval = rest.GetSession().get(url_this)
   if not rval.ok:
     logging.error(f"{rval.status_code}")
     logging.debug(rval.text)
@@ -9,6 +9,8 @@ import sys,os,re,json,argparse,time,logging
 
 from ... import fda
 from ...util import yaml as util_yaml
+from ...util import rest
+from ...util import sink as util_sink
 #
 #############################################################################
 if __name__=='__main__':
@@ -19,7 +21,7 @@ Example UNII: 786Z46389E
   parser = argparse.ArgumentParser(description='OpenFDA Adverse Event Reports client', epilog=epilog)
   ops = ['search', 'get_counts', 'info', 'list_fields']
   parser.add_argument("op", choices=ops, help='operation')
-  parser.add_argument("--o", dest="ofile", help="output (TSV)")
+  parser.add_argument("--o", dest="ofile", help="output (TSV; search: also *.tsv.gz, *.jsonl, *.parquet)")
   parser.add_argument("--drug_class", help="search: EPC pharmacologic class")
   parser.add_argument("--drug_ind", help="search: drug indication")
   parser.add_argument("--drug_unii", help="search: drug ID UNII")
@@ -35,14 +37,21 @@ Example UNII: 786Z46389E
   parser.add_argument("--api_base_path", default=fda.aer.API_BASE_PATH)
   parser.add_argument("--param_file", default=os.environ['HOME']+"/.fda.yaml")
   parser.add_argument("--api_key")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = 'https://'+args.api_host+args.api_base_path
 
-  fout = open(args.ofile, "w+") if args.ofile else sys.stdout
+  if args.op == "search":
+    fout = util_sink.Open(args.ofile)
+  else:
+    fout = open(args.ofile, "w+") if args.ofile else sys.stdout
 
   params = util_yaml.ReadParamFile(args.param_file) if os.path.isfile(args.param_file) else {}
   if args.api_key: params['API_KEY'] = args.api_key
@@ -66,4 +75,6 @@ Example UNII: 786Z46389E
   else:
     parser.error(f"Invalid operation: {args.op}")
 
+  if isinstance(fout, util_sink.RecordSink): fout.close()
+
   logging.info(f"Elapsed time: {time.strftime('%Hh:%Mm:%Ss',time.gmtime(time.time()-t0))}")
@@ -31,6 +31,9 @@ OpenFDA Adverse Events Reports REST API utility functions.
 """
 import sys,os,re,time,json,logging,requests,tqdm
 import pandas as pd
+from ...util import rest
+from ...util import pandas as util_pandas
+from ...util import sink as util_sink
 #
 REST_RETRY_NMAX=10
 REST_RETRY_WAIT=5
@@ -45,7 +48,7 @@ API_BASE_URL='https://'+API_HOST+API_BASE_PATH
 ##############################################################################
 def GetCounts(base_url, tfrom, tto, fout):
   n_count=0; n_out=0; df=None;
-  response = requests.get(base_url+f"?search=receivedate:[{tfrom}+TO+{tto}]&count=receivedate")
+  response = rest.GetSession().get(base_url+f"?search=receivedate:[{tfrom}+TO+{tto}]&count=receivedate")
   if not response.ok or response.status_code != 200:
     response.raise_for_status()
     logging.error(f"status_code: {response.status_code}")
@@ -57,6 +60,7 @@ def GetCounts(base_url, tfrom, tto, fout):
   last_updated = meta['last_updated'] if 'last_updated' in meta else None
   lic = meta['license'] if 'license' in meta else None
   counts = result['results'] if 'results' in result else []
+  dfb = util_pandas.FrameBuilder()
   for c in counts:
     count_this = c['count'] if 'count' in c else 0
     n_count += count_this
@@ -64,13 +68,14 @@ def GetCounts(base_url, tfrom, tto, fout):
     if fout is not None:
       df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += 1
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
   logging.info(f"n_out: {n_out}; n_count: {n_count}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def Info(base_url, fout):
-  response = requests.get(f"{base_url}?search=(serious:1)&limit=1")
+  response = rest.GetSession().get(f"{base_url}?search=(serious:1)&limit=1")
   if not response.ok or response.status_code != 200:
     response.raise_for_status()
     logging.error(f"status_code: {response.status_code}")
@@ -85,7 +90,7 @@ def ListFields(base_url, fout):
 Sample first n records.  However no guarantee sampling contains all fields.
 '''
   n=100
-  response = requests.get(f"{base_url}?search=(serious:1)&limit={n}")
+  response = rest.GetSession().get(f"{base_url}?search=(serious:1)&limit={n}")
   if not response.ok or response.status_code != 200:
     response.raise_for_status()
     logging.error(f"status_code: {response.status_code}")
@@ -156,7 +161,7 @@ def DrugID(drug, id_field):
 
 #############################################################################
 def Search(base_url, drug_cl, drug_ind, drug_unii, drug_ndc, drug_spl, tfrom, tto, serious, fatal, rawquery, nmax, api_key, fout):
-  '''The API seems to disallow limit exceeding 100.  So we need to iterate using skip.'''
+  '''The API seems to disallow limit exceeding 100.  So we need to iterate using skip.  Output fout may be a file handle or util.sink (TSV/JSONL/Parquet).'''
   qrys=[]; df=None; tags=[]; n_out=0;
   tags_result=[]; tags_patient=[]; tags_drug=[]; tags_reaction=[];
   url = f"{base_url}?api_key={api_key}&search="
@@ -178,10 +183,12 @@ def Search(base_url, drug_cl, drug_ind, drug_unii, drug_ndc, drug_spl, tfrom, tt
   fromtime = time.strptime('19000101','%Y%m%d')
   totime = time.localtime()
   ndone=0; nchunk=100; n_report=0;
+  dfb = util_pandas.FrameBuilder()
+  sink = util_sink.Wrap(fout)
   while nmax==0 or ndone<nmax:
     if nmax>ndone: nchunk = min(nchunk, nmax-ndone)
     url_this = url+(f"&limit={nchunk}")+(f"&skip={ndone}" if ndone>0 else '')
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     if not response.ok or response.status_code != 200:
       response.raise_for_status()
       logging.error(f"status_code: {response.status_code}")
@@ -249,8 +256,8 @@ def Search(base_url, drug_cl, drug_ind, drug_unii, drug_ndc, drug_spl, tfrom, tt
           df_this = pd.concat([df_result, df_patient, df_drug_extra, df_drug, df_reaction], axis=1)
 
           rxns.add(reaction['reactionmeddrapt'])
-          if fout is None: df = pd.concat([df, df_this])
-          else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
+          if sink is None: dfb.append(df_this)
+          else: sink.write(df_this)
           n_out += df_this.shape[0]
       logging.debug(f"{n_report}. Report: {r['safetyreportid']} [{r['receiptdate']}] seriousness: {ser}; reactions: {(', '.join(list(rxns)))}; drugs: {(', '.join(list(drugnames)))}")
       uniis_all |= uniis
@@ -259,9 +266,11 @@ def Search(base_url, drug_cl, drug_ind, drug_unii, drug_ndc, drug_spl, tfrom, tt
     ndone+=nchunk
     if nmax>0 and ndone>=nmax: break
 
+  if sink is not None: sink.flush()
   logging.info(f"n_out: {n_out}")
   logging.info(f"N_report: {n_report}; drugs: {len(uniis_all)}; reactions: {len(rxns_all)}")
   logging.info(f"Seriousness: {str(ser_counts)}; total: {sum(ser_counts.values())}")
   logging.info(f"Daterange: ({time.strftime('%Y%m%d',fromtime)}-{time.strftime('%Y%m%d',totime)})")
+  df = dfb.frame(df)
   if fout is None:
     return df
@@ -7,6 +7,7 @@ import urllib.parse
 import pandas as pd
 
 from ..util import rest
+from ..util import pandas as util_pandas
 
 API_HOST='api.geneontology.org'
 API_BASE_PATH='/api'
@@ -16,11 +17,13 @@ BASE_URL = 'https://'+API_HOST+API_BASE_PATH
 def GetEntities(ids, base_url=BASE_URL, fout=None): 
   """For only one type of entity per call (gene, term)."""
   tags=[]; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     ent = rest.GetURL(base_url+'/bioentity/'+urllib.parse.quote(id_this), parse_json=True)
     logging.debug(json.dumps(ent, sort_keys=True, indent=2))
     if not tags: tags = ent.keys()
-    df = pd.concat([df, pd.DataFrame({tags[j]:[ent[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:ent[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   logging.info('n_ent: {}'.format(df.shape[0]))
   if fout: df.to_csv(fout, sep="\t", index=False)
   return df
@@ -28,13 +31,15 @@ def GetEntities(ids, base_url=BASE_URL, fout=None):
 ##############################################################################
 def GetGeneTerms(ids, base_url=BASE_URL, fout=None): 
   tags=[]; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     rval = rest.GetURL(base_url+'/bioentity/gene/{}/function'.format(urllib.parse.quote(id_this)), parse_json=True)
     assns = rval['associations'] if 'associations' in rval else []
     for assn in assns:
       logging.debug(json.dumps(assn, sort_keys=True, indent=2))
       if not tags: tags = assn.keys()
-      df = pd.concat([df, pd.DataFrame({tags[j]:[assn[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:assn[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   logging.info('n_gene: {}; n_assn: {}'.format(len(ids), df.shape[0]))
   if fout: df.to_csv(fout, sep="\t", index=False)
   return df
@@ -9,6 +9,8 @@ curl -X GET "https://api.glygen.org/glycan/detail/G00053MO/" -H "accept: applica
 import sys,os,re,json,collections,time,urllib.parse,logging,tqdm,tqdm.auto
 import pandas as pd
 import requests
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 NCHUNK=100
 #
@@ -19,25 +21,28 @@ BASE_URL="https://"+API_HOST+API_BASE_PATH
 ##############################################################################
 def GetGlycans(ids, skip, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for i in tqdm.auto.trange(len(ids), desc="IDs"):
     id_this = ids[i]
-    response = requests.get(f"{base_url}/glycan/detail/{id_this}", headers={"Content-Type":"application/json"})
+    response = rest.GetSession().get(f"{base_url}/glycan/detail/{id_this}", headers={"Content-Type":"application/json"})
     result = response.json()
     logging.debug(json.dumps(result, indent=2))
     if not tags: tags = [tag for tag in result.keys() if type(result[tag]) not in (list, dict, collections.OrderedDict)]
     df_this = pd.DataFrame({tags[j]:[result[tags[j]]] for j in range(len(tags))})
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def ListGlycans(skip, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None; tq=None;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url = f"""{base_url}/directsearch/glycan/?query={{"offset":{skip+1},"limit":{NCHUNK}}}"""
-    response = requests.get(url, headers={"Content-Type":"application/json"})
+    response = rest.GetSession().get(url, headers={"Content-Type":"application/json"})
     if response is None: break
     if response.status_code!=200:
       logging.debug(f"Status code: {response.status_code}")
@@ -67,13 +72,14 @@ def ListGlycans(skip, base_url=BASE_URL, fout=None):
       df_this = pd.concat([df_this,
 	pd.DataFrame({"inchi_key":[inchi_key], "glytoucan_id":[glytoucan_id], "pubchem_cid":[pubchem_cid], "pubchem_sid":[pubchem_sid], "chebi_id":[chebi_id]})
 	], axis=1)
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
       tq.update(n=df_this.shape[0])
     skip += NCHUNK
   tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -17,6 +17,7 @@ V2:
 import sys,os,re,argparse,json,time,logging
 #
 from .. import gwascatalog
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -49,6 +50,8 @@ Example SNPIDs: rs6085920, rs2273833, rs6684514, rs144991356
   parser.add_argument("--api_host", default=gwascatalog.API_HOST)
   parser.add_argument("--api_base_path", default=gwascatalog.API_BASE_PATH)
   parser.add_argument("--api_base_path_v2", default=gwascatalog.API_BASE_PATH_V2)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   parser.add_argument("-q", "--quiet", default=0, action="count")
   args = parser.parse_args()
@@ -61,6 +64,8 @@ Example SNPIDs: rs6085920, rs2273833, rs6684514, rs144991356
   # logging.PROGRESS = 15 (custom)
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>0 else logging.ERROR if args.quiet else 15))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   t0 = time.time()
 
   ids=[];
@@ -11,10 +11,10 @@ V2:
 ###
 import sys,os,re,json,time,logging,tqdm
 import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 import urllib.request,urllib.parse
 import pandas as pd
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST='www.ebi.ac.uk'
 API_BASE_PATH='/gwas/rest/api'
@@ -26,18 +26,8 @@ NCHUNK=100;
 #
 ##############################################################################
 def InitiateSession():
-  retry_strategy = Retry(
-	total=10,
-	status=4,
-	backoff_factor=2,
-	status_forcelist=[413, 429, 500, 502, 503, 504],
-    allowed_methods=Retry.DEFAULT_ALLOWED_METHODS
-	)
-  adapter = HTTPAdapter(max_retries=retry_strategy)
-  session = requests.Session()
-  session.mount("https://", adapter)
-  session.mount("http://", adapter)
-  return session
+  """Shared pooled session, with retry/backoff policy, from util.rest."""
+  return rest.GetSession()
 
 ##############################################################################
 def GetMetadataV2(base_url=BASE_URL_V2, fout=None):
@@ -67,6 +57,7 @@ def ListStudies(base_url=BASE_URL, fout=None):
   tags=[]; n_study=0; rval=None; df=None; tq=None;
   session = InitiateSession()
   url_this = base_url+f'/studies?size={NCHUNK}'
+  dfb = util_pandas.FrameBuilder()
   while True:
     logging.debug(url_this)
     response = session.get(url_this)
@@ -98,12 +89,13 @@ def ListStudies(base_url=BASE_URL, fout=None):
             logging.info(f"Ignoring tag: {tag}")
       df_this = pd.DataFrame({tag:[str(study[tag]) if tag in study else ''] for tag in tags})
       if fout is not None: df_this.to_csv(fout, sep="\t", index=False, header=(n_study==0), mode=('w' if n_study==0 else 'a'))
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_study+=1
     if 'next' not in rval['_links']: break
     elif url_this == rval['_links']['last']['href']: break
     else: url_this = rval['_links']['next']['href']
   logging.info(f"n_study: {n_study}")
+  df = dfb.frame(df)
   return(df)
 
 ##############################################################################
@@ -119,11 +111,12 @@ https://www.ebi.ac.uk/gwas/rest/api/studies/GCST001430/associations?projection=a
   gcsts=set([]); tags_assn=[]; tags_study=[]; tags_locus=[]; tags_sra=[]; tags_arg=[];
   url = base_url+'/studies'
   if skip>0: logging.info(f"SKIP IDs skipped: {skip}")
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids[skip:]:
     if not quiet and tq is None: tq = tqdm.tqdm(total=len(ids)-skip)
     if tq is not None: tq.update()
     url_this = url+f'/{id_this}/associations?projection=associationByStudy'
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     if (response.status_code!=200):
       logging.error(f"(status_code={response.status_code}): url_this: {url_this}")
       continue
@@ -166,7 +159,7 @@ https://www.ebi.ac.uk/gwas/rest/api/studies/GCST001430/associations?projection=a
           snp_href = sra['_links']['snp']['href'] if '_links' in sra and 'snp' in sra['_links'] and 'href' in sra['_links']['snp'] else ''
           if snp_href: n_snp+=1
     if fout: df_this.to_csv(fout, sep="\t", index=False, header=(n_id==0), mode=('w' if n_id==0 else 'a'))
-    if fout is None: df = pd.concat([df, df_this], axis=0)
+    if fout is None: dfb.append(df_this)
     n_id+=1
     if n_id==nmax:
       logging.info(f"NMAX IDs reached: {nmax}")
@@ -174,6 +167,7 @@ https://www.ebi.ac.uk/gwas/rest/api/studies/GCST001430/associations?projection=a
   if tq is not None: tq.close()
   n_gcst = len(gcsts)
   logging.info(f"INPUT RCSTs: {n_id}; OUTPUT RCSTs: {n_gcst} ; assns: {n_assn} ; loci: {n_loci} ; alleles: {n_sra} ; snps: {n_snp}")
+  df = dfb.frame(df)
   if fout is None: return(df)
 
 ##############################################################################
@@ -187,11 +181,12 @@ sea = SNP effect allele
   gcsts=set([]); snps=set([]); loci=set([]); seas=set([]); 
   quiet = bool(logging.getLogger().getEffectiveLevel()>15)
   if skip>0: logging.info(f"SKIP IDs skipped: {skip}")
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids[skip:]:
     if not quiet and tq is None: tq = tqdm.tqdm(total=len(ids)-skip)
     if tq is not None: tq.update()
     url_this = base_url+f'/associations?accession_id={id_this}'
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     if (response.status_code!=200):
       logging.error(f"(status_code={response.status_code}): url_this: {url_this}")
       continue
@@ -234,7 +229,7 @@ sea = SNP effect allele
         seas.add(sea)
       df_this = pd.concat([df_this, df_assn], axis=0)
     if fout: df_this.to_csv(fout, sep="\t", index=False, header=(n_id==0), mode=('w' if n_id==0 else 'a'))
-    if fout is None: df = pd.concat([df, df_this], axis=0)
+    if fout is None: dfb.append(df_this)
     n_id+=1
     if n_id==nmax:
       logging.info(f"NMAX IDs reached: {nmax}")
@@ -245,6 +240,7 @@ sea = SNP effect allele
   n_snp = len(snps)
   n_sea = len(seas)
   logging.info(f"INPUT RCSTs: {n_id}; OUTPUT RCSTs: {n_gcst} ; assns: {n_assn} ; loci: {n_loci} ; alleles: {n_sea} ; snps: {n_snp}")
+  df = dfb.frame(df)
   if fout is None: return(df)
 
 ##############################################################################
@@ -260,6 +256,7 @@ gc = genomicContext
   session = InitiateSession()
   url = base_url+'/singleNucleotidePolymorphisms'
   if skip>0: logging.info(f"SKIP IDs skipped: {skip}")
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids[skip:]:
     if not quiet and tq is None: tq = tqdm.tqdm(total=len(ids)-skip)
     if tq is not None: tq.update()
@@ -302,12 +299,13 @@ gc = genomicContext
       n_gene+=1
     if tq is not None: tq.close()
     if fout: df_this.to_csv(fout, sep="\t", index=False, header=(n_snp==0), mode=('w' if n_snp==0 else 'a'))
-    if fout is None: df = pd.concat([df, df_this], axis=0)
+    if fout is None: dfb.append(df_this)
     n_snp+=1
     if n_snp==nmax:
       logging.info(f"NMAX IDs reached: {nmax}")
       break
   logging.info(f"SNPs: {n_snp}; genes: {n_gene}")
+  df = dfb.frame(df)
   if fout is None: return(df)
 
 ##############################################################################
@@ -323,6 +321,7 @@ To do(?): Include genomic contexts
   session = InitiateSession()
   url = base_url+'/single-nucleotide-polymorphisms'
   if skip>0: logging.info(f"SKIP IDs skipped: {skip}")
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids[skip:]:
     if not quiet and tq is None: tq = tqdm.tqdm(total=len(ids)-skip)
     if tq is not None: tq.update()
@@ -375,13 +374,14 @@ To do(?): Include genomic contexts
       df_this = pd.concat([df_this, df_snp], axis=0)
 
     if fout: df_this.to_csv(fout, sep="\t", index=False, header=(n_snp==0), mode=('w' if n_snp==0 else 'a'))
-    if fout is None: df = pd.concat([df, df_this], axis=0)
+    if fout is None: dfb.append(df_this)
     n_snp+=1
     if n_snp==nmax:
       logging.info(f"NMAX IDs reached: {nmax}")
       break
   if tq is not None: tq.close()
   logging.info(f"SNPs: {n_snp}; mapped_genes: {n_gene}; locations: {n_loc}; genomic_contexts: {n_gc}")
+  df = dfb.frame(df)
   if fout is None: return(df)
 
 ##############################################################################
@@ -421,9 +421,10 @@ def SearchStudies(ids, searchtype, base_url=BASE_URL, fout=None):
   else:
     logging.error(f'Searchtype not supported: {searchtype}')
     return
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = url.format(urllib.parse.quote(id_this))
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     if (response.status_code!=200):
       logging.error(f"(status_code={response.status_code}): url_this: {url_this}")
       break
@@ -438,10 +439,11 @@ def SearchStudies(ids, searchtype, base_url=BASE_URL, fout=None):
             tags.append(tag) #Only simple metadata.
       n_study+=1
       df_this = pd.DataFrame({tag:[str(study[tag]) if tag in study else ''] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False)
     logging.debug(json.dumps(rval, sort_keys=True, indent=2))
   logging.info(f"n_study: {n_study}")
+  df = dfb.frame(df)
   if fout is None: return(df)
 
 ##############################################################################
@@ -6,6 +6,7 @@ https://portal.hubmapconsortium.org/apis
 ###
 import sys,os,re,time,json,logging,requests,tqdm
 import pandas as pd
+from ..util import rest
 #
 API_HOST='entity.api.hubmapconsortium.org'
 API_BASE_PATH=''
@@ -13,7 +14,7 @@ API_BASE_URL = f"https://{API_HOST}{API_BASE_PATH}"
 #
 #############################################################################
 def ListEntityTypes(base_url=API_BASE_URL, fout=None):
-  response = requests.get(f"{base_url}/entity-types")
+  response = rest.GetSession().get(f"{base_url}/entity-types")
   if response.status_code != 200:
     logging.error(f"status_code: {response.status_code}")
     return []
@@ -28,7 +29,7 @@ def ListEntityTypes(base_url=API_BASE_URL, fout=None):
 def GetEntity(ids, base_url=API_BASE_URL, fout=None):
   n_out=0; df=None; tq=None;
   for id_this in ids:
-    response = requests.get(f"{base_url}/entities/{id_this}")
+    response = rest.GetSession().get(f"{base_url}/entities/{id_this}")
     if response.status_code != 200:
       logging.error(f"status_code: {response.status_code}")
       continue
@@ -5,6 +5,8 @@ See: https://www.genenames.org/help/rest-web-service-help
 """
 import sys,os,re,requests,json,time,logging,tqdm
 import pandas as pd
+from ..util import rest
+from ..util import pandas as util_pandas
 
 #
 API_HOST="rest.genenames.org"
@@ -15,7 +17,7 @@ HEADERS={"Accept":"application/json"}
 #
 ##############################################################################
 def Info(base_url=BASE_URL, fout=None):
-  response = requests.get(base_url+"/info", headers=HEADERS)
+  response = rest.GetSession().get(base_url+"/info", headers=HEADERS)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   if "searchableFields" in result:
@@ -27,7 +29,7 @@ def Info(base_url=BASE_URL, fout=None):
 
 ##############################################################################
 def ListSearchableFields(base_url=BASE_URL, fout=None):
-  response = requests.get(base_url+'/info', headers=HEADERS)
+  response = rest.GetSession().get(base_url+'/info', headers=HEADERS)
   result = response.json()
   fields = result['searchableFields'] if 'searchableFields' in result else None
   fields.sort()
@@ -37,7 +39,7 @@ def ListSearchableFields(base_url=BASE_URL, fout=None):
 
 ##############################################################################
 def ListStoredFields(base_url=BASE_URL, fout=None):
-  response = requests.get(base_url+'/info', headers=HEADERS)
+  response = rest.GetSession().get(base_url+'/info', headers=HEADERS)
   result = response.json()
   fields = result['storedFields'] if 'storedFields' in result else None
   fields.sort()
@@ -52,6 +54,7 @@ for exact SYMBOL fetch.  One case is for RPS15P5, status "Entry Withdrawn".'''
   n_in=0; n_found=0; n_notfound=0; n_ambig=0; n_out=0;
   tags=None; df=None; tq=None;
   logging.debug(f"ftypes[{len(ftypes)}]: {str(ftypes)}")
+  dfb = util_pandas.FrameBuilder()
   for qry in qrys:
     if not tq: tq = tqdm.tqdm(total=len(qrys)-skip)
     tq.update()
@@ -61,7 +64,7 @@ for exact SYMBOL fetch.  One case is for RPS15P5, status "Entry Withdrawn".'''
     numFound=0; genes=[];
     ftype_hit=None
     for ftype in ftypes:
-      response = requests.get(base_url+f"/fetch/{ftype.lower()}/{qry}", headers=HEADERS)
+      response = rest.GetSession().get(base_url+f"/fetch/{ftype.lower()}/{qry}", headers=HEADERS)
       result = response.json()
       logging.debug(json.dumps(result, indent=2))
       if result is None: continue
@@ -99,22 +102,24 @@ for exact SYMBOL fetch.  One case is for RPS15P5, status "Entry Withdrawn".'''
       df_this = pd.DataFrame(gene_data)
       df_this = df_this[tags] #reorder cols
       if fout: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=1
   if tq is not None: tq.close()
   logging.info(f"queries: {n_in-skip}; n_found: {n_found}; n_notfound: {n_notfound}; n_ambig: {n_ambig}; n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def SearchGenes(qrys, ftypes, base_url=BASE_URL, fout=None):
   n_in=0; n_found=0; tags=[]; df=None;
+  dfb = util_pandas.FrameBuilder()
   for qry in qrys:
     n_in+=1
     logging.debug(f"{n_in}. query: {qry}")
     found_this=False
     for ftype in ftypes:
       url = (base_url+'/search{}/*{}*'.format((('/'+ftype.lower()) if ftype else ''), qry))
-      response = requests.get(url, headers=HEADERS)
+      response = rest.GetSession().get(url, headers=HEADERS)
       result = response.json()
       numFound = result['response']['numFound'] if 'numFound' in result['response'] else 0
       if numFound==0: continue
@@ -125,8 +130,9 @@ def SearchGenes(qrys, ftypes, base_url=BASE_URL, fout=None):
         if not tags: tags = list(doc.keys())
         data_this = {'query':qry, 'field':ftype}
         data_this.update({tags[j]:[doc[tags[j]]] for j in range(len(tags))})
-        df = pd.concat([df, pd.DataFrame(data_this)])
+        dfb.append(pd.DataFrame(data_this))
     if found_this: n_found+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"queries: {n_in}; found: {n_found}")
   return df
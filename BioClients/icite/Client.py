@@ -7,6 +7,7 @@ https://icite.od.nih.gov/api
 import sys,os,re,argparse,logging
 #
 from .. import icite
+from ..util import rest
 
 #############################################################################
 if __name__=='__main__':
@@ -20,6 +21,8 @@ if __name__=='__main__':
   parser.add_argument("--o", dest="ofile", help="output (TSV)")
   parser.add_argument("--api_host", default=icite.API_HOST)
   parser.add_argument("--api_base_path", default=icite.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   parser.add_argument("-q", "--quiet", action="store_true", help="Suppress progress notification.")
   args = parser.parse_args()
@@ -27,6 +30,8 @@ if __name__=='__main__':
   # logging.PROGRESS = 15 (custom)
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>0 else logging.ERROR if args.quiet else 15))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w", encoding="utf-8") if args.ofile else sys.stdout
@@ -7,6 +7,7 @@ https://rss.ccs.miami.edu/
 import sys,os,re,argparse,time,logging
 #
 from ...idg import rss
+from ...util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -20,11 +21,15 @@ if __name__=='__main__':
   parser.add_argument("--o", dest="ofile", help="output (TSV)")
   parser.add_argument("--api_host", default=rss.Utils.API_HOST)
   parser.add_argument("--api_base_path", default=rss.Utils.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   fout = open(args.ofile, "w") if args.ofile else sys.stdout
 
   ids=[]
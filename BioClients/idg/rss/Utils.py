@@ -8,6 +8,8 @@ import sys,os,re,json,time,logging,tqdm
 import pandas as pd
 import requests
 import urllib,urllib.parse
+from ...util import rest
+from ...util import pandas as util_pandas
 #
 #
 API_HOST="rss.ccs.miami.edu"
@@ -18,12 +20,14 @@ BASE_URL = 'https://'+API_HOST+API_BASE_PATH
 def ListTargets(base_url=BASE_URL, fout=None):
   tags=[]; tq=None; df=pd.DataFrame(); 
   url = (base_url+f'/target')
-  resp = requests.get(url, verify=False)
+  resp = rest.GetSession().get(url, verify=False)
   targets = resp.json() if resp.status_code==200 else []
+  dfb = util_pandas.FrameBuilder()
   for target in targets:
     logging.debug(json.dumps(target, sort_keys=True, indent=2))
     if not tags: tags = list(target.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[target[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:target[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(df.shape[0]))
   return(df)
@@ -31,14 +35,16 @@ def ListTargets(base_url=BASE_URL, fout=None):
 ##############################################################################
 def GetTargetResources(ids, base_url=BASE_URL, fout=None):
   tags=[]; tq=None; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = (base_url+f'/target/id?id={id_this}')
-    resp = requests.get(url_this, verify=False)
+    resp = rest.GetSession().get(url_this, verify=False)
     resources = resp.json() if resp.status_code==200 else []
     for resource in resources:
       logging.debug(json.dumps(resource, sort_keys=True, indent=2))
       if not tags: tags = list(resource.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[resource[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:resource[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(df.shape[0]))
   return(df)
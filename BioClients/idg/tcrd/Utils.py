@@ -4,6 +4,7 @@ TCRD MySql db client utilities.
 """
 import os,sys,re,time,json,logging,yaml,tqdm
 import pandas as pd
+from ...util import pandas as util_pandas
 
 TDLS = ['Tdark', 'Tbio', 'Tchem', 'Tclin']
 
@@ -39,6 +40,7 @@ def DescribeTables(dbcon, fout=None):
 #############################################################################
 def ListColumns(dbcon, fout=None):
   n_table=0; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for table in ListTables(dbcon).iloc[:,0]:
     n_table+=1
     sql = ('DESCRIBE '+table)
@@ -46,7 +48,8 @@ def ListColumns(dbcon, fout=None):
     cols = list(df_this.columns.values)
     df_this['table'] = table
     df_this = df_this[['table']+cols]
-    df = pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_columns: {df.shape[0]}; n_tables: {df.table.nunique()}")
   return df
@@ -54,6 +57,7 @@ def ListColumns(dbcon, fout=None):
 #############################################################################
 def TableRowCounts(dbcon, fout=None):
   n_table=0; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for table in ListTables(dbcon).iloc[:,0]:
     n_table+=1
     sql = ('SELECT count(*) AS row_count FROM '+table)
@@ -61,7 +65,8 @@ def TableRowCounts(dbcon, fout=None):
     cols = list(df_this.columns.values)
     df_this['table'] = table
     df_this = df_this[['table']+cols]
-    df = pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_table: {df.shape[0]}")
   return df
@@ -247,6 +252,7 @@ LEFT OUTER JOIN
 	) x ON x.protein_id = protein.id
 """
   n_id=0; n_hit=0; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_id+=1
     wheres=[]
@@ -268,7 +274,8 @@ LEFT OUTER JOIN
     logging.debug(f'ID: {idtype} = "{id_this}"')
     df_this = pd.read_sql(sql_this, dbcon)
     if df_this.shape[0]>0: n_hit+=1
-    df = pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_id: {n_id}; n_hit: {n_hit}")
   return df
@@ -307,6 +314,7 @@ JOIN
 """ 
 
   n_id=0; n_hit=0; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_id+=1
     wheres=[]
@@ -317,7 +325,8 @@ JOIN
     df_this = pd.read_sql(sql_this, dbcon)
     if df_this.shape[0]>0:
       n_hit+=1
-    df = pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_id: {n_id}; n_hit: {n_hit}")
   return df
@@ -333,13 +342,15 @@ def GetPathways(dbcon, ids, fout=None):
 	't2p.description',
 	't2p.url' ]
   sql = f"""SELECT {(','.join(map(lambda s: s+" "+s.replace('.', '_')), cols))} FROM target2pathway t2p JOIN target t ON t.id = t2p.target_id"""
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_id+=1
     sql_this = sql+(f"WHERE t.id = {id_this}")
     logging.debug(f'SQL: "{sql_this}"')
     df_this = pd.read_sql(sql_this, dbcon)
     if df_this.shape[0]>0: n_hit+=1
-    df = pd.concat([df, df_this])
+    dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_query: {n_query}; n_hit: {n_hit}")
   return df
@@ -414,14 +425,16 @@ FROM
 WHERE
 	disease.did = '{0}'
 """
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_id+=1
     sql_this = sql.format(id_this)
     df_this = pd.read_sql(sql_this, dbcon)
     if df_this.shape[0]>0: n_hit+=1
     if fout is not None: df_this.to_csv(fout, sep="\t", index=False)
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
   logging.info(f"n_id: {n_id}; n_hit: {n_hit}")
+  df = dfb.frame(df)
   if fout is None: return df
 
 #############################################################################
@@ -490,14 +503,16 @@ FROM
 	pubmed
 """
   df_itr = pd.read_sql(sql, dbcon, chunksize=NCHUNK)
+  dfb = util_pandas.FrameBuilder()
   for df_this in df_itr:
     if not quiet and tq is None: tq = tqdm.tqdm(total=N_row)
     if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0), index=False)
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     if tq is not None: tq.update(df_this.shape[0])
     n_out += df_this.shape[0]
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -517,14 +532,16 @@ GROUP BY
 	cmpd_pubchem_cid,smiles
 """
   df_itr = pd.read_sql(sql, dbcon, chunksize=NCHUNK)
+  dfb = util_pandas.FrameBuilder()
   for df_this in df_itr:
     if not quiet and tq is None: tq = tqdm.tqdm(total=N_row)
     if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0), index=False)
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     if tq is not None: tq.update(df_this.shape[0])
     n_out += df_this.shape[0]
   if tq is not None: tq.close()
   logging.info(f"rows: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -547,14 +564,16 @@ GROUP BY
 """
   logging.debug(sql)
   df_itr = pd.read_sql(sql, dbcon, chunksize=NCHUNK)
+  dfb = util_pandas.FrameBuilder()
   for df_this in df_itr:
     if not quiet and tq is None: tq = tqdm.tqdm(total=N_row)
     if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0), index=False)
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     if tq is not None: tq.update(df_this.shape[0])
     n_out += df_this.shape[0]
   if tq is not None: tq.close()
   logging.info(f"rows: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -5,6 +5,7 @@ TIGA/TCRD (Target Illumination GWAS Analytics) MySql client utilities
 ###
 import os,sys,re,time,json,logging,yaml,tqdm
 import pandas as pd
+from ...util import pandas as util_pandas
 
 #############################################################################
 def Info(dbcon, fout=None):
@@ -95,12 +96,13 @@ FROM
 JOIN
 	protein ON protein.id = tiga.protein_id
 """
+  dfb = util_pandas.FrameBuilder()
   if geneIds is None:
     for traitId in traitIds:
       sql_this = sql+f"\nWHERE efoid = '{traitId}'"
       df_this = pd.read_sql(sql_this, dbcon)
       if fout is None:
-        df = pd.concat([df, df_this])
+        dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   elif traitIds is None:
@@ -108,7 +110,7 @@ JOIN
       sql_this = sql+f"\nWHERE ensg = '{geneId}'"
       df_this = pd.read_sql(sql_this, dbcon)
       if fout is None:
-        df = pd.concat([df, df_this])
+        dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   else:
@@ -117,10 +119,11 @@ JOIN
         sql_this = sql+f"\nWHERE efoid = '{traitId}' AND ensg = '{geneId}'"
         df_this = pd.read_sql(sql_this, dbcon)
         if fout is None:
-          df = pd.concat([df, df_this])
+          dfb.append(df_this)
         else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
         n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   if fout is None:
     return df
 
@@ -146,15 +149,17 @@ WHERE
 	tiga_provenance.ensg = '{0}' AND tiga_provenance.efoid = '{1}'
 	;
 """
+  dfb = util_pandas.FrameBuilder()
   for geneId in geneIds:
     for traitId in traitIds:
       sql_this = sql.format(geneId, traitId)
       df_this = pd.read_sql(sql_this, dbcon)
       if fout is None:
-        df = pd.concat([df, df_this])
+        dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   if fout is None:
     return df
 
@@ -9,6 +9,7 @@ https://api.newdrugtargets.org/targets/
 import sys,os,re,argparse,time,logging
 #
 from ...idg import tinx
+from ...util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -33,11 +34,15 @@ as for get_disease_target_articles.
   parser.add_argument("--query", help="search query")
   parser.add_argument("--api_host", default=tinx.Utils.API_HOST)
   parser.add_argument("--api_base_path", default=tinx.Utils.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   fout = open(args.ofile, "w") if args.ofile else sys.stdout
 
   ids=[]
@@ -11,6 +11,7 @@ import pandas as pd
 import urllib,urllib.parse
 #
 from ...util import rest
+from ...util import pandas as util_pandas
 #
 API_HOST="api.newdrugtargets.org"
 API_BASE_PATH=""
@@ -21,6 +22,7 @@ NCHUNK=100;
 ##############################################################################
 def ListTargets(base_url=BASE_URL, fout=None):
   n_out=0; tags=None; tq=None; df=None; offset=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_next = (base_url+f'/targets/?limit={NCHUNK}&offset={offset}')
     rval = rest.Utils.GetURL(url_next, parse_json=True)
@@ -30,11 +32,12 @@ def ListTargets(base_url=BASE_URL, fout=None):
       tq.update()
       logging.debug(json.dumps(target, sort_keys=True, indent=2))
       if not tags: tags = list(target.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[target[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:target[tags[j]] for j in range(len(tags))})
       n_out+=1
     url_next = rval["next"] if "next" in rval else None #Full URL suboptimal.
     if not url_next: break
     offset += NCHUNK
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(n_out))
   return(df)
@@ -43,6 +46,7 @@ def ListTargets(base_url=BASE_URL, fout=None):
 def SearchTargets(query_term, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
   url_next = (base_url+'/targets/?search='+urllib.parse.quote(query_term))
+  dfb = util_pandas.FrameBuilder()
   while True:
     rval = rest.Utils.GetURL(url_next, parse_json=True)
     logging.debug(json.dumps(rval, sort_keys=True, indent=2))
@@ -50,10 +54,11 @@ def SearchTargets(query_term, base_url=BASE_URL, fout=None):
     for target in targets:
       logging.debug(json.dumps(target, sort_keys=True, indent=2))
       if not tags: tags = list(target.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[target[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:target[tags[j]] for j in range(len(tags))})
       n_out+=1
     url_next = rval["next"] if "next" in rval else None
     if not url_next: break
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(n_out))
   return(df)
@@ -61,6 +66,7 @@ def SearchTargets(query_term, base_url=BASE_URL, fout=None):
 ##############################################################################
 def ListDiseases(base_url=BASE_URL, fout=None):
   n_out=0; tags=None; tq=None; df=None; offset=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_next = (base_url+f'/diseases/?limit={NCHUNK}&offset={offset}')
     rval = rest.Utils.GetURL(url_next, parse_json=True)
@@ -71,11 +77,12 @@ def ListDiseases(base_url=BASE_URL, fout=None):
       tq.update()
       logging.debug(json.dumps(disease, sort_keys=True, indent=2))
       if not tags: tags = list(disease.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[disease[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:disease[tags[j]] for j in range(len(tags))})
       n_out+=1
     url_next = rval["next"] if "next" in rval else None
     if not url_next: break
     offset += NCHUNK
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(n_out))
   return(df)
@@ -83,6 +90,7 @@ def ListDiseases(base_url=BASE_URL, fout=None):
 ##############################################################################
 def ListArticles(base_url=BASE_URL, fout=None):
   n_out=0; tags=None; tq=None; df=None; offset=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_next = (base_url+f'/articles/?limit={NCHUNK}&offset={offset}')
     rval = rest.Utils.GetURL(url_next, parse_json=True)
@@ -92,11 +100,12 @@ def ListArticles(base_url=BASE_URL, fout=None):
       tq.update()
       logging.debug(json.dumps(article, sort_keys=True, indent=2))
       if not tags: tags = list(article.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[article[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:article[tags[j]] for j in range(len(tags))})
       n_out+=1
     url_next = rval["next"] if "next" in rval else None
     if not url_next: break
     offset += NCHUNK
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(n_out))
   return(df)
@@ -104,6 +113,7 @@ def ListArticles(base_url=BASE_URL, fout=None):
 ##############################################################################
 def ListDTO(base_url=BASE_URL, fout=None):
   n_out=0; tags=None; tq=None; df=None; offset=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_next = (base_url+f'/dto/?limit={NCHUNK}&offset={offset}')
     rval = rest.Utils.GetURL(url_next, parse_json=True)
@@ -113,11 +123,12 @@ def ListDTO(base_url=BASE_URL, fout=None):
       tq.update()
       logging.debug(json.dumps(dto, sort_keys=True, indent=2))
       if not tags: tags = list(dto.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[dto[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:dto[tags[j]] for j in range(len(tags))})
       n_out+=1
     url_next = rval["next"] if "next" in rval else None
     if not url_next: break
     offset += NCHUNK
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(n_out))
   return(df)
@@ -126,13 +137,15 @@ def ListDTO(base_url=BASE_URL, fout=None):
 def GetDisease(ids, base_url=BASE_URL, fout=None):
   """IDs should be TIN-X disease IDs, e.g. 5391."""
   n_in=0; n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_in+=1
     disease = rest.Utils.GetURL(base_url+f'/diseases/{id_this}/', parse_json=True)
     logging.debug(json.dumps(disease, sort_keys=True, indent=2))
     if not tags: tags = list(disease.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[disease[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:disease[tags[j]] for j in range(len(tags))})
     n_out+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_in: {n_in}; n_out: {n_out}")
   return(df)
@@ -141,6 +154,7 @@ def GetDisease(ids, base_url=BASE_URL, fout=None):
 def GetDiseaseByDOId(ids, base_url=BASE_URL, fout=None):
   """IDs should be Disease Ontology IDs, e.g. DOID:9297."""
   n_in=0; n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_in+=1
     rval = rest.Utils.GetURL(base_url+f'/diseases/?doid={id_this}', parse_json=True)
@@ -148,8 +162,9 @@ def GetDiseaseByDOId(ids, base_url=BASE_URL, fout=None):
     for disease in diseases:
       logging.debug(json.dumps(disease, sort_keys=True, indent=2))
       if not tags: tags = list(disease.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[disease[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:disease[tags[j]] for j in range(len(tags))})
       n_out+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_in: {n_in}; n_out: {n_out}")
   return(df)
@@ -158,13 +173,15 @@ def GetDiseaseByDOId(ids, base_url=BASE_URL, fout=None):
 def GetTarget(ids, base_url=BASE_URL, fout=None):
   """IDs should be TIN-X target IDs, e.g. 10027."""
   n_in=0; n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_in+=1
     target = rest.Utils.GetURL(base_url+f'/targets/{id_this}/', parse_json=True)
     logging.debug(json.dumps(target, sort_keys=True, indent=2))
     if not tags: tags = list(target.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[target[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:target[tags[j]] for j in range(len(tags))})
     n_out+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_in: {}; n_out: {}".format(n_in, n_out))
   return(df)
@@ -173,6 +190,7 @@ def GetTarget(ids, base_url=BASE_URL, fout=None):
 def GetTargetByUniprot(ids, base_url=BASE_URL, fout=None):
   """IDs should be UniProt IDs, e.g. Q9H4B4."""
   n_in=0; n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_in+=1
     rval = rest.Utils.GetURL(base_url+f'/targets/?uniprot={id_this}', parse_json=True)
@@ -180,8 +198,9 @@ def GetTargetByUniprot(ids, base_url=BASE_URL, fout=None):
     for target in targets:
       logging.debug(json.dumps(target, sort_keys=True, indent=2))
       if not tags: tags = list(target.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[target[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:target[tags[j]] for j in range(len(tags))})
       n_out+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_in: {}; n_out: {}".format(n_in, n_out))
   return(df)
@@ -190,6 +209,7 @@ def GetTargetByUniprot(ids, base_url=BASE_URL, fout=None):
 def GetTargetDiseases(ids, base_url=BASE_URL, fout=None):
   """IDs should be TIN-X target IDs, e.g. 10027."""
   n_in=0; n_out=0; tags=None; tq=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_in+=1
     offset=0;
@@ -209,12 +229,13 @@ def GetTargetDiseases(ids, base_url=BASE_URL, fout=None):
         data_this = {"tinx_target_id":id_this}
         data_this.update({tags[j]:[disease[tags[j]]] for j in range(len(tags))})
         data_this.update({phenotype_tags[j]:[phenotype[phenotype_tags[j]]] for j in range(len(phenotype_tags))})
-        df = pd.concat([df, pd.DataFrame(data_this)])
+        dfb.append(pd.DataFrame(data_this))
         n_out+=1
       url_next = rval["next"] if "next" in rval else None
       if not url_next: break
       if n_out>=rval["count"]: break #url_next may be wrong.
       offset += NCHUNK
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_in: {n_in}; n_out: {n_out}")
   return(df)
@@ -223,6 +244,7 @@ def GetTargetDiseases(ids, base_url=BASE_URL, fout=None):
 def GetDiseaseTargets(ids, base_url=BASE_URL, fout=None):
   """IDs should be TIN-X disease IDs, e.g. 5391."""
   n_in=0; n_out=0; tags=None; tq=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_in+=1
     offset=0;
@@ -243,12 +265,13 @@ def GetDiseaseTargets(ids, base_url=BASE_URL, fout=None):
         data_this = {"tinx_disease_id":id_this}
         data_this.update({tags[j]:[target[tags[j]]] for j in range(len(tags))})
         data_this.update({protein_tags[j]:[protein[protein_tags[j]]] for j in range(len(protein_tags))})
-        df = pd.concat([df, pd.DataFrame(data_this)])
+        dfb.append(pd.DataFrame(data_this))
         n_out+=1
       url_next = rval["next"] if "next" in rval else None
       if not url_next: break
       if n_out>=rval["count"]: break #url_next may be wrong.
       offset += NCHUNK
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_in: {n_in}; n_out: {n_out}")
   return(df)
@@ -257,6 +280,7 @@ def GetDiseaseTargets(ids, base_url=BASE_URL, fout=None):
 def GetDiseaseTargetArticles(disease_ids, ids, base_url=BASE_URL, fout=None):
   """IDs should be TIN-X disease and target IDs and, e.g. 5391, 12203."""
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for did in disease_ids:
     for tid in ids:
       offset=0;
@@ -267,12 +291,13 @@ def GetDiseaseTargetArticles(disease_ids, ids, base_url=BASE_URL, fout=None):
         for article in articles:
           logging.debug(json.dumps(article, sort_keys=True, indent=2))
           if not tags: tags = list(article.keys())
-          df = pd.concat([df, pd.DataFrame({tags[j]:[article[tags[j]]] for j in range(len(tags))})])
+          dfb.append_record({tags[j]:article[tags[j]] for j in range(len(tags))})
           n_out+=1
         url_next = rval["next"] if "next" in rval else None
         if not url_next: break
         if n_out>=rval["count"]: break #url_next may be wrong.
         offset += NCHUNK
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(n_out))
   return(df)
@@ -281,6 +306,7 @@ def GetDiseaseTargetArticles(disease_ids, ids, base_url=BASE_URL, fout=None):
 def SearchDiseases(query_term, base_url=BASE_URL, fout=None):
   """Search names; begins-with search logic."""
   n_out=0; tags=None; df=None; offset=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_next = (base_url+'/diseases/?search={}&limit={}&offset={}'.format(urllib.parse.quote(query_term), NCHUNK, offset))
     rval = rest.Utils.GetURL(url_next, parse_json=True)
@@ -288,11 +314,12 @@ def SearchDiseases(query_term, base_url=BASE_URL, fout=None):
     for disease in diseases:
       logging.debug(json.dumps(disease, sort_keys=True, indent=2))
       if not tags: tags = list(disease.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[disease[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:disease[tags[j]] for j in range(len(tags))})
       n_out+=1
     url_next = rval["next"] if "next" in rval else None
     if not url_next: break
     offset += NCHUNK
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(n_out))
   return(df)
@@ -301,6 +328,7 @@ def SearchDiseases(query_term, base_url=BASE_URL, fout=None):
 def SearchTargets(query_term, base_url=BASE_URL, fout=None):
   """Search names."""
   n_out=0; tags=None; df=None; offset=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_next = (base_url+'/targets/?search={}&limit={}&offset={}'.format(urllib.parse.quote(query_term), NCHUNK, offset))
     rval = rest.Utils.GetURL(url_next, parse_json=True)
@@ -308,11 +336,12 @@ def SearchTargets(query_term, base_url=BASE_URL, fout=None):
     for target in targets:
       logging.debug(json.dumps(target, sort_keys=True, indent=2))
       if not tags: tags = list(target.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[target[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:target[tags[j]] for j in range(len(tags))})
       n_out+=1
     url_next = rval["next"] if "next" in rval else None
     if not url_next: break
     offset += NCHUNK
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(n_out))
   return(df)
@@ -320,6 +349,7 @@ def SearchTargets(query_term, base_url=BASE_URL, fout=None):
 ##############################################################################
 def SearchArticles(terms, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None; offset=0;
+  dfb = util_pandas.FrameBuilder()
   for term in terms:
     while True:
       url_next = (base_url+'/articles/?search={}&limit={}&offset={}'.format(urllib.parse.quote(query_term), NCHUNK, offset))
@@ -329,11 +359,12 @@ def SearchArticles(terms, base_url=BASE_URL, fout=None):
       for article in articles:
         logging.debug(json.dumps(article, sort_keys=True, indent=2))
         if not tags: tags = list(article.keys())
-        df = pd.concat([df, pd.DataFrame({tags[j]:[article[tags[j]]] for j in range(len(tags))})])
+        dfb.append_record({tags[j]:article[tags[j]] for j in range(len(tags))})
         n_out+=1
       url_next = rval["next"] if "next" in rval else None
       if not url_next: break
       offset += NCHUNK
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(n_out))
   return(df)
@@ -5,6 +5,7 @@ See http://www.guidetopharmacology.org/webServices.jsp
 import sys,os,re,argparse,time,logging,urllib.parse,json
 #
 from .. import iuphar
+from ..util import rest
 #
 API_HOST='www.guidetopharmacology.org'
 API_BASE_PATH='/services'
@@ -50,12 +51,16 @@ operations:
   parser.add_argument("--db", help="external accessionId database ChEMBL|EntrezGene|HGNC|PubChemCID|UniProt|etc.")
   parser.add_argument("--api_host", default=API_HOST)
   parser.add_argument("--api_base_path", default=API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
 
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   BASE_URL = 'https://'+args.api_host+args.api_base_path
 
   if args.ofile:
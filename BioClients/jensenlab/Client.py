@@ -6,6 +6,7 @@ See: https://api.jensenlab.org/About
 import sys,os,re,argparse,time,json,logging
 #
 from .. import jensenlab
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -20,11 +21,15 @@ if __name__=='__main__':
   parser.add_argument("--nmax", type=int, default=100, help="max hits")
   parser.add_argument("--api_host", default=jensenlab.API_HOST)
   parser.add_argument("--api_base_path", default=jensenlab.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = 'https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile,"w") if args.ofile else sys.stdout
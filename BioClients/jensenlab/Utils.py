@@ -10,6 +10,7 @@ import sys,os,re,json,time,logging
 import pandas as pd
 
 from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST='api.jensenlab.org'
 API_BASE_PATH=''
@@ -18,6 +19,7 @@ BASE_URL='https://'+API_HOST+API_BASE_PATH
 ##############################################################################
 def GetDiseaseGenes(channel, ids, nmax, base_url=BASE_URL, fout=None):
   tags=[]; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     rval = rest.GetURL(base_url+f'/{channel}?type1=-26&id1={id_this}&type2=9606&limit={nmax}&format=json', parse_json=True)
     genes = rval[0] #dict
@@ -27,7 +29,8 @@ def GetDiseaseGenes(channel, ids, nmax, base_url=BASE_URL, fout=None):
       gene = genes[ensg]
       logging.debug(json.dumps(gene, indent=2))
       if not tags: tags = list(gene.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[gene[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:gene[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(df.shape[0]))
   return df
@@ -36,6 +39,7 @@ def GetDiseaseGenes(channel, ids, nmax, base_url=BASE_URL, fout=None):
 def GetPubmedComentionGenes(ids, base_url=BASE_URL, fout=None):
   """Search by co-mentioned terms."""
   tags=[]; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     rval = rest.GetURL(base_url+f'/Textmining?query={id_this}[tiab]&type2=9606&limit=10&format=json', parse_json=True)
     genes = rval[0] #dict
@@ -45,7 +49,8 @@ def GetPubmedComentionGenes(ids, base_url=BASE_URL, fout=None):
       gene = genes[ensg]
       logging.debug(json.dumps(gene, indent=2))
       if not tags: tags = list(gene.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[gene[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:gene[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info("n_out: {}".format(df.shape[0]))
   return df
@@ -10,6 +10,7 @@ http://www.ilincs.org/ilincs/APIdocumentation
 import sys,os,argparse,re,time,json,logging
 #
 from .. import lincs
+from ..util import rest
 #
 #############################################################################
 if __name__=='__main__':
@@ -41,11 +42,15 @@ Search Terms: cancer, vorinostat, MCF7.
   parser.add_argument("--skip", type=int, help="skip results")
   parser.add_argument("--api_host", default=lincs.API_HOST)
   parser.add_argument("--api_base_path", default=lincs.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = 'https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
@@ -10,6 +10,8 @@ http://www.ilincs.org/ilincs/APIdocumentation
 import sys,os,re,json,logging,requests,tqdm
 import urllib,urllib.parse
 import pandas as pd
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST="www.ilincs.org"
 API_BASE_PATH="/api"
@@ -18,15 +20,17 @@ BASE_URL='https://'+API_HOST+API_BASE_PATH
 #############################################################################
 def GetGene(ids, base_url=BASE_URL, fout=None):
   tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url = base_url+'/GeneInfos/'+id_this
-    response = requests.get(url)
+    response = rest.GetSession().get(url)
     rval = response.json()
     logging.debug(json.dumps(rval, indent=2))
     if not tags:
       tags = [tag for tag in rval.keys() if type(rval[tag]) not in (list, dict)]
     gene = rval
-    df = pd.concat([df, pd.DataFrame({tags[j]:[gene[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:gene[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"IDs: {len(ids)}")
   return df
@@ -34,15 +38,17 @@ def GetGene(ids, base_url=BASE_URL, fout=None):
 #############################################################################
 def GetDataset(ids, base_url=BASE_URL, fout=None):
   tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url = base_url+'/PublicDatasets/'+id_this
-    response = requests.get(url)
+    response = rest.GetSession().get(url)
     rval = response.json()
     logging.debug(json.dumps(rval, indent=2))
     if not tags:
       tags = [tag for tag in rval.keys() if type(rval[tag]) not in (list, dict)]
     dset = rval
-    df = pd.concat([df, pd.DataFrame({tag:[dset[tag]] for tag in tags})])
+    dfb.append_record({tag:dset[tag] for tag in tags})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"IDs: {len(ids)}")
   return df
@@ -50,10 +56,11 @@ def GetDataset(ids, base_url=BASE_URL, fout=None):
 #############################################################################
 def GetCompound(ids, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None; tq=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     if tq is None: tq = tqdm.tqdm(total=len(ids), unit="compounds")
     url = f"{base_url}/Compounds/{id_this}"
-    response = requests.get(url)
+    response = rest.GetSession().get(url)
     compound = response.json()
     logging.debug(json.dumps(compound, indent=2))
     if not tags:
@@ -66,23 +73,25 @@ def GetCompound(ids, base_url=BASE_URL, fout=None):
     if fout is not None:
       df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     else:
-      df = pd.concat([df, df_this])
+      dfb.append(df_this)
     n_out+=1
     tq.update(n=1)
   tq.close()
   logging.info(f"IDs: {len(ids)}; n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def ListCompounds(base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None; tq=None; skip=0; nchunk=100;
-  n_total = requests.get(f"{base_url}/Compounds/count").json()['count']
+  n_total = rest.GetSession().get(f"{base_url}/Compounds/count").json()['count']
+  dfb = util_pandas.FrameBuilder()
   while True:
     if tq is None: tq = tqdm.tqdm(total=n_total, unit="cpds")
     filter_arg = """%7B"skip"%3A"""+str(skip)+"""%2C"limit"%3A"""+str(nchunk)+"""%7D"""
     #url = f"{base_url}/Compounds?filter={urllib.parse.quote(filter_arg)}"
     url = f"{base_url}/Compounds?filter={filter_arg}"
-    response = requests.get(url)
+    response = rest.GetSession().get(url)
     if response.status_code != requests.codes.ok: break
     rval = response.json()
     if not rval: break
@@ -97,12 +106,13 @@ def ListCompounds(base_url=BASE_URL, fout=None):
             logging.info(f"Ignoring tag \"{tag}\"")
       df_this = pd.DataFrame({tag:[compound[tag]] for tag in tags})
       if fout is not None: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=1
       tq.update(n=1)
     skip+=nchunk
   tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -111,28 +121,31 @@ def SearchDataset(searchTerm, lincs, base_url=BASE_URL, fout=None):
   url = base_url+'/PublicDatasets/findTermMeta'
   d = {'term':searchTerm}
   if lincs: d['lincs'] = True
-  response = requests.post(url, data=d)
+  response = rest.GetSession().post(url, data=d)
   rval = response.json()
   logging.debug(json.dumps(rval, indent=2))
   dsets = rval['data'] if 'data' in rval else []
+  dfb = util_pandas.FrameBuilder()
   for dset in dsets:
     logging.debug(json.dumps(dset, indent=2))
     if not tags:
       tags = [tag for tag in dset.keys() if type(dset[tag]) not in (list, dict)]
     df_this = pd.DataFrame({tag:[dset[tag]] for tag in tags})
     if fout is not None: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=1
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def SearchSignature(ids, lincs, base_url=BASE_URL, fout=None):
   #SignatureMeta?filter={"where":{"lincspertid":"LSM-2121"},"limit":10}
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url = base_url+'/SignatureMeta?filter={"where":{"lincspertid":"'+id_this+'"}}'
-    response = requests.get(url)
+    response = rest.GetSession().get(url)
     rval = response.json()
     logging.debug(json.dumps(rval, indent=2))
     sigs = rval
@@ -142,8 +155,9 @@ def SearchSignature(ids, lincs, base_url=BASE_URL, fout=None):
         tags = [tag for tag in sig.keys() if type(sig[tag]) not in (list, dict)]
       df_this = pd.DataFrame({tag:[sig[tag]] for tag in tags})
       if fout is not None: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=1
+  df = dfb.frame(df)
   logging.info(f"IDs: {len(ids)}; n_sig: {df.shape[0]}")
   return df
 
@@ -152,19 +166,21 @@ def GetSignature(ids, ngene, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=None; tq=None;
   url = f"{base_url}/ilincsR/downloadSignature"
   d = {'sigID':(','.join(ids)), 'display':True, 'noOfTopGenes':ngene}
-  response = requests.post(url, data=d)
+  response = rest.GetSession().post(url, data=d)
   rval = response.json()
   logging.debug(json.dumps(rval, indent=2))
   genes = rval['data']['signature'] if 'data' in rval and 'signature' in rval['data'] else []
+  dfb = util_pandas.FrameBuilder()
   for gene in genes:
     logging.debug(json.dumps(gene, indent=2))
     if not tags:
       tags = [tag for tag in gene.keys() if type(gene[tag]) not in (list, dict)]
-    df_this = pd.concat([df, pd.DataFrame({tag:[gene[tag]] for tag in tags})])
+    df_this = pd.DataFrame({tag:[gene[tag]] for tag in tags})
     if fout is not None: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=1
   logging.info(f"IDs: {len(ids)}; n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
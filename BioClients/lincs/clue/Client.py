@@ -20,6 +20,7 @@ import sys,os,re,argparse,json,logging
 #
 from ... import lincs
 from ...util import yaml as util_yaml
+from ...util import rest
 #
 #############################################################################
 if __name__=="__main__":
@@ -48,6 +49,8 @@ Credentials config file should be at $HOME/.clueapi.yaml.
   parser.add_argument("--api_host", default=lincs.clue.Utils.API_HOST)
   parser.add_argument("--api_base_path", default=lincs.clue.Utils.API_BASE_PATH)
   parser.add_argument("--param_file", default=os.environ['HOME']+"/.clueapi.yaml")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", dest="verbose", action="count", default=0)
   args = parser.parse_args()
 
@@ -55,6 +58,8 @@ Credentials config file should be at $HOME/.clueapi.yaml.
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = 'https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
@@ -21,6 +21,7 @@ import pandas as pd
 import urllib.parse
 #
 from ...util import rest
+from ...util import pandas as util_pandas
 #
 API_HOST="api.clue.io"
 API_BASE_PATH="/api"
@@ -35,10 +36,12 @@ def ListDatatypes(params, base_url=BASE_URL, fout=None):
   rval = rest.Utils.GetURL(url, headers=headers, parse_json=True)
   logging.debug(json.dumps(rval, indent=2))
   dts = rval
+  dfb = util_pandas.FrameBuilder()
   for dt in dts:
     if not tags:
       tags = [tag for tag in dt.keys() if type(dt[tag]) not in (list, dict)]
-    df = pd.concat([df, pd.DataFrame({tags[j]:[dt[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:dt[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_datatype: {df.shape[0]}")
   return df
@@ -51,10 +54,12 @@ def ListDatasets(params, base_url=BASE_URL, fout=None):
   rval = rest.Utils.GetURL(url, headers=headers, parse_json=True)
   logging.debug(json.dumps(rval, indent=2))
   dsets = rval
+  dfb = util_pandas.FrameBuilder()
   for dset in dsets:
     if not tags:
       tags = [tag for tag in dset.keys() if type(dset[tag]) not in (list, dict)]
-    df = pd.concat([df, pd.DataFrame({tags[j]:[dset[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:dset[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_dataset: {df.shape[0]}")
   return df
@@ -65,9 +70,11 @@ def ListPerturbagenClasses(params, base_url=BASE_URL, fout=None):
   headers = {"Accept":"application/json", "user_key":params['user_key']}
   url = (base_url+'/pcls')
   pcls = rest.Utils.GetURL(url, headers=headers, parse_json=True)
+  dfb = util_pandas.FrameBuilder()
   for pcl in pcls:
     if not tags: tags = list(pcl.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[pcl[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:pcl[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_pertclasses: {df.shape[0]}")
   return df
@@ -76,6 +83,7 @@ def ListPerturbagenClasses(params, base_url=BASE_URL, fout=None):
 def GetGenes(params, ids, id_type, base_url=BASE_URL, fout=None):
   tags=None; df=pd.DataFrame();
   url_base = (base_url+'/genes?user_key='+params['user_key'])
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug('ID: '+id_this)
     i_chunk=0;
@@ -86,8 +94,9 @@ def GetGenes(params, ids, id_type, base_url=BASE_URL, fout=None):
       if not genes: break
       for gene in genes:
         if not tags: tags = list(gene.keys())
-        df = pd.concat([df, pd.DataFrame({tags[j]:[gene[tags[j]]] for j in range(len(tags))})])
+        dfb.append_record({tags[j]:gene[tags[j]] for j in range(len(tags))})
       i_chunk+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"IDs: {len(ids)}")
   logging.info(f"n_gene: {df.shape[0]}")
@@ -113,6 +122,7 @@ def GetPerturbagens(params, ids, id_type, base_url=BASE_URL, fout=None):
   headers = {"Accept":"application/json", "user_key":params['user_key']}
   url_base = (base_url+'/perts')
   fields = ['pert_id', 'pert_iname', 'pert_type', 'pert_vendor', 'pert_url', 'id', 'pubchem_cid', 'entrez_geneId', 'vector_id', 'clone_name', 'oligo_seq', 'description', 'target', 'structure_url', 'moa', 'pcl_membership', 'tas', 'num_sig', 'status']
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug('ID: '+id_this)
     i_chunk=0;
@@ -124,8 +134,9 @@ def GetPerturbagens(params, ids, id_type, base_url=BASE_URL, fout=None):
       logging.debug(json.dumps(perts, indent=2))
       for pert in perts:
         if not tags: tags = list(pert.keys())
-        df = pd.concat([df, pd.DataFrame({tags[j]:[pert[tags[j]]] for j in range(len(tags))})])
+        dfb.append_record({tags[j]:pert[tags[j]] for j in range(len(tags))})
       i_chunk+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"IDs: {len(ids)}")
   logging.info(f"n_pert: {df.shape[0]}")
@@ -142,6 +153,7 @@ def ListDrugs(params, base_url=BASE_URL, fout=None):
   headers = {"Accept":"application/json", "user_key":params['user_key']}
   url_base = (base_url+'/rep_drugs')
   i_chunk=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     qry = ('{"skip":%d,"limit":%d}'%(i_chunk*N_CHUNK, N_CHUNK))
     url = url_base+('?filter={}'.format(urllib.parse.quote(qry)))
@@ -149,8 +161,9 @@ def ListDrugs(params, base_url=BASE_URL, fout=None):
     if not drugs: break
     for drug in drugs:
       if not tags: tags = list(drug.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[drug[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:drug[tags[j]] for j in range(len(tags))})
     i_chunk+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"IDs: {len(ids)}")
   logging.info(f"n_drug: {df.shape[0]}")
@@ -162,6 +175,7 @@ def GetCells(params, ids, id_type, base_url=BASE_URL, fout=None):
   headers = {"Accept":"application/json", "user_key":params['user_key']}
   url_base = (base_url+'/cells')
   n_cell=0;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     logging.debug('ID: '+id_this)
     i_chunk=0;
@@ -173,8 +187,9 @@ def GetCells(params, ids, id_type, base_url=BASE_URL, fout=None):
       logging.debug(json.dumps(cells, indent=2))
       for cell in cells:
         if not tags: tags = list(cell.keys())
-        df = pd.concat([df, pd.DataFrame({tags[j]:[cell[tags[j]]] for j in range(len(tags))})])
+        dfb.append_record({tags[j]:cell[tags[j]] for j in range(len(tags))})
       i_chunk+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"IDs: {len(ids)}")
   logging.info(f"n_cell: {df.shape[0]}")
@@ -186,6 +201,7 @@ def ListCells(params, base_url=BASE_URL, fout=None):
   headers = {"Accept":"application/json", "user_key":params['user_key']}
   url_base = (base_url+'/cells')
   i_chunk=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     qry = ('{"skip":%d,"limit":%d}'%(i_chunk*N_CHUNK, N_CHUNK))
     url = url_base+('?filter={}'.format(urllib.parse.quote(qry)))
@@ -193,8 +209,9 @@ def ListCells(params, base_url=BASE_URL, fout=None):
     if not cells: break
     for cell in cells:
       if not tags: tags = list(cell.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[cell[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:cell[tags[j]] for j in range(len(tags))})
     i_chunk+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"IDs: {len(ids)}")
   logging.info(f"n_cell: {df.shape[0]}")
@@ -206,9 +223,11 @@ def CountSignatures(params, args, base_url=BASE_URL, fout=None):
   headers = {"Accept":"application/json", "user_key":params['user_key']}
   url = (base_url+'/sigs/count?where='+args.clue_where)
   sigs = rest.Utils.GetURL(url, headers=headers, parse_json=True)
+  dfb = util_pandas.FrameBuilder()
   for sig in sigs:
     if not tags: tags = list(sig.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[sig[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:sig[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"IDs: {len(ids)}")
   logging.info(f"n_sig: {df.shape[0]}")
@@ -221,6 +240,7 @@ def GetSignatures(params, args, base_url=BASE_URL, fout=None):
   headers = {"Accept":"application/json", "user_key":params['user_key']}
   url_base = (base_url+'/sigs')
   i_chunk=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     qry = ('{"where":%s,"fields":[%s],"skip":%d,"limit":%d}'%(args.clue_where, (','.join(['"%s"'%f for f in fields])), args.skip+i_chunk*N_CHUNK, N_CHUNK))
     url = url_base+('?filter=%s'%(qry))
@@ -229,8 +249,9 @@ def GetSignatures(params, args, base_url=BASE_URL, fout=None):
     logging.debug(json.dumps(sigs, indent=2))
     for sig in sigs:
       if not tags: tags = list(sig.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[sig[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:sig[tags[j]] for j in range(len(tags))})
     i_chunk+=1
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"IDs: {len(ids)}")
   logging.info(f"n_sig: {df.shape[0]}")
@@ -5,6 +5,7 @@
 import sys,os,re,argparse,json,logging
 #
 from ...lincs import sigcom as sigcom_lincs
+from ...util import rest
 #
 #############################################################################
 if __name__=="__main__":
@@ -18,11 +19,15 @@ if __name__=="__main__":
   parser.add_argument("--skip", type=int, default=0, help="skip results")
   parser.add_argument("--api_host", default=sigcom_lincs.Utils.API_HOST)
   parser.add_argument("--api_base_path", default=sigcom_lincs.Utils.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", dest="verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = 'https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
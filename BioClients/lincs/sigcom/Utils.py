@@ -5,6 +5,8 @@
 import sys,os,re,json,requests,tqdm,logging
 import pandas as pd
 import urllib.parse
+from ...util import rest
+from ...util import pandas as util_pandas
 #
 API_HOST="maayanlab.cloud"
 API_BASE_PATH="/sigcom-lincs/metadata-api"
@@ -14,15 +16,17 @@ BASE_URL='https://'+API_HOST+API_BASE_PATH
 def GetResources(ids, base_url=BASE_URL, fout=None):
   tags=None; df=None;
   url_base = (base_url+'/resources')
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url = f"{url_base}/{urllib.parse.quote(id_this)}"
-    response = requests.get(url)
+    response = rest.GetSession().get(url)
     rval = response.json()
     logging.debug(json.dumps(rval, indent=2))
     if not tags:
       tags = [tag for tag in rval.keys() if type(rval[tag]) not in (list, dict)]
     res = rval
-    df = pd.concat([df, pd.DataFrame({tags[j]:[res[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:res[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"IDs: {len(ids)}")
   return df
@@ -25,6 +25,7 @@
 import sys,os,re,argparse,time,logging
 #
 from ... import medline
+from ...util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -38,11 +39,15 @@ if __name__=='__main__':
   parser.add_argument("--codesys", choices=medline.connect.Utils.CODESYSTEMS.keys(), default="RXNORM", help="code system")
   parser.add_argument("--api_host", default=medline.connect.Utils.API_HOST)
   parser.add_argument("--api_base_path", default=medline.connect.Utils.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   api_base_url='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
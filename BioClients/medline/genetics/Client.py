@@ -11,6 +11,7 @@
 import sys,os,re,argparse,time,logging
 #
 from ... import medline
+from ...util import rest
 #
 ##############################################################################
 if __name__=="__main__":
@@ -35,11 +36,15 @@ type-2-diabetes,
   parser.add_argument("--download_host", default=medline.genetics.DOWNLOAD_HOST)
   parser.add_argument("--download_base_path", default=medline.genetics.DOWNLOAD_BASE_PATH)
   parser.add_argument("--summary_url", default=medline.genetics.SUMMARY_URL)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format="%(levelname)s:%(message)s", level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   api_base_url="https://"+args.api_host+args.api_base_path
   download_base_url="https://"+args.download_host+args.download_base_path
 
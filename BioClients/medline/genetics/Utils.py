@@ -12,6 +12,8 @@ import sys,os,re,json,argparse,time,logging,requests,urllib.parse
 import collections
 import pandas as pd
 import xmltodict
+from ...util import rest
+from ...util import pandas as util_pandas
 #
 #
 API_HOST="wsearch.nlm.nih.gov"
@@ -27,8 +29,9 @@ SUMMARY_URL="https://medlineplus.gov/download/ghr-summaries.xml"
 ##############################################################################
 def Search(ids, base_url=API_BASE_URL, fout=None):
   n_out=0; tags=None; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_url}/query?db=ghr&term={urllib.parse.quote(id_this)}")
+    response = rest.GetSession().get(f"{base_url}/query?db=ghr&term={urllib.parse.quote(id_this)}")
     rval_dict = xmltodict.parse(response.content)
     logging.debug(json.dumps(rval_dict, indent=2))
     search_results = rval_dict["search_results"]
@@ -39,44 +42,49 @@ def Search(ids, base_url=API_BASE_URL, fout=None):
     for result in results:
       if not tags: tags = list(result.keys())
       df_this = pd.DataFrame({tags[j]:[result[tags[j]]] for j in range(len(tags))})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   if fout is None: return df
 
 ##############################################################################
 def ListConditions(summary_url=SUMMARY_URL, fout=None):
   n_out=0; tags=None; df=pd.DataFrame();
-  response = requests.get(summary_url)
+  response = rest.GetSession().get(summary_url)
   logging.debug(f"HTTP Status code: [{response.status_code}]")
   rval_dict = xmltodict.parse(response.content)
   logging.debug(json.dumps(rval_dict, indent=2))
   summaries = rval_dict["summaries"]["health-condition-summary"]
+  dfb = util_pandas.FrameBuilder()
   for summary in summaries:
       if not tags: tags = [tag for tag in summary.keys() if type(summary[tag]) not in (list, dict, collections.OrderedDict)]
       df_this = pd.DataFrame({tags[j]:[summary[tags[j]]] for j in range(len(tags))})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   if fout is None: return df
 
 ##############################################################################
 def ListGenes(summary_url=SUMMARY_URL, fout=None):
   n_out=0; tags=None; df=pd.DataFrame();
-  response = requests.get(summary_url)
+  response = rest.GetSession().get(summary_url)
   logging.debug(f"HTTP Status code: [{response.status_code}]")
   rval_dict = xmltodict.parse(response.content)
   logging.debug(json.dumps(rval_dict, indent=2))
   summaries = rval_dict["summaries"]["gene-summary"]
+  dfb = util_pandas.FrameBuilder()
   for summary in summaries:
       if not tags: tags = [tag for tag in summary.keys() if type(summary[tag]) not in (list, dict, collections.OrderedDict)]
       df_this = pd.DataFrame({tags[j]:[summary[tags[j]]] for j in range(len(tags))})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -87,8 +95,9 @@ GTR = Genetics Testing Registry, but the IDs are UMLS CUIs.
   """
   n_out=0; n_err=0; tags=None; df=pd.DataFrame();
   xref_tags = ["ICD-10-CM", "MeSH", "OMIM", "SNOMED CT", "GTR"]
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_url}/genetics/condition/{id_this}.json")
+    response = rest.GetSession().get(f"{base_url}/genetics/condition/{id_this}.json")
     if response.status_code != 200:
       logging.error(f"Condition ID not found [{response.status_code}]: '{id_this}'")
       n_err+=1
@@ -117,11 +126,12 @@ GTR = Genetics Testing Registry, but the IDs are UMLS CUIs.
 	"ghr-page":[gene["related-gene"]["ghr-page"]]})
       df_this = pd.concat([df_condition, df_gene], axis=1)
 
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
 
   logging.info(f"n_out: {n_out}; n_err: {n_err}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
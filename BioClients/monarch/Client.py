@@ -47,6 +47,7 @@ https://www.ncbi.nlm.nih.gov/pmc/articles/PMC3653101/
 import sys,os,re,json,argparse,time,logging
 #
 from .. import monarch
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -77,11 +78,15 @@ NCBIGene:26564 (mouse gene)
   parser.add_argument("--o", dest="ofile", help="output (TSV)")
   parser.add_argument("--api_host", default=monarch.API_HOST)
   parser.add_argument("--api_base_path", default=monarch.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", dest="verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = 'https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile,"w") if args.ofile else sys.stdout
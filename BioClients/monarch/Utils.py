@@ -49,6 +49,7 @@ import pandas as pd
 import urllib,urllib.parse
 #
 from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST="monarchinitiative.org"
 API_BASE_PATH=""
@@ -57,6 +58,7 @@ BASE_URL = "https://"+API_HOST+API_BASE_PATH
 ##############################################################################
 def GetDisease(ids, base_url=BASE_URL, fout=None):
   tags=[]; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     disease = rest.GetURL(f"{base_url}/disease/{id_this}.json", parse_json=True)
     logging.debug((json.dumps(disease, indent=2, sort_keys=False)))
@@ -64,7 +66,8 @@ def GetDisease(ids, base_url=BASE_URL, fout=None):
       tags = list(disease.keys())
       for tag in ("relationships", "equivalentNodes", "equivalentClasses", "bundleJS", "bundleCSS"):
         tags.remove(tag)
-    df = pd.concat([df, pd.DataFrame({tags[j]:[disease[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:disease[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   logging.info(f"IDs in: {len(ids)}; n_out: {df.shape[0]}")
   if fout is not None: df.to_csv(fout, sep="\t", index=False)
   else: return df
@@ -72,6 +75,7 @@ def GetDisease(ids, base_url=BASE_URL, fout=None):
 ##############################################################################
 def GetDiseaseRelationships(ids, base_url=BASE_URL, fout=None):
   tags_dis=[]; tags_rel=[]; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     disease = rest.GetURL(f"{base_url}/disease/{id_this}.json", parse_json=True)
     logging.debug((json.dumps(disease, indent=2, sort_keys=False)))
@@ -85,7 +89,8 @@ def GetDiseaseRelationships(ids, base_url=BASE_URL, fout=None):
       df_this = pd.concat([
         pd.DataFrame({tags_dis[j]:[disease[tags_dis[j]]] for j in range(len(tags_dis))}),
         pd.DataFrame({tags_rel[j]:[rel[tags_rel[j]]] for j in range(len(tags_rel))}) ], axis=1)
-      df = pd.concat([df, df_this], axis=0)
+      dfb.append(df_this)
+  df = dfb.frame(df)
   logging.info(f"IDs in: {len(ids)}; n_out: {df.shape[0]}")
   if fout is not None: df.to_csv(fout, sep="\t", index=False)
   else: return df
@@ -97,11 +102,13 @@ def GetPhenotype(ids, base_url=BASE_URL, fout=None):
 ##############################################################################
 def GetGene(ids, base_url=BASE_URL, fout=None):
   tags=[]; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for gid in ids:
     gene = rest.GetURL(f"{base_url}/gene/{gid}.json", parse_json=True)
     logging.debug((json.dumps(gene, indent=2, sort_keys=False)))
     if not tags: tags = list(gene.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[gene[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:gene[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   logging.info(f"IDs in: {len(ids)}; n_out: {df.shape[0]}")
   if fout is not None: df.to_csv(fout, sep="\t", index=False)
   else: return df
@@ -116,13 +123,14 @@ def GetGene(ids, base_url=BASE_URL, fout=None):
 def ComparePhenotypes(idAs, idBs, base_url=BASE_URL, fout=None):
   tags=[]; df=pd.DataFrame();
   #fout.write("idA,typeA,labelA,taxonA,idB,typeB,labelB,taxonB,url,matchidA,matchlabelA,matchidB,matchlabelB,matchidLCS,matchlabelLCS,matchicA,matchicB,matchicLCS\n")
+  dfb = util_pandas.FrameBuilder()
   for idA in idAs:
     url_this = f"{base_url}/compare/{idA}/{(','.join(idBs))}.json"
     rval = rest.GetURL(url_this, parse_json=True)
     logging.debug(json.dumps(rval, indent=2, sort_keys=False))
     cmpr = rval
     if not tags: tags = list(cmpr.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[cmpr[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:cmpr[tags[j]] for j in range(len(tags))})
 
 #    A = cmpr["a"] if "a" in cmpr else {}
 #    typeA = A["type"] if "type" in A else ""
@@ -166,6 +174,7 @@ def ComparePhenotypes(idAs, idBs, base_url=BASE_URL, fout=None):
 
   logging.info(f"n_comparison = {len(idAs)*len(idBs)} ({len(idAs)}x{len(idBs)})")
   #logging.info("n_match = {n_match}; n_out = {n_out}")
+  df = dfb.frame(df)
   logging.info(f"n_out: {df.shape[0]}")
   if fout is not None: df.to_csv(fout, sep="\t", index=False)
   else: return df
@@ -9,6 +9,7 @@ https://pypi.org/project/mygene/
 import sys,os
 import pandas as pd
 import mygene as mg
+from ..util import pandas as util_pandas
 #
 FIELDS = 'HGNC,symbol,name,taxid,entrezgene,ensemblgene'
 NCHUNK=100;
@@ -18,12 +19,14 @@ def GetGenes(ids, fields=FIELDS, fout=None):
   """Get genes by Entrez or Ensembl gene ID."""
   ichunk=0; n_out=0; df=None;
   mgi = mg.MyGeneInfo()
+  dfb = util_pandas.FrameBuilder()
   while ichunk*NCHUNK<len(ids):
     df_this = mgi.getgenes(ids[ichunk*NCHUNK:((ichunk+1)*NCHUNK)], fields, as_dataframe=True)
     if fout is not None: df.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=df_this.shape[0]
     ichunk+=1
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -31,12 +34,14 @@ def SearchGenes(queries, species, fout=None):
   """Search genes by symbol, etc. using MyGene syntax."""
   ichunk=0; n_out=0; df=None;
   mgi = mg.MyGeneInfo()
+  dfb = util_pandas.FrameBuilder()
   for qry in queries:
     df_this = mgi.query(qry, species=species, as_dataframe=True)
     if fout is not None: df.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=df_this.shape[0]
     ichunk+=1
+  df = dfb.frame(df)
   return df
 
 #############################################################################
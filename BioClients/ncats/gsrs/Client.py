@@ -8,6 +8,7 @@ https://gsrs.ncats.nih.gov/#/api
 import sys,os,re,json,argparse,time,logging
 
 from ... import ncats
+from ...util import rest
 #
 #############################################################################
 if __name__=='__main__':
@@ -36,11 +37,15 @@ C=1CC=CC=C1C(=O)O
   parser.add_argument("--query", help="Search query.")
   parser.add_argument("--api_host", default=ncats.gsrs.API_HOST)
   parser.add_argument("--api_base_path", default=ncats.gsrs.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   api_base_url = 'https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
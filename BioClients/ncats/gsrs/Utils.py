@@ -4,6 +4,8 @@
 import sys,os,re,time,json,logging,requests,tqdm
 import urllib,urllib.parse
 import pandas as pd
+from ...util import rest
+from ...util import pandas as util_pandas
 #
 API_HOST='gsrs.ncats.nih.gov'
 API_BASE_PATH='/ginas/app/api/v1'
@@ -15,9 +17,10 @@ NCHUNK=100
 def ListVocabularies(base_url=API_BASE_URL, fout=None):
   n_out=0; tags=None; tags_term=None; df=None;
   size=NCHUNK; skip=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_this = f"{base_url}/vocabularies?skip={skip}&top={size}"
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     logging.debug(response.text)
     if response.status_code!=200: break
     results = response.json()
@@ -35,21 +38,23 @@ def ListVocabularies(base_url=API_BASE_URL, fout=None):
           tags_term = list(term.keys())
         df_this = pd.DataFrame({tag:[thing[tag] if tag in thing else ''] for tag in tags})
         df_this = pd.concat([df_this, pd.DataFrame({f"term_{tag}":[term[tag] if tag in term else ''] for tag in tags_term})], axis=1)
-        if fout is None: df = pd.concat([df, df_this])
+        if fout is None: dfb.append(df_this)
         else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
         n_out += df_this.shape[0]
     if results['count']<NCHUNK: break
     skip+=NCHUNK
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def ListSubstances(base_url=API_BASE_URL, fout=None):
   n_out=0; tags=None; df=None; tq=None;
   size=NCHUNK; skip=0;
+  dfb = util_pandas.FrameBuilder()
   while True:
     url_this = f"{base_url}/substances?skip={skip}&top={size}"
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     logging.debug(response.text)
     if response.status_code!=200: break
     results = response.json()
@@ -64,7 +69,7 @@ def ListSubstances(base_url=API_BASE_URL, fout=None):
             logging.info(f"Ignoring field: {tag}")
             tags.remove(tag)
       df_this = pd.DataFrame({tag:[thing[tag] if tag in thing else ''] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
     tq.update(n=results['count'])
@@ -72,6 +77,7 @@ def ListSubstances(base_url=API_BASE_URL, fout=None):
     skip+=NCHUNK
   if tq is not None: tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -79,8 +85,9 @@ def Search(query, base_url=API_BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
   size=NCHUNK; skip=0;
   url_this = f"{base_url}/substances/search?q={urllib.parse.quote(query)}&top={size}"
+  dfb = util_pandas.FrameBuilder()
   while True:
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     logging.debug(response.text)
     if response.status_code!=200: break
     results = response.json()
@@ -98,20 +105,22 @@ def Search(query, base_url=API_BASE_URL, fout=None):
 pd.DataFrame({
 	"struct_id":[thing['structure']['id'] if 'structure' in thing and 'id' in thing['structure'] else ''],
 	"struct_smiles":[thing['structure']['smiles'] if 'structure' in thing and 'smiles' in thing['structure'] else '']})], axis=1)
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
     if results['count']<NCHUNK: break
     url_this = results['nextPageUri']
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def GetSubstance(ids, base_url=API_BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = f"{base_url}/substances({id_this})"
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     logging.debug(response.text)
     if response.status_code!=200: continue
     thing = response.json()
@@ -126,18 +135,20 @@ def GetSubstance(ids, base_url=API_BASE_URL, fout=None):
 	pd.DataFrame({
 	"struct_id":[thing['structure']['id'] if 'structure' in thing and 'id' in thing['structure'] else ''],
 	"struct_smiles":[thing['structure']['smiles'] if 'structure' in thing and 'smiles' in thing['structure'] else '']})], axis=1)
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def GetSubstanceNames(ids, base_url=API_BASE_URL, fout=None):
   n_out=0; tags=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = f"{base_url}/substances({id_this})/names"
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     logging.debug(response.text)
     if response.status_code!=200: continue
     names = response.json()
@@ -149,10 +160,11 @@ def GetSubstanceNames(ids, base_url=API_BASE_URL, fout=None):
             logging.info(f"Ignoring field: {tag}")
             tags.remove(tag)
       df_this = pd.DataFrame({tag:[name[tag] if tag in name else ''] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
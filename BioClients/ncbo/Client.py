@@ -10,6 +10,7 @@ import sys,os,argparse,re,yaml,logging,time
 #
 from .. import ncbo
 from ..util import yaml as util_yaml
+from ..util import rest
 #
 #############################################################################
 if __name__=='__main__':
@@ -24,12 +25,16 @@ if __name__=='__main__':
   parser.add_argument("--api_base_path", default=ncbo.API_BASE_PATH)
   parser.add_argument("--param_file", default=os.environ["HOME"]+"/.ncbo.yaml")
   parser.add_argument("--api_key", help="API key")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
 
   args = parser.parse_args()
 
   logging.basicConfig(format="%(levelname)s:%(message)s", level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = "https://"+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
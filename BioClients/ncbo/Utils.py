@@ -14,6 +14,7 @@ import sys,os,re,json,requests,urllib.parse,logging,time
 import pandas as pd
 #
 from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST="data.bioontology.org"
 API_BASE_PATH=""
@@ -25,12 +26,13 @@ def RecommendOntologies(base_url, api_key, texts, fout):
   tags=[]; df=pd.DataFrame(); n_err=0;
   resultTags=["coverageResult", "specializationResult", "acceptanceResult", "detailResult"];
   headers = {"Authorization":f"apikey token={api_key}"}
+  dfb = util_pandas.FrameBuilder()
   for text in texts:
     url_this = base_url+f"/recommender?input={urllib.parse.quote(text)}"
     url_this += "&input_type=2"
     url_this += "&display_context=false&display_links=false"
     logging.debug(url_this)
-    rval = requests.get(url_this, headers=headers)
+    rval = rest.GetSession().get(url_this, headers=headers)
     if not rval.ok:
       logging.error(f'{rval.status_code} : "{text}"')
       n_err+=1
@@ -41,7 +43,8 @@ def RecommendOntologies(base_url, api_key, texts, fout):
       if not tags:
         tags = list(result.keys())
         df_this = pd.DataFrame({tags[j]:([str(result[tags[j]])] if tags[j] in result else ['']) for j in range(len(tags))})
-        df = pd.concat([df, df_this])
+        dfb.append(df_this)
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"n_texts: {len(texts)}; n_out: {df.shape[0]}; n_err: {n_err}")
   return df
@@ -54,9 +54,13 @@ example searches: {
   parser.add_argument("--api_host", default=API_HOST)
   parser.add_argument("--api_base_path", default=API_BASE_PATH)
   parser.add_argument("--api_key", default=API_KEY)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   if args.mims:
     mim_vals = map(lambda n:int(n), re.split(',', args.mims))
   else:
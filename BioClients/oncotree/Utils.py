@@ -6,6 +6,7 @@ See: https://oncotree.mskcc.org/#/home
 """
 import sys,os,re,requests,urllib,json,time,logging,tqdm
 import pandas as pd
+from ..util import rest
 
 #
 API_HOST="oncotree.mskcc.org"
@@ -16,13 +17,13 @@ HEADERS={"Accept":"application/json"}
 #
 ##############################################################################
 def Info(base_url=BASE_URL, fout=None):
-  response = requests.get(base_url+"/info", headers=HEADERS)
+  response = rest.GetSession().get(base_url+"/info", headers=HEADERS)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
 
 ##############################################################################
 def ListVersions(base_url=BASE_URL, fout=None):
-  response = requests.get(base_url+'/versions', headers=HEADERS)
+  response = rest.GetSession().get(base_url+'/versions', headers=HEADERS)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   versions = result
@@ -33,7 +34,7 @@ def ListVersions(base_url=BASE_URL, fout=None):
 
 ##############################################################################
 def ListMainTypes(base_url=BASE_URL, fout=None):
-  response = requests.get(base_url+'/mainTypes', headers=HEADERS)
+  response = rest.GetSession().get(base_url+'/mainTypes', headers=HEADERS)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   maintypes = result
@@ -45,7 +46,7 @@ def ListMainTypes(base_url=BASE_URL, fout=None):
 
 ##############################################################################
 def ListTumorTypes(base_url=BASE_URL, fout=None):
-  response = requests.get(base_url+'/tumorTypes', headers=HEADERS)
+  response = rest.GetSession().get(base_url+'/tumorTypes', headers=HEADERS)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   tumortypes = result
@@ -56,7 +57,7 @@ def ListTumorTypes(base_url=BASE_URL, fout=None):
 
 ##############################################################################
 def SearchTumorTypes(qry, qtype, exact, levels, base_url=BASE_URL, fout=None):
-  response = requests.get(base_url+f"/tumorTypes/search/{qtype}/{qry}?exactMatch={str(exact)}&levels={urllib.parse.quote(levels)}", headers=HEADERS)
+  response = rest.GetSession().get(base_url+f"/tumorTypes/search/{qtype}/{qry}?exactMatch={str(exact)}&levels={urllib.parse.quote(levels)}", headers=HEADERS)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   tumortypes = result
@@ -18,6 +18,7 @@ import sys,os,re,time,argparse,logging
 from .. import openphacts
 #
 from ..util import yaml as util_yaml
+from ..util import rest
 #
 #
 ##############################################################################
@@ -39,11 +40,15 @@ http://www.conceptwiki.org/concept/00059958-a045-4581-9dc5-e5a08bb0c291 (target)
   parser.add_argument("--api_user_id")
   parser.add_argument("--api_user_key")
   parser.add_argument("--param_file", default=os.environ['HOME']+"/.openphacts.yaml")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   params = util_yaml.ReadParamFile(args.param_file) if os.path.isfile(args.param_file) else {}
   api_user_id = args.api_user_id if args.api_user_id else params['ID'] if 'ID' in params else None
   api_user_key = args.api_user_key if args.api_user_key else params['KEY'] if 'KEY' in params else None
@@ -33,6 +33,7 @@
 import sys,os,re,time,logging
 import requests,json,urllib.parse
 import pandas as pd
+from ..util import rest
 #
 API_HOST='beta.openphacts.org'
 API_BASE_PATH='/2.1'
@@ -46,7 +47,7 @@ def ShowCounts(user_id, user_key, base_url):
 	]
   for countpath in countpaths:
     url = f"{base_url}{countpath}?app_id={user_id}&app_key={user_key}"
-    response = requests.get(url)
+    response = rest.GetSession().get(url)
     logging.debug(json.dumps(response.json(), sort_keys=True, indent=2))
     logging.info(f"{countpath}: {response.content}")
 #
@@ -55,7 +56,7 @@ def ListPathways(user_id, user_key, base_url, fout):
   url = base_url+'/pathways?'
   url+=('&app_id=%s&app_key=%s'%(user_id,user_key))
   url+=('&_format=tsv')
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   logging.debug(json.dumps(response.json(), sort_keys=True, indent=2))
   lines = response.content.splitlines()
   tags = re.split('\t', lines[0])
@@ -77,7 +78,7 @@ def ListSources(user_id, user_key, base_url,fout):
   url=base_url+'/sources?'
   url+=('&app_id=%s&app_key=%s'%(user_id,user_key))
   url+=('&_format=json')
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   result = response.json()
 
   if type(result) is not dict:
@@ -145,7 +146,7 @@ def ListTargetTypes(user_id, user_key, base_url,fout):
   url=base_url+'/target/types?'
   url+=('&app_id=%s&app_key=%s'%(user_id,user_key))
   url+=('&_format=json')
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   result = response.json()
 
   if type(result) is not dict:
@@ -196,7 +197,7 @@ def ListTargets(uri_qry,user_id, user_key, base_url,fout):
   while True:
     page+=1
     url_this = url+('&_page=%d'%page)
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     result = response.json()
 
     if not result: break
@@ -233,7 +234,7 @@ def GetAssay(uri_qry, user_id, user_key, base_url,fout):
   url=base_url+'/assay?uri=%s'%urllib.parse.quote(uri_qry).replace('/','%2F')
   url+=('&app_id=%s&app_key=%s'%(user_id,user_key))
   url+=('&_format=tsv')
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   result = response.content
 
   lines = result.splitlines()
@@ -257,7 +258,7 @@ def GetInstance(resource, uri_qry, user_id, user_key, base_url, fout):
   url=base_url+'/%s?uri=%s'%(resource,urllib2.quote(uri_qry).replace('/','%2F'))
   url+=('&app_id=%s&app_key=%s'%(user_id,user_key))
   url+=('&_format=tsv')
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   result = response.content
 
   lines = result.splitlines()
@@ -8,6 +8,7 @@ https://data.rcsb.org/redoc/
 import sys,os,re,json,argparse,time,logging
 #
 from .. import pdb as pdb_utils
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -26,11 +27,15 @@ Example chemical IDs: CFF
   parser.add_argument("--o", dest="ofile", help="output file (TSV)")
   parser.add_argument("--api_host", default=pdb_utils.API_HOST)
   parser.add_argument("--api_base_path", default=pdb_utils.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = f"https://{args.api_host}{args.api_base_path}"
 
   ids=[]
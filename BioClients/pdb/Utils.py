@@ -8,6 +8,7 @@ Major changes include all JSON output.
 """
 ###
 import sys,os,re,time,json,logging,requests
+from ..util import rest
 #
 API_HOST='data.rcsb.org'
 API_BASE_PATH='/rest/v1'
@@ -16,7 +17,7 @@ API_BASE_URL = f"https://{API_HOST}{API_BASE_PATH}"
 #############################################################################
 def GetEntryData(eid, base_url=API_BASE_URL):
   """E.g. https://data.rcsb.org/rest/v1/core/entry/3ert"""
-  response = requests.get(f"{base_url}/core/entry/{eid}")
+  response = rest.GetSession().get(f"{base_url}/core/entry/{eid}")
   if response.status_code != 200:
     logging.error(f"status_code: {response.status_code}")
     return None
@@ -36,7 +37,7 @@ def GetEntrys(eids, base_url=API_BASE_URL, fout=None):
 #############################################################################
 def GetChemicalData(cid, base_url):
   """Chemical component (ligands, small molecules and monomers) via CCD ID. E.g. https://data.rcsb.org/rest/v1/core/chemcomp/CFF"""
-  response = requests.get(f"{base_url}/core/chemcomp/{cid}")
+  response = rest.GetSession().get(f"{base_url}/core/chemcomp/{cid}")
   if response.status_code != 200:
     logging.error(f"status_code: {response.status_code}")
     return None
@@ -79,7 +80,7 @@ def ChemicalIsDruglike(chem):
 
 #############################################################################
 def ListEntrys(base_url=API_BASE_URL, fout=None):
-  response = requests.get(f"{base_url}/holdings/current/entry_ids")
+  response = rest.GetSession().get(f"{base_url}/holdings/current/entry_ids")
   if response.status_code != 200:
     logging.error(f"status_code: {response.status_code}")
     return []
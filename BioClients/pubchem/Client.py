@@ -6,6 +6,8 @@ Utility app for the PubChem PUG REST API.
 import sys,os,re,argparse,time,logging
 #
 from .. import pubchem
+from ..util import rest
+from ..util import parallel
 #
 ##############################################################################
 if __name__=='__main__':
@@ -23,6 +25,10 @@ if __name__=='__main__':
 	"get_assaysubstances",
 	"get_assaysubstanceresults",
         "get_compoundview", "get_substanceview", "get_assayview",]
+  BULK_OPS = [
+        "get_cid2smiles", "get_cid2sdf", "get_cid2properties", "get_cid2inchi",
+        "get_cid2descriptions", "get_cid2sid", "get_cid2assaysummary",
+        "get_sid2cid", "get_sid2assaysummary"]
   parser = argparse.ArgumentParser(description="PubChem PUG REST client")
   parser.add_argument("op", choices=OPS, help="OPERATION")
   parser.add_argument("--i", dest="ifile", help="input IDs file (CID|SID|SMILES|name)")
@@ -36,12 +42,22 @@ if __name__=='__main__':
   parser.add_argument("--skip", type=int, default=0)
   parser.add_argument("--nmax", type=int, default=0)
   parser.add_argument("--nmax_per_cid", type=int, default=20)
+  parser.add_argument("--concurrency", type=int, default=1, help="max requests in flight")
+  parser.add_argument("--bulk", action="store_true", help="listkey mode for large ID sets: upload IDs, poll, page results (CID/SID ops)")
   parser.add_argument("-q", "--quiet", action="store_true", help="Suppress progress notification.")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>0 else logging.ERROR if args.quiet else 15))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl, methods=["GET", "POST"]) #PUG-REST POSTs are queries; listkey uploads and polling use NO_CACHE.
+
+  if args.concurrency>rest.REST_POOL_MAXSIZE: rest.ConfigureSession(pool_maxsize=args.concurrency)
+
+  if args.bulk and args.op not in BULK_OPS: parser.error(f"--bulk not supported for operation: {args.op}")
+
   base_url = f"https://{args.api_host}{args.api_base_path}"
 
   fout = open(args.ofile, "w") if args.ofile else sys.stdout
@@ -85,35 +101,35 @@ if __name__=='__main__':
     pubchem.GetCID2Nicename(ids, args.skip, args.nmax, base_url, fout)
 
   elif args.op == 'get_cid2descriptions':
-    pubchem.GetCID2Descriptions(ids, base_url, fout)
+    pubchem.GetCID2Descriptions(ids, base_url, fout, args.concurrency, args.bulk)
 
   elif args.op == 'get_cid2properties':
-    pubchem.GetCID2Properties(ids, base_url, fout)
+    pubchem.GetCID2Properties(ids, base_url, fout, args.concurrency, args.bulk)
 
   elif args.op == 'get_cid2inchi':
-    pubchem.GetCID2Inchi(ids, base_url, fout)
+    pubchem.GetCID2Inchi(ids, base_url, fout, args.concurrency, args.bulk)
 
   elif args.op == 'get_cid2sid':
-    pubchem.GetCID2SID(ids, base_url, fout)
+    pubchem.GetCID2SID(ids, base_url, fout, args.concurrency, args.bulk)
 
   elif args.op == 'get_cid2smiles':
-    pubchem.Utils.GetCID2Smiles(ids, base_url, fout)
+    pubchem.Utils.GetCID2Smiles(ids, base_url, fout, args.concurrency, args.bulk)
 
   elif args.op == 'get_cid2sdf':
-    pubchem.GetCID2SDF(ids, base_url, fout)
+    pubchem.GetCID2SDF(ids, base_url, fout, args.concurrency, args.bulk)
 
   elif args.op == 'get_cid2assaysummary':
-    pubchem.GetCID2AssaySummary(ids, base_url, fout)
+    pubchem.GetCID2AssaySummary(ids, base_url, fout, args.concurrency, args.bulk)
 
   elif args.op == 'get_compoundview':
     base_url = f"https://{args.api_host}{args.api_base_path_view}"
     pubchem.GetCompoundView(ids, base_url, fout)
 
   elif args.op == 'get_sid2cid':
-    pubchem.GetSID2CID(ids, base_url, fout)
+    pubchem.GetSID2CID(ids, base_url, fout, args.concurrency, args.bulk)
 
   elif args.op == 'get_sid2assaysummary':
-    pubchem.GetSID2AssaySummary(ids, base_url, fout)
+    pubchem.GetSID2AssaySummary(ids, base_url, fout, args.concurrency, args.bulk)
 
   elif args.op == 'get_sid2sdf':
     pubchem.GetSID2SDF(ids, fout, args.skip, args.nmax, base_url)
@@ -125,7 +141,7 @@ if __name__=='__main__':
     pubchem.GetSmiles2CID(ids, base_url, fout)
 
   elif args.op == 'get_name2sid':
-    pubchem.GetName2SID(ids, args.skip, args.nmax, base_url, fout)
+    pubchem.GetName2SID(ids, args.skip, args.nmax, base_url, fout, args.concurrency)
 
   elif args.op == 'get_name2cid':
     pubchem.GetName2CID(ids, args.skip, args.nmax, base_url, fout)
@@ -154,3 +170,4 @@ if __name__=='__main__':
 
   logging.info(('elapsed time: %s'%(time.strftime('%Hh:%Mm:%Ss',time.gmtime(time.time()-t0)))))
 
+  if parallel.ReportFailures(): sys.exit(1)
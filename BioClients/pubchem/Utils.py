@@ -26,10 +26,11 @@ Utility functions for the PubChem PUG REST API.
 import sys,os,io,re,csv,json,math,time,logging,tempfile,tqdm,tqdm.auto
 from xml.etree import ElementTree
 import requests
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 import urllib.request,urllib.parse
 import pandas as pd
+from ..util import rest
+from ..util import parallel
+from ..util import pandas as util_pandas
 #
 OUTCOME_CODES = {
         'inactive':1,
@@ -44,14 +45,143 @@ API_BASE_PATH_VIEW='/rest/pug_view'
 BASE_URL="https://"+API_HOST+API_BASE_PATH
 #
 NCHUNK=100
+CHUNK_SHRINK_STATUS_CODES=[413, 414] #Request too large: reduce chunk size for all chunks.
+CHUNK_BISECT_STATUS_CODES=[400] #Bad ID(s): bisect this chunk only. 5xx left to util.rest retries.
+CHUNK_BISECT_NMAX=32 #Sub-requests per chunk, bisecting.
+#
+DOMAINS = {'cid':'compound', 'sid':'substance', 'aid':'assay'}
+LISTKEY_NCHUNK=10000 #page size (listkey_count)
+LISTKEY_UPLOAD_NMAX=100000 #IDs per uploaded list
+POLL_WAIT=5
+MAX_WAIT=600
 #
 #############################################################################
 def OutcomeCode(txt):
   return OUTCOME_CODES[txt.lower()] if txt.lower() in OUTCOME_CODES else OUTCOME_CODES['unspecified']
 
+#############################################################################
+def ChunkIDs(ids, nchunk):
+  """Generate chunks of ids.  Chunk size read from nchunk[0] at each step,
+so a size reduced by PostIDs() applies to the remaining chunks."""
+  i=0;
+  while i<len(ids):
+    ids_this = ids[i:i+nchunk[0]]
+    i+=len(ids_this)
+    yield ids_this
+
+#############################################################################
+def PostIDs(url, idtype, ids, headers=None, nchunk=None, response=None, nbisect=None):
+  """POST comma-separated IDs (idtype = cid|sid|aid) in one request.  If
+the batch is too large (413, 414), split in half and retry, recursively, and
+reduce nchunk[0] for subsequent chunks.  If rejected as bad request (400),
+bisect locally to isolate the bad IDs, without changing nchunk[0], up to
+CHUNK_BISECT_NMAX sub-requests per chunk, and stopping if both halves are
+also rejected (e.g. bad URL or idtype, not bad IDs).  Server errors (5xx)
+are retried by util.rest.  Returns list of (ids, response)."""
+  if response is None:
+    response = rest.GetSession().post(url, headers=headers, data={idtype:(','.join(map(lambda x:str(x), ids)))})
+  if len(ids)<=1: return [(ids, response)]
+  n_half = (len(ids)+1)//2
+  if response.status_code in CHUNK_SHRINK_STATUS_CODES:
+    logging.warning(f"status_code: {response.status_code}; chunk size: {len(ids)} -> {n_half}")
+    if nchunk is not None: nchunk[0] = min(nchunk[0], n_half)
+    return PostIDs(url, idtype, ids[:n_half], headers, nchunk, nbisect=nbisect)+PostIDs(url, idtype, ids[n_half:], headers, nchunk, nbisect=nbisect)
+  if response.status_code in CHUNK_BISECT_STATUS_CODES:
+    nbisect = nbisect if nbisect is not None else [CHUNK_BISECT_NMAX]
+    if nbisect[0]<2:
+      logging.warning(f"status_code: {response.status_code}; bisection limit ({CHUNK_BISECT_NMAX}) reached; {len(ids)} IDs ({ids[0]}...) not resolved")
+      return [(ids, response)]
+    nbisect[0]-=2
+    logging.debug(f"status_code: {response.status_code}; bisecting {len(ids)} IDs ({ids[0]}...)")
+    halves = [ids[:n_half], ids[n_half:]]
+    responses = [rest.GetSession().post(url, headers=headers, data={idtype:(','.join(map(lambda x:str(x), ids_this)))}) for ids_this in halves]
+    if all([r.status_code in CHUNK_BISECT_STATUS_CODES for r in responses]):
+      logging.warning(f"status_code: {response.status_code}, and for both halves; not bisecting {len(ids)} IDs ({ids[0]}...) further")
+      return list(zip(halves, responses))
+    return PostIDs(url, idtype, halves[0], headers, nchunk, responses[0], nbisect)+PostIDs(url, idtype, halves[1], headers, nchunk, responses[1], nbisect)
+  return [(ids, response)]
+
+#############################################################################
+def PostChunks(url, idtype, ids, headers=None, nchunk=NCHUNK, concurrency=1):
+  """Common chunked-POST path for multi-ID PUG-REST requests, with chunk
+size backoff.  Generates (ids, response) per request in input order."""
+  nchunk = [nchunk]
+  for ids_this,results in parallel.MapOrdered(lambda ids_this: PostIDs(url, idtype, ids_this, headers, nchunk), ChunkIDs(ids, nchunk), concurrency):
+    if results is None: continue
+    for ids_that,response in results:
+      if response.status_code!=200:
+        logging.debug(f"status_code: {response.status_code}; IDs: {len(ids_that)} ({ids_that[0]}...)")
+      yield ids_that, response
+
+#############################################################################
+def WaitForListkey(response, url_poll, poll_wait=POLL_WAIT, max_wait=MAX_WAIT):
+  """Asynchronous requests return 202 and a Waiting listkey.  Poll
+url_poll (formatted with the listkey) until done.  Returns final response,
+or None if max_wait exceeded."""
+  t0=time.time()
+  while response.status_code==202:
+    rval = response.json()
+    listkey = rval['Waiting']['ListKey'] if 'Waiting' in rval and 'ListKey' in rval['Waiting'] else None
+    if listkey is None: break
+    if time.time()-t0>max_wait:
+      logging.error(f"Max wait exceeded ({max_wait} sec); quitting [listkey={listkey}].")
+      return None
+    time.sleep(poll_wait)
+    logging.debug(f"Polling PUG-REST [listkey={listkey}]...")
+    response = rest.GetSession().get(url_poll.format(listkey=listkey), headers=rest.NO_CACHE)
+  return response
+
+#############################################################################
+def UploadListkey(ids, idtype, base_url=BASE_URL):
+  """Store ids on the server, returning (listkey, size)."""
+  domain = DOMAINS[idtype]
+  response = rest.GetSession().post(f"{base_url}/{domain}/{idtype}/{idtype}s/JSON?list_return=listkey", data={idtype:(','.join(map(lambda x:str(x), ids)))}, headers=rest.NO_CACHE)
+  response = WaitForListkey(response, f"{base_url}/{domain}/listkey/{{listkey}}/{idtype}s/JSON?list_return=listkey")
+  if response is None or response.status_code!=200:
+    logging.error(f"Listkey upload failed: {response.status_code if response is not None else None}")
+    return None, 0
+  rval = response.json()
+  listkey = rval['IdentifierList']['ListKey'] if 'IdentifierList' in rval and 'ListKey' in rval['IdentifierList'] else None
+  size = rval['IdentifierList']['Size'] if listkey else 0
+  logging.debug(f"Uploaded {idtype.upper()}s: {size}; listkey: {listkey}")
+  return listkey, size
+
+#############################################################################
+def GetListkeyPage(url, headers=None):
+  response = rest.GetSession().get(url, headers=headers)
+  if response.status_code==202:
+    response = WaitForListkey(response, re.sub(r'/listkey/[^/]+/', '/listkey/{listkey}/', url))
+  return response
+
+#############################################################################
+def ListkeyChunks(base_url, idtype, op, ids, headers=None, nchunk=LISTKEY_NCHUNK, concurrency=1):
+  """Bulk mode for large ID sets: upload ids as listkey(s), then request op
+on the stored list in pages (listkey_start, listkey_count), concurrently.
+Generates (ids, response) per page in input order."""
+  domain = DOMAINS[idtype]
+  for i in range(0, len(ids), LISTKEY_UPLOAD_NMAX):
+    ids_this = ids[i:i+LISTKEY_UPLOAD_NMAX]
+    listkey, size = UploadListkey(ids_this, idtype, base_url)
+    if listkey is None: continue
+    url = f"{base_url}/{domain}/listkey/{listkey}/{op}"+("&" if "?" in op else "?")
+    starts = list(range(0, size, nchunk))
+    for start,response in parallel.MapOrdered(lambda start: GetListkeyPage(url+f"listkey_start={start}&listkey_count={nchunk}", headers), starts, concurrency):
+      if response is None: continue
+      if response.status_code!=200:
+        logging.debug(f"status_code: {response.status_code}; listkey: {listkey}; start: {start}")
+      yield ids_this[start:start+nchunk], response
+
+#############################################################################
+def RequestChunks(base_url, idtype, op, ids, headers=None, concurrency=1, bulk=False):
+  """Multi-ID request for op (e.g. "sids/JSON"), via chunked POST, or if
+bulk, listkey upload and paged retrieval."""
+  if bulk:
+    return ListkeyChunks(base_url, idtype, op, ids, headers, concurrency=concurrency)
+  return PostChunks(f"{base_url}/{DOMAINS[idtype]}/{idtype}/{op}", idtype, ids, headers, concurrency=concurrency)
+
 #############################################################################
 def ListSources(src_type, base_url=BASE_URL, fout=None):
-  rval = requests.get(base_url+f"/sources/{src_type}/JSON").json()
+  rval = rest.GetSession().get(base_url+f"/sources/{src_type}/JSON").json()
   logging.debug(json.dumps(rval,indent=2))
   sources = rval['InformationList']['SourceName'] if 'InformationList' in rval and 'SourceName' in rval['InformationList'] else []
   n_src=0;
@@ -63,21 +193,22 @@ def ListSources(src_type, base_url=BASE_URL, fout=None):
 ##############################################################################
 def GetSID2SDF(id_query, base_url=BASE_URL):
   url = (base_url+f"/substance/sid/{id_query}/SDF")
-  txt = requests.get(url).text
+  txt = rest.GetSession().get(url).text
   return txt
 
 #############################################################################
-def GetSID2CID(sids, base_url=BASE_URL, fout=None):
+def GetSID2CID(sids, base_url=BASE_URL, fout=None, concurrency=1, bulk=False):
   cids=set(); tq=None; df=None;
   if fout: fout.write("SID\tCID\n")
-  for sid in sids:
-    rval = requests.get(base_url+f"/substance/sid/{sid}/cids/JSON?cids_type=standardized").json()
+  for sids_this,response in RequestChunks(base_url, "sid", "cids/JSON?cids_type=standardized", sids, concurrency=concurrency, bulk=bulk):
+    if response.status_code!=200: continue
+    rval = response.json()
     infos = rval['InformationList']['Information'] if 'InformationList' in rval and 'Information' in rval['InformationList'] else []
     for info in infos:
       cids_this = info['CID'] if 'CID' in info else []
       for cid in cids_this:
         cids.add(str(cid))
-        if fout: fout.write(f"{sid}\t{cid}\n")
+        if fout: fout.write(f"{info['SID']}\t{cid}\n")
   return list(cids)
 
 #############################################################################
@@ -86,16 +217,11 @@ def GetSID2Smiles(sids, base_url=BASE_URL, fout=None):
   GetCID2Smiles(cids, base_url, fout)
 
 #############################################################################
-def GetCID2SID(cids, base_url=BASE_URL, fout=None):
+def GetCID2SID(cids, base_url=BASE_URL, fout=None, concurrency=1, bulk=False):
   sids=set(); df=None;
   if fout: fout.write("CID\tSID\n")
-  for cid in cids:
-    time.sleep(0.01) #Kludge fix: requests.exceptions.ConnectionError: ('Connection aborted.', ConnectionResetError(104, 'Connection reset by peer'))
-    url_this = f"{base_url}/compound/cid/{cid}/sids/JSON"
-    response = requests.get(url_this)
-    if response.status_code!=200:
-      logging.debug(f"status_code: {response.status_code}; {url_this}")
-      continue
+  for cids_this,response in RequestChunks(base_url, "cid", "sids/JSON", cids, concurrency=concurrency, bulk=bulk):
+    if response.status_code!=200: continue
     try:
       rval = response.json()
     except Exception as e:
@@ -106,7 +232,7 @@ def GetCID2SID(cids, base_url=BASE_URL, fout=None):
       sids_this = info['SID'] if 'SID' in info else []
       for sid in sids_this:
         sids.add(str(sid))
-        if fout: fout.write(f"{cid}\t{sid}\n")
+        if fout: fout.write(f"{info['CID']}\t{sid}\n")
   return list(sids)
 
 #############################################################################
@@ -116,12 +242,13 @@ def GetCID2SID(cids, base_url=BASE_URL, fout=None):
 #############################################################################
 def GetSmiles2CID(smis, base_url=BASE_URL, fout=None):
   n_out=0; tq=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for i_smi in tqdm.auto.trange(len(smis)):
     smi = smis[i_smi]
     name = re.sub(r'^[\S]+\s', '', smi) if re.search(r'^[\S]+\s', smi) else ""
     smi = re.sub(r'\s.*$', '', smi)
     try:
-      response = requests.get(base_url+f"/compound/smiles/{urllib.parse.quote(smi, '')}/cids/JSON")
+      response = rest.GetSession().get(base_url+f"/compound/smiles/{urllib.parse.quote(smi, '')}/cids/JSON")
     except Exception as e:
       logging.error(f"{smi} REST request failed: {e}")
       continue
@@ -138,77 +265,78 @@ def GetSmiles2CID(smis, base_url=BASE_URL, fout=None):
       continue
     df_this = pd.DataFrame({"CID":cids, "SMILES":smi, "Name":name})
     if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0), index=False)
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=len(cids)
   logging.info(f"SMIs: {len(smis)}; CIDs out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
-def GetCID2AssaySummary(ids, base_url=BASE_URL, fout=None):
+def GetCID2AssaySummary(ids, base_url=BASE_URL, fout=None, concurrency=1, bulk=False):
   """Example CIDs: 2519 (caffeine), 3034034 (quinine)"""
   n_out=0; df=None;
-  for i_cid in tqdm.auto.trange(len(ids), desc="CIDs"):
-    id_this = ids[i_cid]
-    rval = requests.get(base_url+f"/compound/cid/{id_this}/assaysummary/CSV").text
-    if not rval: continue
-    df_this = pd.read_csv(io.StringIO(rval), sep=',')
+  dfb = util_pandas.FrameBuilder()
+  tq = tqdm.auto.tqdm(total=len(ids), desc="CIDs")
+  for ids_this,response in RequestChunks(base_url, "cid", "assaysummary/CSV", ids, concurrency=concurrency, bulk=bulk):
+    tq.update(n=len(ids_this))
+    if response.status_code!=200 or not response.text: continue
+    df_this = pd.read_csv(io.StringIO(response.text), sep=',')
     if fout is not None: df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out += df_this.shape[0]
+  tq.close()
   logging.info(f"CIDs: {len(ids)}; assay summaries out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
-def GetSID2AssaySummary(ids, base_url=BASE_URL, fout=None):
+def GetSID2AssaySummary(ids, base_url=BASE_URL, fout=None, concurrency=1, bulk=False):
   n_out=0; df=None;
-  for i_sid in tqdm.auto.trange(len(ids), desc="SIDs"):
-    id_this = ids[i_sid]
-    rval = requests.get(base_url+f"/substance/sid/{id_this}/assaysummary/CSV").text
-    if not rval: continue
-    df_this = pd.read_csv(io.StringIO(rval), sep=',')
+  dfb = util_pandas.FrameBuilder()
+  tq = tqdm.auto.tqdm(total=len(ids), desc="SIDs")
+  for ids_this,response in RequestChunks(base_url, "sid", "assaysummary/CSV", ids, concurrency=concurrency, bulk=bulk):
+    tq.update(n=len(ids_this))
+    if response.status_code!=200 or not response.text: continue
+    df_this = pd.read_csv(io.StringIO(response.text), sep=',')
     if fout is not None: df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out += df_this.shape[0]
+  tq.close()
   logging.info(f"SIDs: {len(ids)}; assay summaries out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
-def GetCID2Inchi(ids, base_url=BASE_URL, fout=None):
-  nskip_this=0; n_out=0; tq=None; df=None;
+def GetCID2Inchi(ids, base_url=BASE_URL, fout=None, concurrency=1, bulk=False):
+  n_out=0; tq=None; df=None;
   PROPTAGS = ["InChIKey", "InChI"]
   HEADERS = {'Accept':'text/CSV', 'Content-type':'application/x-www-form-urlencoded'}
-  url = f"{base_url}/compound/cid/property/{','.join(PROPTAGS)}/CSV"
-  while True:
-    if tq is None: tq = tqdm.tqdm(total=len(ids), unit="cids")
-    if nskip_this>=len(ids): break
-    ids_this = ids[nskip_this:nskip_this+NCHUNK]
-    ids_this_dict = {'cid':(','.join(map(lambda x:str(x), ids_this)))}
-    response = requests.post(url, headers=HEADERS, data=ids_this_dict)
+  dfb = util_pandas.FrameBuilder()
+  tq = tqdm.tqdm(total=len(ids), unit="cids")
+  for ids_this,response in RequestChunks(base_url, "cid", f"property/{','.join(PROPTAGS)}/CSV", ids, HEADERS, concurrency, bulk):
+    tq.update(n=len(ids_this))
+    if response.status_code!=200: continue
     df_this = pd.read_csv(io.StringIO(response.text), sep=',')
-    if fout is None: df = pd.concat([df, df_this], axis=0)
-    else: df_this.to_csv(fout, sep='\t', index=False, header=bool(nskip_this==0))
-    nskip_this+=NCHUNK
+    if fout is None: dfb.append(df_this)
+    else: df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
-    tq.update(n=len(ids_this))
   tq.close()
   logging.info(f"Input IDs: {len(ids)}; Output InChIs: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
-def GetCID2SDF(ids, base_url=BASE_URL, fout=None):
-  """Request in chunks.  Works for 50, and not for 200 (seems to be a limit)."""
-  nskip_this=0; n_out=0; tq=None; txt_out="";
-  while True:
-    if tq is None: tq = tqdm.tqdm(total=len(ids), unit="cids")
-    if nskip_this>=len(ids): break
-    ids_this = ids[nskip_this:nskip_this+NCHUNK]
-    idstr = (','.join(map(lambda x:str(x), ids_this)))
-    response = requests.post(base_url+'/compound/cid/SDF', data={'cid':idstr})
+def GetCID2SDF(ids, base_url=BASE_URL, fout=None, concurrency=1, bulk=False):
+  """Request in chunks.  Works for 50, and not for 200 (seems to be a limit),
+hence chunk size backoff via PostChunks()."""
+  n_out=0; tq=None; txt_out="";
+  tq = tqdm.tqdm(total=len(ids), unit="cids")
+  for ids_this,response in RequestChunks(base_url, "cid", "SDF", ids, concurrency=concurrency, bulk=bulk):
+    tq.update(n=len(ids_this))
+    if response.status_code!=200: continue
     if fout is not None: fout.write(response.text)
     else: txt_out += response.text
     n_out += len(re.findall(r'^\$\$\$\$$', response.text, re.M))
-    nskip_this+=NCHUNK
-    tq.update(n=len(ids_this))
   tq.close()
   logging.info(f"SDFs out: {n_out}")
   return txt_out
@@ -228,7 +356,7 @@ def GetSID2SDF(ids, skip, nmax, base_url=BASE_URL, fout=None):
     ids_this = ids[nskip_this:nskip_this+NCHUNK]
     idstr = (','.join(map(lambda x:str(x), ids_this)))
     #rval = rest.Utils.PostURL(base_url+'/substance/sid/SDF', data={'sid':idstr})
-    response = requests.post(base_url+'/substance/sid/SDF', data={'sid':idstr})
+    response = rest.GetSession().post(base_url+'/substance/sid/SDF', data={'sid':idstr})
     if fout is not None: fout.write(response.text)
     else: txt_out += response.text
     n_out += len(re.findall(r'^\$\$\$\$$', response.text, re.M))
@@ -242,70 +370,68 @@ def GetSID2SDF(ids, skip, nmax, base_url=BASE_URL, fout=None):
   return txt_out
 
 #############################################################################
-def GetCID2Smiles(ids, base_url=BASE_URL, fout=None):
+def GetCID2Smiles(ids, base_url=BASE_URL, fout=None, concurrency=1, bulk=False):
   """Returns Canonical and Isomeric SMILES."""
   PROPTAGS = ['CanonicalSMILES', 'IsomericSMILES']
-  url = (base_url+"/compound/cid/property/{}/CSV".format(','.join(PROPTAGS)))
-  nskip_this=0; df=None; tq=None;
+  df=None; tq=None;
   n_in=0; n_out=0; n_err=0; results=[];
-  while True:
-    if tq is None: tq = tqdm.tqdm(total=len(ids), unit="mols")
-    if nskip_this>=len(ids): break
-    ids_this = ids[nskip_this:nskip_this+NCHUNK]
+  dfb = util_pandas.FrameBuilder()
+  tq = tqdm.tqdm(total=len(ids), unit="mols")
+  for ids_this,response in RequestChunks(base_url, "cid", f"property/{','.join(PROPTAGS)}/CSV", ids, concurrency=concurrency, bulk=bulk):
+    tq.update(n=len(ids_this))
     n_in+=len(ids_this)
-    idstr = (','.join(map(lambda x:str(x), ids_this)))
-    response = requests.post(url, data={'cid':idstr})
+    if response.status_code!=200:
+      n_err+=1
+      continue
     df_this = pd.read_csv(io.StringIO(response.text), sep=',')
     if fout is not None:
       df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
     else:
-      df = pd.concat([df, df_this])
-    nskip_this+=NCHUNK
-    n_out+=len(ids_this)
-    tq.update(n=len(ids_this))
+      dfb.append(df_this)
+    n_out+=df_this.shape[0]
   tq.close()
   logging.info(f"Input IDs: {len(ids)}; Output records: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
-def GetCID2Properties(ids, base_url=BASE_URL, fout=None):
+def GetCID2Properties(ids, base_url=BASE_URL, fout=None, concurrency=1, bulk=False):
   PROPTAGS = ["CanonicalSMILES", "IsomericSMILES", "InChIKey", "InChI", "MolecularFormula", "HeavyAtomCount", "MolecularWeight", "XLogP", "TPSA"]
-  url = (base_url+"/compound/cid/property/{}/CSV".format(','.join(PROPTAGS)))
-  nskip_this=0; df=None; tq=None;
+  df=None; tq=None;
   n_in=0; n_out=0; n_err=0; results=[];
-  while True:
-    if tq is None: tq = tqdm.tqdm(total=len(ids), unit="mols")
-    if nskip_this>=len(ids): break
-    ids_this = ids[nskip_this:nskip_this+NCHUNK]
+  dfb = util_pandas.FrameBuilder()
+  tq = tqdm.tqdm(total=len(ids), unit="mols")
+  for ids_this,response in RequestChunks(base_url, "cid", f"property/{','.join(PROPTAGS)}/CSV", ids, {'Accept':'text/CSV', 'Content-type':'application/x-www-form-urlencoded'}, concurrency, bulk):
+    tq.update(n=len(ids_this))
     n_in+=len(ids_this)
-    idstr = (','.join(map(lambda x:str(x), ids_this)))
-    response = requests.post(url, headers={'Accept':'text/CSV', 'Content-type':'application/x-www-form-urlencoded'}, data={'cid':idstr})
+    if response.status_code!=200:
+      n_err+=1
+      continue
     try:
       df_this = pd.read_csv(io.StringIO(response.text), sep=',')
     except Exception as e:
       logging.error(f"{e}")
       logging.debug(response.text)
+      n_err+=1
       continue
     if fout is not None:
       df_this.to_csv(fout, sep='\t', index=False, header=bool(n_out==0))
     else:
-      df = pd.concat([df, df_this])
-    nskip_this+=NCHUNK
-    n_out+=len(ids_this)
-    tq.update(n=len(ids_this))
+      dfb.append(df_this)
+    n_out+=df_this.shape[0]
   tq.close()
   logging.info(f"Input IDs: {len(ids)}; Output records: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
-def GetCID2Descriptions(ids, base_url=BASE_URL, fout=None):
+def GetCID2Descriptions(ids, base_url=BASE_URL, fout=None, concurrency=1, bulk=False):
   n_out=0; tags=None; df=None;
-  for i in tqdm.tqdm(range(len(ids))):
-    id_this = ids[i]
-    response = requests.get(base_url+f"/compound/cid/{id_this}/description/JSON")
-    if response.status_code!=200:
-      logging.error(f"status_code: {response.status_code}")
-      continue
+  dfb = util_pandas.FrameBuilder()
+  tq = tqdm.tqdm(total=len(ids), unit="cids")
+  for ids_this,response in RequestChunks(base_url, "cid", "description/JSON", ids, concurrency=concurrency, bulk=bulk):
+    tq.update(n=len(ids_this))
+    if response.status_code!=200: continue
     rval = response.json()
     infos = rval['InformationList']['Information'] if 'InformationList' in rval and 'Information' in rval['InformationList'] else []
     for info in infos:
@@ -315,9 +441,11 @@ def GetCID2Descriptions(ids, base_url=BASE_URL, fout=None):
       df_this = pd.DataFrame({tag:([info[tag]] if tag in info else ['']) for tag in tags})
 
       if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0), index=False)
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=df_this.shape[0]
+  tq.close()
   logging.info(f"Input IDs: {len(ids)}; Output records: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -329,12 +457,13 @@ def Inchi2CID(inchis, base_url=BASE_URL, fout=None):
   '''
   n_out=0; tq=None; df=None;
   url = base_url+"/compound/inchi/cids/TXT"
+  dfb = util_pandas.FrameBuilder()
   for inchi in inchis:
     if tq is None: tq = tqdm.tqdm(total=len(ids), unit="inchis")
     logging.info(f"inchi='{inchi}'")
     body_dict={'inchi':urllib.parse.quote(inchi)}
     #rval = rest.Utils.PostURL(url=url, headers={'Content-Type':'application/x-www-form-urlencoded','Accept':'text/plain'}, data=body_dict)
-    response = requests.post(url=url, headers={'Content-Type':'application/x-www-form-urlencoded','Accept':'text/plain'}, data=body_dict)
+    response = rest.GetSession().post(url=url, headers={'Content-Type':'application/x-www-form-urlencoded','Accept':'text/plain'}, data=body_dict)
     lines = response.text.splitlines()
     cids_this=set() 
     for line in lines:
@@ -343,40 +472,44 @@ def Inchi2CID(inchis, base_url=BASE_URL, fout=None):
         cids_this.add(cid)
     df_this = pd.DataFrame({"InChI":inchi, "CID":list(cids_this)})
     if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out += len(cids_this)
     tq.update(n=1)
   tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def GetAssayName(aids, base_url=BASE_URL, fout=None):
   n_out=0; tq=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for aid in aids:
     if tq is None: tq = tqdm.tqdm(total=len(ids), unit="assays")
-    xmlstr = requests.get(base_url+f"/assay/aid/{aid}/description/XML").text
+    xmlstr = rest.GetSession().get(base_url+f"/assay/aid/{aid}/description/XML").text
     name, source = AssayXML2NameAndSource(xmlstr)
     df_this = pd.DataFrame({"AID":[aid], "Name":[name], "Source":[source]})
     if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=1
     tq.update(n=1)
   tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def GetAssayDescriptions(ids, skip, nmax, base_url=BASE_URL, fout=None):
   """Example AIDs: 527,159014"""
   n_in=0; n_out=0; tq=None; df=None;
+  dfb = util_pandas.FrameBuilder()
   for aid in ids:
     n_in+=1
     if skip and n_in<skip: continue
     if nmax and n_out==nmax: break
     if tq is None: tq = tqdm.tqdm(total=len(ids), unit="assays")
     url = (base_url+f"/assay/aid/{aid}/description/JSON")
-    rval = requests.get(url).json()
+    rval = rest.GetSession().get(url).json()
     logging.debug(json.dumps(rval, indent=2))
     assays = rval['PC_AssayContainer'] if 'PC_AssayContainer' in rval else []
     for assay in assays:
@@ -405,11 +538,12 @@ def GetAssayDescriptions(ids, skip, nmax, base_url=BASE_URL, fout=None):
 	"comment":[comment]
 	})
       if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0), index=False)
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=1
     tq.update(n=1)
   tq.close()
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -418,6 +552,7 @@ def GetAssaySIDs(aids, skip, nmax, base_url=BASE_URL, fout=None):
   if nmax: logging.info(f"NMAX: {nmax}")
   n_aid_in=0; n_aid_done=0; n_out=0; nchunk_sid=100; df=None; tags=None;
   tqa=None;
+  dfb = util_pandas.FrameBuilder()
   for aid in aids:
     if tqa is None: tqa = tqdm.tqdm(total=len(aids), unit="assays")
     n_aid_in+=1
@@ -426,7 +561,7 @@ def GetAssaySIDs(aids, skip, nmax, base_url=BASE_URL, fout=None):
     n_aid_done+=1
     logging.debug(f"Request: ({n_aid_done}) [AID={aid}]")
     url = base_url+f"/assay/aid/{aid}/concise/JSON"
-    rval = requests.get(url).json()
+    rval = rest.GetSession().get(url).json()
     logging.debug(json.dumps(rval, indent=2))
     tags_this = rval["Table"]["Columns"]["Column"]
     logging.debug(f"tags_this = {str(tags_this)}")
@@ -444,11 +579,12 @@ def GetAssaySIDs(aids, skip, nmax, base_url=BASE_URL, fout=None):
       sid = cells[j_sid]
       cid = cells[j_cid]
       df_this = pd.DataFrame({"AID":[aid], "SID":[sid], "CID":[cid]})
-      df = pd.concat([df, df_this])
+      dfb.append(df_this)
       tqb.update()
     tqb.close()
     tqa.update()
   tqa.close()
+  df = dfb.frame(df)
   logging.info(f"AIDs: {df.AID.nunique()}; SIDs: {df.SID.nunique()}; CIDs: {df.CID.nunique()}")
   df.drop_duplicates(inplace=True)
   df.sort_values(by=["AID", "SID"], inplace=True)
@@ -466,6 +602,7 @@ for each AID, then iterate through SIDs and use local hash.
   n_aid_in=0; n_aid_done=0; n_out=0; df=None; tqa=None;
   j_tag={};
   tags = None
+  dfb = util_pandas.FrameBuilder()
   for aid in aids:
     if tqa is None: tqa = tqdm.tqdm(total=len(aids), unit="assays")
     n_aid_in+=1
@@ -475,7 +612,7 @@ for each AID, then iterate through SIDs and use local hash.
     n_aid_done+=1
     logging.debug(f"Request: ({n_aid_done}) [AID={aid}] SID count: {len(sids)}")
     url = base_url+f"/assay/aid/{aid}/concise/JSON"
-    rval = requests.get(url).json()
+    rval = rest.GetSession().get(url).json()
     if not tags:
       tags = rval["Table"]["Columns"]["Column"]
       logging.debug(f"tags= {str(tags)}")
@@ -488,11 +625,12 @@ for each AID, then iterate through SIDs and use local hash.
       cells = row["Cell"]
       logging.debug(json.dumps(cells, indent=2))
       df_this = pd.DataFrame({tag:[cells[j_tag[tag]]] for tag in tags})
-      df = pd.concat([df, df_this])
+      dfb.append(df_this)
       tqb.update()
     tqb.close()
     tqa.update()
   tqa.close()
+  df = dfb.frame(df)
   logging.info(f"AIDs: {df.AID.nunique()}; SIDs: {df.SID.nunique()}; CIDs: {df.CID.nunique()}; Activity results: {df.shape[0]}")
   for key,val in df['Bioactivity Outcome'].value_counts().iteritems():
     logging.info(f'Bioactivity_Outcome = {key:>12}: {val:6d}')
@@ -516,17 +654,9 @@ ns).text
 def GetSID2Synonyms(ids, base_url=BASE_URL, fout=None):
   n_out=0; df=None;
 
-  retry_strategy = Retry(
-	total=30,
-	backoff_factor=2,
-	status_forcelist=[413, 429, 500, 502, 503, 504],
-	method_whitelist=["HEAD", "GET", "PUT", "DELETE", "OPTIONS", "TRACE"]
-	)
-  adapter = HTTPAdapter(max_retries=retry_strategy)
-  session = requests.Session()
-  session.mount("https://", adapter)
-  session.mount("http://", adapter)
+  session = rest.GetSession()
 
+  dfb = util_pandas.FrameBuilder()
   for i_sid in range(len(ids)):
     id_this = ids[i_sid]
     url_this = f"{base_url}/substance/sid/{id_this}/synonyms/JSON"
@@ -540,14 +670,16 @@ def GetSID2Synonyms(ids, base_url=BASE_URL, fout=None):
       synonyms_this = info['Synonym'] if 'Synonym' in info else []
       df_this = pd.DataFrame({"SID":id_this, "Synonym":synonyms_this})
       if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_out==0), index=False)
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_out+=len(synonyms_this)
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def GetCID2Synonyms(ids, skip, nmax, nmax_per_cid, base_url=BASE_URL, fout=None):
   sids_all = set([])
   i_cid=0; n_out=0; df=None;
+  dfb = util_pandas.FrameBuilder()
   for i_cid in tqdm.auto.trange(len(ids), desc="CIDs"):
     id_this = ids[i_cid]
     if skip and i_cid<skip: continue
@@ -568,11 +700,12 @@ def GetCID2Synonyms(ids, skip, nmax, nmax_per_cid, base_url=BASE_URL, fout=None)
     if fout is not None:
       df_this.to_csv(fout, sep="\t", header=bool(n_out==0), index=False)
       fout.flush()
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out+=len(synonyms_this_cid_nice)
     logging.debug(f"{i_cid+1}. CID={id_this}: SIDs: {len(sids_this)}; synonyms: {len(synonyms_this_cid)} ({min(len(synonyms_this_cid_nice), nmax_per_cid)})")
     if nmax and (i_cid+1)>=(skip+nmax): break
   logging.info(f"Totals: CIDs: {len(ids)}; SIDs: {len(sids_all)}; Synonyms: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -580,31 +713,37 @@ def GetCID2Nicename(ids, skip, nmax, base_url=BASE_URL, fout=None):
   return GetCID2Synonyms(ids, skip, nmax, 1, base_url, fout)
 
 #############################################################################
-def GetName2SID(names, skip, nmax, base_url=BASE_URL, fout=None):
+def GetName2SID(names, skip, nmax, base_url=BASE_URL, fout=None, concurrency=1):
+  """The name namespace takes a single identifier per request (not a
+comma-separated list), so names are not batched, but fanned out with up to
+concurrency requests in flight."""
   n_sid=0; sids_all=set(); df=None;
-  for i_name in tqdm.auto.trange(len(names), leave=False):
-    name = names[i_name]
-    if skip and (i_name+1)<=skip: continue
-    rval = requests.get(base_url+f"/substance/name/{urllib.parse.quote(name)}/sids/JSON").json()
+  names = names[skip:(skip+nmax) if nmax else None]
+  session = rest.GetSession()
+  dfb = util_pandas.FrameBuilder()
+  for name,response in tqdm.auto.tqdm(parallel.MapOrdered(lambda name: session.post(base_url+"/substance/name/sids/JSON", data={'name':name}), names, concurrency), total=len(names), leave=False):
+    if response is None or response.status_code!=200: continue
+    rval = response.json()
     sids_this = rval['IdentifierList']['SID'] if 'IdentifierList' in rval and 'SID' in rval['IdentifierList'] else []
     for sid in sids_this:
       df_this = pd.DataFrame({"Name":[name], "SID":[sid]})
       if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_sid==0), index=False)
-      else: df = pd.concat([df, df_this])
+      else: dfb.append(df_this)
       n_sid+=1
     sids_all |= set(sids_this)
-    if nmax and (i_name+1)>=(skip+nmax): break
   logging.info(f"n_name: {len(names)}; n_sid: {n_sid}; n_sid_unique: {len(sids_all)}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
 def GetName2CID(names, skip, nmax, base_url=BASE_URL, fout=None):
   n_cid=0; cids_all=set(); n_sid=0; sids_all=set(); df=None;
+  dfb = util_pandas.FrameBuilder()
   for i_name in tqdm.auto.trange(len(names), leave=False):
     name = names[i_name]
     if skip and (i_name+1)<=skip: continue
     #sids_this = GetName2SID([name], base_url)
-    rval = requests.get(base_url+f"/substance/name/{urllib.parse.quote(name)}/sids/JSON").json()
+    rval = rest.GetSession().get(base_url+f"/substance/name/{urllib.parse.quote(name)}/sids/JSON").json()
     sids_this = rval['IdentifierList']['SID'] if 'IdentifierList' in rval and 'SID' in rval['IdentifierList'] else []
     sids_all |= set(sids_this)
     for sid in sids_this:
@@ -613,11 +752,12 @@ def GetName2CID(names, skip, nmax, base_url=BASE_URL, fout=None):
       for cid in cids_this:
         df_this = pd.DataFrame({"Name":[name], "SID":[sid], "CID":[cid]})
         if fout is not None: df_this.to_csv(fout, sep="\t", header=bool(n_cid==0), index=False)
-        else: df = pd.concat([df, df_this])
+        else: dfb.append(df_this)
         n_cid+=1
       cids_all |= set(cids_this)
     if nmax and (i_name+1)>=(skip+nmax): break
   logging.info(f"n_name: {len(names)}; n_sid: {n_sid}; n_sid_unique: {len(sids_all)}; n_cid: {n_cid}; n_cid_unique: {len(cids_all)}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -629,7 +769,7 @@ def GetName2Synonyms(names, skip, nmax, base_url=BASE_URL, fout=None):
     sids_this = GetName2SID([name], 0, None, base_url)
     sids_all |= set(sids_this)
     for sid in sids_this:
-      rval = requests.get(base_url+f"/substance/sid/{sid}/synonyms/JSON").json()
+      rval = rest.GetSession().get(base_url+f"/substance/sid/{sid}/synonyms/JSON").json()
       infos = rval['InformationList']['Information'] if 'InformationList' in rval and 'Information' in rval['InformationList'] else []
       synonyms_this_sid = set()
       for info in infos:
@@ -696,7 +836,7 @@ From PubChem PUG REST API, determine activity stats for compounds.
   n_sam=0; n_sam_active=0; mol_active=False; mol_found=False;
 
   try:
-    fcsv = requests.get(base_url+f"/compound/cid/{cid}/assaysummary/CSV").text
+    fcsv = rest.GetSession().get(base_url+f"/compound/cid/{cid}/assaysummary/CSV").text
   except Exception as e:
     logging.error(f"[{cid}] REST request failed; {e}")
     fout_mol.write(f"{smiles}\t{cid}\n")
@@ -767,7 +907,7 @@ From PubChem PUG REST API, determine activity stats for compounds.
 def GetCpdAssayData(cid_query, aidset, base_url=BASE_URL, fout=None):
   """This function needs fixing."""
   try:
-    fcsv = requests.get(base_url+f"/compound/cid/{cid_query}/assaysummary/CSV").text
+    fcsv = rest.GetSession().get(base_url+f"/compound/cid/{cid_query}/assaysummary/CSV").text
   except Exception as e:
     logging.error(f"[{cid_query}] REST request failed; {e}")
     return False
@@ -833,7 +973,7 @@ def GetCompoundView(ids, base_url=BASE_URL, fout=None):
   n_out=0; results=[];
   for i_cid in tqdm.auto.trange(len(ids), desc="CIDs"):
     id_this = ids[i_cid]
-    response = requests.get(base_url+f"/data/compound/{id_this}/JSON")
+    response = rest.GetSession().get(base_url+f"/data/compound/{id_this}/JSON")
     if response.status_code != 200:
       logging.info(f"Not found (status_code={response.status_code}): {id_this}")
       continue
@@ -851,7 +991,7 @@ def GetSubstanceView(ids, base_url=BASE_URL, fout=None):
   n_out=0; results=[];
   for i_sid in tqdm.auto.trange(len(ids), desc="CIDs"):
     id_this = ids[i_sid]
-    response = requests.get(base_url+f"/data/substance/{id_this}/JSON")
+    response = rest.GetSession().get(base_url+f"/data/substance/{id_this}/JSON")
     if response.status_code != 200:
       logging.info(f"Not found (status_code={response.status_code}): {id_this}")
       continue
@@ -869,7 +1009,7 @@ def GetAssayView(ids, base_url=BASE_URL, fout=None):
   n_out=0; results=[];
   for i_aid in tqdm.auto.trange(len(ids), desc="CIDs"):
     id_this = ids[i_aid]
-    response = requests.get(base_url+f"/data/bioassay/{id_this}/JSON")
+    response = rest.GetSession().get(base_url+f"/data/bioassay/{id_this}/JSON")
     if response.status_code != 200:
       logging.info(f"Not found (status_code={response.status_code}): {id_this}")
       continue
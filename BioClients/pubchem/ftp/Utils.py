@@ -5,10 +5,23 @@
 ### PUBCHEM_ACTTIVITY_OUTCOME values:
 ###  Inactive:1, Active:2, Inconclusive:3, Unspecified:4, Probe:5
 #############################################################################
-import sys,os,re,time,csv,logging
-import urllib,urllib.request,tempfile
+import sys,os,io,re,time,csv,gzip,zipfile,sqlite3,itertools,logging
+import urllib,urllib.request,tempfile,shutil
+import numpy as np
+import pandas as pd
+import scipy.sparse
+
+from ...util import parallel
 
 OUTCOME_CODES = {'inactive':1,'active':2,'inconclusive':3,'unspecified':4,'probe':5}
+#
+INDEX_BATCH_SIZE=100000
+OUTCOME_CHUNKSIZE=100000
+#
+GINI_SCORES = {1:0.0, 2:1.0, 3:0.5, 5:0.5} #inactive, active, inconclusive, discrepant
+CHECKPOINT_EVERY=100
+ASSAYSIM_BLOCK_SIZE=256
+ASSAY_SUFFIX=".csv.gz"
 
 #############################################################################
 def UrlOpen(url, ntries=20, poll_wait=10):
@@ -81,116 +94,689 @@ or PUBCHEM_OPENEYE_ISO_SMILES, and PUBCHEM_COMPOUND_CID or PUBCHEM_COMPOUND_SID
 
 
 #############################################################################
-### ExtractOutcomes() - return hash of all SIDs/CIDs to list of
-### activity values [1-4] (may be multiple and discrepant).
-### Also return hash of outcomes from this assay.
+### Assay CSV parsing, chunked (pandas), to NumPy arrays.  Outcome values,
+### numeric or text, are coded 1-5 (OUTCOME_CODES); others unspecified (4).
+### Multiple outcomes for an ID in one assay are resolved by group-by on
+### the ID, OR-ing one bit per outcome, and lookup of the bitmask
+### (OUTCOME_MASK_LUT), with the same rule as ResolveOutcome().
+#############################################################################
+def ReadAssayChunks(fin, chunksize=OUTCOME_CHUNKSIZE):
+  """Generate DataFrames (sid, cid, outcome) from assay CSV path or stream;
+typed int64, int64 (-1 if none), int8.  Descriptor rows (RESULT_TYPE etc.)
+and rows without SID are dropped."""
+  tags_ok = set(['PUBCHEM_SID', 'PUBCHEM_CID', 'PUBCHEM_ACTIVITY_OUTCOME'])
+  try:
+    reader = pd.read_csv(fin, usecols=(lambda tag: tag.strip() in tags_ok), dtype={'PUBCHEM_ACTIVITY_OUTCOME':'category'}, chunksize=chunksize, skipinitialspace=True, low_memory=False)
+    for df in reader:
+      df.columns = [tag.strip() for tag in df.columns]
+      if 'PUBCHEM_SID' not in df.columns or 'PUBCHEM_ACTIVITY_OUTCOME' not in df.columns:
+        logging.info(f"cannot find sid and activity tags: {list(df.columns)}")
+        return
+      sids = pd.to_numeric(df['PUBCHEM_SID'], errors='coerce')
+      ok = sids.notna().to_numpy()
+      cids = pd.to_numeric(df['PUBCHEM_CID'], errors='coerce').fillna(-1) if 'PUBCHEM_CID' in df.columns else pd.Series(-1, index=df.index)
+      yield pd.DataFrame({'sid':sids[ok].astype(np.int64).to_numpy(), 'cid':cids[ok].astype(np.int64).to_numpy(), 'outcome':OutcomeCodes(df['PUBCHEM_ACTIVITY_OUTCOME'])[ok]})
+  except pd.errors.EmptyDataError:
+    return
+
+#############################################################################
+def OutcomeCodes(vals):
+  """Categorical outcome values (numeric or text) to int8 codes 1-5."""
+  vals = vals.astype('category')
+  lut = []
+  for val in vals.cat.categories:
+    val = str(val).strip().lower()
+    code = int(float(val)) if re.match(r'\d+(\.0*)?$', val) else OUTCOME_CODES.get(val, OUTCOME_CODES['unspecified'])
+    lut.append(code if code in range(1,6) else OUTCOME_CODES['unspecified'])
+  lut.append(OUTCOME_CODES['unspecified']) #missing (code -1)
+  return np.array(lut, dtype=np.int8)[vals.cat.codes.to_numpy()]
+
+#############################################################################
+def ReduceOutcomeMasks(ids, masks):
+  """Group-by ID, OR-ing outcome bitmasks; returns sorted unique IDs and
+masks."""
+  if len(ids)==0: return ids, masks
+  order = np.argsort(ids, kind='stable')
+  ids = ids[order]; masks = masks[order]
+  starts = np.flatnonzero(np.concatenate(([True], ids[1:]!=ids[:-1])))
+  return ids[starts], np.bitwise_or.reduceat(masks, starts)
+
+#############################################################################
+def ResolveOutcomes(ids, outcomes):
+  """Vectorized ResolveOutcome(): sorted unique IDs, one outcome each."""
+  ids,masks = ReduceOutcomeMasks(np.asarray(ids, dtype=np.int64), np.left_shift(1, np.asarray(outcomes, dtype=np.uint8)).astype(np.uint8))
+  return ids, OUTCOME_MASK_LUT[masks]
+
+#############################################################################
+def ReadOutcomeArrays(fin, idset=None, use_cids=False, chunksize=OUTCOME_CHUNKSIZE):
+  """(ids, outcomes) arrays from assay CSV path or stream, sorted by ID,
+outcomes resolved.  If idset, a subset of interest.  If use_cids, IDs are
+CIDs."""
+  idcol = 'cid' if use_cids else 'sid'
+  idarr = np.fromiter(idset, dtype=np.int64, count=len(idset)) if idset else None
+  ids_parts=[]; masks_parts=[];
+  for df in ReadAssayChunks(fin, chunksize):
+    ids = df[idcol].to_numpy()
+    ok = (ids>=0) if idarr is None else np.isin(ids, idarr)
+    ids,masks = ReduceOutcomeMasks(ids[ok], np.left_shift(1, df['outcome'].to_numpy()[ok].astype(np.uint8)).astype(np.uint8))
+    ids_parts.append(ids); masks_parts.append(masks)
+  if not ids_parts: return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int8)
+  ids,masks = ReduceOutcomeMasks(np.concatenate(ids_parts), np.concatenate(masks_parts))
+  return ids, OUTCOME_MASK_LUT[masks]
+
+#############################################################################
+### ExtractOutcomes() - return hash of all SIDs/CIDs to resolved outcome
+### [1-5] (5 = discrepant), from assay CSV text or stream.
 ### If sidset exists this is a subset of interest.
 ### If use_cids is true, all ids are CIDs.
 #############################################################################
 def ExtractOutcomes(ftxt,sidset,use_cids=False):
-  sids={} 
-  sids_inactive=[]; sids_active=[]; sids_inconclusive=[];
-  sids_unspecified=[]; sids_discrepant=[];
-  lines=ftxt.splitlines()
-  if len(lines)<2:
-    return sids
-  logging.debug('tag line: %s'%(lines[0]))
-  if use_cids:
-    id_tag='PUBCHEM_CID'
-  else:
-    id_tag='PUBCHEM_SID'
-  tags=lines[0].split(',')
-  j_sid,j_cid,j_act=None,None,None
-  for j,tag in enumerate(tags):
-    if re.match('"?%s"?$'%id_tag,tag): j_sid=j
-    if re.match('"?PUBCHEM_ACTIVITY_OUTCOME"?$',tag): j_act=j
-  if j_sid==None or j_act==None:
-    logging.info('cannot find sid and activity tags: %s'%(lines[0]))
-    return sids
-  for line in lines[1:]:
-    try:
-      vals=line.split(',')
-      ## sid may be absent; report?
-      sid=re.sub('"','',vals[j_sid])
-      if not sid: continue
-      sid=int(sid)
-      act=int(vals[j_act])	## should be [1-4]
-    except:
-      logging.warning('Problem with line: %s'%(line))
-      #break	#DEBUG
-      continue
-    if sidset and sid not in sidset : continue
+  fin = io.StringIO(ftxt) if isinstance(ftxt, str) else ftxt
+  ids,outcomes = ReadOutcomeArrays(fin, sidset, use_cids)
+  return {id_this:{'outcome':outcome} for id_this,outcome in zip(ids.tolist(), outcomes.tolist())}
 
-    if sid in sids:
-      sids[sid]['acts'].append(act)
-    else:
-      sids[sid]={'acts':[act],'outcome':0}
-
-  for sid in sids.keys():
-    acts=sids[sid]['acts']
-    acts.sort()
-    while 4 in acts and len(acts)>1: acts.remove(4)
-    if len(acts)==1 or acts[0]==acts[-1]:
-      sids[sid]['outcome']=acts[0]
-    else:
-      sids[sid]['outcome']=5
-      if not ( (1 in acts and 2 in acts)
-        or (1 in acts and 3 in acts)
-        or (2 in acts and 3 in acts)): logging.error('Doh!  acts=%s'%(str(acts)))
+#############################################################################
+### ResolveOutcome() - one outcome from multiple (samples) for an ID in an
+### assay.  Unspecified (4) ignored if others; differing 1, 2 or 3 is
+### discrepant (5).
+#############################################################################
+def ResolveOutcome(acts):
+  acts=sorted(acts)
+  while 4 in acts and len(acts)>1: acts.remove(4)
+  if len(acts)==1 or acts[0]==acts[-1]:
+    return acts[0]
+  if not ( (1 in acts and 2 in acts)
+    or (1 in acts and 3 in acts)
+    or (2 in acts and 3 in acts)): logging.error('Doh!  acts=%s'%(str(acts)))
+  return 5
+
+def _ResolveOutcomeMask(mask):
+  acts = [act for act in range(1,6) if mask&(1<<act)]
+  if len(acts)>1 and 4 in acts: acts.remove(4)
+  return acts[0] if len(acts)==1 else (5 if acts else 0)
+
+OUTCOME_MASK_LUT = np.array([_ResolveOutcomeMask(mask) for mask in range(256)], dtype=np.int8)
 
-  return sids
-    
 #############################################################################
-### Input file is assay CSV.  For specified SIDs, output CSV with outcomes.
-### 4 header lines expected.  Maybe 10 fields.
+### Input file is assay CSV (path or stream).  For specified SIDs, output
+### CSV with outcomes, one row per datapoint.
 #############################################################################
 def ExtractResults(fin,aid,sids,fout):
   n_in=0; n_out=0; n_active=0;
-  tags = None;
-  j_sid = None; j_actout = None; j_actsco = None;
+  sidarr = np.fromiter(sids, dtype=np.int64, count=len(sids))
   fout.write('AID,SID,ACTIVITY_OUTCOME\n')
-  while True:
-    line = fin.readline()
-    if not line: break
-    n_in+=1
-    if n_in==1 or not tags:
-      tags = re.split(',',line)
-      logging.debug('DEBUG: %s'%line)
-      for j,tag in enumerate(tags):
-        logging.debug('\t"%s"'%tag)
-        if tag == 'PUBCHEM_SID': j_sid = j
-        elif tag == 'PUBCHEM_ACTIVITY_OUTCOME': j_actout = j
-        elif tag == 'PUBCHEM_ACTIVITY_SCORE': j_actsco = j
-      continue
-    elif n_in<5: continue
-    if not j_sid:
-      logging.error('PUBCHEM_SID column not found.')
-      break
-    if not j_actout:
-      logging.error('PUBCHEM_ACTIVITY_OUTCOME column not found.')
-      break
-    vals = re.split(',',line.rstrip())
-    sid = vals[j_sid]
-    if not sid: continue
-    sid = int(sid)
-    if sid not in sids: continue
-    actout = vals[j_actout]
-    if actout=='Active': n_active+=1
-    if actout.lower() in OUTCOME_CODES:
-      actout = OUTCOME_CODES[actout.lower()]
-    fout.write('%d,%d,%s\n'%(aid,sid,actout))
-    n_out+=1
-
+  for df in ReadAssayChunks(fin):
+    n_in+=df.shape[0]
+    df = df[np.isin(df['sid'].to_numpy(), sidarr)]
+    n_active+=(df['outcome']==OUTCOME_CODES['active']).sum()
+    fout.write(''.join([f"{aid},{sid},{outcome}\n" for sid,outcome in zip(df['sid'].tolist(), df['outcome'].tolist())]))
+    n_out+=df.shape[0]
   logging.info('%s: n_in = %d ; n_out = %d ; n_active = %d'%(aid,n_in,n_out,n_active))
+  return n_out
+
+#############################################################################
+def ReadAssayOutcomes(fpath, member=None, idset=None, use_cids=False):
+  """(ids, outcomes) arrays, as ReadOutcomeArrays(), from assay csv.gz (or
+zip member)."""
+  with OpenAssayCSV(fpath, member) as fin:
+    return ReadOutcomeArrays(fin, idset, use_cids)
 
 #############################################################################
 def Str2Ints(str):
-  if not re.search('\S',str): return []
-  return map(lambda x:int(x),str.split(','))
+  if not re.search(r'\S',str): return []
+  return list(map(lambda x:int(x),str.split(',')))
 
 #############################################################################
 def Ints2Str(intlist):
-  if not intlist: return ''
+  if len(intlist)==0: return ''
   return (','.join(map(lambda x:('%d'%x),intlist)))
 
 #############################################################################
+def Gini(vals):
+  """Gini coefficient of non-negative values (0 = uniform, ->1 = selective)."""
+  vals = sorted(vals)
+  n = len(vals); total = sum(vals)
+  if n==0 or total==0: return 0.0
+  return sum([(2*(i+1)-n-1)*x for i,x in enumerate(vals)])/(n*total)
+
+#############################################################################
+def ReadIds(ifile=None, ids=None):
+  """Integer IDs from file (first field per line) or comma-separated string."""
+  vals=[]
+  if ifile:
+    with open(ifile) as fin:
+      for line in fin:
+        line = re.sub(r'[,\s].*$', '', line.strip())
+        if line: vals.append(int(line))
+  elif ids:
+    vals = [int(val) for val in re.split(r'[\s,]+', ids.strip()) if val]
+  return vals
+
+#############################################################################
+### Local mirror of ftp://ftp.ncbi.nlm.nih.gov/pubchem/Bioassay/CSV/Data/,
+### either zip bundles (e.g. 0000001_0001000.zip) with csv.gz members, or
+### directories of csv.gz files.
+#############################################################################
+def AidFromFilename(fname, suffix=ASSAY_SUFFIX):
+  m = re.search(r'(\d+)'+re.escape(suffix)+'$', fname)
+  return int(m.group(1)) if m else None
+
+#############################################################################
+def ListAssayFiles(datadir, aidset=None, suffix=ASSAY_SUFFIX):
+  """Returns list of (aid, fpath, member, signature), sorted by AID.  Member
+is the path within zip fpath, or None.  Signature (size and CRC, or size and
+mtime) detects changed files.  With suffix ".descr.xml.gz", for the assay
+description mirror.  Zip bundles named by AID range (e.g.
+0000001_0001000.zip) not including any of aidset are skipped unopened."""
+  files=[];
+  for root,dirs,fnames in os.walk(datadir):
+    for fname in sorted(fnames):
+      fpath = os.path.join(root, fname)
+      if re.search(r'\.zip$', fname):
+        m = re.match(r'(\d+)_(\d+)\.zip$', fname)
+        if aidset and m and not any([int(m.group(1))<=aid<=int(m.group(2)) for aid in aidset]): continue
+        for aid,member,signature in ListArchive(fpath, suffix):
+          if aidset and aid not in aidset: continue
+          files.append((aid, fpath, member, signature))
+      else:
+        aid = AidFromFilename(fname, suffix)
+        if aid is None or (aidset and aid not in aidset): continue
+        st = os.stat(fpath)
+        files.append((aid, fpath, None, f"{st.st_size}:{int(st.st_mtime)}"))
+  files.sort()
+  logging.info(f"Assay files: {len(files)}")
+  return files
+
+#############################################################################
+### Archive reading: gzip files, and gzip members of zip bundles, read as
+### streams (no extraction to scratch files, no whole-file strings), through
+### buffers of ARCHIVE_BUFFER_SIZE.  Gzip decompression by the faster
+### python-isal (isal.igzip) or zlib-ng (zlib_ng.gzip_ng) if installed, else
+### the standard gzip module; see SetGzipBackend().
+#############################################################################
+ARCHIVE_BUFFER_SIZE=1<<20
+GZIP_BACKENDS = ["isal", "zlib_ng", "gzip"]
+_GZIP = {}
+
+def SetGzipBackend(name=None):
+  """Select gzip backend, by name, or first available if None."""
+  for backend in ([name] if name else GZIP_BACKENDS):
+    try:
+      if backend=="isal": from isal import igzip as module
+      elif backend=="zlib_ng": from zlib_ng import gzip_ng as module
+      elif backend=="gzip": module = gzip
+      else: raise ValueError(f"Invalid gzip backend: {backend} (allowed: {GZIP_BACKENDS})")
+    except ImportError as e:
+      if name: raise
+      continue
+    _GZIP['name'] = backend
+    _GZIP['module'] = module
+    logging.debug(f"gzip backend: {backend}")
+    return backend
+
+def GzipModule():
+  if not _GZIP: SetGzipBackend()
+  return _GZIP['module']
+
+#############################################################################
+class ArchiveStream(io.TextIOWrapper):
+  """Text stream which also closes the underlying zip member and file."""
+  def __init__(self, buffer, closers=None, **kwargs):
+    super().__init__(buffer, **kwargs)
+    self._closers = closers if closers else []
+
+  def close(self):
+    super().close()
+    for f in self._closers: f.close()
+    self._closers = []
+
+class ArchiveBinaryStream(io.BufferedReader):
+  """Binary stream which also closes the underlying zip member and file."""
+  def __init__(self, raw, closers=None, buffer_size=ARCHIVE_BUFFER_SIZE):
+    super().__init__(raw, buffer_size=buffer_size)
+    self._closers = closers if closers else []
+
+  def close(self):
+    super().close()
+    for f in self._closers: f.close()
+    self._closers = []
+
+#############################################################################
+def ListArchive(fpath, suffix=ASSAY_SUFFIX):
+  """(aid, member, signature) for members of zip fpath, by AID from name."""
+  members=[]
+  try:
+    with zipfile.ZipFile(fpath, 'r') as zf:
+      for zinfo in zf.infolist():
+        aid = AidFromFilename(zinfo.filename, suffix)
+        if aid is not None: members.append((aid, zinfo.filename, f"{zinfo.file_size}:{zinfo.CRC}"))
+  except zipfile.BadZipFile as e:
+    logging.error(f"Cannot read {fpath}: {e}")
+  return members
+
+#############################################################################
+def OpenArchive(fpath, member=None, text=True, decompress=True):
+  """Stream for gzip file fpath, or gzip member of zip file fpath; text
+(utf-8) or binary; decompressed, or as stored (decompress=False)."""
+  closers=[]
+  if member is None:
+    fin = open(fpath, 'rb')
+  else:
+    zf = zipfile.ZipFile(fpath, 'r')
+    fin = zf.open(member, 'r')
+    closers.append(zf)
+  if decompress:
+    closers.insert(0, fin)
+    fin = GzipModule().GzipFile(fileobj=fin, mode='rb')
+  stream = ArchiveBinaryStream(fin, closers)
+  if not text: return stream
+  return ArchiveStream(stream, encoding='utf-8', errors='replace')
+
+#############################################################################
+def IterArchives(datadir, aidset=None, suffix=ASSAY_SUFFIX, text=True):
+  """Generate (aid, stream) over mirror datadir, in AID order; each stream
+closed when the next is opened."""
+  for aid,fpath,member,signature in ListAssayFiles(datadir, aidset, suffix):
+    try:
+      fin = OpenArchive(fpath, member, text)
+    except Exception as e:
+      logging.error(f"AID {aid}: cannot read {fpath}{':'+member if member else ''}: {e}")
+      continue
+    with fin:
+      yield aid, fin
+
+#############################################################################
+def OpenAssayCSV(fpath, member=None):
+  """Text stream for csv.gz file, or csv.gz member of zip file."""
+  return OpenArchive(fpath, member, text=True)
+
+#############################################################################
+### Offline bioassay index (SQLite): one row per (AID, SID, CID, outcome)
+### datapoint, indexed on each, for compound-by-assay lookups without
+### re-reading the mirror.  Updates are incremental: only new or changed
+### AID files (by signature) are (re)loaded.
+#############################################################################
+def IndexConnect(dbfile):
+  db = sqlite3.connect(dbfile)
+  db.execute("PRAGMA journal_mode=WAL")
+  db.execute("CREATE TABLE IF NOT EXISTS assay_file (aid INTEGER PRIMARY KEY, fpath TEXT, member TEXT, signature TEXT, n_row INTEGER, t_indexed REAL)")
+  db.execute("CREATE TABLE IF NOT EXISTS outcome (aid INTEGER NOT NULL, sid INTEGER NOT NULL, cid INTEGER, outcome INTEGER NOT NULL)")
+  return db
+
+#############################################################################
+def IndexCreateIndexes(db):
+  for col in ('aid', 'sid', 'cid'):
+    db.execute(f"CREATE INDEX IF NOT EXISTS outcome_{col} ON outcome ({col})")
+  db.commit()
+
+#############################################################################
+def IndexAssayFiles(datadir, dbfile, aidset=None):
+  """Build or update index from mirror datadir.  Each AID is committed with
+its file signature, so an interrupted run resumes where it stopped."""
+  db = IndexConnect(dbfile)
+  db.execute("PRAGMA synchronous=OFF")
+  signatures = {aid:signature for aid,signature in db.execute("SELECT aid, signature FROM assay_file")}
+  files = ListAssayFiles(datadir, aidset)
+  n_new=0; n_changed=0; n_unchanged=0; n_row_total=0;
+  for aid,fpath,member,signature in files:
+    if signatures.get(aid)==signature:
+      n_unchanged+=1
+      continue
+    if aid in signatures:
+      db.execute("DELETE FROM outcome WHERE aid=?", (aid,))
+      n_changed+=1
+    else:
+      n_new+=1
+    n_row=0;
+    with OpenAssayCSV(fpath, member) as fin:
+      for df in ReadAssayChunks(fin, INDEX_BATCH_SIZE):
+        cids = [cid if cid>=0 else None for cid in df['cid'].tolist()]
+        db.executemany("INSERT INTO outcome (aid, sid, cid, outcome) VALUES (?, ?, ?, ?)", zip([aid]*df.shape[0], df['sid'].tolist(), cids, df['outcome'].tolist()))
+        n_row+=df.shape[0]
+    db.execute("INSERT OR REPLACE INTO assay_file (aid, fpath, member, signature, n_row, t_indexed) VALUES (?, ?, ?, ?, ?, ?)", (aid, fpath, member, signature, n_row, time.time()))
+    db.commit()
+    n_row_total+=n_row
+    logging.debug(f"AID {aid}: {n_row} rows ({fpath}{':'+member if member else ''})")
+  IndexCreateIndexes(db)
+  aids_missing = set(signatures.keys())-set([aid for aid,fpath,member,signature in files])
+  if aids_missing and not aidset:
+    logging.warning(f"AIDs indexed but not in mirror (kept): {len(aids_missing)}")
+  logging.info(f"AIDs new: {n_new}; changed: {n_changed}; unchanged: {n_unchanged}; rows loaded: {n_row_total}")
+  db.close()
+
+#############################################################################
+def IndexAIDs(db, aidset=None):
+  aids = [aid for (aid,) in db.execute("SELECT aid FROM assay_file ORDER BY aid")]
+  return [aid for aid in aids if aid in aidset] if aidset else aids
+
+#############################################################################
+def IndexOutcomes(db, aid, idset=None, use_cids=False):
+  """As ExtractOutcomes(), from index: hash of SIDs (or CIDs) to resolved
+outcome for one AID."""
+  ids,outcomes = IndexOutcomeArrays(db, aid, idset, use_cids)
+  return {id_this:{'outcome':outcome} for id_this,outcome in zip(ids.tolist(), outcomes.tolist())}
+
+#############################################################################
+def IndexOutcomeArrays(db, aid, idset=None, use_cids=False):
+  """As ReadOutcomeArrays(), from index, for one AID."""
+  idcol = 'cid' if use_cids else 'sid'
+  rows = db.execute(f"SELECT {idcol}, outcome FROM outcome WHERE aid=? AND {idcol} IS NOT NULL", (aid,)).fetchall()
+  vals = np.array(rows, dtype=np.int64).reshape(-1, 2)
+  ids,acts = vals[:,0],vals[:,1]
+  if idset:
+    ok = np.isin(ids, np.fromiter(idset, dtype=np.int64, count=len(idset)))
+    ids,acts = ids[ok],acts[ok]
+  return ResolveOutcomes(ids, acts)
+
+#############################################################################
+def IndexCompoundOutcomes(db, ids, use_cids=False, aidset=None):
+  """Compound-by-assay lookup: hash of SIDs (or CIDs) to hash of AIDs to
+resolved outcome, via indexed join."""
+  idcol = 'cid' if use_cids else 'sid'
+  db.execute("CREATE TEMP TABLE IF NOT EXISTS qid (id INTEGER PRIMARY KEY)")
+  db.execute("DELETE FROM qid")
+  db.executemany("INSERT OR IGNORE INTO qid (id) VALUES (?)", [(int(id_this),) for id_this in ids])
+  acts={}
+  for id_this,aid,act in db.execute(f"SELECT o.{idcol}, o.aid, o.outcome FROM outcome o JOIN qid ON o.{idcol}=qid.id"):
+    if aidset and aid not in aidset: continue
+    acts.setdefault(id_this, {}).setdefault(aid, []).append(act)
+  return {id_this:{aid:ResolveOutcome(acts[id_this][aid]) for aid in acts[id_this]} for id_this in acts}
+#############################################################################
+### Assay sweep: AID files parsed in parallel worker processes, per-AID
+### (ids, outcomes) arrays merged by the caller, in file order, so output
+### is identical for any nproc.
+#############################################################################
+_SWEEP = {}
+
+def _SweepInit(idset, use_cids, index_db):
+  _SWEEP['idset'] = idset
+  _SWEEP['use_cids'] = use_cids
+  _SWEEP['db'] = IndexConnect(index_db) if index_db else None
+
+def _SweepAssay(task):
+  aid,fpath,member = task
+  if _SWEEP['db'] is not None:
+    return IndexOutcomeArrays(_SWEEP['db'], aid, _SWEEP['idset'], _SWEEP['use_cids'])
+  return ReadAssayOutcomes(fpath, member, _SWEEP['idset'], _SWEEP['use_cids'])
+
+def SweepAssays(files, idset=None, use_cids=False, index_db=None, nproc=parallel.NPROC):
+  """Generate (aid, ids, outcomes) for files (as from ListAssayFiles()), in
+order, from nproc worker processes.  If index_db, outcomes are read from the
+index (fpath unused).  Errors are logged and the AID skipped."""
+  tasks = [(aid, fpath, member) for aid,fpath,member,signature in files]
+  for (aid,fpath,member),result in parallel.MapOrderedProcesses(_SweepAssay, tasks, nproc, _SweepInit, (idset, use_cids, index_db)):
+    if result is None:
+      logging.error(f"AID {aid}: could not read {fpath if fpath else index_db}")
+      continue
+    ids,outcomes = result
+    yield aid, ids, outcomes
+
+#############################################################################
+### Outcome matrix: AID x SID (or CID), CSR int8, value = resolved outcome
+### (1-5), 0 = not tested.  Rows (AIDs) and columns (IDs) are sorted, with
+### index maps aids and ids.  Saved as a directory of .npy arrays, loadable
+### memory-mapped.  Built streaming by OutcomeMatrixBuilder, one AID at a
+### time: IDs are assigned columns as first seen, and every checkpoint_every
+### AIDs the pending rows are flushed as a CSR part (to the checkpoint dir,
+### if specified, for resume).  Parts are merged into the sorted matrix at
+### build(), optionally written directly to disk (memory-mapped).
+#############################################################################
+class OutcomeMatrix:
+  ARRAYS = ("aids", "ids", "indptr", "indices", "data")
+
+  def __init__(self, aids, ids, matrix):
+    self.aids = aids
+    self.ids = ids
+    self.matrix = matrix
+    self._csc = None
+
+  @classmethod
+  def from_blocks(cls, aids, blocks):
+    """From per-AID (ids, outcomes) arrays."""
+    builder = OutcomeMatrixBuilder()
+    for aid,(ids,outcomes) in zip(aids, blocks):
+      builder.add(aid, ids, outcomes)
+    return builder.build()
+
+  @classmethod
+  def load(cls, dirpath, mmap=True):
+    arrays = {name:np.load(os.path.join(dirpath, f"{name}.npy"), mmap_mode=('r' if mmap else None)) for name in cls.ARRAYS}
+    matrix = scipy.sparse.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=(len(arrays["aids"]), len(arrays["ids"])), copy=False)
+    logging.info(f"Outcome matrix loaded: {dirpath} ({len(arrays['aids'])} AIDs x {len(arrays['ids'])} IDs; {matrix.nnz} datapoints)")
+    return cls(arrays["aids"], arrays["ids"], matrix)
+
+  def save(self, dirpath):
+    os.makedirs(dirpath, exist_ok=True)
+    arrays = {"aids":self.aids, "ids":self.ids, "indptr":self.matrix.indptr, "indices":self.matrix.indices, "data":self.matrix.data}
+    for name in self.ARRAYS:
+      np.save(os.path.join(dirpath, f"{name}.npy"), arrays[name])
+    logging.info(f"Outcome matrix saved: {dirpath}")
+
+  @property
+  def nnz(self):
+    return self.matrix.nnz
+
+  def csc(self):
+    """Column (ID) major copy, for per-ID AID lists."""
+    if self._csc is None:
+      self._csc = self.matrix.tocsc()
+      self._csc.sort_indices()
+    return self._csc
+
+  def id_aids(self, j, outcome=None):
+    """AIDs (with outcome if specified) for ID at column j."""
+    csc = self.csc()
+    rows = csc.indices[csc.indptr[j]:csc.indptr[j+1]]
+    if outcome is not None:
+      rows = rows[csc.data[csc.indptr[j]:csc.indptr[j+1]]==outcome]
+    return self.aids[rows]
+
+  def id_scores(self, j, scores=GINI_SCORES):
+    """(AIDs, scores) for ID at column j; outcomes not in scores omitted."""
+    csc = self.csc()
+    rows = csc.indices[csc.indptr[j]:csc.indptr[j+1]]
+    vals = self.score_lut(scores)[csc.data[csc.indptr[j]:csc.indptr[j+1]]]
+    ok = ~np.isnan(vals)
+    return self.aids[rows[ok]], vals[ok]
+
+  @staticmethod
+  def score_lut(scores):
+    lut = np.full(256, np.nan)
+    for outcome,score in scores.items(): lut[outcome] = score
+    return lut
+
+  def counts(self):
+    """Per-ID counts of AIDs by outcome: array (n_ids x 5), columns
+inactive, active, inconclusive, unspecified, discrepant."""
+    n = len(self.ids)
+    indices = self.matrix.indices
+    data = np.asarray(self.matrix.data)
+    return np.column_stack([np.bincount(indices[data==outcome], minlength=n) for outcome in (1,2,3,4,5)])
+
+  def gini(self, scores=GINI_SCORES):
+    """Per-ID Gini coefficient of scores over AIDs, vectorized; as Gini()."""
+    n = len(self.ids)
+    vals = self.score_lut(scores)[np.asarray(self.matrix.data)]
+    ok = ~np.isnan(vals)
+    cols = np.asarray(self.matrix.indices)[ok]
+    vals = vals[ok]
+    order = np.lexsort((vals, cols))
+    cols = cols[order]; vals = vals[order]
+    n_vals = np.bincount(cols, minlength=n)
+    starts = np.concatenate(([0], np.cumsum(n_vals)[:-1]))
+    ranks = np.arange(len(cols)) - starts[cols] + 1
+    num = np.bincount(cols, weights=(2*ranks-n_vals[cols]-1)*vals, minlength=n)
+    total = np.bincount(cols, weights=vals, minlength=n)
+    gini = np.zeros(n)
+    np.divide(num, n_vals*total, out=gini, where=(total>0))
+    return gini
+
+#############################################################################
+class OutcomeMatrixBuilder:
+  """Accumulate per-AID outcomes; build OutcomeMatrix.  Memory held is the
+ID-to-column map plus the CSR parts (only the current part, if checkpoint
+dir is specified).  Each checkpoint_every AIDs are flushed as a part file
+there, and AIDs in existing parts are loaded (resume)."""
+
+  def __init__(self, checkpoint=None, checkpoint_every=CHECKPOINT_EVERY):
+    self.checkpoint = checkpoint
+    self.checkpoint_every = checkpoint_every
+    self.aids = []
+    self.cols = {} #id -> column, in order first seen
+    self.blocks = [] #pending (cols, outcomes), not yet in a part
+    self.parts = [] #part file paths, or (aids, indptr, indices, data) if no checkpoint
+    self.n_saved = 0
+    self.n_ids_saved = 0
+    if checkpoint:
+      os.makedirs(checkpoint, exist_ok=True)
+      for fname in sorted(os.listdir(checkpoint)):
+        if not re.match(r'part_\d+\.npz$', fname): continue
+        fpath = os.path.join(checkpoint, fname)
+        with np.load(fpath) as part:
+          self.aids.extend(int(aid) for aid in part["aids"])
+          for id_this in part["ids_new"].tolist(): self.cols[id_this] = len(self.cols)
+        self.parts.append(fpath)
+      self.n_saved = len(self.aids)
+      self.n_ids_saved = len(self.cols)
+      if self.aids: logging.info(f"Resuming from checkpoint {checkpoint}: {len(self.aids)} AIDs done")
+    self.aids_done = set(self.aids)
+
+  def __len__(self):
+    return len(self.aids)
+
+  def __contains__(self, aid):
+    return aid in self.aids_done
+
+  def add(self, aid, ids, outcomes):
+    cols = self.cols
+    self.aids.append(aid)
+    self.aids_done.add(aid)
+    self.blocks.append((np.fromiter((cols.setdefault(id_this, len(cols)) for id_this in np.asarray(ids).tolist()), dtype=np.int64, count=len(ids)), np.asarray(outcomes, dtype=np.int8)))
+    if len(self.aids)-self.n_saved>=self.checkpoint_every:
+      self.save_part()
+
+  def save_part(self):
+    """Flush pending AIDs as a CSR part (columns as assigned so far), with
+the IDs first seen in it, so column assignment is restored on resume."""
+    if len(self.aids)==self.n_saved: return
+    blocks = self.blocks
+    indptr = np.zeros(len(blocks)+1, dtype=np.int64)
+    np.cumsum([len(cols) for cols,acts in blocks], out=indptr[1:])
+    aids = np.array(self.aids[self.n_saved:], dtype=np.int64)
+    indices = np.concatenate([cols for cols,acts in blocks]).astype(np.int32)
+    data = np.concatenate([acts for cols,acts in blocks])
+    if self.checkpoint:
+      ids_new = np.fromiter(itertools.islice(self.cols.keys(), self.n_ids_saved, None), dtype=np.int64, count=len(self.cols)-self.n_ids_saved)
+      fpath = os.path.join(self.checkpoint, f"part_{len(self.parts):06d}.npz")
+      fpath_tmp = fpath+".tmp.npz"
+      np.savez(fpath_tmp, aids=aids, indptr=indptr, indices=indices, data=data, ids_new=ids_new)
+      os.replace(fpath_tmp, fpath)
+      logging.debug(f"Checkpoint: {fpath} ({len(blocks)} AIDs)")
+      self.parts.append(fpath)
+    else:
+      self.parts.append((aids, indptr, indices, data))
+    self.blocks = []
+    self.n_saved = len(self.aids)
+    self.n_ids_saved = len(self.cols)
+
+  def iter_parts(self):
+    for part in self.parts:
+      if isinstance(part, str):
+        with np.load(part) as npz:
+          yield npz["aids"], npz["indptr"], npz["indices"], npz["data"]
+      else:
+        yield part
+
+  def build(self, dirpath=None):
+    """Merge parts into OutcomeMatrix, rows sorted by AID and columns by ID.
+If dirpath, arrays are written there (as save()) and the matrix is returned
+memory-mapped, so the full matrix need not fit in memory."""
+    self.save_part()
+    ids = np.fromiter(self.cols.keys(), dtype=np.int64, count=len(self.cols))
+    order = np.argsort(ids, kind='stable')
+    ids = ids[order]
+    rank = np.empty(len(order), dtype=np.int32)
+    rank[order] = np.arange(len(order), dtype=np.int32)
+    aids = np.array(self.aids, dtype=np.int64)
+    lens = np.concatenate([np.diff(indptr) for aids_part,indptr,indices,data in self.iter_parts()]) if self.parts else np.zeros(0, dtype=np.int64)
+    row_order = np.argsort(aids, kind='stable')
+    row_pos = np.empty(len(aids), dtype=np.int64)
+    row_pos[row_order] = np.arange(len(aids))
+    indptr = np.zeros(len(aids)+1, dtype=np.int64)
+    np.cumsum(lens[row_order], out=indptr[1:])
+    arrays = {"aids":aids[row_order], "ids":ids, "indptr":indptr}
+    for name,dtype,n in (("indices", np.int32, int(indptr[-1])), ("data", np.int8, int(indptr[-1]))):
+      if dirpath:
+        os.makedirs(dirpath, exist_ok=True)
+        arrays[name] = np.lib.format.open_memmap(os.path.join(dirpath, f"{name}.npy"), mode="w+", dtype=dtype, shape=(n,))
+      else:
+        arrays[name] = np.empty(n, dtype=dtype)
+    row = 0
+    for aids_part,indptr_part,indices_part,data_part in self.iter_parts():
+      for k in range(len(aids_part)):
+        cols = rank[indices_part[indptr_part[k]:indptr_part[k+1]]]
+        o = np.argsort(cols)
+        start,end = indptr[row_pos[row]],indptr[row_pos[row]+1]
+        arrays["indices"][start:end] = cols[o]
+        arrays["data"][start:end] = data_part[indptr_part[k]:indptr_part[k+1]][o]
+        row+=1
+    if dirpath:
+      for name in ("aids", "ids", "indptr"):
+        np.save(os.path.join(dirpath, f"{name}.npy"), arrays[name])
+      for name in ("indices", "data"):
+        arrays[name].flush()
+      del arrays
+      logging.info(f"Outcome matrix saved: {dirpath}")
+      return OutcomeMatrix.load(dirpath)
+    matrix = scipy.sparse.csr_matrix((arrays["data"], arrays["indices"], indptr), shape=(len(aids), len(ids)), copy=False)
+    matrix.has_sorted_indices = True
+    return OutcomeMatrix(arrays["aids"], ids, matrix)
+
+  def remove_checkpoint(self):
+    if self.checkpoint and os.path.isdir(self.checkpoint):
+      shutil.rmtree(self.checkpoint)
+#############################################################################
+### Assay similarity: active-overlap Tanimoto over the common SID space, i.e.
+### for assays i, j, over IDs tested (outcome not 4) in both:
+###   sim = n(active in i and j) / n(active in i or j)
+### Candidate pairs, with a common active (others have sim 0), from the
+### sparse product A*A' of the active (A) AID x ID matrix, in blocks of query
+### AIDs.  Overlaps with the tested (T) matrix, A*T', T*A' and T*T', are block
+### sparse products restricted to the candidate neighbor AIDs, read at the
+### candidate pairs.
+#############################################################################
+def AssayNeighbors(omat, query_aids=None, topk=None, min_sim=0.0, block_size=ASSAYSIM_BLOCK_SIZE):
+  """Generate DataFrames (aid, aid_nbr, n_tested_common, n_active_common,
+sim), per block of query AIDs (default all), each query's neighbors by
+descending sim, up to topk if specified."""
+  data = np.asarray(omat.matrix.data)
+  indices = np.array(omat.matrix.indices); indptr = np.array(omat.matrix.indptr) #writable, if memory-mapped
+  T = scipy.sparse.csr_matrix(((data!=OUTCOME_CODES['unspecified']).astype(np.int32), indices, indptr), shape=omat.matrix.shape)
+  A = scipy.sparse.csr_matrix(((data==OUTCOME_CODES['active']).astype(np.int32), indices.copy(), indptr.copy()), shape=omat.matrix.shape)
+  T.eliminate_zeros(); A.eliminate_zeros()
+  At = A.T.tocsr()
+  rows = np.arange(len(omat.aids)) if query_aids is None else np.flatnonzero(np.isin(omat.aids, np.asarray(list(query_aids), dtype=np.int64)))
+  for b in range(0, len(rows), block_size):
+    rows_this = rows[b:b+block_size]
+    AA = (A[rows_this] @ At).tocoo()
+    i,j,n_aa = AA.row, AA.col, AA.data
+    ok = (rows_this[i]!=j)
+    i,j,n_aa = i[ok],j[ok],n_aa[ok]
+    nbrs,jj = np.unique(j, return_inverse=True) #candidate neighbor AIDs, jj indexing them
+    A_q = A[rows_this]; T_q = T[rows_this]
+    T_nbrs_t = T[nbrs].T.tocsr()
+    n_at = np.asarray((A_q @ T_nbrs_t)[i,jj]).ravel()
+    n_ta = np.asarray((T_q @ A[nbrs].T.tocsr())[i,jj]).ravel()
+    sim = n_aa/np.maximum(n_at+n_ta-n_aa, 1)
+    ok = sim>=min_sim
+    i,j,jj,n_aa,sim = i[ok],j[ok],jj[ok],n_aa[ok],sim[ok]
+    order = np.lexsort((j, -sim, i))
+    i,j,jj,n_aa,sim = i[order],j[order],jj[order],n_aa[order],sim[order]
+    if topk:
+      starts = np.searchsorted(i, i, side='left')
+      ok = (np.arange(len(i))-starts)<topk
+      i,j,jj,n_aa,sim = i[ok],j[ok],jj[ok],n_aa[ok],sim[ok]
+    n_tt = np.asarray((T_q @ T_nbrs_t)[i,jj]).ravel()
+    yield pd.DataFrame({'aid':omat.aids[rows_this[i]], 'aid_nbr':omat.aids[j], 'n_tested_common':n_tt, 'n_active_common':n_aa, 'sim':sim.round(4)})
+
+#############################################################################
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+#############################################################################
+### pubchem_ftp_assay_index.py - offline index (SQLite) of PubChem bioassay
+### CSV data from local FTP mirror, with (AID, SID, CID, outcome) indexes.
+###
+### index: build, or update with new/changed AIDs only.
+### list_aids: AIDs indexed.
+### get_assay_outcomes: SID (or CID) outcomes for AIDs.
+### get_compound_outcomes: AID outcomes for SIDs (or CIDs).
+###
+### activity outcomes:
+###   1 = inactive
+###   2 = active
+###   3 = inconclusive
+###   4 = unspecified
+###   5 = discrepant (multiple, differing 1, 2 or 3)
+#############################################################################
+import sys,os,re,time,argparse,logging
+
+from ... import pubchem
+
+DATADIR="/home/data/pubchem/bioassay/csv/data"
+
+#############################################################################
+if __name__=='__main__':
+  epilog="Example: python3 -m BioClients.pubchem.ftp.pubchem_ftp_assay_index index --datadir /data/pubchem/bioassay/csv/data --db pubchem_bioassay.sqlite"
+  ops = ["index", "list_aids", "get_assay_outcomes", "get_compound_outcomes"]
+  parser = argparse.ArgumentParser(description="PubChem bioassay offline index", epilog=epilog)
+  parser.add_argument("op", choices=ops, help="OPERATION")
+  parser.add_argument("--db", dest="dbfile", required=True, help="index database file (SQLite)")
+  parser.add_argument("--datadir", default=DATADIR, help="dir w/ csv.gz assay data, or zips thereof")
+  parser.add_argument("--aids", help="AIDs (comma-separated)")
+  parser.add_argument("--iaid", dest="ifile_aid", help="input AIDs file")
+  parser.add_argument("--ids", help="SIDs or CIDs (comma-separated)")
+  parser.add_argument("--i", dest="ifile", help="input SIDs or CIDs file")
+  parser.add_argument("--use_cids", action="store_true", help="CIDs instead of SIDs (all i/o)")
+  parser.add_argument("--o", dest="ofile", help="output (TSV)")
+  parser.add_argument("-v", "--verbose", default=0, action="count")
+  args = parser.parse_args()
+
+  logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>0 else logging.INFO))
+
+  aidset = set(pubchem.ftp.Utils.ReadIds(args.ifile_aid, args.aids))
+  idtag = "CID" if args.use_cids else "SID"
+
+  fout = open(args.ofile, "w") if args.ofile else sys.stdout
+
+  t0=time.time()
+
+  if args.op=="index":
+    pubchem.ftp.Utils.IndexAssayFiles(args.datadir, args.dbfile, aidset)
+
+  elif args.op=="list_aids":
+    db = pubchem.ftp.Utils.IndexConnect(args.dbfile)
+    fout.write("AID\tn_row\tfpath\tmember\n")
+    for aid,n_row,fpath,member in db.execute("SELECT aid, n_row, fpath, member FROM assay_file ORDER BY aid"):
+      if aidset and aid not in aidset: continue
+      fout.write(f"{aid}\t{n_row}\t{fpath}\t{member if member else ''}\n")
+
+  elif args.op=="get_assay_outcomes":
+    if not aidset: parser.error(f"--aids or --iaid required for {args.op}")
+    db = pubchem.ftp.Utils.IndexConnect(args.dbfile)
+    idset = set(pubchem.ftp.Utils.ReadIds(args.ifile, args.ids))
+    fout.write(f"AID\t{idtag}\toutcome\n")
+    for aid in pubchem.ftp.Utils.IndexAIDs(db, aidset):
+      outcomes = pubchem.ftp.Utils.IndexOutcomes(db, aid, idset, args.use_cids)
+      for id_this in sorted(outcomes.keys()):
+        fout.write(f"{aid}\t{id_this}\t{outcomes[id_this]['outcome']}\n")
+
+  elif args.op=="get_compound_outcomes":
+    ids = pubchem.ftp.Utils.ReadIds(args.ifile, args.ids)
+    if not ids: parser.error(f"--i or --ids required for {args.op}")
+    db = pubchem.ftp.Utils.IndexConnect(args.dbfile)
+    outcomes = pubchem.ftp.Utils.IndexCompoundOutcomes(db, ids, args.use_cids, aidset)
+    fout.write(f"{idtag}\tAID\toutcome\n")
+    for id_this in ids:
+      for aid in sorted(outcomes.get(id_this, {}).keys()):
+        fout.write(f"{id_this}\t{aid}\t{outcomes[id_this][aid]}\n")
+    logging.info(f"{idtag}s: {len(ids)}; found: {len(outcomes)}")
+
+  else:
+    parser.error(f"Invalid operation: {args.op}")
+
+  logging.info(f"Elapsed time: {time.strftime('%Hh:%Mm:%Ss',time.gmtime(time.time()-t0))}")
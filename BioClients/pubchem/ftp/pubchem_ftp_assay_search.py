@@ -1,245 +1,130 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 '''
-Search for text in assay descriptions (XML)
+Search for text in assay descriptions (XML), from local mirror of
+PubChem Bioassay descriptions (zips of descr.xml.gz files).
 
 Jeremy J Yang
 22 Oct 2014
 '''
-import os,sys,re,time,getopt,gzip,zipfile
-import xml.dom.minidom
+import os,sys,re,time,argparse,logging
+from xml.etree import ElementTree
 
-from ..util import xml_utils
-
-PROG=os.path.basename(sys.argv[0])
+from ... import pubchem
+from ...util import xml as util_xml
 
 #ASSAY_DESC_DIR='/home/data/pubchem/bioassay/xml/description'
 ASSAY_DESC_DIR='/home/data/pubchem/bioassay/csv/description'
-
-SCRATCHDIR='/tmp/'+PROG+'_SCRATCHDIR'
+DESC_SUFFIX='.descr.xml.gz'
 
 #############################################################################
-def ParseAssayXml(assayxml):
+def ParseAssayXml(fin):
   aname,ameth,adesc,atargs=None,None,None,None
-  dom=xml.dom.minidom.parseString(assayxml)
-  tag='PC-AssayDescription_name'
-  anames=xml_utils.DOM_GetLeafValsByTagName(dom,tag)
+  root = ElementTree.parse(fin).getroot()
+  for elem in root.iter():
+    elem.tag = re.sub(r'^\{.*\}', '', elem.tag) #namespace stripped
+  anames = util_xml.GetLeafValsByTagName(root, 'PC-AssayDescription_name')
   if anames: aname=anames[0]
-  tag='PC-AssayDescription_activity-outcome-method'
-  ameths=xml_utils.DOM_GetAttr(dom,tag,'value')
+  ameths = util_xml.GetAttr(root, 'PC-AssayDescription_activity-outcome-method', 'value')
   if ameths: ameth=ameths[0]
-  tag='PC-AssayDescription_description_E'
-  adescs=xml_utils.DOM_GetLeafValsByTagName(dom,tag)
+  adescs = util_xml.GetLeafValsByTagName(root, 'PC-AssayDescription_description_E')
   if adescs: adesc=('\n'.join(adescs))
 
-  tag='PC-AssayTargetInfo_name'
-  atargs_names=xml_utils.DOM_GetLeafValsByTagName(dom,tag)
-  tag='PC-AssayTargetInfo_molecule-type'
-  atargs_types=xml_utils.DOM_GetAttr(dom,tag,'value')
-  tag='PC-AssayTargetInfo_mol-id'
-  atargs_ids=xml_utils.DOM_GetLeafValsByTagName(dom,tag)
+  atargs_names = util_xml.GetLeafValsByTagName(root, 'PC-AssayTargetInfo_name')
+  atargs_types = util_xml.GetAttr(root, 'PC-AssayTargetInfo_molecule-type', 'value')
+  atargs_ids = util_xml.GetLeafValsByTagName(root, 'PC-AssayTargetInfo_mol-id')
   gids=[]
   if atargs_names:
     atargs=''
     for i,atargs_name in enumerate(atargs_names):
       if i>0: atargs+=';  '
-      atargs+=('%d. %s'%(i+1,atargs_name))
+      atargs+=(f"{i+1}. {atargs_name}")
       if len(atargs_ids)>i and len(atargs_types)>i:
-        atargs+=(' [%s:%s]'%(atargs_types[i],atargs_ids[i]))
-      if atargs_types[i]=='protein':
-        gids.append(int(atargs_ids[i]))
+        atargs+=(f" [{atargs_types[i]}:{atargs_ids[i]}]")
+        if atargs_types[i]=='protein':
+          gids.append(int(atargs_ids[i]))
 
   return aname,ameth,adesc,atargs,gids
 
-#############################################################################
-def ErrorExit(msg):
-  print >>sys.stderr,msg
-  sys.exit(1)
-
 #############################################################################
 if __name__=='__main__':
-  usage='''
-  %(PROG)s - search assay names and descriptions
-
-  required:
-  --string=<STRING>   ... search substring
-  or
-  --regexp=<REGEXP>   ... search regular expression
-  or
-  --out_all_aid_file=<out_all_aid_file> ... csv file: aid,name,method,target[s]
-
-  options:
-  --desc           ... search descriptions (default only names)
-  --casesensitive  ... case sensitive
-  --out_aids=<outfile> ... output file of matched AIDs
-  --out_all_aid_file=<out_all_aid_file> ... csv file: aid,name,method,target[s]
-  --out_all_gid_file=<outfile> ... output file of all protein GIDs
-  --v            ... verbose
-  --vv           ... very verbose
-  --h            ... this help
-'''%{'PROG':PROG}
-  string=None; regexp=None; out_aids_file=None; out_all_aid_file=None;
-  out_all_gid_file=None;
-  casesensitive=False; desc=False; verbose=0;
-  opts,pargs = getopt.getopt(sys.argv[1:],'',['h','v','vv','string=',
-  'out_all_aid_file=', 'out_all_gid_file=',
-  'regexp=','out_aids=','casesensitive','desc'])
-  if not opts: ErrorExit(usage)
-  for (opt,val) in opts:
-    if opt=='--h': ErrorExit(usage)
-    elif opt=='--string': string=val
-    elif opt=='--regexp': regexp=val
-    elif opt=='--out_aids': out_aids_file=val
-    elif opt=='--out_all_aid_file': out_all_aid_file=val
-    elif opt=='--out_all_gid_file': out_all_gid_file=val
-    elif opt=='--casesensitive': casesensitive=True
-    elif opt=='--desc': desc=True
-    elif opt=='--vv': verbose=2
-    elif opt=='--v': verbose=1
-    else: ErrorExit('Illegal option: %s'%val)
-
-  if not (string or regexp or out_all_aid_file):
-    ErrorExit('-string or -regexp or -out_all_aid_file required\n'+usage)
-
-  fout_aid=None
-  if out_aids_file:
-    fout_aid=open(out_aids_file,'w')
-    if not fout_aid:
-      ErrorExit('cannot open: %s'%out_aids_file)
-
+  parser = argparse.ArgumentParser(description="search PubChem assay names and descriptions, from local mirror")
+  parser.add_argument("--string", help="search substring")
+  parser.add_argument("--regexp", help="search regular expression")
+  parser.add_argument("--desc", action="store_true", help="search descriptions (default only names)")
+  parser.add_argument("--casesensitive", action="store_true", help="case sensitive")
+  parser.add_argument("--out_aids", dest="out_aids_file", help="output file of matched AIDs")
+  parser.add_argument("--out_all_aid_file", help="csv file: aid,name,method,target[s]")
+  parser.add_argument("--out_all_gid_file", help="output file of all protein GIDs")
+  parser.add_argument("--datadir", default=ASSAY_DESC_DIR, help="dir w/ descr.xml.gz assay descriptions, or zips thereof")
+  parser.add_argument("-v", "--verbose", default=0, action="count")
+  args = parser.parse_args()
+
+  logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
+
+  if not (args.string or args.regexp or args.out_all_aid_file):
+    parser.error('--string or --regexp or --out_all_aid_file required')
+
+  if not os.access(args.datadir, os.R_OK):
+    parser.error(f"cannot find: {args.datadir}")
+
+  fout_aid = open(args.out_aids_file, 'w') if args.out_aids_file else None
   fout_all_aid=None
-  if out_all_aid_file:
-    fout_all_aid=open(out_all_aid_file,'w')
-    if not fout_all_aid:
-      ErrorExit('cannot open: %s'%out_all_aid_file)
+  if args.out_all_aid_file:
+    fout_all_aid = open(args.out_all_aid_file, 'w')
     fout_all_aid.write('AID,name,method,target')
-    if verbose>1: fout_all_aid.write('description')
+    if args.verbose>1: fout_all_aid.write(',description')
     fout_all_aid.write('\n')
-  fout_all_gid=None
-  if out_all_gid_file:
-    fout_all_gid=open(out_all_gid_file,'w')
-    if not fout_all_gid:
-      ErrorExit('cannot open: %s'%out_all_gid_file)
-
-  if not os.access(ASSAY_DESC_DIR,os.R_OK):
-    ErrorExit('cannot find: %s'%ASSAY_DESC_DIR)
-
-# files=[]
-# for file in os.listdir(ASSAY_DESC_DIR):
-#   if not re.search('\.descr\.xml\.gz',file): continue
-#   try:
-#     aid=int(re.sub('\.descr\.xml\.gz','',file))
-#   except:
-#     print >>sys.stderr, 'cannot parse AID: "%s"'%file
-#     continue
-#   fpath=ASSAY_DESC_DIR+'/'+file
-#   files.append((fpath,aid))
-
-  if string and not regexp: regexp=string
-  if regexp:
-    if casesensitive:
-      rob=re.compile(regexp)
-    else:
-      rob=re.compile(regexp,re.I)
+  fout_all_gid = open(args.out_all_gid_file, 'w') if args.out_all_gid_file else None
 
-  t0=time.time()
+  regexp = args.regexp if args.regexp else (re.escape(args.string) if args.string else None)
+  rob = (re.compile(regexp) if args.casesensitive else re.compile(regexp, re.I)) if regexp else None
 
-  aids={}
-  badfiles=[]
-  n_gids_out=0
+  t0=time.time()
 
-# for fpath,aid in files:
-  files=[]
-  for fname_zip in os.listdir(ASSAY_DESC_DIR):
-    if not re.search('\.zip',fname_zip): continue
-    fpath_zip=ASSAY_DESC_DIR+'/'+fname_zip
+  aids={}; badfiles=[]; n_files=0; n_gids_out=0;
+  for aid,fin in pubchem.ftp.Utils.IterArchives(args.datadir, suffix=DESC_SUFFIX):
+    n_files+=1
+    logging.debug(f"{aid}")
     try:
-      zf=zipfile.ZipFile(fpath_zip,'r')
-    except:
-      print >>sys.stderr, 'ERROR: cannot read fpath_zip: "%s"'%fpath_zip
-      continue
-    flist_xml_gz=zf.namelist()
-    zf.close()
-    for fpath_xml_gz in flist_xml_gz:
-      if not re.search('\.descr\.xml\.gz',fpath_xml_gz): continue
-      try:
-        if re.search(r'/',fpath_xml_gz):
-          txt=re.sub(r'^.*/(\d*)\.descr\.xml\.gz',r'\1',fpath_xml_gz)
-        else:
-          txt=re.sub(r'\.descr\.xml\.gz','',fpath_xml_gz)
-        aid=int(txt)
-      except:
-        print >>sys.stderr, 'cannot parse AID: "%s"'%fpath_xml_gz
-        print >>sys.stderr, 'DEBUG txt: "%s"'%txt
-        continue
-      files.append((fpath_zip,fpath_xml_gz,aid))
-
-  if not os.access(SCRATCHDIR,os.R_OK):
-    try:
-      os.mkdir(SCRATCHDIR)
-    except:
-      print >>sys.stderr, 'ERROR: failed to create SCRATCHDIR %s'%SCRATCHDIR
-      sys.exit(1)
-
-  for f in files:
-    fpath_zip,fpath_xml_gz,aid = f
-    if verbose>1: print >>sys.stderr, '%d: %s:%s'%(aid,fpath_zip,fpath_xml_gz)
-    zf=zipfile.ZipFile(fpath_zip,'r')
-    cwd=os.getcwd()
-    os.chdir(SCRATCHDIR)
-    zf.extract(fpath_xml_gz)
-    os.chdir(cwd)
-    zf.close()
-    f_xml=gzip.open(SCRATCHDIR+'/'+fpath_xml_gz)
-    fxml=f_xml.read()
-    f_xml.close()
-    if not fxml:
-      print >>sys.stderr, 'ERROR: file empty: AID %d: %s'%(aid,fpath)
-      badfiles.append(fpath)
+      aname,ameth,adesc,atargs,gids = ParseAssayXml(fin)
+    except Exception as e:
+      logging.error(f"AID {aid}: {e}")
+      badfiles.append(aid)
       continue
 
-    aname,ameth,adesc,atargs,gids = ParseAssayXml(fxml)
     if fout_all_aid:
-      fout_all_aid.write('%d,"%s","%s","%s"'%(aid,aname,ameth,atargs))
-      if verbose>1:
-        fout_all_aid.write(',"%s"'%(adesc))
+      fout_all_aid.write(f'{aid},"{aname}","{ameth}","{atargs}"')
+      if args.verbose>1:
+        fout_all_aid.write(f',"{adesc}"')
       fout_all_aid.write('\n')
 
     if fout_all_gid:
       for gid in gids:
-        fout_all_gid.write('%d\n'%(gid))
+        fout_all_gid.write(f'{gid}\n')
         n_gids_out+=1
 
     ok=False
-    if regexp:
-      if rob.search(aname):
-        if verbose:
-          print >>sys.stderr, 'name match: AID %d: %s'%(aid,aname)
+    if rob:
+      if aname and rob.search(aname):
+        logging.info(f"name match: AID {aid}: {aname}")
         ok=True
-      elif desc and rob.search(adesc):
-        if verbose: print >>sys.stderr, 'desc match: AID %d: %s'%(aid,adesc)
+      elif args.desc and adesc and rob.search(adesc):
+        logging.info(f"desc match: AID {aid}: {adesc}")
         ok=True
     if ok:
       aids[aid]=(aname,adesc)
       if fout_aid:
-        fout_aid.write('%d\n'%aid)
-    os.unlink(SCRATCHDIR+'/'+fpath_xml_gz)
+        fout_aid.write(f'{aid}\n')
 
   if fout_aid: fout_aid.close()
   if fout_all_aid: fout_all_aid.close()
   if fout_all_gid: fout_all_gid.close()
 
-  for dir in os.listdir(SCRATCHDIR):
-    subdir=SCRATCHDIR+"/"+dir
-    for f in os.listdir(subdir):
-      os.unlink(subdir+'/'+f)
-    os.rmdir(subdir)
-  os.rmdir(SCRATCHDIR)
-
-  print >>sys.stderr, '%s: total assays: %d'%(PROG,len(files))
-  print >>sys.stderr, '%s: matched assays: %d'%(PROG,len(aids.keys()))
+  logging.info(f"total assays: {n_files}")
+  logging.info(f"matched assays: {len(aids)}")
   if n_gids_out:
-    print >>sys.stderr, '%s: target protein GIDs written: %d'%(PROG,n_gids_out)
-  print >>sys.stderr, '%s: ERRORS: bad files: %d'%(PROG,len(badfiles))
-  for badfile in badfiles:
-    print >>sys.stderr, '\tbadfile: %s'%(os.path.basename(badfile))
-  print >>sys.stderr, ('%s: total elapsed time: %s'%(PROG,time.strftime('%Hh:%Mm:%Ss',time.gmtime(time.time()-t0))))
+    logging.info(f"target protein GIDs written: {n_gids_out}")
+  logging.info(f"ERRORS: bad files: {len(badfiles)}")
+  for aid in badfiles:
+    logging.info(f"\tbad file: AID {aid}")
+  logging.info(f"Elapsed time: {time.strftime('%Hh:%Mm:%Ss',time.gmtime(time.time()-t0))}")
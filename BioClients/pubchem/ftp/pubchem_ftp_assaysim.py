@@ -1,200 +1,104 @@
-#!/usr/bin/env python
+#!/usr/bin/env python3
 #############################################################################
 ### pubchem_assaysim.py - assay similarity based on activity profiles
 ### from PubChem CSV assay file[s]
+###
+### Similarity is active-overlap Tanimoto over the common SID space, i.e.
+### over SIDs tested (outcome not unspecified) in both assays:
+###   sim = n(active in A and B) / n(active in A or B)
+###
+### Modes:
+###   --aidA and --aidB: one pair, with outcome counts.
+###   --aidA (or --query_aids) only: one (or some) vs. all selected AIDs.
+###   neither: all pairs.
+### Many-AID modes write a sparse neighbor list (pairs with a common active),
+### up to --topk per query AID, from one pass over the assays (see
+### pubchem.ftp.Utils.AssayNeighbors).
 #############################################################################
-import os,sys,re,getopt,gzip,zipfile,tempfile
-#try:
-#  import gdbm
-#except:
-#  import dbm as gdbm
+import sys,os,re,argparse,logging
+import numpy as np
 
 from ... import pubchem
+from ...util import parallel
+from ...util import sink as util_sink
 
-PROG=os.path.basename(sys.argv[0])
 DATADIR="/home/data/pubchem/bioassay/csv/data"
 
-SCRATCHDIR='/tmp/'+PROG+'_SCRATCHDIR'
-
 #############################################################################
 if __name__=='__main__':
-  usage='''
-  %(PROG)s - assay similarity based on activity profiles (A vs. B)
-
-  required:
-  --aidA=<AID> ... assay ID A
-  --aidB=<AID> ... assay ID B
-
-  options:
-
-  --v            ... verbose
-  --vv           ... very verbose
-  --h            ... this help
-'''%{'PROG':PROG,'DATADIR':DATADIR}
-
-  def ErrorExit(msg):
-    print >>sys.stderr,msg
-    sys.exit(1)
-
-  indir=DATADIR;
-  infile=None; verbose=0;
-  aidA=None; aidB=None; 
-  opts,pargs = getopt.getopt(sys.argv[1:],'',['h','v','vv','indir=',
-  'aidA=','aidB=','infile=' ])
-  if not opts: ErrorExit(usage)
-  for (opt,val) in opts:
-    if opt=='--h': ErrorExit(usage)
-    elif opt=='--indir': indir=val
-    elif opt=='--aidA': aidA=val
-    elif opt=='--aidB': aidB=val
-    elif opt=='--vv': verbose=2
-    elif opt=='--v': verbose=1
-    else: ErrorExit('Illegal option: %s'%val)
-
-  if not (aidA and aidB):
-    ErrorExit('--aidA and --aidB required\n'+usage)
-
-  try:
-    aidA=int(aidA)
-    aidB=int(aidB)
-  except:
-    ErrorExit('aidA and aidB must be integers.\n'+usage)
-
-###
-
-  fpath_csv_gzA=None; fpath_csv_gzB=None;
-  for fname_zip in os.listdir(indir):
-    if not re.search('\.zip',fname_zip): continue
-    fpath_zip=indir+'/'+fname_zip
-    try:
-      zf=zipfile.ZipFile(fpath_zip,'r')
-    except:
-      print >>sys.stderr, 'ERROR: cannot read fpath_zip: "%s"'%fpath_zip
-      continue
-    flist_csv_gz=zf.namelist()
-    zf.close()
-    for fpath_csv_gz in flist_csv_gz:
-      if not re.search('\.csv\.gz',fpath_csv_gz): continue
-      try:
-        if re.search(r'/',fpath_csv_gz):
-          txt=re.sub(r'^.*/(\d*)\.csv\.gz',r'\1',fpath_csv_gz)
-        else:
-          txt=re.sub(r'\.csv\.gz','',fpath_csv_gz)
-        aid=int(txt)
-      except:
-        print >>sys.stderr, 'cannot parse AID: "%s"'%fpath_csv_gz
-        print >>sys.stderr, 'DEBUG txt: "%s"'%txt
-        continue
-      if aid==aidA:
-        fpath_zipA=fpath_zip
-        fpath_csv_gzA=fpath_csv_gz
-        if verbose>1:
-          print >>sys.stderr, '\tA: %s: %s (%s)'%(aidA,fpath_zipA,fpath_csv_gzA)
-      if aid==aidB:
-        fpath_zipB=fpath_zip
-        fpath_csv_gzB=fpath_csv_gz
-        if verbose>1:
-          print >>sys.stderr, '\tB: %s: %s (%s)'%(aidB,fpath_zipB,fpath_csv_gzB)
-      if fpath_csv_gzA and fpath_csv_gzB: break
-    if fpath_csv_gzA and fpath_csv_gzB: break
-
-  if not fpath_csv_gzA:
-    ErrorExit('ERROR: could not find file for AID %s'%(aidA))
-  if not fpath_csv_gzB:
-    ErrorExit('ERROR: could not find file for AID %s'%(aidB))
-
-
-  if not os.access(SCRATCHDIR,os.R_OK):
-    try:
-      os.mkdir(SCRATCHDIR)
-    except:
-      print >>sys.stderr, 'ERROR: failed to create SCRATCHDIR %s'%SCRATCHDIR
-      sys.exit(1)
-
-
-  zfA=zipfile.ZipFile(fpath_zipA,'r')
-  cwd=os.getcwd()
-  os.chdir(SCRATCHDIR)
-  zfA.extract(fpath_csv_gzA)
-  os.chdir(cwd)
-  zfA.close()
-  f_csvA=gzip.open(SCRATCHDIR+'/'+fpath_csv_gzA)
-  csvA=f_csvA.read()
-  f_csvA.close()
-  if not csvA:
-    ErrorExit('ERROR: file empty: AID %d: %s'%(aidA,fpath_csv_gzA))
-
-  zfB=zipfile.ZipFile(fpath_zipB,'r')
-  cwd=os.getcwd()
-  os.chdir(SCRATCHDIR)
-  zfB.extract(fpath_csv_gzB)
-  os.chdir(cwd)
-  zfB.close()
-  f_csvB=gzip.open(SCRATCHDIR+'/'+fpath_csv_gzB)
-  csvB=f_csvB.read()
-  f_csvB.close()
-  if not csvB:
-    ErrorExit('ERROR: file empty: AID %d: %s'%(aidB,fpath_csv_gzB))
-
-
-  sids_active=[]; sids_inactive=[]; sids_inconclusive=[]; sids_unspecified=[];
-  sids_discrepant=[]; sids_tested=[];
-  sidset={};
-  n_datapoints_total=0
-  use_cids=False;
-
-  sidsA=pubchem.ftp.Utils.ExtractOutcomes(csvA,sidset,use_cids)
-
-  sidsB=pubchem.ftp.Utils.ExtractOutcomes(csvB,sidset,use_cids)
-
-  print >>sys.stderr, '\t  aidA, SIDs total: %3d'%(len(sidsA.keys()))
-  print >>sys.stderr, '\t  aidB, SIDs total: %3d'%(len(sidsB.keys()))
-
-  sids_all=(set(sidsA.keys()) | set(sidsB.keys()))
-  sids_common=(set(sidsA.keys()) & set(sidsB.keys()))
-  print >>sys.stderr, '\t  aidA | aidB, SIDs total: %3d'%(len(sids_all))
-  print >>sys.stderr, '\t  aidA & aidB, SIDs common: %3d'%(len(sids_common))
-
-
-  n_activeA=0; n_inactiveA=0; n_inconclusiveA=0; n_unspecifiedA=0; n_discrepantA=0;
-  n_activeB=0; n_inactiveB=0; n_inconclusiveB=0; n_unspecifiedB=0; n_discrepantB=0;
-  n_active_common=0
-  for sid in sids_all:
-    outcomeA=None;
-    outcomeB=None;
-    if sidsA.has_key(sid):
-      outcomeA=sidsA[sid]['outcome']
-      if outcomeA==2: n_activeA+=1
-      elif outcomeA==1: n_inactiveA+=1
-      elif outcomeA==3: n_inconclusiveA+=1
-      elif outcomeA==4: n_unspecifiedA+=1
-      elif outcomeA==5: n_discrepantA+=1
-      else: print >>sys.stderr, 'ERROR: outcomeA=%d'%(sidsA[sid]['outcome'])
-    if sidsB.has_key(sid):
-      outcomeB=sidsB[sid]['outcome']
-      if outcomeB==2: n_activeB+=1
-      elif outcomeB==1: n_inactiveB+=1
-      elif outcomeB==3: n_inconclusiveB+=1
-      elif outcomeB==4: n_unspecifiedB+=1
-      elif outcomeB==5: n_discrepantB+=1
-      else: print >>sys.stderr, 'ERROR: outcomeB=%d'%(sidsB[sid]['outcome'])
-    if outcomeA==2 and outcomeB==2:
-      n_active_common+=1
-
-  if verbose>1:
-    print >>sys.stderr, '\tA:       active: %3d'%(n_activeA)
-    print >>sys.stderr, '\tA:     inactive: %3d'%(n_inactiveA)
-    print >>sys.stderr, '\tA: inconclusive: %3d'%(n_inconclusiveA)
-    print >>sys.stderr, '\tA:  unspecified: %3d'%(n_unspecifiedA)
-    print >>sys.stderr, '\tA:   discrepant: %3d'%(n_discrepantA)
-    print >>sys.stderr, '\tA:        total: %3d'%(len(sidsA.keys()))
-    print >>sys.stderr, '\tB:       active: %3d'%(n_activeB)
-    print >>sys.stderr, '\tB:     inactive: %3d'%(n_inactiveB)
-    print >>sys.stderr, '\tB: inconclusive: %3d'%(n_inconclusiveB)
-    print >>sys.stderr, '\tB:  unspecified: %3d'%(n_unspecifiedB)
-    print >>sys.stderr, '\tB:   discrepant: %3d'%(n_discrepantB)
-    print >>sys.stderr, '\tB:        total: %3d'%(len(sidsB.keys()))
-    print >>sys.stderr, '\t  common active: %3d'%(n_active_common)
-
-  sim = float(n_active_common) / len(sids_common)
-  print >>sys.stderr, '\t  Tanimoto similarity: %.3f'%(sim)
+  epilog="Example: python3 -m BioClients.pubchem.ftp.pubchem_ftp_assaysim --indir /data/pubchem/bioassay/csv/data --aidfile mlpcn.aid --topk 10 --o mlpcn_assaysim.tsv"
+  parser = argparse.ArgumentParser(description="PubChem assay similarity based on activity profiles", epilog=epilog)
+  parser.add_argument("--aidA", type=int, help="assay ID A (query)")
+  parser.add_argument("--aidB", type=int, help="assay ID B")
+  parser.add_argument("--query_aids", help="query AIDs (comma-separated), vs. all selected")
+  parser.add_argument("--indir", default=DATADIR, help="dir w/ csv.gz assay data, or zips thereof")
+  parser.add_argument("--index_db", help="assay index (SQLite), instead of assay files")
+  parser.add_argument("--load_matrix", help="outcome matrix dir (from --save_matrix), instead of assay files")
+  parser.add_argument("--save_matrix", help="save outcome matrix to dir")
+  parser.add_argument("--aids", help="AIDs to select (comma-separated)")
+  parser.add_argument("--aidfile", help="AIDs to select")
+  parser.add_argument("--topk", type=int, default=10, help="neighbors per query AID (0 for all)")
+  parser.add_argument("--min_sim", type=float, default=0.0, help="minimum similarity")
+  parser.add_argument("--use_cids", action="store_true", help="CIDs instead of SIDs")
+  parser.add_argument("--nproc", type=int, default=1, help="worker processes, parsing assays")
+  parser.add_argument("--o", dest="ofile", help="output neighbor list (TSV, or by extension, e.g. .parquet)")
+  parser.add_argument("-v", "--verbose", default=0, action="count")
+  args = parser.parse_args()
+
+  logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>0 else logging.INFO))
+
+  if args.aidB and not args.aidA: parser.error("--aidB requires --aidA")
+
+  aidset = set(pubchem.ftp.Utils.ReadIds(args.aidfile, args.aids))
+  query_aids = set(pubchem.ftp.Utils.ReadIds(None, args.query_aids))
+  if args.aidA: query_aids.add(args.aidA)
+  if args.aidB: aidset = set([args.aidA, args.aidB])
+  elif aidset and query_aids: aidset |= query_aids
+
+  if args.load_matrix:
+    omat = pubchem.ftp.Utils.OutcomeMatrix.load(args.load_matrix)
+  else:
+    if args.index_db:
+      db = pubchem.ftp.Utils.IndexConnect(args.index_db)
+      files = [(aid, None, None, None) for aid in pubchem.ftp.Utils.IndexAIDs(db, aidset)]
+    else:
+      files = pubchem.ftp.Utils.ListAssayFiles(args.indir, aidset)
+    for aid in sorted(aidset-set([aid for aid,fpath,member,signature in files])):
+      logging.error(f"no data for AID: {aid}")
+    builder = pubchem.ftp.Utils.OutcomeMatrixBuilder()
+    for aid,ids,outcomes in pubchem.ftp.Utils.SweepAssays(files, None, args.use_cids, args.index_db, args.nproc):
+      builder.add(aid, ids, outcomes)
+    omat = builder.build(args.save_matrix) #If save_matrix, built on disk.
+
+  if args.aidB:
+    for aid in (args.aidA, args.aidB):
+      if aid not in omat.aids: parser.error(f"no data for AID: {aid}")
+    rows={}
+    for tag,aid in (('A',args.aidA), ('B',args.aidB)):
+      row = int(np.flatnonzero(omat.aids==aid)[0])
+      rows[tag] = (omat.matrix.indices[omat.matrix.indptr[row]:omat.matrix.indptr[row+1]], np.asarray(omat.matrix.data[omat.matrix.indptr[row]:omat.matrix.indptr[row+1]]))
+      counts = np.bincount(rows[tag][1], minlength=6)
+      logging.debug(f"{tag}: active: {counts[2]}; inactive: {counts[1]}; inconclusive: {counts[3]}; unspecified: {counts[4]}; discrepant: {counts[5]}; total: {counts.sum()}")
+    js,ia,ib = np.intersect1d(rows['A'][0], rows['B'][0], return_indices=True)
+    outA,outB = rows['A'][1][ia],rows['B'][1][ib]
+    tested = (outA!=4)&(outB!=4)
+    n_aa = int(((outA==2)&(outB==2)&tested).sum())
+    n_or = int((((outA==2)|(outB==2))&tested).sum())
+    sim = n_aa/n_or if n_or else 0.0
+    logging.info(f"{'CID' if args.use_cids else 'SID'}s common: {len(js)}; tested common: {tested.sum()}; active common: {n_aa}")
+    logging.info(f"Tanimoto similarity: {sim:.3f}")
+    fout = open(args.ofile, "w") if args.ofile else sys.stdout
+    fout.write("aid\taid_nbr\tn_tested_common\tn_active_common\tsim\n")
+    fout.write(f"{args.aidA}\t{args.aidB}\t{tested.sum()}\t{n_aa}\t{round(sim, 4)}\n")
+    if args.ofile: fout.close()
+
+  else:
+    fout = util_sink.Open(args.ofile)
+    n_pairs=0;
+    for df in pubchem.ftp.Utils.AssayNeighbors(omat, (query_aids if query_aids else None), args.topk, args.min_sim):
+      fout.write(df)
+      n_pairs+=df.shape[0]
+    fout.close()
+    logging.info(f"AIDs: {len(omat.aids)}; queries: {len(query_aids) if query_aids else len(omat.aids)}; neighbor pairs: {n_pairs}")
+
+  if parallel.ReportFailures(): sys.exit(1)
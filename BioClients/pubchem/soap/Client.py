@@ -12,6 +12,7 @@ https://pubchem.ncbi.nlm.nih.gov/pug_soap/pug_soap.cgi?wsdl
 import sys,os,re,time,argparse,logging
 
 from ... import pubchem
+from ...util import rest
 
 #############################################################################
 if __name__=='__main__':
@@ -42,11 +43,15 @@ Synonym, and Registry ID (for specified Source)"""
   parser.add_argument("--poll_wait", type=int, default=pubchem.soap.POLL_WAIT, help="Polling wait interval")
   parser.add_argument("--api_host", default=pubchem.soap.API_HOST)
   parser.add_argument("--api_base_path", default=pubchem.soap.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   api_base_url = f"https://{args.api_host}{args.api_base_path}"
 
   do_gz = args.gz if args.gz else bool(args.ofile and args.ofile[-3:]=='.gz')
@@ -14,6 +14,7 @@ import sys,os,io,re,requests,urllib.request,time,logging
 from xml.etree import ElementTree
 
 from ...util import xml
+from ...util import rest
 
 XMLHEADER = """\
 <?xml version="1.0"?>
@@ -67,12 +68,12 @@ Error status values: "server-error"
 
   def getStatus(self):
     logging.debug(f"Connecting {self.base_url}...")
-    response = requests.post(self.base_url, data=(self.qxml_template.format(header=XMLHEADER, REQID=self.reqid, MODE="status")), headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":"http://pubchem.ncbi.nlm.nih.gov/GetOperationStatus"})
+    response = rest.GetSession().post(self.base_url, data=(self.qxml_template.format(header=XMLHEADER, REQID=self.reqid, MODE="status")), headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":"http://pubchem.ncbi.nlm.nih.gov/GetOperationStatus", **rest.NO_CACHE})
     self.parsePugXml(response.text)
 
   def cancel(self):
     logging.debug(f"Connecting {self.base_url}...")
-    response = requests.post(self.base_url, data=(self.qxml_template.format(header=XMLHEADER, REQID=self.reqid, MODE="cancel")), headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":"http://pubchem.ncbi.nlm.nih.gov/GetOperationStatus"})
+    response = rest.GetSession().post(self.base_url, data=(self.qxml_template.format(header=XMLHEADER, REQID=self.reqid, MODE="cancel")), headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":"http://pubchem.ncbi.nlm.nih.gov/GetOperationStatus", **rest.NO_CACHE})
     self.parsePugXml(response.text)
 
   def parsePugXml(self, pugxml):
@@ -201,7 +202,7 @@ nmax=10000, base_url=API_BASE_URL):
 """
   logging.debug(f"qxml: {qxml}")
   logging.info(f"StructuralSearch: base_url: {base_url}; searchtype: {searchtype}{'(sim>='+str(sim_cutoff)+')' if searchtype.lower()=='search_similarity' else '' }; query: {query}")
-  response = requests.post(base_url, data=qxml, headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":SOAP_ACTIONS[searchtype]})
+  response = rest.GetSession().post(base_url, data=qxml, headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":SOAP_ACTIONS[searchtype], **rest.NO_CACHE})
   return PugSoapRequest(response.text, base_url)
 
 #############################################################################
@@ -269,7 +270,7 @@ def SubmitRequest_IDExchange(ids, ifmt, ofmt, operator, do_gz, base_url=API_BASE
 """)
   logging.debug(f"qxml: {qxml}")
   logging.debug(f"IDExchange: base_url: {base_url}: IDs: {len(ids)}")
-  response = requests.post(base_url, data=qxml, headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":SOAP_ACTIONS["idexchange"]})
+  response = rest.GetSession().post(base_url, data=qxml, headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":SOAP_ACTIONS["idexchange"], **rest.NO_CACHE})
   if response.status_code!=200:
     logging.error(f"(status_code={response.status_code})")
   logging.debug(f"(response.text={response.text})")
@@ -305,7 +306,7 @@ def SubmitRequest_Standardize(id_this, ifmt, ofmt, do_gz, base_url=API_BASE_URL)
 """)
   logging.debug(f"qxml: {qxml}")
   logging.debug(f"Standardize: base_url: {base_url}")
-  response = requests.post(base_url, data=qxml, headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":SOAP_ACTIONS["standardize"]})
+  response = rest.GetSession().post(base_url, data=qxml, headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":SOAP_ACTIONS["standardize"], **rest.NO_CACHE})
   return PugSoapRequest(response.text, base_url)
 
 #############################################################################
@@ -327,7 +328,7 @@ def MonitorQuery(qkey, webenv, fmt='smiles', do_gz=False, base_url=API_BASE_URL)
 """)
   logging.debug(f"qxml: {qxml}")
   logging.debug(f"[MonitorQuery] Requesting: base_url: {base_url}; qkey: {qkey}")
-  response = requests.post(base_url, data=qxml, headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":"http://pubchem.ncbi.nlm.nih.gov/Download"})
+  response = rest.GetSession().post(base_url, data=qxml, headers={"Accept":"text/soap+xml; charset=utf-8", "SOAPAction":"http://pubchem.ncbi.nlm.nih.gov/Download", **rest.NO_CACHE})
   return PugSoapRequest(response.text, base_url)
 
 #############################################################################
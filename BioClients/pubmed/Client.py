@@ -6,6 +6,8 @@ Utility app for the PubMed REST-ful-ish webservices API.
 import sys,os,re,argparse,time,logging
 #
 from .. import pubmed
+from ..util import rest
+from ..util import parallel
 #
 ##############################################################################
 if __name__=='__main__':
@@ -22,12 +24,19 @@ if __name__=='__main__':
   parser.add_argument("--api_base_path", default=pubmed.API_BASE_PATH)
   parser.add_argument("--skip", type=int, default=0)
   parser.add_argument("--nmax", type=int, default=None)
+  parser.add_argument("--concurrency", type=int, default=1, help="max requests in flight")
   parser.add_argument("-q", "--quiet", action="store_true", help="Suppress progress notification.")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>0 else logging.ERROR if args.quiet else 15))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
+  if args.concurrency>rest.REST_POOL_MAXSIZE: rest.ConfigureSession(pool_maxsize=args.concurrency)
+
   base_url = f"https://{args.api_host}{args.api_base_path}"
 
   fout = open(args.ofile, "w") if args.ofile else sys.stdout
@@ -47,7 +56,7 @@ if __name__=='__main__':
   t0=time.time()
 
   if args.op == 'get_esummary':
-    pubmed.GetESummary(ids, args.skip, args.nmax, base_url, fout)
+    pubmed.GetESummary(ids, args.skip, args.nmax, base_url, fout, args.concurrency)
 
   elif args.op == 'get_record':
     pubmed.GetRecord(ids, args.skip, args.nmax, base_url, fout)
@@ -57,3 +66,4 @@ if __name__=='__main__':
 
   logging.info(('elapsed time: %s'%(time.strftime('%Hh:%Mm:%Ss',time.gmtime(time.time()-t0)))))
 
+  if parallel.ReportFailures(): sys.exit(1)
@@ -4,32 +4,30 @@ https://www.ncbi.nlm.nih.gov/pmc/tools/developers/
 https://www.ncbi.nlm.nih.gov/pmc/tools/get-metadata/
 '''
 import os,sys,io,re,json,time,requests,urllib.parse,logging,tqdm,tqdm.auto
-from requests.adapters import HTTPAdapter
-from requests.packages.urllib3.util.retry import Retry
 import pandas as pd
 
 from xml.etree import ElementTree
 
 from .. import util
 from ..util import xml as util_xml
+from ..util import rest
+from ..util import parallel
+from ..util import pandas as util_pandas
 
 API_HOST="eutils.ncbi.nlm.nih.gov"
 API_BASE_PATH="/entrez/eutils"
 BASE_URL=f"https://{API_HOST}{API_BASE_PATH}"
 
 #############################################################################
-def GetESummary(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
-  n_out=0; n_err=0; tq=None; tags=None; df=None; i_this=0;
+def GetESummary(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None, concurrency=1):
+  n_out=0; n_err=0; tq=None; tags=None; df=None; i_this=max(skip-1, 0);
   if skip: logging.debug(f"skip: [1-{skip}]")
-  for id_this in ids:
+  session = rest.GetSession()
+  dfb = util_pandas.FrameBuilder()
+  for id_this,response in parallel.MapOrdered(lambda id_this: session.get(f"{base_url}/esummary.fcgi?db=pubmed&id={id_this}&retmode=json"), ids[i_this:], concurrency):
     i_this+=1
-    if i_this<skip: continue
     if tq is None: tq = tqdm.tqdm(total=(len(ids)-skip if nmax is None else nmax))
-    url_this = f"{base_url}/esummary.fcgi?db=pubmed&id={id_this}&retmode=json"
-    try:
-      response = requests.get(url_this)
-    except Exception as e:
-      logging.error(f"{e}")
+    if response is None:
       n_err+=1
       continue
     if response.status_code!=200:
@@ -50,12 +48,13 @@ def GetESummary(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
       if fout is not None:
         df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       else:
-        df = pd.concat([df, df_this])
+        dfb.append(df_this)
     n_out+=1
     tq.update(n=1)
     if nmax is not None and i_this-skip>nmax: break
   tq.close()
   logging.info(f"n_out: {n_out}; n_err: {n_err}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -63,13 +62,14 @@ def GetRecord(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
   """Only get title, abstract, journal, year.  Must process XML since no retmode=json supported."""
   n_out=0; n_err=0; tq=None; tags=None; df=None; i_this=0;
   if skip: logging.debug(f"skip: [1-{skip}]")
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     i_this+=1
     if i_this<skip: continue
     if tq is None: tq = tqdm.tqdm(total=min(len(ids)-skip, nmax if nmax is not None else float("inf")))
     url_this = f"{base_url}/efetch.fcgi?db=pubmed&id={id_this}"
     try:
-      response = requests.get(url_this)
+      response = rest.GetSession().get(url_this)
     except Exception as e:
       logging.error(f"{e}")
       n_err+=1
@@ -117,11 +117,12 @@ def GetRecord(ids, skip=0, nmax=None, base_url=BASE_URL, fout=None):
       if fout is not None:
         df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       else:
-        df = pd.concat([df, df_this])
+        dfb.append(df_this)
       n_out+=df_this.shape[0]
     tq.update(n=1)
   tq.close()
   logging.info(f"n_ids: {len(ids)}; n_out: {n_out}; n_err: {n_err}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -22,6 +22,7 @@ webapp https://www.ncbi.nlm.nih.gov/CBBresearch/Lu/Demo/PubTator/index.cgi
 import sys,os,time,json,argparse,re,logging
 #
 from .. import pubtator
+from ..util import rest
 #
 API_HOST="www.ncbi.nlm.nih.gov"
 API_BASE_PATH="/CBBresearch/Lu/Demo/RESTful/tmTool.cgi"
@@ -39,11 +40,15 @@ if __name__=='__main__':
   parser.add_argument("--api_host", default=API_HOST)
   parser.add_argument("--api_base_path", default=API_BASE_PATH)
   parser.add_argument("--o", dest="ofile", help="output (TSV)")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   BASE_URL='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
@@ -7,6 +7,7 @@ https://reactome.org/ContentService/data/pathways/top/9606
 import sys,os,re,argparse,time,json,logging
 #
 from .. import reactome
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -50,11 +51,15 @@ Classes:
   parser.add_argument("--o", dest="ofile", help="output file")
   parser.add_argument("--api_host", default=reactome.API_HOST)
   parser.add_argument("--api_base_path", default=reactome.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile,"w") if args.ofile else sys.stdout
@@ -14,6 +14,7 @@ import sys,os,re,json,time,logging
 import pandas as pd
 #
 from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST='reactome.org'
 API_BASE_PATH='/ContentService'
@@ -33,9 +34,11 @@ def DBInfo(base_url=BASE_URL, fout=None):
 def ListToplevelPathways(base_url=BASE_URL, fout=None):
   tags=None; species="9606"; df=pd.DataFrame();
   pathways = rest.GetURL(base_url+f'/data/pathways/top/{species}', parse_json=True)
+  dfb = util_pandas.FrameBuilder()
   for pathway in pathways:
     if not tags: tags = list(pathway.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[pathway[tags[j]]] if tags[j] in pathway else [''] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:(pathway[tags[j]] if tags[j] in pathway else '') for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info('Top-level pathways: {}'.format(df.shape[0]))
   return df
@@ -45,9 +48,11 @@ def ListDiseases(base_url=BASE_URL, fout=None):
   tags=[]; df=pd.DataFrame();
   rval = rest.GetURL(base_url+'/data/diseases', parse_json=True)
   diseases = rval
+  dfb = util_pandas.FrameBuilder()
   for disease in diseases:
     if not tags: tags = list(disease.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[disease[tags[j]]] if tags[j] in disease else [''] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:(disease[tags[j]] if tags[j] in disease else '') for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info('n_diseases: {}'.format(df.shape[0]))
   return df
@@ -56,13 +61,15 @@ def ListDiseases(base_url=BASE_URL, fout=None):
 def QueryEntry(ids, base_url=BASE_URL, fout=None):
   """Stable or database IDs required, such as for disease, or pathway."""
   tags=None; df=pd.DataFrame(); classNames=set();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     rval = rest.GetURL(base_url+f'/data/query/{id_this}', parse_json=True)
     logging.debug(json.dumps(rval, sort_keys=True, indent=2)+'\n')
     ent = rval
     if not tags: tags = list(ent.keys())
     if 'className' in ent: classNames.add(ent['className'])
-    df = pd.concat([df, pd.DataFrame({tags[j]:[ent[tags[j]]] if tags[j] in ent else [''] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:(ent[tags[j]] if tags[j] in ent else '') for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info('n_out {}: {}'.format((list(classNames)), df.shape[0]))
   return df
@@ -71,6 +78,7 @@ def QueryEntry(ids, base_url=BASE_URL, fout=None):
 def GetInteractors(ids, base_url=BASE_URL, fout=None):
   """IDs may be UniProt accessions."""
   tags=None; df=pd.DataFrame(); classNames=set();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     rval = rest.GetURL(base_url+f'/interactors/static/molecule/{id_this}/details', parse_json=True)
     logging.debug(json.dumps(rval, sort_keys=True, indent=2)+'\n')
@@ -80,7 +88,8 @@ def GetInteractors(ids, base_url=BASE_URL, fout=None):
       for intr in intrs:
         if not tags: tags = list(intr.keys())
         if 'className' in intr: classNames.add(intr['className'])
-        df = pd.concat([df, pd.DataFrame({tags[j]:[intr[tags[j]]] if tags[j] in intr else [''] for j in range(len(tags))})])
+        dfb.append_record({tags[j]:(intr[tags[j]] if tags[j] in intr else '') for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info('n_out {}: {}'.format((list(classNames)), df.shape[0]))
   return df
@@ -91,9 +100,11 @@ def ListCompounds(base_url=BASE_URL, fout=None):
   tags=[]; df=pd.DataFrame();
   rval = rest.GetURL(base_url+'/getReferenceMolecules', parse_json=True)
   mols = rval
+  dfb = util_pandas.FrameBuilder()
   for mol in mols:
     if not tags: tags = list(mol.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[mol[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:mol[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info('n_mols: {}'.format(df.shape[0]))
   return df
@@ -106,9 +117,11 @@ def GetPathwaysForEntities(ids, base_url=BASE_URL, fout=None):
   rval = rest.PostURL(base_url+'/pathwaysForEntities', data=d, headers=HEADERS, parse_json=True)
   logging.debug(json.dumps(rval, sort_keys=True, indent=2)+'\n')
   pathways = rval
+  dfb = util_pandas.FrameBuilder()
   for pathway in pathways:
     if not tags: tags = list(set(pathway.keys()))
-    df = pd.concat([df, pd.DataFrame({tags[j]:[pathway[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:pathway[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info('n_in: {}; n_out: {}'.format(len(ids), df.shape[0]))
   return df
@@ -121,9 +134,11 @@ def GetPathwaysForGenes(ids, base_url=BASE_URL, fout=None):
   rval = rest.PostURL(base_url+'/queryHitPathways', data=d, headers=HEADERS, parse_json=True)
   logging.debug(json.dumps(rval, sort_keys=True, indent=2)+'\n')
   pathways = rval
+  dfb = util_pandas.FrameBuilder()
   for pathway in pathways:
     if not tags: tags = list(set(pathway.keys()))
-    df = pd.concat([df, pd.DataFrame({tags[j]:[pathway[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:pathway[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info('n_in: {}; n_out: {}'.format(len(ids), df.shape[0]))
   return df
@@ -135,9 +150,11 @@ def GetPathwayParticipants(id_query, base_url=BASE_URL, fout=None):
   rval = rest.GetURL(base_url+'/pathwayParticipants/'+id_query, parse_json=True)
   logging.debug(json.dumps(rval, sort_keys=True, indent=2)+'\n')
   parts = rval
+  dfb = util_pandas.FrameBuilder()
   for part in parts:
     if not tags: tags = list(set(part.keys()))
-    df = pd.concat([df, pd.DataFrame({tags[j]:[part[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:part[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info('n_in: {}; n_out: {}'.format(len(ids), df.shape[0]))
   return df
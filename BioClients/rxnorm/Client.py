@@ -75,11 +75,15 @@ to chemical compounds.
   parser.add_argument("--api_host", default=rxnorm.API_HOST)
   parser.add_argument("--api_base_path", default=rxnorm.API_BASE_PATH)
   parser.add_argument("--api_key")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   BASE_URL='https://'+args.api_host+args.api_base_path
 
   t0=time.time()
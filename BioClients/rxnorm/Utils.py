@@ -8,6 +8,7 @@ import sys,os,re,json,logging,urllib.parse,tqdm
 import pandas as pd
 
 from ..util import rest
+from ..util import pandas as util_pandas
 
 #
 API_HOST='rxnav.nlm.nih.gov'
@@ -81,20 +82,23 @@ def List_Classes(class_types, base_url=BASE_URL, fout=None):
   rval = rest.GetURL(url, parse_json=True)
   logging.debug(json.dumps(rval, indent=4))
   clss = rval["rxclassMinConceptList"]["rxclassMinConcept"] if "rxclassMinConceptList" in rval and "rxclassMinConcept" in rval["rxclassMinConceptList"] else []
+  dfb = util_pandas.FrameBuilder()
   for cls in clss:
     if not tq: tq = tqdm.tqdm(total=len(clss), unit="classes")
     tq.update()
     if not tags: tags = list(cls.keys())
     df_this = pd.DataFrame({tags[j]:[cls[tags[j]]] for j in range(len(tags))})
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   if fout is None: return df
 
 #############################################################################
 def Get_Name2RxCUI(names, base_url=BASE_URL, fout=None):
   n_out=0; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for name in names:
     rval = rest.GetURL(f'{base_url}/rxcui.json?name={urllib.parse.quote(name)}', parse_json=True)
     logging.debug(json.dumps(rval, indent=4))
@@ -102,15 +106,17 @@ def Get_Name2RxCUI(names, base_url=BASE_URL, fout=None):
     rxnormIds = idGroup["rxnormId"] if idGroup and "rxnormId" in idGroup else []
     for rxnormId in rxnormIds:
       df_this = pd.DataFrame({"name":[idGroup["name"]], "rxnormId":rxnormId})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   if fout is None: return df
 
 #############################################################################
 def Get_Name(names, base_url=BASE_URL, fout=None):
   n_out=0; tags=None; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for name in names:
     rval = rest.GetURL(f'{base_url}/drugs.json?name={urllib.parse.quote(name)}', parse_json=True)
     logging.debug(json.dumps(rval, indent=4))
@@ -121,25 +127,28 @@ def Get_Name(names, base_url=BASE_URL, fout=None):
       for cprop in cprops:
         if not tags: tags = list(cprop.keys())
         df_this = pd.DataFrame({tags[j]:[cprop[tags[j]]] for j in range(len(tags))})
-        if fout is None: df = pd.concat([df, df_this])
+        if fout is None: dfb.append(df_this)
         else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
         n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   if fout is None: return df
 
 #############################################################################
 def Get_ID2RxCUI(ids, idtype, base_url=BASE_URL, fout=None):
   """For mapping external ID, for supported ID types, to RxNorm ID."""
   n_out=0; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     rval = rest.GetURL(f'{base_url}/rxcui.json?idtype={idtype}&id={id_this}', parse_json=True)
     logging.debug(json.dumps(rval, indent=4))
     for rxcui in rval['idGroup']['rxnormId']:
       df_this = pd.DataFrame({"idtype":idtype, "id":[id_this], "rxnormId":rxcui})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += df_this.shape[0]
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   if fout is None: return df
 
 #############################################################################
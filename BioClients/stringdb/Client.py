@@ -17,6 +17,7 @@ stitch.embl.de
 import sys,os,re,json,argparse,time,logging
 #
 from .. import stringdb
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -41,11 +42,15 @@ Image formats: PNG|PNG_highres|SVG
   parser.add_argument("--imgfmt", choices=stringdb.IMG_FMTS, default='image', help="image format")
   parser.add_argument("--api_host", default=stringdb.API_HOST)
   parser.add_argument("--api_base_path", default=stringdb.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url='https://'+args.api_host+args.api_base_path
 
   ids=[]
@@ -17,6 +17,8 @@ stitch.embl.de
 import sys,os,re,json,time,logging
 import pandas as pd
 import requests,urllib,urllib.request,urllib.parse
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST='string-db.org'
 API_BASE_PATH='/api'
@@ -28,14 +30,16 @@ IMG_FMTS=['image', 'highres_image', 'svg']
 ##############################################################################
 def GetIds(ids, base_url=BASE_URL, fout=None):
   tags=[]; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = f"{base_url}/json/get_string_ids?identifier={id_this}"
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     results = response.json()
     for result in results:
       logging.debug(result)
       if not tags: tags = list(result.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[result[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:result[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"queries: {len(ids)}; results: {df.shape[0]}")
   return df
@@ -44,17 +48,19 @@ def GetIds(ids, base_url=BASE_URL, fout=None):
 def GetInteractionPartners(ids, species, limit, minscore, base_url=BASE_URL, fout=None):
   """ALL interacting proteins, up to limit (ordered by confidence)"""
   tags=[]; df=pd.DataFrame();
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = f"{base_url}/json/interaction_partners?identifier={id_this}"
     if species: url_this+=(f'&species={species}')
     if limit: url_this+=(f'&limit={limit}')
     if minscore: url_this+=(f'&required_score={minscore}')
-    response = requests.get(url_this)
+    response = rest.GetSession().get(url_this)
     results = response.json()
     for result in results:
       logging.debug(result)
       if not tags: tags = list(result.keys())
-      df = pd.concat([df, pd.DataFrame({tags[j]:[result[tags[j]]] for j in range(len(tags))})])
+      dfb.append_record({tags[j]:result[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"queries: {len(ids)}; interaction partners: {df.shape[0]}")
   return df
@@ -66,12 +72,14 @@ def GetEnrichment(ids, species, minscore, base_url=BASE_URL, fout=None):
   url = f"{base_url}/json/enrichment?identifiers={ids_param}"
   if species: url+=(f'&species={species}')
   if minscore: url+=(f'&required_score={minscore}')
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   results = response.json()
+  dfb = util_pandas.FrameBuilder()
   for result in results:
     logging.debug(result)
     if not tags: tags = list(result.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[result[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:result[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"queries: {len(ids)}; enrichment results: {df.shape[0]}")
   return df
@@ -83,12 +91,14 @@ def GetPPIEnrichment(ids, species, minscore, base_url=BASE_URL, fout=None):
   url = f"{base_url}/json/ppi_enrichment?identifiers={ids_param}"
   if species: url+=(f'&species={species}')
   if minscore: url+=(f'&required_score={minscore}')
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   results = response.json()
+  dfb = util_pandas.FrameBuilder()
   for result in results:
     logging.debug(result)
     if not tags: tags = list(result.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[result[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:result[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"queries: {len(ids)}; enrichment results: {df.shape[0]}")
   return df
@@ -100,13 +110,15 @@ def GetNetwork(nid, species, minscore, netflavor, base_url=BASE_URL, fout=None):
   if species: url+=(f'&species={species}')
   if minscore: url+=(f'&required_score={minscore}')
   if netflavor: url+=(f'&network_flavor={netflavor}')
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   edges = response.json()
   logging.debug(json.dumps(edges, indent=2))
+  dfb = util_pandas.FrameBuilder()
   for edge in edges:
     logging.debug(edge)
     if not tags: tags = list(edge.keys())
-    df = pd.concat([df, pd.DataFrame({tags[j]:[edge[tags[j]]] for j in range(len(tags))})])
+    dfb.append_record({tags[j]:edge[tags[j]] for j in range(len(tags))})
+  df = dfb.frame(df)
   if fout: df.to_csv(fout, sep="\t", index=False)
   logging.info(f"edges: {df.shape[0]}")
   return df
@@ -118,7 +130,7 @@ def GetNetworkImage(nid, species, minscore, netflavor, imgfmt, base_url=BASE_URL
   if species: url+=(f'&species={species}')
   if minscore: url+=(f'&required_score={minscore}')
   if netflavor: url+=(f'&network_flavor={netflavor}')
-  response = requests.get(url)
+  response = rest.GetSession().get(url)
   img = response.content
   if fout is not None:
     fout.write(img)
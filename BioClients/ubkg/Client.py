@@ -8,6 +8,7 @@ import pandas as pd
 #
 from .. import ubkg
 from .. import umls
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -47,11 +48,15 @@ The Data Distillery Knowledge Graph (DDKG) is a context (extension) of the Unifi
   parser.add_argument("--api_base_path", default=ubkg.API_BASE_PATH)
   parser.add_argument("--api_key", help="UMLS API Key")
   parser.add_argument("--param_file", default=os.environ['HOME']+"/.umls.yaml")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   BASE_URL='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile,"w") if args.ofile else sys.stdout
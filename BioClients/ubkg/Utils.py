@@ -6,6 +6,8 @@ C0006142,C0678222
 """
 import sys,os,re,requests,urllib,json,time,logging,tqdm
 import pandas as pd
+from ..util import rest
+from ..util import pandas as util_pandas
 
 #
 #API_HOST="datadistillery.api.sennetconsortium.org"
@@ -20,7 +22,7 @@ HEADERS={"Accept":"application/json"}
 ##############################################################################
 def Info(api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
-  response = requests.get(base_url+"/database/server", headers=headers)
+  response = rest.GetSession().get(base_url+"/database/server", headers=headers)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   df = pd.DataFrame({"field":result.keys(), "value":result.values()})
@@ -30,7 +32,7 @@ def Info(api_key, base_url=BASE_URL, fout=None):
 ##############################################################################
 def ListSABs(api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
-  response = requests.get(base_url+"/sabs", headers=headers)
+  response = rest.GetSession().get(base_url+"/sabs", headers=headers)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   df = pd.DataFrame({"sabs":result["sabs"]})
@@ -41,10 +43,11 @@ def ListSABs(api_key, base_url=BASE_URL, fout=None):
 def ListSources(context, sab, api_key, base_url=BASE_URL, fout=None):
   n_out=0; df=None; tags=None;
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
-  response = requests.get(base_url+f"/sources?context={context}", headers=headers)
+  response = rest.GetSession().get(base_url+f"/sources?context={context}", headers=headers)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   sources = result["sources"]
+  dfb = util_pandas.FrameBuilder()
   for source in sources:
     if not tags:
       tags = list(source.keys())
@@ -64,16 +67,17 @@ def ListSources(context, sab, api_key, base_url=BASE_URL, fout=None):
         else:
           source[tag] = str(source[tag])
       df_this = pd.DataFrame({tag:[(source[tag] if tag in source else None)] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=df_this.shape[0]
   logging.info(f"Sources: {n_out}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def ListNodeTypes(api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
-  response = requests.get(base_url+"/node-types", headers=headers)
+  response = rest.GetSession().get(base_url+"/node-types", headers=headers)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   df = pd.DataFrame(result)
@@ -86,23 +90,25 @@ def ListNodeTypeCounts(api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
   node_types = ListNodeTypes(api_key, base_url)["node_types"]
   n_type=0; n_out=0; df=None;
+  dfb = util_pandas.FrameBuilder()
   for node_type in node_types:
     n_type+=1
-    response = requests.get(f"{base_url}/node-types/{node_type}/counts", headers=headers)
+    response = rest.GetSession().get(f"{base_url}/node-types/{node_type}/counts", headers=headers)
     result = response.json()
     logging.debug(json.dumps(result, sort_keys=True, indent=2))
     df_this = pd.DataFrame(result)
     df_this.insert(loc=0, column='node_type', value=node_type)
     df_this = df_this[["node_type", "total_count"]]
     if fout: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out += 1
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def ListRelationshipTypes(api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
-  response = requests.get(base_url+"/relationship-types", headers=headers)
+  response = rest.GetSession().get(base_url+"/relationship-types", headers=headers)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   df = pd.DataFrame(result)
@@ -113,7 +119,7 @@ def ListRelationshipTypes(api_key, base_url=BASE_URL, fout=None):
 ##############################################################################
 def ListPropertyTypes(api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
-  response = requests.get(base_url+"/property-types", headers=headers)
+  response = rest.GetSession().get(base_url+"/property-types", headers=headers)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   df = pd.DataFrame(result)
@@ -124,7 +130,7 @@ def ListPropertyTypes(api_key, base_url=BASE_URL, fout=None):
 ##############################################################################
 def ListSemanticTypes(api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
-  response = requests.get(base_url+"/semantics/semantic-types", headers=headers)
+  response = rest.GetSession().get(base_url+"/semantics/semantic-types", headers=headers)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   semantic_types = result["semantic_types"]
@@ -137,9 +143,10 @@ def ListSemanticTypes(api_key, base_url=BASE_URL, fout=None):
 def GetConcept2Codes(ids, api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
   n_in=0; n_out=0; n_code=0; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_in += 1
-    response = requests.get(f"{base_url}/concepts/{id_this}/codes", headers=headers)
+    response = rest.GetSession().get(f"{base_url}/concepts/{id_this}/codes", headers=headers)
     if not response:
       continue
     result = response.json()
@@ -148,19 +155,21 @@ def GetConcept2Codes(ids, api_key, base_url=BASE_URL, fout=None):
     if not codes or len(codes)==0: continue
     df_this = pd.DataFrame({"concept":[id_this for i in range(len(codes))], "code":codes})
     if fout: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out += 1
     n_code += len(codes)
   logging.info(f"Concepts in: {n_in}; out: {n_out}; codes out: {n_code}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def GetConcept2Concepts(ids, api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
   n_in=0; n_out=0; n_concept=0; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_in += 1
-    response = requests.get(f"{base_url}/concepts/{id_this}/concepts", headers=headers)
+    response = rest.GetSession().get(f"{base_url}/concepts/{id_this}/concepts", headers=headers)
     if not response:
       continue
     result = response.json()
@@ -171,19 +180,21 @@ def GetConcept2Concepts(ids, api_key, base_url=BASE_URL, fout=None):
     df_this.columns = ["conceptB", "preftermB", "relationship", "sabB"]
     df_this.insert(loc=0, column='conceptA', value=id_this)
     if fout: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out += 1
     n_concept += len(concepts)
   logging.info(f"Concepts in: {n_in}; out: {n_out}; concepts out: {n_concept}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
 def GetConcept2Definitions(ids, api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
   n_in=0; n_out=0; n_def=0; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     n_in += 1
-    response = requests.get(f"{base_url}/concepts/{id_this}/definitions", headers=headers)
+    response = rest.GetSession().get(f"{base_url}/concepts/{id_this}/definitions", headers=headers)
     if not response:
       continue
     result = response.json()
@@ -194,10 +205,11 @@ def GetConcept2Definitions(ids, api_key, base_url=BASE_URL, fout=None):
     df_this = df_this[["sab", "definition"]]
     df_this.insert(loc=0, column='concept', value=id_this)
     if fout: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
-    else: df = pd.concat([df, df_this])
+    else: dfb.append(df_this)
     n_out += 1
     n_def += len(defs)
   logging.info(f"Concepts in: {n_in}; out: {n_out}; defs out: {n_def}")
+  df = dfb.frame(df)
   return df
 
 ##############################################################################
@@ -207,7 +219,7 @@ def GetConcept2Paths(ids, sab, rel, mindepth, maxdepth, api_key, base_url=BASE_U
   n_in=0; n_node_out=0; n_edge_out=0;
   for id_this in ids:
     n_in += 1
-    response = requests.get(f"{base_url}/concepts/{id_this}/paths/expand?sab={sab}&rel={rel}&mindepth={mindepth}&maxdepth={maxdepth}&skip=0&limit=10", headers=headers)
+    response = rest.GetSession().get(f"{base_url}/concepts/{id_this}/paths/expand?sab={sab}&rel={rel}&mindepth={mindepth}&maxdepth={maxdepth}&skip=0&limit=10", headers=headers)
     if not response:
       continue
     result = response.json()
@@ -224,7 +236,7 @@ def GetConcept2Trees(ids, sab, rel, mindepth, maxdepth, api_key, base_url=BASE_U
   n_in=0; n_node_out=0; n_edge_out=0;
   for id_this in ids:
     n_in += 1
-    response = requests.get(f"{base_url}/concepts/{id_this}/paths/trees?sab={sab}&rel={rel}&mindepth={mindepth}&maxdepth={maxdepth}&skip=0&limit=10", headers=headers)
+    response = rest.GetSession().get(f"{base_url}/concepts/{id_this}/paths/trees?sab={sab}&rel={rel}&mindepth={mindepth}&maxdepth={maxdepth}&skip=0&limit=10", headers=headers)
     if not response:
       continue
     result = response.json()
@@ -237,7 +249,7 @@ def GetConcept2Trees(ids, sab, rel, mindepth, maxdepth, api_key, base_url=BASE_U
 ##############################################################################
 def GetTerm2Concepts(term, api_key, base_url=BASE_URL, fout=None):
   headers = {**HEADERS, **{"UMLS-Key": api_key}}
-  response = requests.get("{}/terms/{}/concepts".format(base_url, urllib.parse.quote(term)), headers=headers)
+  response = rest.GetSession().get("{}/terms/{}/concepts".format(base_url, urllib.parse.quote(term)), headers=headers)
   if not response:
     logging.info(f"Not found: {term}")
     return
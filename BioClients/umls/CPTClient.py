@@ -14,6 +14,8 @@ https://cts.nlm.nih.gov/fhir/res/CodeSystem/$lookup?system=http://www.ama-assn.o
 import sys,os,argparse,re,yaml,json,logging,requests,urllib,time
 #
 from .. import umls
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST="cts.nlm.nih.gov"
 API_BASE_PATH="/fhir/res/CodeSystem"
@@ -36,7 +38,7 @@ def CPTLogin(api_key):
           'username':'apikey',
           'password':api_key
           }
-  response = requests.post(url_this, headers=headers, data=data)
+  response = rest.GetSession().post(url_this, headers=headers, data=data)
   if (response.status_code!=200):
     logging.error(f"(status_code={response.status_code};{response.reason};{response.text}): url_this: {url_this}")
     return
@@ -62,9 +64,10 @@ def GetCPTCodes(ids, api_key, base_url, fout=None):
           "Accept": "application/json"
           }
   n_out=0; df=None;
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
     url_this = f"{base_url}&code={id_this}"
-    response = requests.get(url_this, headers=headers)
+    response = rest.GetSession().get(url_this, headers=headers)
     if (response.status_code!=200):
       logging.error(f"(status_code={response.status_code};{response.reason};{response.text}): url_this: {url_this}")
       continue
@@ -74,11 +77,12 @@ def GetCPTCodes(ids, api_key, base_url, fout=None):
 
 
     df_this = pd.DataFrame({'CPT_code':[id_this], 'name': 'TBA'})
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
     else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
     n_out+=1
   logging.info(f'n_id: {len(ids)}')
   logging.info(f'n_out: {n_out}')
+  df = dfb.frame(df)
   if fout is None: return df
 
 #############################################################################
@@ -103,12 +107,16 @@ From the AMA website, https://www.ama-assn.org/topics/cpt-codes:
   parser.add_argument("--api_code_version", default=API_CODE_VERSION)
   parser.add_argument("--param_file", default=os.environ['HOME']+"/.umls.yaml")
   parser.add_argument("--api_key", help="API key")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
 
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url = f"https://{args.api_host}{args.api_base_path}/$lookup?system={urllib.parse.quote(args.api_code_system)}&version={args.api_code_version}"
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
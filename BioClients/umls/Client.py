@@ -45,6 +45,7 @@ UTS = UMLS Technology Services
 import sys,os,argparse,re,yaml,json,csv,logging,requests,time
 #
 from .. import umls
+from ..util import rest
 #
 #############################################################################
 if __name__=='__main__':
@@ -78,6 +79,8 @@ Example CUIs: C34488, C0018787, C0016644
   parser.add_argument("--api_auth_service", default=umls.API_AUTH_SERVICE)
   parser.add_argument("--param_file", default=os.environ['HOME']+"/.umls.yaml")
   parser.add_argument("--api_key", help="API key")
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
 
   args = parser.parse_args()
@@ -87,6 +90,8 @@ Example CUIs: C34488, C0018787, C0016644
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   base_url='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
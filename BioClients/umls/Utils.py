@@ -30,6 +30,7 @@ from lxml import etree
 from pyquery import PyQuery
 #
 from ..util import rest
+from ..util import pandas as util_pandas
 #
 ###
 API_HOST='uts-ws.nlm.nih.gov'
@@ -118,7 +119,7 @@ class Authentication:
     self.verbosity=0
 
   def gettgt(self):
-    response = requests.post(self.url, data={'apikey':self.apikey}, headers=self.headers)
+    response = rest.GetSession().post(self.url, data={'apikey':self.apikey}, headers=self.headers)
     logging.debug(f'response = {response}')
     d = PyQuery(response.text)
 
@@ -133,7 +134,7 @@ class Authentication:
     return tgt
 
   def getst(self, tgt):
-    r = requests.post(tgt, data={'service':self.service}, headers=self.headers)
+    r = rest.GetSession().post(tgt, data={'service':self.service}, headers=self.headers)
     st = r.text
     return st
 
@@ -157,7 +158,7 @@ def UmlsApiGet(url, auth, tgt, params={}, tries=10, sleep=1):
   for i in range(1,tries+1):
     try:
       params['ticket'] = UmlsAuthGetTicket(auth, tgt)
-      response = requests.get(url, params=params)
+      response = rest.GetSession().get(url, params=params)
       return response
     except Exception as e:
       logging.error(f'{i}. {e}')
@@ -247,17 +248,19 @@ def XrefConcept(src, ids, skip, nmax, auth, ver=API_VERSION, base_url=API_BASE_U
 #############################################################################
 def GetCodes(cuis, srcs, auth, ver=API_VERSION, base_url=API_BASE_URL, fout=None):
   n_out=0; df=None;
+  dfb = util_pandas.FrameBuilder()
   for cui in cuis:
     codes = Cui2Code(cui, srcs, auth, ver, base_url)
     for src in sorted(codes.keys()):
       atoms = sorted(list(codes[src]))
       for atom in atoms:
         df_this = pd.DataFrame({'CUI':[cui], 'src':[src], 'atom_code':atom.code, 'atom_name':atom.name})
-        if fout is None: df = pd.concat([df, df_this])
+        if fout is None: dfb.append(df_this)
         else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
         n_out+=1
   logging.info(f'n_cui: {len(cuis)}')
   logging.info(f'n_out: {n_out}')
+  df = dfb.frame(df)
   if fout is None: return df
 
 #############################################################################
@@ -306,6 +309,7 @@ def GetAtoms(cuis, skip, nmax, srcs, auth, ver=API_VERSION, base_url=API_BASE_UR
   '''Expected fields: sourceDescriptor,suppressible,code,name,language,descendants,classType,sourceConcept,obsolete,relations,parents,children,concept,ui,rootSource,definitions,attributes,ancestors,termType'''
   n_in=0; n_atom=0; n_out=0; df=None; tags=None;
   tgt = auth.gettgt()
+  dfb = util_pandas.FrameBuilder()
   for cui in cuis:
     n_in+=1
     if skip and n_in<=skip:
@@ -335,7 +339,7 @@ def GetAtoms(cuis, skip, nmax, srcs, auth, ver=API_VERSION, base_url=API_BASE_UR
         for tag in ('relations', 'parents', 'children','descendants','ancestors', 'attributes', 'contentViewMemberships'):
             if tag in atom and atom[tag]!='NONE': atom[tag] = '*'
         df_this = pd.DataFrame({tag:[atom[tag] if tag in atom else ''] for tag in tags})
-        if fout is None: df = pd.concat([df, df_this])
+        if fout is None: dfb.append(df_this)
         else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
         n_out+=1
       pageSize = items["pageSize"]
@@ -352,12 +356,14 @@ def GetAtoms(cuis, skip, nmax, srcs, auth, ver=API_VERSION, base_url=API_BASE_UR
     if nmax and n_in==nmax: break
   logging.info(f'n_atom: {n_atom}')
   logging.info(f'n_out: {n_out}')
+  df = dfb.frame(df)
   if fout is None: return df
 
 #############################################################################
 def GetRelations(cuis, skip, nmax, srcs, auth, ver=API_VERSION, base_url=API_BASE_URL, fout=None):
   n_in=0; n_rel=0; n_out=0; tags=None; df=None;
   tgt = auth.gettgt()
+  dfb = util_pandas.FrameBuilder()
   for cui in cuis:
     n_in+=1
     if skip and n_in<=skip:
@@ -386,7 +392,7 @@ def GetRelations(cuis, skip, nmax, srcs, auth, ver=API_VERSION, base_url=API_BAS
         if not tags: tags = list(rel.keys())
         df_this = pd.DataFrame({tag:[rel[tag] if tag in rel else ''] for tag in tags})
         df_this["cui"] = [cui]
-        if fout is None: df = pd.concat([df, df_this])
+        if fout is None: dfb.append(df_this)
         else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
         n_out+=1
       pageSize = items["pageSize"]
@@ -402,6 +408,7 @@ def GetRelations(cuis, skip, nmax, srcs, auth, ver=API_VERSION, base_url=API_BAS
     if nmax and n_in==nmax: break
   logging.info(f'n_rel: {n_rel}')
   logging.info(f'n_out: {n_out}')
+  df = dfb.frame(df)
   if fout is None: return df
 
 #############################################################################
@@ -415,6 +422,7 @@ See https://documentation.uts.nlm.nih.gov/rest/search/
   params = {'string':query, 'searchType':searchType, 'inputType':inputType, 'returnIdType':returnIdType}
   if srcs: params['sabs'] = srcs
   tgt = auth.gettgt()
+  dfb = util_pandas.FrameBuilder()
   while True:
     params['pageNumber']=pNum
     logging.debug(f"url: {url}; params: {str(params)}")
@@ -445,7 +453,7 @@ See https://documentation.uts.nlm.nih.gov/rest/search/
           src_counts[item['rootSource']]=0
         src_counts[item['rootSource']]+=1
       df_this = pd.DataFrame({tag:[item[tag] if tag in item else ''] for tag in tags})
-      if fout is None: df = pd.concat([df, df_this])
+      if fout is None: dfb.append(df_this)
       else: df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out+=1
     pNum+=1
@@ -453,6 +461,7 @@ See https://documentation.uts.nlm.nih.gov/rest/search/
   logging.info(f'n_out: {n_out}')
   for src in sorted(src_counts.keys()):
     logging.info(f'{src:16s}: {src_counts[src]:3d} items')
+  df = dfb.frame(df)
   if fout is None: return df
 
 #############################################################################
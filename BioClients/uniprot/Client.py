@@ -6,6 +6,7 @@ UniprotKB = Uniprot Knowledge Base
 import sys,os,re,argparse,time,logging
 #
 from .. import uniprot
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -24,11 +25,15 @@ if __name__=='__main__':
   parser.add_argument("--search_fields", default=uniprot.DEFAULT_SEARCH_FIELDS, help="search fields, comma-separated")
   parser.add_argument("--api_host", default=uniprot.API_HOST)
   parser.add_argument("--api_base_path", default=uniprot.API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v", "--verbose", default=0, action="count")
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   BASE_URI='https://'+args.api_host+args.api_base_path
 
   fout = open(args.ofile, 'w') if args.ofile else sys.stdout
@@ -8,6 +8,8 @@ import sys,os,re,json,logging
 #
 import requests,tqdm
 import pandas as pd
+from ..util import rest
+from ..util import pandas as util_pandas
 #
 API_HOST='rest.uniprot.org'
 API_BASE_PATH='/uniprotkb'
@@ -20,8 +22,9 @@ def GetNames(base_uri, ids, fout):
   params = { "fields": [ "accession", "protein_name" ] }
   headers = { "accept": "application/json" }
 
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_uri}/{id_this}", headers=headers, params=params)
+    response = rest.GetSession().get(f"{base_uri}/{id_this}", headers=headers, params=params)
     #logging.debug(response.text)
     result = response.json()
     logging.debug(json.dumps(result, sort_keys=True, indent=2))
@@ -53,9 +56,10 @@ def GetNames(base_uri, ids, fout):
     if fout is not None:
       df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
       n_out += 1
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
 
   logging.info(f"n_in: {len(ids)}; n_out: {n_out}; n_err: {n_err}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -66,8 +70,9 @@ def GetFunctions(base_uri, ids, fout):
   params = { "fields": [ "accession", "cc_function" ] }
   headers = { "accept": "application/json" }
 
+  dfb = util_pandas.FrameBuilder()
   for id_this in ids:
-    response = requests.get(f"{base_uri}/{id_this}", headers=headers, params=params)
+    response = rest.GetSession().get(f"{base_uri}/{id_this}", headers=headers, params=params)
     #logging.debug(response.text)
     result = response.json()
     logging.debug(json.dumps(result, sort_keys=True, indent=2))
@@ -111,10 +116,11 @@ def GetFunctions(base_uri, ids, fout):
           if fout is not None:
             df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
             n_out_this+=1
-          if fout is None: df = pd.concat([df, df_this])
+          if fout is None: dfb.append(df_this)
     if n_out_this>0: n_out+=1
 
   logging.info(f"n_in: {len(ids)}; n_out: {n_out}; n_comment: {n_comment}; n_text: {n_text}; n_evidence: {n_evidence}; n_err: {n_err}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -123,13 +129,14 @@ def ListSearchFields(base_uri, fout):
   tags_base=["id", "groupName", "isDataBaseGroup"];
   tags_field=["id", "label", "name", "isMultiValueCrossReference"];
   headers = { "accept": "application/json" }
-  response = requests.get(f"https://{API_HOST}/configure/uniprotkb/result-fields", headers=headers)
+  response = rest.GetSession().get(f"https://{API_HOST}/configure/uniprotkb/result-fields", headers=headers)
   result = response.json()
   logging.debug(json.dumps(result, sort_keys=True, indent=2))
   if not response.ok or response.status_code != 200:
     response.raise_for_status()
     logging.error(f"status_code: {response.status_code}")
   sfs = result
+  dfb = util_pandas.FrameBuilder()
   for sf in sfs:
     #if not tags: tags = [key if type(sf[key]) not in (list, dict) else None for key in sf.keys()]
     df_this_base = pd.DataFrame({tag:[sf[tag]] if tag in sf else None for tag in tags_base})
@@ -142,8 +149,9 @@ def ListSearchFields(base_uri, fout):
       if fout is not None:
         df_this.to_csv(fout, sep="\t", index=False, header=bool(n_out==0))
         n_out+=1
-    if fout is None: df = pd.concat([df, df_this])
+    if fout is None: dfb.append(df_this)
   logging.info(f"n_out: {n_out}")
+  df = dfb.frame(df)
   return df
 
 #############################################################################
@@ -157,7 +165,7 @@ def Search(base_uri, query, search_fields, fout):
           "fields": [ "accession", "protein_name", "cc_funtion", "ft_binding" ] }
   headers = { "accept": "application/json" }
 
-  response = requests.get(f"{base_uri}/search", headers=headers, params=params)
+  response = rest.GetSession().get(f"{base_uri}/search", headers=headers, params=params)
 
 
 #############################################################################
@@ -175,7 +183,7 @@ def GetData(base_uri, ids, fout):
   headers = { "accept": "application/json" }
 
   for id_this in ids:
-    response = requests.get(f"{base_uri}/{id_this}", headers=headers, params=params)
+    response = rest.GetSession().get(f"{base_uri}/{id_this}", headers=headers, params=params)
     #logging.debug(response.text)
     result = response.json()
     logging.debug(json.dumps(result, sort_keys=True, indent=2))
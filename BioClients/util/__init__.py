@@ -1,3 +1,3 @@
 """Miscellaneous utilities for web service clients."""
 
-__all__ = [ "pandas", "rest", "sparql", "xml", "yaml" ]
+__all__ = [ "pandas", "parallel", "rest", "sink", "sparql", "xml", "yaml" ]
@@ -15,6 +15,10 @@ Note that this is a kind of "Platonic" IC; in contrast, a set of
 annotated disease instances could have a sampled IC which depends
 on the frequency of each DO annotation.  In that scenario, an unused
 disease has no effect on the sampled IC.
+The ic_computeCorpusIC operation computes this corpus IC, from an
+annotation TSV (--annotations, e.g. gene or disease instance to term),
+as "ic_corpus", alongside structural IC; simmatrix_fast uses it with
+--ic_attr ic_corpus.
 
 Used for Disease Ontology, as converted to GraphML with
 BioClients.util.obo.App and Go_do_graph_IC.sh.
@@ -23,6 +27,7 @@ BioClients.util.obo.App and Go_do_graph_IC.sh.
 import sys,os,argparse,logging,re
 
 from .. import igraph as util_igraph
+from .. import parallel
 
 #############################################################################
 def TestMICA(g, nidA, nidB):
@@ -53,6 +58,10 @@ NOTE: select also deletes non-matching for modified output.
 Info content (IC) and most informative common ancestor (MICA) for directed
 acyclic graph (DAG).
 simMatrixNodelist outputs vertex indices with node IDs.  simMatrix with --nidA to compute one row.
+ic_computeCorpusIC: IC from annotation frequencies (--annotations TSV).
+simmatrix_fast: as ic_simMatrix, via precomputed ancestor closure index (bitsets);
+in --nproc processes, with --min_sim threshold, --topk neighbors per node to --o_topk,
+and output format by --o extension (e.g. .npz sparse matrix, .parquet, .tsv).
 """
   parser = argparse.ArgumentParser(description="IGraph (python-igraph API) utility, graph processingand display", epilog=epilog)
   ops = ["summary",
@@ -66,7 +75,8 @@ simMatrixNodelist outputs vertex indices with node IDs.  simMatrix with --nidA t
 	"disconnectednodes",
 	"node_select",
 	"edge_select",
-	"ic_computeIC", "ic_findMICA", "ic_simMatrix", "ic_simMatrixNodelist", "ic_test" ]
+	"ic_computeIC", "ic_findMICA", "ic_simMatrix", "ic_simMatrixNodelist", "ic_test",
+	"ic_computeCorpusIC", "simmatrix_fast" ]
   parser.add_argument("op", choices=ops, help='OPERATION')
   parser.add_argument("--i", dest="ifile", required=True, help="input file or URL (e.g. GraphML)")
   parser.add_argument("--o", dest="ofile", help="output file")
@@ -87,6 +97,13 @@ simMatrixNodelist outputs vertex indices with node IDs.  simMatrix with --nidA t
   parser.add_argument("--nidB", help="nodeB ID")
   parser.add_argument("--nmax", type=int)
   parser.add_argument("--skip", type=int)
+  parser.add_argument("--annotations", help="annotations TSV (with header; e.g. gene, term), for ic_computeCorpusIC")
+  parser.add_argument("--annot_termcol", help="annotations term ID column (default 2nd)")
+  parser.add_argument("--ic_attr", default="ic", help="IC node attribute (e.g. ic_corpus), for simmatrix_fast")
+  parser.add_argument("--min_sim", type=float, default=0.0, help="minimum similarity (IC of MICA), for simmatrix_fast")
+  parser.add_argument("--topk", type=int, help="top-k neighbors per node, for simmatrix_fast")
+  parser.add_argument("--o_topk", dest="ofile_topk", help="output top-k neighbors per node (TSV, or by extension)")
+  parser.add_argument("--nproc", type=int, default=1, help="worker processes, for simmatrix_fast")
   parser.add_argument("--recursionlimit", type=int, default=sys.getrecursionlimit())
   parser.add_argument("--quiet", action="store_true")
   parser.add_argument("-v", "--verbose", dest="verbose", action="count", default=0)
@@ -180,6 +197,23 @@ simMatrixNodelist outputs vertex indices with node IDs.  simMatrix with --nidA t
     vidxA = g.vs.find(id=args.nidA).index if args.nidA else None
     util_igraph.SimMatrix(g, vidxA, args.skip, args.nmax, fout)
 
+  elif args.op == 'ic_computeCorpusIC':
+    if not g.is_dag(): parser.error(f"Graph not DAG; required for operation: {args.op}")
+    if not args.annotations: parser.error(f"--annotations required for operation: {args.op}")
+    counts = util_igraph.ReadAnnotationCounts(args.annotations, args.annot_termcol)
+    util_igraph.ComputeCorpusInfoContent(g, counts)
+    util_igraph.Save_GraphML(g, fout)
+
+  elif args.op == 'simmatrix_fast':
+    if not g.is_dag(): parser.error(f"Graph not DAG; required for operation: {args.op}")
+    if args.topk and not args.ofile_topk: parser.error("--topk requires --o_topk")
+    if args.ic_attr not in g.vs.attributes(): parser.error(f"IC attribute not found: {args.ic_attr}")
+    cindex = util_igraph.ClosureIndex(g, args.ic_attr)
+    if args.nidA:
+      util_igraph.SimMatrixFast(g, g.vs.find(id=args.nidA).index, args.skip, args.nmax, fout, cindex)
+    else:
+      util_igraph.SimMatrixParallel(g, args.ofile, args.min_sim, args.topk, args.ofile_topk, args.nproc, skip=args.skip, nmax=args.nmax, cindex=cindex)
+
   elif args.op == 'ic_simMatrixNodelist':
     util_igraph.SimMatrixNodelist(g, fout)
 
@@ -201,3 +235,4 @@ simMatrixNodelist outputs vertex indices with node IDs.  simMatrix with --nidA t
   if args.display:
     util_igraph.DisplayGraph(g, args.display_layout, args.display_width, args.display_height)
 
+  if parallel.ReportFailures(): sys.exit(1)
@@ -11,8 +11,15 @@ import sys,os,argparse,logging,tqdm
 import re,random,tempfile,shutil,json
 import numpy as np
 import pandas as pd
+import scipy.sparse
 import igraph
 
+from .. import parallel
+from .. import sink as util_sink
+#
+SIM_BLOCK_SIZE=64 #rows per task
+ANNOT_CHUNKSIZE=1000000 #annotation rows per chunk
+
 #############################################################################
 def Load_GraphML(ifile):
   g = igraph.Graph.Read_GraphML(ifile)
@@ -331,32 +338,72 @@ def Layout(g, method):
 
 #############################################################################
 def ComputeInfoContent(g):
+  """IC = -log10((ndes+1)/ndes_root), vectorized, into g.vs["ic"] (and
+g.vs["ndes"])."""
   rs = RootNodes(g)
   if len(rs)>1:
     logging.warning(f"Multiple root nodes ({len(rs)}) using one only.")
-  r = rs[0];
-  ridx = r.index
-  g.vs["ndes"] = [0 for i in range(len(g.vs))]
-  g.vs["ic"] = [0.0 for i in range(len(g.vs))]
-  NDescendants(g, ridx, 0)
-  for v in g.vs:
-    v["ic"] = -np.log10(min(float((v["ndes"]+1)/r["ndes"]), 1.0))
-    v["ic"] = np.abs(v["ic"])
-
-#############################################################################
-def NDescendants(g, vidx, level):
-  """Recursive by depth first search.  Since DAG may not be a tree, need
-to avoid multiple counts via alternate parents."""
-  dvidxs = set() #descendant vidxs
-  for vidx_ in g.neighbors(vidx, mode=igraph.OUT):
-    dvidxs.add(vidx_)
-    dvidxs_this = NDescendants(g, vidx_, level+1)
-    dvidxs |= dvidxs_this
-    g.vs[vidx_]["ndes"] = len(dvidxs_this)
-  ndes=len(dvidxs) #number of descendants of vidx
-  logging.debug(f"{level*'>'}{level}) vs[{vidx}]: {g.vs[vidx]['id']} ({g.vs[vidx]['name']}); ndes = {ndes}")
-  g.vs[vidx]["ndes"] = ndes
-  return dvidxs
+  ridx = rs[0].index
+  ndes = NDescendants(g)
+  g.vs["ndes"] = ndes.tolist()
+  ic = np.abs(-np.log10(np.minimum((ndes+1)/ndes[ridx], 1.0)))
+  g.vs["ic"] = ic.tolist()
+  logging.info(f"IC computed: {len(ic)} nodes; root: {g.vs[ridx]['id']} (ndes = {ndes[ridx]}); IC max: {ic.max():.3f}")
+
+#############################################################################
+def ReadAnnotationCounts(ifile, termcol=None, chunksize=ANNOT_CHUNKSIZE):
+  """Annotations per term, from TSV (with header, e.g. gene and term columns),
+streamed in chunks.  termcol default 2nd column."""
+  counts = pd.Series(dtype=np.int64); n_row=0;
+  for df in pd.read_csv(ifile, sep="\t", dtype=str, usecols=[termcol if termcol else 1], chunksize=chunksize):
+    counts = counts.add(df.iloc[:,0].value_counts(), fill_value=0)
+    n_row+=df.shape[0]
+    logging.debug(f"annotation rows: {n_row}; terms: {len(counts)}")
+  logging.info(f"Annotation rows: {n_row}; terms: {len(counts)}")
+  return counts.astype(np.int64)
+
+#############################################################################
+def ComputeCorpusInfoContent(g, counts, cindex=None):
+  """Corpus (annotation-frequency) IC = -log10(nannot/nannot_total), where
+nannot is annotations to the term or any descendant, into g.vs["ic_corpus"]
+(and g.vs["nannot"]), alongside structural IC.  Unannotated terms IC 0.
+counts: Series, annotations per term ID (node "id")."""
+  vidxs = pd.Index(g.vs["id"]).get_indexer(counts.index)
+  if (vidxs<0).any():
+    logging.warning(f"Annotated terms not in graph: {(vidxs<0).sum()}; annotations: {counts[vidxs<0].sum()}")
+  weights = np.zeros(g.vcount())
+  np.add.at(weights, vidxs[vidxs>=0], counts.values[vidxs>=0])
+  cindex = cindex if cindex else ClosureIndex(g)
+  nannot = cindex.propagate(weights)
+  with np.errstate(divide="ignore"):
+    ic = np.where(nannot>0, np.abs(-np.log10(nannot/max(weights.sum(), 1.0))), 0.0)
+  g.vs["nannot"] = nannot.astype(np.int64).tolist()
+  g.vs["ic_corpus"] = ic.tolist()
+  logging.info(f"Corpus IC computed: {g.vcount()} nodes; annotated (incl. descendants): {(nannot>0).sum()}; annotations: {int(weights.sum())}")
+
+#############################################################################
+def NDescendants(g):
+  """Number of descendants of each node, iteratively.  Descendant bitsets are
+computed once per node, in reverse topological order, as the union of its
+children's, so shared sub-DAGs are counted once and not re-traversed."""
+  n = g.vcount()
+  nword = max((n+63)//64, 1)
+  des = np.zeros((n, nword), dtype=np.uint64)
+  vidxs = np.arange(n)
+  des[vidxs, vidxs//64] = np.left_shift(np.uint64(1), (vidxs%64).astype(np.uint64))
+  children = g.get_adjlist(mode="out")
+  for vidx in reversed(g.topological_sorting(mode="out")):
+    for vidx_ in children[vidx]:
+      des[vidx] |= des[vidx_]
+  return PopCount(des)-1 #self excluded
+
+#############################################################################
+def PopCount(bitsets, chunksize=1024):
+  """Number of set bits in each row of 2D uint64 array."""
+  counts = np.zeros(bitsets.shape[0], dtype=np.int64)
+  for i in range(0, bitsets.shape[0], chunksize):
+    counts[i:i+chunksize] = np.unpackbits(np.ascontiguousarray(bitsets[i:i+chunksize]).view(np.uint8), axis=1).sum(axis=1)
+  return counts
 
 #############################################################################
 def FindMICA(g, vidxA, vidxB, vidxFrom=None):
@@ -462,10 +509,183 @@ If vidxA specified, compute one row only."""
       if ic>0.0:
         n_nonzero_this+=1
         fout.write(f"{doidA.replace('DOID:','')}\t{doidB.replace('DOID:','')}\t{doidMICA.replace('DOID:','')}\t{ic:4f}\n")
-        fout.flush()
         n_out+=1
       if (n_in%1e5)==0: logging.info(f"n_in: {n_in}; n_out: {n_out}; n_nonzero: {n_nonzero} ({100.0*n_nonzero/n_in:.1f}%%)")
     n_nonzero+=n_nonzero_this
     logging.debug(f"vA: [{vidxA}] {vA['doid']} ({vA['name']}); n_nonzero_this = {n_nonzero_this}/{n_in_this}; total n_nonzero = {n_nonzero}/{n_in} ({100.0*n_nonzero/n_in:.1f}%%)")
   logging.info(f"Total n_in: {n_in}; n_out: {n_out}; n_nonzero: {n_nonzero} ({100*n_nonzero/n_in:.1f}%%)")
   logging.info(f"Total n_err: {n_err}")
+
+#############################################################################
+### Closure index: ancestors (self included) of each vertex in a DAG (edges
+### parent->child), as packed bitsets, built once in topological order.
+### Stored word-major, ceil(n/64) x n uint64, so one word for many vertices
+### is a contiguous row.  Bit positions are ordered by descending IC (ties by
+### vertex index), so the MICA of A and B is the lowest set bit of
+### anc[A] & anc[B], found vectorized for one vs. many.
+#############################################################################
+class ClosureIndex:
+  def __init__(self, g, ic_attr="ic"):
+    n = g.vcount()
+    self.n = n
+    self.ic = np.array(g.vs[ic_attr], dtype=np.float64) if ic_attr in g.vs.attributes() else np.zeros(n)
+    self.order = np.lexsort((np.arange(n), -self.ic)) #bit position -> vidx
+    self.pos = np.empty(n, dtype=np.int64) #vidx -> bit position
+    self.pos[self.order] = np.arange(n)
+    self.nword = max((n+63)//64, 1)
+    self.anc = np.zeros((self.nword, n), dtype=np.uint64)
+    self.anc[self.pos//64, np.arange(n)] = np.left_shift(np.uint64(1), (self.pos%64).astype(np.uint64))
+    parents = g.get_adjlist(mode="in")
+    for vidx in g.topological_sorting(mode="out"):
+      for pidx in parents[vidx]:
+        self.anc[:, vidx] |= self.anc[:, pidx]
+    logging.debug(f"Closure index: {n} nodes; {self.anc.nbytes/1e6:.1f}MB")
+
+  def ancestors(self, vidx):
+    """Ancestor vidxs of vidx, self included."""
+    bits = np.unpackbits(np.ascontiguousarray(self.anc[:, vidx]).view(np.uint8), bitorder="little")[:self.n]
+    return self.order[np.flatnonzero(bits)]
+
+  def mica(self, vidxA, vidxsB):
+    """MICA vidx for vidxA vs. each of vidxsB (-1 if no common ancestor).
+Words of A's ancestor set are scanned highest IC first; each B is done at
+its first word in common."""
+    vidxsB = np.asarray(vidxsB)
+    micapos = np.full(len(vidxsB), -1, dtype=np.int64)
+    todo = np.arange(len(vidxsB))
+    for word in np.flatnonzero(self.anc[:, vidxA]): #only these can intersect
+      common = self.anc[word, vidxsB[todo]] & self.anc[word, vidxA]
+      hit = (common!=0)
+      if not hit.any(): continue
+      lowbits = common[hit]
+      lowbits = lowbits & (np.uint64(0)-lowbits)
+      micapos[todo[hit]] = word*64+np.rint(np.log2(lowbits.astype(np.float64))).astype(np.int64)
+      todo = todo[~hit]
+      if len(todo)==0: break
+    return np.where(micapos>=0, self.order[np.maximum(micapos, 0)], -1)
+
+  def propagate(self, weights):
+    """Per-vertex totals of weights (e.g. annotation counts) over descendants,
+self included, in one pass over the closure (weighted column sums)."""
+    weights = np.asarray(weights, dtype=np.float64)
+    vidxs = np.flatnonzero(weights) #only these contribute
+    totals = np.zeros(self.nword*64)
+    for word in range(self.nword):
+      bits = np.unpackbits(self.anc[word, vidxs].view(np.uint8), bitorder="little").reshape(len(vidxs), 64)
+      totals[word*64:(word+1)*64] = weights[vidxs] @ bits
+    return totals[self.pos]
+
+  def sim(self, vidxA, vidxsB):
+    """(MICA vidxs, IC of MICA) for vidxA vs. each of vidxsB; IC 0 if no MICA."""
+    micas = self.mica(vidxA, vidxsB)
+    return micas, np.where(micas>=0, self.ic[np.maximum(micas, 0)], 0.0)
+
+#############################################################################
+def NodeIds(g, idattr=None):
+  """Node IDs, from idattr ("doid" if present, else "id"), without DOID: prefix."""
+  idattr = idattr if idattr else ("doid" if "doid" in g.vs.attributes() else "id")
+  return np.array([re.sub(r'^DOID:', '', str(val)) for val in g.vs[idattr]], dtype=object)
+
+#############################################################################
+def SimMatrixFast(g, vidxA_query, skip, nmax, fout, cindex=None):
+  """As SimMatrix(), via ClosureIndex: for each node, MICA and IC vs. all
+following nodes in one vectorized step.  cindex may use another IC, e.g.
+ClosureIndex(g, "ic_corpus")."""
+  cindex = cindex if cindex else ClosureIndex(g)
+  ids = NodeIds(g)
+  fout.write("doidA\tdoidB\tdoidMICA\tsim\n")
+  n = g.vcount(); skip = skip if skip else 0
+  n_in=0; n_out=0;
+  for vidxA in range(skip, n):
+    if nmax and (vidxA-skip)==nmax: break
+    if vidxA_query is not None and vidxA_query!=vidxA: continue
+    vidxsB = np.arange(vidxA+1, n)
+    micas,ics = cindex.sim(vidxA, vidxsB)
+    ok = (ics>0.0)
+    n_in+=len(vidxsB); n_out+=ok.sum()
+    if ok.any():
+      pd.DataFrame({"doidA":ids[vidxA], "doidB":ids[vidxsB[ok]], "doidMICA":ids[micas[ok]], "sim":ics[ok]}).to_csv(fout, sep="\t", index=False, header=False, float_format="%4f")
+  logging.info(f"Total n_in: {n_in}; n_out (nonzero): {n_out} ({100*n_out/max(n_in,1):.1f}%)")
+
+#############################################################################
+### Parallel all-pairs similarity.  Row blocks are computed in worker
+### processes, each holding the read-only closure index (passed via the
+### pool initializer, so pickled once per worker, not per task).  Pairs below
+### min_sim are dropped.  A failed block is logged and its rows left empty.
+#############################################################################
+_SIM = {}
+
+def _SimInit(cindex, min_sim, topk):
+  _SIM["cindex"] = cindex
+  _SIM["min_sim"] = min_sim
+  _SIM["topk"] = topk
+
+def _SimBlock(block):
+  """For rows block[0]:block[1], thresholded upper-triangle pairs (i, j,
+mica, sim), and if topk, top-k neighbors per row (from full rows)."""
+  cindex,min_sim,topk = _SIM["cindex"],_SIM["min_sim"],_SIM["topk"]
+  pairs=[]; tops=[];
+  for vidxA in range(block[0], block[1]):
+    vidxsB = np.arange(0 if topk else vidxA+1, cindex.n)
+    micas,ics = cindex.sim(vidxA, vidxsB)
+    ok = (ics>0.0)&(ics>=min_sim)&(vidxsB!=vidxA)
+    upper = ok&(vidxsB>vidxA)
+    pairs.append((np.full(upper.sum(), vidxA, dtype=np.int32), vidxsB[upper].astype(np.int32), micas[upper].astype(np.int32), ics[upper].astype(np.float32)))
+    if topk:
+      js = np.flatnonzero(ok)
+      if len(js)>topk: js = js[np.argpartition(-ics[js], topk-1)[:topk]]
+      js = js[np.lexsort((js, -ics[js]))]
+      tops.append((np.full(len(js), vidxA, dtype=np.int32), vidxsB[js].astype(np.int32), micas[js].astype(np.int32), ics[js].astype(np.float32)))
+  return tuple(np.concatenate(arrays) for arrays in zip(*pairs)), (tuple(np.concatenate(arrays) for arrays in zip(*tops)) if topk else None)
+
+def SimMatrixParallel(g, ofile=None, min_sim=0.0, topk=None, ofile_topk=None, nproc=1, block_size=SIM_BLOCK_SIZE, skip=None, nmax=None, cindex=None):
+  """All-pairs similarity (IC of MICA), via ClosureIndex, in nproc processes.
+Output by extension: NPZ (sparse upper triangle, see LoadSimMatrix), or
+TSV/Parquet/etc. (util.sink) with columns as SimMatrix().  Optionally, top-k
+neighbors per node to ofile_topk."""
+  cindex = cindex if cindex else ClosureIndex(g)
+  ids = NodeIds(g)
+  n = g.vcount(); i0 = skip if skip else 0
+  i1 = min(i0+nmax, n) if nmax else n
+  blocks = [(i, min(i+block_size, i1)) for i in range(i0, i1, block_size)]
+  npz = bool(ofile and re.search(r'\.npz$', ofile, re.I))
+  fout = None if npz else util_sink.Open(ofile)
+  fout_topk = util_sink.Open(ofile_topk) if topk else None
+  parts=[]; n_out=0; n_err=0;
+  for block,result in tqdm.tqdm(parallel.MapOrderedProcesses(_SimBlock, blocks, nproc, _SimInit, (cindex, min_sim, topk)), total=len(blocks), unit="blocks"):
+    if result is None:
+      n_err+=1
+      if npz: parts.append((np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32), np.zeros(block[1]-block[0], dtype=np.int64))) #Rows empty, keeping later rows aligned.
+      continue
+    (rows,cols,micas,sims),top = result
+    n_out+=len(rows)
+    if npz:
+      parts.append((cols,micas,sims,np.bincount(rows-block[0], minlength=block[1]-block[0])))
+    elif len(rows):
+      fout.write(pd.DataFrame({"doidA":ids[rows], "doidB":ids[cols], "doidMICA":ids[micas], "sim":sims.round(6)}))
+    if top is not None and len(top[0]):
+      rows,cols,micas,sims = top
+      rank = np.arange(len(rows))-np.searchsorted(rows, rows)+1
+      fout_topk.write(pd.DataFrame({"doid":ids[rows], "doid_nbr":ids[cols], "doidMICA":ids[micas], "sim":sims.round(6), "rank":rank}))
+  if npz:
+    cols,micas,sims,rowcounts = (tuple(np.concatenate(arrays) for arrays in zip(*parts)) if parts else (np.zeros(0, dtype=np.int32),)*2+(np.zeros(0, dtype=np.float32),np.zeros(0, dtype=np.int64)))
+    indptr = np.concatenate([np.zeros(i0+1, dtype=np.int64), np.cumsum(rowcounts)])
+    indptr = np.concatenate([indptr, np.full(n+1-len(indptr), indptr[-1])])
+    np.savez_compressed(ofile, ids=ids.astype(str), indptr=indptr, indices=cols, data=sims, micas=micas)
+  else:
+    fout.close()
+  if fout_topk: fout_topk.close()
+  if n_err: logging.error(f"Blocks failed: {n_err} (rows empty in output)")
+  logging.info(f"Rows: {i1-i0}; pairs: {sum([n-i-1 for i in range(i0, i1)])}; n_out (sim>={max(min_sim, 0.0)}, nonzero): {n_out}")
+  return n_out
+
+#############################################################################
+def LoadSimMatrix(ifile):
+  """From SimMatrixParallel() NPZ output: ids, upper-triangle similarity
+matrix (CSR float32, indices into ids), and MICA indices aligned with
+its data."""
+  with np.load(ifile, allow_pickle=False) as arrays:
+    ids = arrays["ids"]
+    simmat = scipy.sparse.csr_matrix((arrays["data"], arrays["indices"], arrays["indptr"]), shape=(len(ids), len(ids)))
+    micas = arrays["micas"]
+  return ids, simmat, micas
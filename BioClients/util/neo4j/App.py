@@ -13,12 +13,16 @@ from .. import neo4j as util_neo4j
 #############################################################################
 if __name__=='__main__':
   parser = argparse.ArgumentParser(description="Neo4j client (via py2neo API)", epilog="See https://neo4j.com/docs/cypher-manual, https://py2neo.org.")
-  ops = [ 'dbinfo', 'query', 'dbsummary' ]
+  ops = [ 'dbinfo', 'query', 'query_batched', 'dbsummary' ]
   parser.add_argument("op", choices=ops, help='OPERATION')
   parser.add_argument("--i", dest="ifile", help="input query file (CQL aka Cypher)")
   parser.add_argument("--cql", help="input query (CQL aka Cypher)")
-  parser.add_argument("--o", dest="ofile", help="output (TSV|JSON)")
-  parser.add_argument("--ofmt", choices=('TSV', 'JSON'), default='TSV')
+  parser.add_argument("--o", dest="ofile", help="output (TSV|JSON|JSONL)")
+  parser.add_argument("--ofmt", choices=util_neo4j.FORMATS, default='TSV')
+  parser.add_argument("--ids", help="input IDs (comma-separated), for query_batched ($ids)")
+  parser.add_argument("--idfile", help="input IDs file (one per line), for query_batched ($ids)")
+  parser.add_argument("--ids_int", action="store_true", help="IDs are integers")
+  parser.add_argument("--batch_size", type=int, default=util_neo4j.BATCH_SIZE, help="IDs per query, for query_batched")
   parser.add_argument("--dbhost", default=util_neo4j.DBHOST)
   parser.add_argument("--dbport", type=int, default=util_neo4j.DBPORT)
   parser.add_argument("--dbscheme", default=util_neo4j.DBSCHEME)
@@ -40,7 +44,7 @@ if __name__=='__main__':
     db = util_neo4j.DbConnect(dbhost=args.dbhost, dbport=args.dbport, dbscheme=args.dbscheme, dbusr=args.dbusr, dbpw=args.dbpw, secure=args.secure)
     util_neo4j.DbSummary(db, fout)
 
-  elif args.op == 'query':
+  elif args.op in ('query', 'query_batched'):
     db = util_neo4j.DbConnect(dbhost=args.dbhost, dbport=args.dbport, dbscheme=args.dbscheme, dbusr=args.dbusr, dbpw=args.dbpw, secure=args.secure)
     if args.ifile:
       fin = open(args.ifile)
@@ -48,8 +52,19 @@ if __name__=='__main__':
     elif args.cql:
       cql = args.cql
     else:
-      parser.error('--cql or --i required for query.')
-    util_neo4j.DbQuery(db, cql, args.ofmt, fout)
+      parser.error(f'--cql or --i required for {args.op}.')
+    if args.op == 'query':
+      util_neo4j.DbQuery(db, cql, args.ofmt, fout)
+    else:
+      if args.idfile:
+        with open(args.idfile) as fin:
+          ids = [line.strip() for line in fin if line.strip()]
+      elif args.ids:
+        ids = [id_this.strip() for id_this in args.ids.split(',') if id_this.strip()]
+      else:
+        parser.error(f'--ids or --idfile required for {args.op}.')
+      if args.ids_int: ids = [int(id_this) for id_this in ids]
+      util_neo4j.DbQueryBatched(db, cql, ids, args.ofmt, fout, args.batch_size)
 
   else:
     parser.error(f"Unsupported operation: {args.op}")
@@ -7,11 +7,15 @@ import sys,os,json,logging
 import pandas as pd
 import py2neo
 
+from .. import sink as util_sink
+
 DBHOST="localhost"
 DBPORT=7687
 DBSCHEME="bolt"
 DBUSR="neo4j"
 DBPW="neo4j"
+BATCH_SIZE=1000
+FORMATS=["TSV", "JSON", "JSONL"]
 
 #############################################################################
 def DbConnect(dbhost=DBHOST, dbport=DBPORT, dbscheme=DBSCHEME, dbusr=DBUSR, dbpw=DBPW, secure=False):
@@ -41,18 +45,53 @@ def DbSummary(db, fout):
   df.transpose().to_csv(fout, sep="\t")
 
 #############################################################################
-def DbQuery(db, cql, fmt, fout):
-  n_out=0;
+def DbQuery(db, cql, fmt, fout, parameters=None):
+  """Records streamed from the result cursor to TSV, JSON (array) or JSONL
+as they arrive, not materialized."""
   g = db.default_graph
-  result = g.run(cql)
-  if fmt.upper()=='JSON':
-    rows = result.data()
-    n_out = len(rows)
-    fout.write(json.dumps(rows, indent=2)+'\n')
-  else: #TSV
-    df = result.to_data_frame()
-    n_out = df.shape[0]
-    df.to_csv(fout, '\t', index=False)
+  cursor = g.run(cql, parameters)
+  n_out = WriteRecords(cursor, fmt, fout)
+  if fmt.upper()=='JSON': fout.write(('\n]' if n_out else '[]')+'\n')
   logging.info(f"rows: {n_out}")
+  return n_out
+
+#############################################################################
+def DbQueryBatched(db, cql, ids, fmt, fout, batch_size=BATCH_SIZE):
+  """Query for ids, in batches, as parameter $ids, e.g.
+"UNWIND $ids AS id MATCH (n {id:id}) RETURN n.id, n.name".  If cql does
+not use $ids, "UNWIND $ids AS id" is prepended.  Output as DbQuery()."""
+  if '$ids' not in cql:
+    cql = "UNWIND $ids AS id\n"+cql
+  logging.debug(cql)
+  g = db.default_graph
+  n_id=0; n_batch=0; n_out=0;
+  for i in range(0, len(ids), batch_size):
+    batch = ids[i:i+batch_size]
+    cursor = g.run(cql, {"ids":batch})
+    n_out += WriteRecords(cursor, fmt, fout, n_out, header=(n_batch==0))
+    n_id+=len(batch); n_batch+=1;
+    logging.debug(f"batch {n_batch}: ids: {n_id}; rows: {n_out}")
+  if fmt.upper()=='JSON': fout.write(('\n]' if n_out else '[]')+'\n')
+  logging.info(f"ids: {n_id}; batches: {n_batch}; rows: {n_out}")
+  return n_out
+
+#############################################################################
+def WriteRecords(cursor, fmt, fout, n_prev=0, header=True):
+  """Write cursor records; TSV header if header; JSON array items after
+n_prev previous (array closed by caller).  Returns number written."""
+  fmt = fmt.upper()
+  keys = list(cursor.keys())
+  if fmt=='TSV' and header:
+    fout.write('\t'.join(keys)+'\n')
+  n_out=0;
+  for record in cursor:
+    if fmt=='TSV':
+      fout.write('\t'.join([util_sink.TSVValue(val) for val in record.values()])+'\n')
+    elif fmt=='JSONL':
+      fout.write(json.dumps(dict(zip(keys, record.values())), default=str)+'\n')
+    else: #JSON
+      fout.write(('[\n' if n_prev+n_out==0 else ',\n')+json.dumps(dict(zip(keys, record.values())), default=str, indent=2))
+    n_out+=1
+  return n_out
 
 #############################################################################
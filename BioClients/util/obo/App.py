@@ -1,16 +1,24 @@
 #! /usr/bin/env python3
 """
 Developed and tested with doid.obo (Disease Ontology).
+
+Output formats: tsv (terms), graphml (terms and edges, for
+BioClients.util.igraph), edges (TSV, parent-child edges by ID).
 """
 import sys,os,argparse,re,logging
+import pandas as pd
 
 from .. import obo as util_obo
 
 #############################################################################
 if __name__=='__main__':
-  parser = argparse.ArgumentParser(description='OBO to TSV converter')
+  OFMTS = ["tsv", "graphml", "edges"]
+  parser = argparse.ArgumentParser(description='OBO to TSV or GraphML converter')
   parser.add_argument("--i", dest="ifile", required=True, help="input OBO file")
-  parser.add_argument("--o", dest="ofile", help="output (TSV)")
+  parser.add_argument("--o", dest="ofile", help="output (TSV or GraphML)")
+  parser.add_argument("--ofmt", choices=OFMTS, default="tsv", help="output format")
+  parser.add_argument("--reltypes", default=",".join(util_obo.RELTYPES), help="edge relationship types (comma-separated, or 'all'), for graphml and edges")
+  parser.add_argument("--obsolete", action="store_true", help="include obsolete terms, for graphml and edges")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
 
@@ -20,4 +28,14 @@ if __name__=='__main__':
 
   fout = open(args.ofile, "w+") if args.ofile else sys.stdout
 
-  util_obo.OBO2CSV(fin, fout)
+  reltypes = None if args.reltypes=='all' else re.split(r'\s*,\s*', args.reltypes.strip())
+
+  if args.ofmt=="tsv":
+    util_obo.OBO2CSV(fin, fout)
+
+  elif args.ofmt=="graphml":
+    util_obo.OBO2GraphML(util_obo.ReadOBO(fin), fout, reltypes=reltypes, obsolete=args.obsolete)
+
+  elif args.ofmt=="edges":
+    nodes,edges = util_obo.OBO2Arrays(util_obo.ReadOBO(fin), reltypes=reltypes, obsolete=args.obsolete)
+    pd.DataFrame({"parent":nodes.id.values[edges.source.values], "child":nodes.id.values[edges.target.values], "reltype":edges.reltype.values}).to_csv(fout, sep="\t", index=False)
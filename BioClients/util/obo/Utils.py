@@ -1,62 +1,159 @@
 #! /usr/bin/env python3
 """
 Developed and tested with doid.obo (Disease Ontology)
+
+ReadOBO() streams stanza records ([Term], [Typedef], [Instance]), as dicts
+of tag to list of values, with "stanza" the stanza type.  Comments and
+trailing {modifiers} are removed, except within quoted strings.  From
+records, OBO2Arrays() makes compact node and edge arrays (is_a and
+relationship edges, parent->child), and OBO2Graph() an igraph Graph, or
+OBO2GraphML() GraphML, directly.
 """
 import sys,os,argparse,re,logging
+import numpy as np
+import pandas as pd
+from xml.sax.saxutils import escape,quoteattr
+#
+OBO_TAGS = ['id', 'name', 'namespace', 'alt_id', 'def', 'subset', 'synonym', 'xref', 'is_a', 'is_obsolete']
+NODE_TAGS = ['name', 'namespace', 'def']
+RELTYPES = ['is_a']
+XREF_RE = re.compile(r'\S+:\S+$')
+#
+#############################################################################
+def OBOValue(val):
+  """Value without comment (! ...) or trailing {modifiers}, which are
+not parsed within a leading quoted string."""
+  if val[:1]=='"':
+    j = OBOQuoteEnd(val)
+    if j<0: return val
+    head,tail = val[:j+1],val[j+1:]
+  elif '!' in val or '{' in val:
+    head,tail = '',val
+  else:
+    return val
+  if '!' in tail: tail = tail.split('!', 1)[0]
+  if '{' in tail: tail = tail.split('{', 1)[0]
+  return (head+tail).rstrip()
+
+def OBOQuoteEnd(val):
+  """Index of closing quote of leading quoted string, or -1."""
+  j = val.find('"', 1)
+  while j>0 and val[j-1]=='\\':
+    j = val.find('"', j+1)
+  return j
+
+def OBOQuoted(val):
+  """Text of leading quoted string (e.g. def, synonym), else value unquoted."""
+  if val.startswith('"'):
+    j = OBOQuoteEnd(val)
+    if j>0: return val[1:j].replace('\\"', '"')
+  return val
+
+#############################################################################
+def ReadOBO(fin):
+  """Generate stanza records, dict of tag to list of values, plus "stanza"
+(e.g. "Term", "Typedef").  Header tags (before first stanza) skipped."""
+  rec=None; n_in=0; n_rec=0;
+  for line in fin:
+    n_in+=1
+    line = line.strip()
+    if not line or line[0]=='!': continue
+    if line[0]=='[':
+      if rec: yield rec
+      rec = {"stanza":line.strip('[]')}
+      n_rec+=1
+      continue
+    if rec is None: continue
+    tag,_,val = line.partition(':')
+    val = OBOValue(val.strip())
+    if tag in rec: rec[tag].append(val)
+    else: rec[tag] = [val]
+  if rec: yield rec
+  logging.info(f"input lines: {n_in}; input records: {n_rec}")
+
+#############################################################################
+def IsObsolete(rec):
+  return bool(rec.get('is_obsolete', ['false'])[0].lower()=='true')
 
 #############################################################################
 def OBO2CSV(fin, fout):
-  n_in=0; n_rec=0; n_out=0;
-  tags = ['id', 'name', 'namespace', 'alt_id', 'def', 'subset', 'synonym', 'xref', 'is_a', 'is_obsolete']
+  n_rec=0; n_out=0;
+  tags = OBO_TAGS
   fout.write('\t'.join(tags)+'\n')
-  reclines=[];
-  while True:
-    line=fin.readline()
-    if not line: break
-    n_in+=1
-    line=line.strip()
-    if reclines:
-      if line == '':
-        row = OBO2CSV_Record(reclines)
-        n_rec+=1
-        vals=[]
-        is_obsolete=False
-        for tag in tags:
-          if tag in row:
-            val=row[tag]
-            if tag in ('def', 'synonym'):
-              val=re.sub(r'^"([^"]*)".*$', r'\1', val)
-            else:
-              val=re.sub(r'^"(.*)"$', r'\1', val)
-          else:
-            val=''
-          if tag=='is_obsolete': is_obsolete = bool(val.lower() == "true")
-          vals.append(val)
-        if not is_obsolete:
-          fout.write('\t'.join(vals)+'\n')
-          n_out+=1
-        reclines=[];
-      else:
-        reclines.append(line)
-    else:
-      if line == '[Term]':
-        reclines.append(line)
-      else: continue
-
-  logging.info("input lines: %d; input records: %d ; output lines: %d"%(n_in, n_rec, n_out))
-
-#############################################################################
-def OBO2CSV_Record(reclines):
-  vals={};
-  if reclines[0] != '[Term]':
-    logging.error('reclines[0] = "%s"'%reclines[0])
-    return
-  for line in reclines[1:]:
-    line = re.sub(r'\s*!.*$','',line)
-    k,v = re.split(r':\s*', line, maxsplit=1)
-    if k=='xref' and not re.match(r'\S+:\S+$',v): continue
-    if k not in vals: vals[k]=''
-    vals[k] = '%s%s%s'%(vals[k],(';' if vals[k] else ''),v)
-  return vals
+  for rec in ReadOBO(fin):
+    if rec["stanza"]!='Term': continue
+    n_rec+=1
+    if IsObsolete(rec): continue
+    vals=[]
+    for tag in tags:
+      vals_this = rec.get(tag)
+      if not vals_this:
+        vals.append('')
+        continue
+      if tag=='xref': vals_this = [val for val in vals_this if XREF_RE.match(val)]
+      if tag in ('def', 'synonym'): vals_this = [OBOQuoted(val) for val in vals_this]
+      else: vals_this = [(val[1:-1] if len(val)>1 and val[0]=='"' and val[-1]=='"' else val) for val in vals_this]
+      vals.append(';'.join(vals_this))
+    fout.write('\t'.join(vals)+'\n')
+    n_out+=1
+  logging.info(f"terms: {n_rec}; output lines: {n_out}")
+
+#############################################################################
+def OBO2Arrays(records, stanza="Term", reltypes=RELTYPES, obsolete=False):
+  """Nodes (DataFrame: id, name, namespace, def) and edges (DataFrame:
+source, target (int32 node indices), reltype (categorical)), directed
+parent->child, from is_a and relationship tags of type in reltypes (all
+if None).  Edges to terms not in nodes (e.g. other ontologies) dropped."""
+  ids=[]; nodevals={tag:[] for tag in NODE_TAGS}; parents=[]; children=[]; rels=[];
+  for rec in records:
+    if rec["stanza"]!=stanza: continue
+    if not obsolete and IsObsolete(rec): continue
+    id_this = rec['id'][0]
+    ids.append(id_this)
+    for tag in NODE_TAGS:
+      nodevals[tag].append(OBOQuoted(rec[tag][0]) if tag in rec else '')
+    if reltypes is None or 'is_a' in reltypes:
+      for val in rec.get('is_a', []):
+        parents.append(val.split(None, 1)[0]); children.append(id_this); rels.append('is_a')
+    for val in rec.get('relationship', []):
+      reltype,parent = (val.split()+[None])[:2]
+      if parent and (reltypes is None or reltype in reltypes):
+        parents.append(parent); children.append(id_this); rels.append(reltype)
+  nodes = pd.DataFrame(dict(id=ids, **nodevals))
+  idx = pd.Index(nodes['id'])
+  sources = idx.get_indexer(parents)
+  targets = idx.get_indexer(children)
+  ok = (sources>=0)&(targets>=0)
+  if (~ok).any(): logging.info(f"Edges to terms not included, dropped: {(~ok).sum()}")
+  edges = pd.DataFrame({"source":sources[ok].astype(np.int32), "target":targets[ok].astype(np.int32), "reltype":pd.Categorical(np.array(rels, dtype=object)[ok])}).drop_duplicates(ignore_index=True)
+  logging.info(f"nodes: {nodes.shape[0]}; edges: {edges.shape[0]}")
+  return nodes, edges
+
+#############################################################################
+def OBO2Graph(records, stanza="Term", reltypes=RELTYPES, obsolete=False):
+  """igraph Graph (directed, parent->child), with node attributes id, name,
+namespace, def, and edge attribute reltype."""
+  import igraph
+  nodes,edges = OBO2Arrays(records, stanza, reltypes, obsolete)
+  g = igraph.Graph(n=nodes.shape[0], edges=edges[['source', 'target']].values, directed=True)
+  for tag in nodes.columns:
+    g.vs[tag] = nodes[tag].tolist()
+  g.es['reltype'] = edges['reltype'].astype(str).tolist()
+  return g
+
+#############################################################################
+def OBO2GraphML(records, fout, stanza="Term", reltypes=RELTYPES, obsolete=False):
+  """GraphML, as from OBO2Graph(), written directly from node and edge arrays."""
+  nodes,edges = OBO2Arrays(records, stanza, reltypes, obsolete)
+  fout.write('<?xml version="1.0" encoding="UTF-8"?>\n<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n')
+  for tag in NODE_TAGS:
+    fout.write(f'<key id="{tag}" for="node" attr.name="{tag}" attr.type="string"/>\n')
+  fout.write('<key id="reltype" for="edge" attr.name="reltype" attr.type="string"/>\n<graph id="G" edgedefault="directed">\n')
+  for id_this,*vals in zip(*[nodes[col].values for col in ['id']+NODE_TAGS]):
+    fout.write(f'<node id={quoteattr(id_this)}>'+''.join([f'<data key="{tag}">{escape(val)}</data>' for tag,val in zip(NODE_TAGS, vals) if val])+'</node>\n')
+  ids = nodes['id'].values
+  for source,target,reltype in zip(ids[edges['source'].values], ids[edges['target'].values], edges['reltype'].astype(str).values):
+    fout.write(f'<edge source={quoteattr(source)} target={quoteattr(target)}><data key="reltype">{escape(reltype)}</data></edge>\n')
+  fout.write('</graph>\n</graphml>\n')
 
 #############################################################################
@@ -9,13 +9,17 @@ from .. import owl as util_owl
 #############################################################################
 if __name__=="__main__":
   epilog="""\
-Example IRI (from MONDO): http://purl.obolibrary.org/obo/MONDO_0000001
+Example IRI (from MONDO): http://purl.obolibrary.org/obo/MONDO_0000001.
+list_subclass_closure: as list_all_subclasses, or list_subclasses with --iri,
+in bulk from the quadstore (SQL), for large ontologies.
+--world_db: persist loaded ontology in SQLite file; reloads skip parsing.
   """
   parser = argparse.ArgumentParser(description="OWL utility", epilog=epilog)
   ops = [ "describe_owl", "validate_owl",
          "list_classes",
          "list_all_subclasses",
          "list_subclasses",
+         "list_subclass_closure",
          "list_individuals",
          "find_iri",
          "show_root",
@@ -24,6 +28,7 @@ Example IRI (from MONDO): http://purl.obolibrary.org/obo/MONDO_0000001
   parser.add_argument("--iri", help="node specification")
   parser.add_argument("--i", dest="ifile", help="input file (OWL)")
   parser.add_argument("--o", dest="ofile", help="output file")
+  parser.add_argument("--world_db", help="owlready2 SQLite world (quadstore) file, persistent")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
 
@@ -35,39 +40,43 @@ Example IRI (from MONDO): http://purl.obolibrary.org/obo/MONDO_0000001
   t0 = time.time()
 
   if args.op == "describe_owl":
-    util_owl.DescribeOwl(fin)
+    util_owl.DescribeOwl(fin, args.world_db)
 
   elif args.op == "validate_owl":
     util_owl.ValidateOwl(fin)
 
   elif args.op == "list_classes":
-    onto = util_owl.LoadOwlFile(fin)
+    onto = util_owl.LoadOwlFile(fin, args.world_db)
     util_owl.ListClasses(onto, fout)
 
   elif args.op == "list_all_subclasses":
-    onto = util_owl.LoadOwlFile(fin)
+    onto = util_owl.LoadOwlFile(fin, args.world_db)
     util_owl.ListAllSubclasses(onto, fout)
 
   elif args.op == "list_subclasses":
     if not args.iri:
       parser.error(f"--iri required for {args.op}")
-    onto = util_owl.LoadOwlFile(fin)
+    onto = util_owl.LoadOwlFile(fin, args.world_db)
     c = util_owl.FindIri(onto, args.iri)
     tq = tqdm.tqdm(total=len(list(onto.classes())))
     triples = set()
     util_owl.ListSubclasses(onto, c, triples, tq, fout)
     tq.close()
 
+  elif args.op == "list_subclass_closure":
+    onto = util_owl.LoadOwlFile(fin, args.world_db)
+    util_owl.ListSubclassClosure(onto, fout, args.iri)
+
   elif args.op == "list_individuals":
-    onto = util_owl.LoadOwlFile(fin)
+    onto = util_owl.LoadOwlFile(fin, args.world_db)
     util_owl.ListIndividuals(onto, fout)
 
   elif args.op == "show_root":
-    onto = util_owl.LoadOwlFile(fin)
+    onto = util_owl.LoadOwlFile(fin, args.world_db)
     util_owl.ShowRoot(onto)
 
   elif args.op == "find_iri":
-    onto = util_owl.LoadOwlFile(fin)
+    onto = util_owl.LoadOwlFile(fin, args.world_db)
     c = util_owl.FindIri(onto, args.iri)
 
   else:
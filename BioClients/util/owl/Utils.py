@@ -8,18 +8,25 @@ import sys,os,re,gzip,argparse,logging,tqdm
 import owlready2 as or2
 
 #############################################################################
-def LoadOwlFile(fin):
+def LoadOwlFile(fin, world_db=None):
+  """With world_db, ontology is persisted in owlready2 SQLite world
+(quadstore), and reloads skip parsing, unless file is newer."""
   logging.info(f"Loading {fin.name}...")
   try:
-    onto = or2.get_ontology(f"file://{fin.name}").load()
+    if world_db:
+      world = or2.World(filename=world_db)
+      onto = world.get_ontology(f"file://{os.path.abspath(fin.name)}").load(reload_if_newer=True)
+      world.save()
+    else:
+      onto = or2.get_ontology(f"file://{fin.name}").load()
   except Exception as e:
     logging.error(e)
     return None
   return onto
 
 #############################################################################
-def DescribeOwl(fin):
-  onto = LoadOwlFile(fin)
+def DescribeOwl(fin, world_db=None):
+  onto = LoadOwlFile(fin, world_db)
   logging.info(f"base_iri: {onto.base_iri}")
   if onto.imported_ontologies:
     logging.info(f"imported_ontologies: {onto.imported_ontologies}")
@@ -100,3 +107,75 @@ def ListIndividuals(onto, fout):
   logging.info(f"n_ind: {n_ind}")
 
 #############################################################################
+
+#############################################################################
+### Bulk subclass closure from the quadstore (SQL), instead of per-class
+### search: named-class subClassOf edges are selected once (to an indexed
+### temp table), closure computed by recursive query, rows streamed.
+#############################################################################
+def IriParts(iri):
+  """(namespace name, base IRI, name), as owlready2 namespace and entity."""
+  for sep in ('#', '/', ':'):
+    if sep in iri:
+      base_iri,name = iri.rsplit(sep, 1)
+      base_iri+=sep
+      break
+  else:
+    base_iri,name = '',iri
+  ns_name = base_iri[:-1].rsplit("/", 1)[-1]
+  if ns_name.endswith(".owl") or ns_name.endswith(".rdf"): ns_name = ns_name[:-4]
+  return ns_name, base_iri, name
+
+def ClassInfo(onto):
+  """Dict of class storid to TSV fields (namespace name, base IRI, name,
+labels, IRI), from the quadstore."""
+  db = onto.world.graph.db
+  labels={}
+  for storid,label in db.execute("SELECT s,o FROM datas WHERE p=? AND s IN (SELECT s FROM objs WHERE p=? AND o=?) ORDER BY rowid", (or2.label.storid, or2.rdf_type, or2.owl_class)):
+    labels.setdefault(storid, []).append(str(label))
+  info={}
+  for storid,iri in db.execute("SELECT storid,iri FROM resources WHERE storid IN (SELECT s FROM objs WHERE p=? AND o=?)", (or2.rdf_type, or2.owl_class)):
+    info[storid] = '\t'.join(IriParts(iri)+(';'.join(labels.get(storid, [])), iri))
+  return info
+
+def SubclassClosure(onto, root_iri=None):
+  """Generate (class, subclass) storid pairs, all levels (ancestor,
+descendant), from named-class subClassOf edges.  Optionally only for
+subclasses of root_iri."""
+  db = onto.world.graph.db
+  db.execute("DROP TABLE IF EXISTS temp.subclass_edge")
+  db.execute("CREATE TEMP TABLE subclass_edge (a INTEGER, d INTEGER)")
+  db.execute("INSERT INTO temp.subclass_edge SELECT DISTINCT o,s FROM objs WHERE p=? AND s>0 AND o>0 AND s!=o AND s IN (SELECT s FROM objs WHERE p=? AND o=?) AND o IN (SELECT s FROM objs WHERE p=? AND o=?)", (or2.rdfs_subclassof, or2.rdf_type, or2.owl_class, or2.rdf_type, or2.owl_class))
+  db.execute("CREATE INDEX temp.subclass_edge_a ON subclass_edge(a)")
+  n_edge = db.execute("SELECT COUNT(*) FROM temp.subclass_edge").fetchone()[0]
+  logging.info(f"Subclass edges (named classes): {n_edge}")
+  params=[]; sql_subtree=""; sql_where="";
+  if root_iri:
+    root = db.execute("SELECT storid FROM resources WHERE iri=?", (root_iri,)).fetchone()
+    if root is None:
+      logging.error(f"NOT FOUND: {root_iri}")
+      return
+    params = [root[0]]
+    sql_subtree = "subtree(c) AS (SELECT ? UNION SELECT subclass_edge.d FROM subtree JOIN temp.subclass_edge ON subclass_edge.a=subtree.c),"
+    sql_where = "WHERE a IN subtree"
+  sql = f"""\
+WITH RECURSIVE {sql_subtree}
+closure(a,d) AS (
+  SELECT a,d FROM temp.subclass_edge {sql_where}
+  UNION
+  SELECT closure.a,subclass_edge.d FROM closure JOIN temp.subclass_edge ON subclass_edge.a=closure.d
+  )
+SELECT a,d FROM closure WHERE a!=d"""
+  for a,d in db.execute(sql, params):
+    yield a,d
+
+def ListSubclassClosure(onto, fout, root_iri=None):
+  """As ListAllSubclasses(), or ListSubclasses() with root_iri, in bulk."""
+  info = ClassInfo(onto)
+  logging.info(f"n_class: {len(info)}")
+  n_subclass=0;
+  for a,d in SubclassClosure(onto, root_iri):
+    fout.write(f"{info[a]}\t{info[d]}\n")
+    n_subclass+=1
+  logging.info(f"n_subclass: {n_subclass}")
+  return n_subclass
@@ -100,3 +100,40 @@ def Merge(dfA, dfB, merge_how, merge_type, coltags, delim, fout):
   logging.info(f"Rows out: {df.shape[0]}")
 
 #############################################################################
+class FrameBuilder:
+  """Accumulates DataFrame chunks and/or records (dicts), concatenated once
+by frame().  Unlike repeated df = pd.concat([df, df_this]), which copies all
+rows so far, cost is linear in rows."""
+  def __init__(self):
+    self.frames = []
+    self.records = []
+    self.nrows = 0
+
+  def __len__(self):
+    return self.nrows
+
+  def append(self, df_this):
+    if df_this is None: return
+    self.flush_records()
+    self.frames.append(df_this)
+    self.nrows += df_this.shape[0]
+
+  def append_record(self, record):
+    self.records.append(record)
+    self.nrows += 1
+
+  def flush_records(self):
+    if self.records:
+      self.frames.append(pd.DataFrame(self.records))
+      self.records = []
+
+  def frame(self, df=None):
+    """Materialize, appended to df if not None.  Returns df if nothing accumulated."""
+    self.flush_records()
+    frames = ([df] if df is not None else [])+self.frames
+    self.frames = []
+    self.nrows = 0
+    if not frames: return df
+    return pd.concat(frames) if len(frames)>1 else frames[0]
+
+#############################################################################
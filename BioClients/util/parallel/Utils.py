@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+'''
+Bounded-concurrency fan-out for per-ID REST lookups.
+
+Requests are issued from a thread pool, at most N in flight, and results
+yielded in input order, so TSV output is identical to the serial case.
+Requests share the pooled session from util.rest; for N greater than its
+per-host pool size, use rest.ConfigureSession(pool_maxsize=N).
+
+MapOrderedProcesses() is the same for CPU-bound work (e.g. file parsing),
+in a pool of worker processes.
+
+Failed calls (exceptions) are counted, in the calling process, so that
+clients can report them at the end and exit non-zero; see ReportFailures().
+'''
+import sys,os,logging,threading,collections
+from concurrent.futures import ThreadPoolExecutor,ProcessPoolExecutor
+#
+CONCURRENCY=1
+NPROC=1
+FAILURES_NMAX_LOGGED=20 #Failed items listed in summary.
+#
+FAILURES=[]
+FAILURES_LOCK=threading.Lock()
+#
+##############################################################################
+def Failed(item, e):
+  logging.error(f"{str(item)[:200]}: {e}")
+  with FAILURES_LOCK:
+    FAILURES.append(item)
+
+def CallSafe(func, item):
+  '''Errors logged and counted, returning None, so one bad ID does not abort a run.'''
+  try:
+    return func(item)
+  except Exception as e:
+    Failed(item, e)
+    return None
+
+def ResultSafe(future, item):
+  '''Result of future, as CallSafe().'''
+  try:
+    return future.result()
+  except Exception as e:
+    Failed(item, e)
+    return None
+
+##############################################################################
+def NFailures():
+  with FAILURES_LOCK:
+    return len(FAILURES)
+
+def ResetFailures():
+  with FAILURES_LOCK:
+    FAILURES.clear()
+
+def ReportFailures():
+  '''Log error summary of failed calls, if any; return number failed.'''
+  with FAILURES_LOCK:
+    n_fail = len(FAILURES)
+    items = FAILURES[:FAILURES_NMAX_LOGGED]
+  if n_fail:
+    logging.error(f"Failed calls: {n_fail}; output incomplete. Failed: {', '.join([str(item)[:200] for item in items])}{' ...' if n_fail>len(items) else ''}")
+  return n_fail
+
+##############################################################################
+def MapOrdered(func, items, concurrency=CONCURRENCY):
+  '''Generate (item, func(item)) in input order, with up to concurrency
+calls in flight.  Results are None for calls which raise.  Lazy: only
+a bounded window of pending results is held in memory.'''
+  if concurrency is None or concurrency<=1:
+    for item in items:
+      yield item, CallSafe(func, item)
+    return
+  with ThreadPoolExecutor(max_workers=concurrency) as executor:
+    pending = collections.deque()
+    for item in items:
+      pending.append((item, executor.submit(func, item)))
+      if len(pending)>=2*concurrency:
+        item_this, future = pending.popleft()
+        yield item_this, ResultSafe(future, item_this)
+    while pending:
+      item_this, future = pending.popleft()
+      yield item_this, ResultSafe(future, item_this)
+##############################################################################
+def MapOrderedProcesses(func, items, nproc=NPROC, initializer=None, initargs=()):
+  '''As MapOrdered(), with up to nproc worker processes.  func, and
+initializer if specified, must be picklable (module level).  initializer
+(called with initargs once per worker, or once in-process if nproc<=1)
+sets up per-worker read-only state, rather than pickling it per item.'''
+  if nproc is None or nproc<=1:
+    if initializer is not None: initializer(*initargs)
+    for item in items:
+      yield item, CallSafe(func, item)
+    return
+  with ProcessPoolExecutor(max_workers=nproc, initializer=initializer, initargs=initargs) as executor:
+    pending = collections.deque()
+    for item in items:
+      pending.append((item, executor.submit(func, item)))
+      if len(pending)>=2*nproc:
+        item_this, future = pending.popleft()
+        yield item_this, ResultSafe(future, item_this)
+    while pending:
+      item_this, future = pending.popleft()
+      yield item_this, ResultSafe(future, item_this)
+
+##############################################################################
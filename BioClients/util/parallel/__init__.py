@@ -0,0 +1 @@
+from .Utils import *
@@ -11,29 +11,45 @@ from .. import rdf as util_rdf
 #############################################################################
 if __name__=="__main__":
   parser = argparse.ArgumentParser(description="RDF utility", epilog="")
-  ops = [ "describe_rdf", "validate_rdf", "convert_rdf", ]
-  FORMATS = ["text/turtle", "application/rdf+xml", "text/n3", ]
+  ops = [ "describe_rdf", "validate_rdf", "convert_rdf", "lookup_predicate", ]
+  FORMATS = util_rdf.FORMATS
   parser.add_argument("op", choices=ops, help="OPERATION")
   parser.add_argument("--i", dest="ifile", help="input file (RDF)")
   parser.add_argument("--ifmt", choices=FORMATS, default="text/turtle", help="input RDF format")
   parser.add_argument("--ofmt", choices=FORMATS, default="text/turtle", help="output RDF format")
   parser.add_argument("--o", dest="ofile", help="output file")
+  parser.add_argument("--store", choices=util_rdf.STORES, default="memory", help="graph store, for conversions not streamed (N-Triples/N-Quads to N-Triples/N-Quads/Turtle are streamed)")
+  parser.add_argument("--store_path", help="on-disk store directory (berkeleydb, oxigraph)")
+  parser.add_argument("--graph", help="graph IRI, for N-Quads output")
+  parser.add_argument("--o_index", dest="ofile_index", help="output predicate index (SQLite), from describe_rdf")
+  parser.add_argument("--index", dest="ifile_index", help="input predicate index (SQLite), for lookup_predicate")
+  parser.add_argument("--predicate", help="predicate IRI, for lookup_predicate")
+  parser.add_argument("--hll_precision", type=int, default=util_rdf.HLL_PRECISION, help="HyperLogLog precision (log2 registers), for distinct counts")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format="%(levelname)s:%(message)s", level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
-  fin = open(args.ifile, "r") if args.ifile else sys.stdin
-  fout = open(args.ofile, "w") if args.ofile else sys.stdout
+  if args.store=="berkeleydb" and not args.store_path:
+    parser.error("--store_path required for berkeleydb.")
+
+  fin = util_rdf.OpenRdf(args.ifile, "r")
+  fout = util_rdf.OpenRdf(args.ofile, "w")
 
   if args.op == "describe_rdf":
-    util_rdf.DescribeRdf(fin, args.ifmt)
+    util_rdf.DescribeRdf(fin, args.ifmt, fout, args.ofile_index, args.hll_precision)
 
   elif args.op == "validate_rdf":
     util_rdf.ValidateRdf(fin, args.ifmt)
 
   elif args.op == "convert_rdf":
-    util_rdf.ConvertRdf(fin, args.ifmt, args.ofmt, fout)
+    util_rdf.ConvertRdf(fin, args.ifmt, args.ofmt, fout, args.store, args.store_path, args.graph)
+
+  elif args.op == "lookup_predicate":
+    if not (args.ifile_index and args.predicate): parser.error(f"--index and --predicate required for {args.op}")
+    util_rdf.LookupPredicate(args.ifile_index, args.predicate, fout)
 
   else:
     parser.error(f"Invalid operation: {args.op}")
+
+  if args.ofile: fout.close()
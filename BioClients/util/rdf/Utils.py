@@ -3,14 +3,63 @@
 RDF utility functions.
 https://rdflib.readthedocs.io/
 https://owlready2.readthedocs.io/
+
+Line-oriented formats (N-Triples, N-Quads) are converted by streaming, line
+by line, without building a graph, so memory is bounded regardless of input
+size.  N-Triples is also valid Turtle, so Turtle output is streamed likewise.
+Other conversions need a full graph, held in memory (rdflib default), or in
+an on-disk store: "berkeleydb" (rdflib BerkeleyDB store, requires berkeleydb)
+or "oxigraph" (pyoxigraph Store, bulk load and dump, both streaming).
+Files ending in .gz are read and written gzipped.  N-Quads converted to a
+format without named graphs are merged into one graph (union).
+
+DescribeRdf() profiles a file in one streaming pass (N-Triples/N-Quads by
+line; other formats with the pyoxigraph parser if available, else rdflib):
+predicate, class, namespace and literal datatype frequencies, and distinct
+subject and object counts, estimated by HyperLogLog.  Optionally it writes
+a predicate index (SQLite), for LookupPredicate().
 """
-import sys,os,re,gzip,argparse,logging
+import sys,os,re,gzip,hashlib,sqlite3,argparse,logging
+import numpy as np
 
 import rdflib as rl
+#
+FORMATS = ["text/turtle", "application/rdf+xml", "text/n3", "application/n-triples", "application/n-quads"]
+LINE_FORMATS = ["application/n-triples", "application/n-quads"] #one statement per line
+DATASET_FORMATS = ["application/n-quads"] #named graphs; to other formats, graphs are merged
+STORES = ["memory", "berkeleydb", "oxigraph"]
+HLL_PRECISION = 14 #2^14 registers, std error ~0.8%
+HLL_BATCH = 100000
+INDEX_BATCH = 100000
+RDF_TYPE = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>"
+XSD_STRING = "<http://www.w3.org/2001/XMLSchema#string>"
+RDF_LANGSTRING = "<http://www.w3.org/1999/02/22-rdf-syntax-ns#langString>"
+#
+NT_IRI = r'<[^<>"{}|^`\\\s]*>'
+NT_BNODE = r'_:[^\s<>"]+?'
+NT_LITERAL = r'"(?:[^"\\\n\r]|\\.)*"(?:@[a-zA-Z]+(?:-[a-zA-Z0-9]+)*|\^\^'+NT_IRI+r')?'
+NT_STATEMENT_RE = re.compile(r'\s*('+NT_IRI+'|'+NT_BNODE+r')\s*('+NT_IRI+r')\s*('+NT_IRI+'|'+NT_BNODE+'|'+NT_LITERAL+r')\s*(?:('+NT_IRI+'|'+NT_BNODE+r')\s*)?\.\s*(?:#.*)?$')
+#
+#############################################################################
+def OpenRdf(fpath, mode="r"):
+  """Open text file, gzipped if .gz; stdin/stdout if None."""
+  if fpath is None:
+    return sys.stdin if mode.startswith("r") else sys.stdout
+  if fpath.endswith(".gz"):
+    return gzip.open(fpath, mode+"t", encoding="utf8")
+  return open(fpath, mode, encoding="utf8")
 
 #############################################################################
-def LoadRdfFile(fin, ifmt):
-  g = rl.Graph()
+def LoadRdfFile(fin, ifmt, store=None, store_path=None):
+  """Graph in memory, or in on-disk store (berkeleydb) at store_path.  For
+dataset (quad) formats, a Dataset whose default graph is the union of
+graphs, so serializing to a triples format merges them."""
+  if ifmt in DATASET_FORMATS:
+    g = rl.Dataset(store=("BerkeleyDB" if store=="berkeleydb" else "default"), default_union=True)
+  else:
+    g = rl.Graph(store=("BerkeleyDB" if store=="berkeleydb" else "default"))
+  if store=="berkeleydb":
+    g.open(store_path, create=True)
   try:
     g.parse(fin, format=ifmt)
     logging.info(f"RDF graph from {fin.name} ({ifmt}) contains {len(g)} triples.")
@@ -30,13 +79,205 @@ def ValidateRdf(fin, ifmt):
     return False
 
 #############################################################################
-def DescribeRdf(fin, ifmt):
-  g = LoadRdfFile(fin, ifmt)
+class HyperLogLog:
+  """Distinct count estimator (Flajolet et al. 2007), with small range
+(linear counting) correction.  Values (str) hashed in batches."""
+  def __init__(self, p=HLL_PRECISION):
+    if not 4<=p<=18: raise ValueError(f"HyperLogLog precision must be in 4-18: {p}")
+    self.p = p
+    self.m = 1<<p
+    self.registers = np.zeros(self.m, dtype=np.uint8)
+    self.buf = []
+
+  def add(self, val):
+    self.buf.append(val)
+    if len(self.buf)>=HLL_BATCH: self.flush()
+
+  def flush(self):
+    if not self.buf: return
+    hashes = np.fromiter((int.from_bytes(hashlib.blake2b(val.encode("utf8"), digest_size=8).digest(), "little") for val in self.buf), dtype=np.uint64, count=len(self.buf))
+    self.buf = []
+    nbits = 64-self.p
+    idx = (hashes>>np.uint64(nbits)).astype(np.int64)
+    rest = (hashes&np.uint64((1<<nbits)-1)).astype(np.float64)
+    rho = (nbits-np.frexp(rest)[1]+1).astype(np.uint8) #leading zeros + 1
+    np.maximum.at(self.registers, idx, rho)
+
+  def count(self):
+    self.flush()
+    alpha = 0.7213/(1+1.079/self.m)
+    est = alpha*self.m*self.m/np.sum(np.ldexp(1.0, -self.registers.astype(np.int32)))
+    nzero = int((self.registers==0).sum())
+    if est<=2.5*self.m and nzero>0:
+      est = self.m*np.log(self.m/nzero)
+    return int(round(est))
 
 #############################################################################
-def ConvertRdf(fin, ifmt, ofmt, fout):
-  g = LoadRdfFile(fin, ifmt)
-  fout.write(g.serialize(format=ofmt).decode("utf8"))
-  logging.info(f"RDF graph to {fout.name} ({ofmt}) containing {len(g)} triples.")
+def ReadRdfTerms(fin, ifmt):
+  """Generate (subject, predicate, object, graph) terms, as N-Triples
+strings (graph None if default), streaming if possible."""
+  if ifmt in LINE_FORMATS:
+    yield from ReadStatements(fin)
+    return
+  try:
+    import pyoxigraph as ox
+  except ImportError:
+    logging.warning(f"pyoxigraph not available; loading graph with rdflib.")
+    g = LoadRdfFile(fin, ifmt)
+    if g is None: return
+    for s,p,o in g:
+      yield s.n3(), p.n3(), o.n3(), None
+    return
+  for q in ox.parse(input=fin, format=ox.RdfFormat.from_media_type(ifmt)):
+    yield str(q.subject), str(q.predicate), str(q.object), (None if isinstance(q.graph_name, ox.DefaultGraph) else str(q.graph_name))
+
+def IriNamespace(term):
+  """Namespace of IRI term (to last # or /), else None."""
+  if term[:1]!='<': return None
+  k = max(term.rfind('#'), term.rfind('/'))
+  return term[1:k+1] if k>0 else term[1:-1]
+
+def LiteralDatatype(term):
+  if term[-1:]=='>': return term[term.rfind('^^')+2:]
+  if term[-1:]!='"': return RDF_LANGSTRING
+  return XSD_STRING
+
+#############################################################################
+def DescribeRdf(fin, ifmt, fout=None, ofile_index=None, hll_precision=HLL_PRECISION):
+  """Statistics TSV (category, key, count), and optional predicate index
+(SQLite) of (subject, object) by predicate."""
+  preds={}; pids={}; classes={}; namespaces={}; datatypes={}; graphs={};
+  hll_s = HyperLogLog(hll_precision)
+  hll_o = HyperLogLog(hll_precision)
+  n_triple=0; n_literal=0; n_bnode=0;
+  db=None; rows=[];
+  if ofile_index:
+    if os.path.exists(ofile_index): os.remove(ofile_index)
+    db = sqlite3.connect(ofile_index)
+    db.execute("CREATE TABLE predicate (pid INTEGER PRIMARY KEY, iri TEXT, n INTEGER)")
+    db.execute("CREATE TABLE pso (pid INTEGER, s TEXT, o TEXT)")
+  for s,p,o,g in ReadRdfTerms(fin, ifmt):
+    n_triple+=1
+    if p in preds: preds[p]+=1
+    else: preds[p]=1; pids[p]=len(pids)+1;
+    if g is not None: graphs[g] = graphs.get(g, 0)+1
+    hll_s.add(s)
+    hll_o.add(o)
+    if s[:1]=='_': n_bnode+=1
+    if o[:1]=='"':
+      n_literal+=1
+      dt = LiteralDatatype(o)
+      datatypes[dt] = datatypes.get(dt, 0)+1
+    elif o[:1]=='_':
+      n_bnode+=1
+    elif p==RDF_TYPE:
+      classes[o] = classes.get(o, 0)+1
+    for term in (s, p, o):
+      ns = IriNamespace(term)
+      if ns is not None: namespaces[ns] = namespaces.get(ns, 0)+1
+    if db is not None:
+      rows.append((pids[p], s, o))
+      if len(rows)>=INDEX_BATCH:
+        db.executemany("INSERT INTO pso (pid, s, o) VALUES (?, ?, ?)", rows)
+        rows=[]
+  if db is not None:
+    db.executemany("INSERT INTO pso (pid, s, o) VALUES (?, ?, ?)", rows)
+    db.executemany("INSERT INTO predicate (pid, iri, n) VALUES (?, ?, ?)", [(pids[p], p, n) for p,n in preds.items()])
+    db.execute("CREATE INDEX pso_pid ON pso (pid)")
+    db.commit()
+    db.close()
+    logging.info(f"Predicate index: {ofile_index}")
+  stats = [("triples", n_triple), ("predicates", len(preds)), ("subjects_distinct_est", hll_s.count()), ("objects_distinct_est", hll_o.count()), ("classes", len(classes)), ("literals", n_literal), ("blank_node_terms", n_bnode), ("graphs", len(graphs))]
+  for key,val in stats:
+    logging.info(f"{key}: {val}")
+  if fout is None: return
+  fout.write("category\tkey\tcount\n")
+  for key,val in stats:
+    fout.write(f"summary\t{key}\t{val}\n")
+  for category,counts in (("predicate", preds), ("class", classes), ("namespace", namespaces), ("datatype", datatypes), ("graph", graphs)):
+    for key,val in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0])):
+      fout.write(f"{category}\t{key}\t{val}\n")
+
+#############################################################################
+def LookupPredicate(ifile_index, predicate, fout):
+  """From predicate index, (subject, object) TSV for predicate IRI."""
+  predicate = predicate if predicate.startswith('<') else f"<{predicate}>"
+  db = sqlite3.connect(ifile_index)
+  n_out=0;
+  fout.write("subject\tobject\n")
+  for s,o in db.execute("SELECT s, o FROM pso JOIN predicate USING (pid) WHERE iri=?", (predicate,)):
+    fout.write(f"{s}\t{o}\n")
+    n_out+=1
+  db.close()
+  logging.info(f"{predicate}: {n_out}")
+  return n_out
+
+#############################################################################
+def ReadStatements(fin):
+  """Generate (subject, predicate, object, graph) N-Triples/N-Quads terms,
+as strings (graph None if absent).  Blank and comment lines skipped; invalid
+lines logged and skipped."""
+  n_in=0; n_err=0;
+  for line in fin:
+    n_in+=1
+    if not line.strip() or line.lstrip().startswith('#'): continue
+    m = NT_STATEMENT_RE.match(line)
+    if m is None:
+      n_err+=1
+      if n_err<=10: logging.warning(f"Invalid statement, line {n_in}: {line.strip()[:200]}")
+      continue
+    yield m.groups()
+  logging.info(f"input lines: {n_in}; invalid: {n_err}")
+
+#############################################################################
+def ConvertRdfStream(fin, ifmt, ofmt, fout, graph=None):
+  """Line by line, N-Triples/N-Quads to N-Triples/N-Quads/Turtle.  To
+triples, graph names are dropped; to N-Quads, graph (IRI) is assigned to
+statements without one."""
+  if ifmt not in LINE_FORMATS or ofmt not in LINE_FORMATS+["text/turtle"]:
+    raise ValueError(f"Streaming conversion requires {LINE_FORMATS} input, {LINE_FORMATS+['text/turtle']} output.")
+  quads = (ofmt=="application/n-quads")
+  graph = f"<{graph}>" if graph else None
+  n_out=0;
+  for s,p,o,g in ReadStatements(fin):
+    g = g if g else graph
+    if quads and g: fout.write(f"{s} {p} {o} {g} .\n")
+    else: fout.write(f"{s} {p} {o} .\n")
+    n_out+=1
+  logging.info(f"RDF statements to {fout.name} ({ofmt}): {n_out}")
+  return n_out
+
+#############################################################################
+def ConvertRdfOxigraph(fin, ifmt, ofmt, fout, store_path=None):
+  """Via pyoxigraph Store (on disk, if store_path), bulk load and dump.  If
+the output format does not support datasets, quads are loaded into the
+default graph (graphs merged)."""
+  import pyoxigraph as ox
+  store = ox.Store(store_path) if store_path else ox.Store()
+  iformat = ox.RdfFormat.from_media_type(ifmt)
+  oformat = ox.RdfFormat.from_media_type(ofmt)
+  if iformat.supports_datasets and not oformat.supports_datasets:
+    store.bulk_extend(ox.Quad(q.subject, q.predicate, q.object, ox.DefaultGraph()) for q in ox.parse(input=fin, format=iformat))
+  else:
+    store.bulk_load(input=fin, format=iformat)
+  logging.info(f"RDF store ({store_path if store_path else 'memory'}) contains {len(store)} quads.")
+  fout.flush()
+  store.dump(output=getattr(fout, "buffer", fout), format=oformat, from_graph=(None if oformat.supports_datasets else ox.DefaultGraph()))
+  logging.info(f"RDF graph to {fout.name} ({ofmt}) containing {len(store)} quads.")
+
+#############################################################################
+def ConvertRdf(fin, ifmt, ofmt, fout, store=None, store_path=None, graph=None):
+  """Streaming for line-oriented formats, else via store."""
+  if ifmt in LINE_FORMATS and ofmt in LINE_FORMATS+["text/turtle"]:
+    ConvertRdfStream(fin, ifmt, ofmt, fout, graph)
+  elif store=="oxigraph":
+    ConvertRdfOxigraph(fin, ifmt, ofmt, fout, store_path)
+  else:
+    g = LoadRdfFile(fin, ifmt, store, store_path)
+    if g is None: return
+    fout.flush()
+    g.serialize(destination=getattr(fout, "buffer", fout), format=ofmt)
+    logging.info(f"RDF graph to {fout.name} ({ofmt}) containing {len(g)} triples.")
+    if store=="berkeleydb": g.close()
 
 #############################################################################
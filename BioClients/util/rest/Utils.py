@@ -4,16 +4,342 @@ Commonly used functions for REST client applications.
 
 * JSON and XML handled, parsed into objects.
 * HTTP headers and POST data handled.
+* One process-wide requests.Session, with per-host keep-alive connection
+  pools, gzip/br negotiation and retry/backoff, shared by all clients
+  via GetSession(), so repeated requests reuse TCP+TLS connections.
+* Per-host token-bucket rate limiting, consulted by the session for every
+  request, with adaptive slowdown on 429/503 and Retry-After honored.
+  Defaults (REST_RATE_LIMITS) follow published service policies:
+    - PubChem PUG-REST: 5 requests/s.
+    - NCBI E-utilities: 3 requests/s, 10 requests/s with api_key.
+    - EBI (ChEMBL etc.): no published limit; 10 requests/s assumed.
+    - Ensembl REST: 55,000 requests/hour (~15 requests/s).
+  Other hosts are unlimited until throttled.  See SetRateLimit().
+* Opt-in persistent response cache (SQLite), keyed by method+URL+body, with
+  per-host TTLs and LRU eviction to a size cap.  GET only, by default.
+  Requests with header NO_CACHE (e.g. status polling, listkey submission)
+  are never cached.  See EnableCache().
 
 '''
-import sys,os,io,re,time,logging,base64,json
+import sys,os,io,re,time,logging,base64,json,threading,hashlib,sqlite3,atexit
 import urllib,urllib.request,urllib.parse
+import email.utils
 from xml.etree import ElementTree as ET
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+from urllib3.util.retry import Retry
+from urllib3.util import make_headers
 #
 REST_TIMEOUT=10
 REST_RETRY_NMAX=10
-REST_RETRY_WAIT=5
+REST_RETRY_STATUS_NMAX=4
+REST_RETRY_BACKOFF=2
+REST_RETRY_WAIT_MAX=120
+REST_RETRY_STATUS_CODES=[500, 502, 504] #429, 503 handled by rate limiter; 413 by callers (smaller requests).
+REST_THROTTLE_STATUS_CODES=[429, 503]
+REST_POOL_CONNECTIONS=20 #Number of per-host pools cached.
+REST_POOL_MAXSIZE=10 #Max keep-alive connections per host.
 #
+REST_RATE_LIMITS={ #Requests per second, per host.
+	"pubchem.ncbi.nlm.nih.gov":5,
+	"eutils.ncbi.nlm.nih.gov":3,
+	"www.ebi.ac.uk":10,
+	"rest.ensembl.org":15
+	}
+REST_RATE_LIMITS_APIKEY={ #Requests per second, per host, if api_key in URL.
+	"eutils.ncbi.nlm.nih.gov":10
+	}
+REST_RATE_INIT=10 #Initial rate for unlimited hosts when throttled.
+REST_RATE_MIN=0.2
+#
+REST_CACHE_FILE="bioclients_cache.sqlite"
+REST_CACHE_TTL=30*24*3600 #Seconds.
+REST_CACHE_TTLS={ #Seconds, per host, for frequently updated sources.
+	"eutils.ncbi.nlm.nih.gov":7*24*3600,
+	"clinicaltrials.gov":24*3600
+	}
+REST_CACHE_SIZE_MAX=2*1024**3 #Bytes.
+REST_CACHE_EVICT_INTERVAL=1000 #Stores between eviction checks.
+REST_CACHE_METHODS=["GET"] #POST may be enabled, for query-only services (EnableCache(methods=...)).
+REST_NO_CACHE_HEADER="X-BioClients-No-Cache" #Removed before sending.
+NO_CACHE={REST_NO_CACHE_HEADER:"1"} #Per-request opt-out: headers={**headers, **rest.NO_CACHE}.
+#
+SESSION=None
+SESSION_LOCK=threading.Lock()
+RATE_LIMITERS={}
+RATE_LIMITERS_LOCK=threading.Lock()
+CACHE=None
+#
+##############################################################################
+class ResponseCache:
+  '''Persistent HTTP response cache in a SQLite file.  Only 200 responses
+are stored, with body decoded (gzip/br).  Thread-safe.'''
+  def __init__(self, cachedir, ttl=None, size_max=REST_CACHE_SIZE_MAX, methods=REST_CACHE_METHODS):
+    os.makedirs(cachedir, exist_ok=True)
+    self.path = os.path.join(cachedir, REST_CACHE_FILE)
+    self.ttl = ttl
+    self.methods = methods
+    self.size_max = size_max
+    self.n_store = 0
+    self.n_hit = 0
+    self.n_miss = 0
+    self.lock = threading.Lock()
+    self.db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+    self.db.execute("PRAGMA journal_mode=WAL")
+    self.db.execute("PRAGMA synchronous=NORMAL")
+    self.db.execute("""CREATE TABLE IF NOT EXISTS response (
+	key TEXT PRIMARY KEY,
+	host TEXT,
+	url TEXT,
+	t_stored REAL,
+	t_access REAL,
+	size INTEGER,
+	status INTEGER,
+	reason TEXT,
+	headers TEXT,
+	body BLOB)""")
+    self.db.execute("CREATE INDEX IF NOT EXISTS response_t_access ON response (t_access)")
+    logging.debug(f"Cache: {self.path}")
+
+  @staticmethod
+  def Key(request):
+    body = request.body if request.body is not None else b''
+    if type(body) is str: body = body.encode('utf-8')
+    return hashlib.sha256(request.method.encode('utf-8')+b' '+request.url.encode('utf-8')+b'\n'+body).hexdigest()
+
+  def TTL(self, host):
+    return self.ttl if self.ttl is not None else REST_CACHE_TTLS.get(host, REST_CACHE_TTL)
+
+  def get(self, request):
+    if request.method not in self.methods: return None
+    key = self.Key(request)
+    host = urllib.parse.urlsplit(request.url).hostname
+    t_now = time.time()
+    with self.lock:
+      row = self.db.execute("SELECT t_stored, status, reason, headers, body FROM response WHERE key=?", (key,)).fetchone()
+      if row is None or t_now-row[0]>self.TTL(host):
+        self.n_miss+=1
+        return None
+      self.db.execute("UPDATE response SET t_access=? WHERE key=?", (t_now, key))
+      self.n_hit+=1
+    response = requests.models.Response()
+    response.status_code = row[1]
+    response.reason = row[2]
+    response.headers = CaseInsensitiveDict(json.loads(row[3]))
+    response._content = row[4]
+    response._content_consumed = True
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.url = request.url
+    response.request = request
+    return response
+
+  def put(self, request, response):
+    if request.method not in self.methods or response.status_code!=200: return
+    body = response.content
+    headers = {k:v for k,v in response.headers.items() if k.lower() not in ("content-encoding", "content-length", "transfer-encoding")}
+    t_now = time.time()
+    with self.lock:
+      self.db.execute("INSERT OR REPLACE INTO response (key, host, url, t_stored, t_access, size, status, reason, headers, body) VALUES (?,?,?,?,?,?,?,?,?,?)", (self.Key(request), urllib.parse.urlsplit(request.url).hostname, request.url, t_now, t_now, len(body), response.status_code, response.reason, json.dumps(headers), body))
+      self.n_store+=1
+      if self.n_store%REST_CACHE_EVICT_INTERVAL==0: self.evict()
+
+  def evict(self):
+    '''Remove least recently used responses until under size_max.  Call with lock held.'''
+    size = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM response").fetchone()[0]
+    if size<=self.size_max: return
+    n_del=0;
+    for key,size_this in self.db.execute("SELECT key, size FROM response ORDER BY t_access").fetchall():
+      self.db.execute("DELETE FROM response WHERE key=?", (key,))
+      size-=size_this; n_del+=1
+      if size<=0.9*self.size_max: break
+    logging.debug(f"Cache: evicted {n_del} responses; size: {size} bytes")
+
+  def close(self):
+    with self.lock:
+      self.evict()
+      self.db.close()
+    logging.info(f"Cache: hits: {self.n_hit}; misses: {self.n_miss}; stored: {self.n_store}")
+
+##############################################################################
+def EnableCache(cachedir, ttl=None, size_max=REST_CACHE_SIZE_MAX, methods=REST_CACHE_METHODS):
+  '''Cache responses of the shared session in cachedir.  TTL (seconds), if
+specified, overrides the per-host defaults in REST_CACHE_TTLS.  Only
+requests with methods are cached (default GET); POST is safe only for
+services where POST is a query, not a submission.'''
+  global CACHE
+  if CACHE is not None: CACHE.close()
+  CACHE = ResponseCache(cachedir, ttl, size_max, methods)
+  atexit.register(DisableCache)
+  return CACHE
+
+##############################################################################
+def DisableCache():
+  global CACHE
+  if CACHE is not None: CACHE.close()
+  CACHE = None
+
+##############################################################################
+class TokenBucket:
+  '''Thread-safe token bucket.  Rate None means unlimited.  Multiplicative
+decrease when throttled, additive increase on success, up to rate_max.'''
+  def __init__(self, rate, burst=None):
+    self.rate_max = rate
+    self.rate = rate
+    self.burst = burst if burst else max(1, rate) if rate else 1
+    self.tokens = self.burst
+    self.t_last = time.monotonic()
+    self.t_pause = 0
+    self.lock = threading.Lock()
+
+  def acquire(self):
+    while True:
+      with self.lock:
+        t_now = time.monotonic()
+        if t_now<self.t_pause:
+          wait = self.t_pause-t_now
+        elif self.rate is None:
+          return
+        else:
+          self.tokens = min(self.burst, self.tokens+(t_now-self.t_last)*self.rate)
+          self.t_last = t_now
+          if self.tokens>=1:
+            self.tokens-=1
+            return
+          wait = (1-self.tokens)/self.rate
+      time.sleep(wait)
+
+  def penalize(self, wait):
+    with self.lock:
+      self.rate = max(REST_RATE_MIN, (self.rate if self.rate else REST_RATE_INIT)/2)
+      self.tokens = min(self.tokens, 1)
+      self.t_pause = max(self.t_pause, time.monotonic()+wait)
+      logging.debug(f"Throttled; rate: {self.rate:.2f}/s; pause: {wait:.1f}s")
+
+  def reward(self):
+    with self.lock:
+      if self.rate is None or self.rate==self.rate_max: return
+      rate_ceil = self.rate_max if self.rate_max else REST_RATE_INIT
+      self.rate = min(rate_ceil, self.rate+rate_ceil/20)
+      if self.rate_max is None and self.rate>=rate_ceil: self.rate = None
+
+##############################################################################
+def SetRateLimit(host, rate, burst=None):
+  '''Set requests/second for a host; None for unlimited.'''
+  with RATE_LIMITERS_LOCK:
+    RATE_LIMITERS[host] = TokenBucket(rate, burst)
+
+##############################################################################
+def GetRateLimiter(url):
+  '''Token bucket for the URL's host, created on first use from REST_RATE_LIMITS.'''
+  urlp = urllib.parse.urlsplit(url)
+  host = urlp.hostname
+  key = host
+  if host in REST_RATE_LIMITS_APIKEY and 'api_key' in urllib.parse.parse_qs(urlp.query):
+    key = f"{host}?api_key"
+  with RATE_LIMITERS_LOCK:
+    if key not in RATE_LIMITERS:
+      rate = REST_RATE_LIMITS_APIKEY[host] if key!=host else REST_RATE_LIMITS.get(host)
+      RATE_LIMITERS[key] = TokenBucket(rate)
+    return RATE_LIMITERS[key]
+
+##############################################################################
+def RetryAfter(response):
+  '''Seconds from Retry-After header (delta-seconds or HTTP-date), or None.'''
+  val = response.headers.get("Retry-After")
+  if not val: return None
+  try:
+    return max(0, float(val))
+  except ValueError:
+    pass
+  try:
+    return max(0, email.utils.parsedate_to_datetime(val).timestamp()-time.time())
+  except Exception:
+    return None
+
+##############################################################################
+class ThrottledAdapter(HTTPAdapter):
+  '''HTTPAdapter which waits on the host's token bucket before each request,
+and on 429/503 slows the host down and retries after Retry-After (or backoff).
+If enabled, the response cache is consulted first, without rate limiting,
+unless the request has the NO_CACHE header.'''
+  def send(self, request, **kwargs):
+    cache = CACHE
+    if request.headers.pop(REST_NO_CACHE_HEADER, None) is not None:
+      cache = None
+    if cache is not None:
+      response = cache.get(request)
+      if response is not None:
+        response.connection = self
+        return response
+    bucket = GetRateLimiter(request.url)
+    i_try=0
+    while True:
+      bucket.acquire()
+      response = super().send(request, **kwargs)
+      if response.status_code not in REST_THROTTLE_STATUS_CODES or i_try>=REST_RETRY_STATUS_NMAX:
+        if response.ok: bucket.reward()
+        if cache is not None and not kwargs.get("stream"): cache.put(request, response)
+        return response
+      i_try+=1
+      wait = RetryAfter(response)
+      if wait is None: wait = REST_RETRY_BACKOFF*2**(i_try-1)
+      wait = min(wait, REST_RETRY_WAIT_MAX)
+      logging.debug(f"[try {i_try}/{REST_RETRY_STATUS_NMAX}] {response.status_code} {response.reason}; waiting {wait:.1f}s: {request.url}")
+      response.close()
+      bucket.penalize(wait)
+
+##############################################################################
+def RetryStrategy(nmax_retry=REST_RETRY_NMAX, backoff_factor=REST_RETRY_BACKOFF):
+  '''Retry with exponential backoff for connection errors and transient
+HTTP statuses.  POST included, since our POSTs are queries (e.g. PUG-REST ID lists).
+Retry-After is not honored here: urllib3 would then also retry 413/429/503
+carrying it, before ThrottledAdapter (429, 503: slowdown and Retry-After) or
+callers (413: smaller requests) see the response.  After retries, the last
+response is returned, not raised.'''
+  return Retry(
+	total=nmax_retry,
+	status=REST_RETRY_STATUS_NMAX,
+	backoff_factor=backoff_factor,
+	status_forcelist=REST_RETRY_STATUS_CODES,
+	allowed_methods=Retry.DEFAULT_ALLOWED_METHODS|frozenset(["POST"]),
+	respect_retry_after_header=False,
+	raise_on_status=False
+	)
+
+##############################################################################
+def MountAdapters(session, pool_connections=REST_POOL_CONNECTIONS, pool_maxsize=REST_POOL_MAXSIZE, nmax_retry=REST_RETRY_NMAX):
+  adapter = ThrottledAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=RetryStrategy(nmax_retry))
+  session.mount("https://", adapter)
+  session.mount("http://", adapter)
+
+##############################################################################
+def InitiateSession(pool_connections=REST_POOL_CONNECTIONS, pool_maxsize=REST_POOL_MAXSIZE, nmax_retry=REST_RETRY_NMAX):
+  '''New session with keep-alive pools and retry policy.  Normally use GetSession().'''
+  session = requests.Session()
+  MountAdapters(session, pool_connections, pool_maxsize, nmax_retry)
+  session.headers.update(make_headers(accept_encoding=True)) #gzip,deflate[,br,zstd] as supported.
+  return session
+
+##############################################################################
+def GetSession():
+  '''Process-wide shared session, created on first use.  Thread-safe.'''
+  global SESSION
+  with SESSION_LOCK:
+    if SESSION is None:
+      SESSION = InitiateSession()
+    return SESSION
+
+##############################################################################
+def ConfigureSession(pool_connections=REST_POOL_CONNECTIONS, pool_maxsize=REST_POOL_MAXSIZE, nmax_retry=REST_RETRY_NMAX):
+  '''Reconfigure the shared session in place, e.g. with larger pools for
+concurrent requests.  Existing references to the session remain valid.'''
+  session = GetSession()
+  with SESSION_LOCK:
+    MountAdapters(session, pool_connections, pool_maxsize, nmax_retry)
+  return session
+
 ##############################################################################
 def GetURL(url, headers={}, parse_json=False, usr=None, pw=None, parse_xml=False, nmax_retry=REST_RETRY_NMAX, verbose=0):
   '''Entry point for GET requests.'''
@@ -26,71 +352,57 @@ def PostURL(url, headers={}, data={}, usr=None, pw=None, parse_json=False, parse
 
 ##############################################################################
 def RequestURL(url, headers, data, usr, pw, parse_json, parse_xml, nmax_retry, verbose):
-  '''Use internally, not externally.  Called by GetURL() and PostURL().  Only Basic authentication supported.'''
+  '''Use internally, not externally.  Called by GetURL() and PostURL().  Only Basic authentication supported.
+Retries are by the session's retry policy only (see RetryStrategy(), ConfigureSession(nmax_retry=...));
+nmax_retry here is retained for compatibility, and ignored.'''
   if data and type(data) is dict:
-    data = urllib.parse.urlencode(data).encode('utf-8')
+    pass #Form-urlencoded by requests.
   elif data and type(data) in (str,): #Ok for SOAP/XML?
     data = data.encode('utf-8')
+  elif data and type(data) is bytes:
+    pass
   else:
     data = None
-  req = urllib.request.Request(url=url, headers=headers, data=data)
-  if usr and pw:
-    req.add_header("Authorization", "Basic %s"%base64.encodestring('%s:%s'%(usr,pw)).replace('\n','')) 
+  method = "POST" if data else "GET"
+  auth = (usr, pw) if usr and pw else None
+  session = GetSession()
 
   logging.debug('url="%s"'%url)
-  logging.debug('request type = %s'%req.type)
-  logging.debug('request method = %s'%req.get_method())
-  logging.debug('request host = %s'%req.host)
-  logging.debug('request full_url = %s'%req.full_url)
-  logging.debug('request header_items = %s'%req.header_items())
+  logging.debug('request method = %s'%method)
+  logging.debug('request header_items = %s'%list(headers.items()))
   if data:
-    logging.debug('request data = %s'%req.data)
-    logging.debug('request data size = %s'%len(req.data))
+    logging.debug('request data = %s'%data)
+    logging.debug('request data size = %s'%len(data))
 
-  i_try=0
-  while True:
-    i_try+=1
-    try:
-      with urllib.request.urlopen(req, timeout=REST_TIMEOUT) as f:
-        fbytes = f.read() #With Python3 read bytes from sockets.
-        ftxt = fbytes.decode('utf-8')
-        #f.close()
-    except urllib.request.HTTPError as e:
-      if e.code==404:
-        return ([])
-      elif e.code==400:
-        logging.warn('%s (URL=%s)'%(e, url))
-      else:
-        logging.warn('%s'%e)
-      return None
-    except urllib.request.URLError as e:  ## may be socket.error
-      # may be "<urlopen error [Errno 110] Connection timed out>"
-      logging.warn('[try %d/%d]: %s'%(i_try, nmax_retry, e))
-      if i_try<nmax_retry:
-        time.sleep(REST_RETRY_WAIT)
-        continue
-      return None
-    except Exception as e:
-      logging.warn('%s'%e)
-      if i_try<nmax_retry:
-        time.sleep(REST_RETRY_WAIT)
-        continue
-      return None
-    break
+  try:
+    response = session.request(method, url, headers=headers, data=data, auth=auth, timeout=REST_TIMEOUT)
+  except requests.exceptions.RequestException as e:  ## may be socket.error
+    # may be "Connection timed out", after the session's retries.
+    logging.warning(f"{e}")
+    return None
+  if response.status_code==404:
+    return ([])
+  elif response.status_code==400:
+    logging.warning('%s %s (URL=%s)'%(response.status_code, response.reason, url))
+    return None
+  elif response.status_code>=400:
+    logging.warning('%s %s'%(response.status_code, response.reason))
+    return None
+  ftxt = response.content.decode('utf-8') #With Python3 read bytes from sockets.
 
   if ftxt.strip()=='': return None
   #logging.debug('%s'%ftxt)
 
   if parse_json:
     try:
-      rval = json.loads(ftxt, encoding='utf-8')
+      rval = json.loads(ftxt)
     except ValueError as e:
       logging.debug('JSON Error: %s'%e)
       try:
         ### Should not be necessary.  Backslash escapes allowed in JSON.
         ftxt_fix = ftxt.replace(r'\"', '&quot;').replace(r'\\', '')
         ftxt_fix = ftxt_fix.replace(r'\n', '\\\\n') #ok?
-        rval = json.loads(ftxt_fix, encoding='utf-8')
+        rval = json.loads(ftxt_fix)
         logging.debug('Apparently fixed JSON Error: %s'%e)
         logging.debug('Apparently fixed JSON: "%s"'%ftxt)
       except ValueError as e:
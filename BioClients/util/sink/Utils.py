@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Streaming record writers ("sinks") for client output.
+
+Client functions write DataFrame chunks and/or records (dicts) to a sink as
+they arrive, instead of accumulating all results in memory.  The column set
+(and for Parquet, the Arrow schema) is locked from the first batch; later
+batches are conformed to it: missing columns are null-filled, extra columns
+dropped with a warning.
+
+Formats, inferred from the output filename extension:
+  tsv	*.tsv, *.txt, other (default)
+  tsv.gz	*.tsv.gz, *.txt.gz (gzip-compressed TSV)
+  csv	*.csv
+  csv.gz	*.csv.gz (gzip-compressed CSV)
+  jsonl	*.jsonl, *.ndjson (JSON Lines)
+  parquet	*.parquet, *.pq (requires pyarrow)
+"""
+###
+import sys,os,re,gzip,logging
+from abc import ABC, abstractmethod
+import numpy as np
+import pandas as pd
+
+from ..pandas import FrameBuilder
+#
+FORMATS = ["tsv", "tsv.gz", "csv", "csv.gz", "jsonl", "parquet"]
+#
+#############################################################################
+def Format(ofile):
+  """Infer sink format from filename extension."""
+  if re.search(r'\.(tsv|txt)\.gz$', ofile, re.I): return "tsv.gz"
+  if re.search(r'\.csv\.gz$', ofile, re.I): return "csv.gz"
+  if re.search(r'\.csv$', ofile, re.I): return "csv"
+  if re.search(r'\.(jsonl|ndjson)$', ofile, re.I): return "jsonl"
+  if re.search(r'\.(parquet|pq)$', ofile, re.I): return "parquet"
+  return "tsv"
+
+#############################################################################
+def Open(ofile=None, fmt=None, batch_size=None):
+  """Open sink for path ofile, or TSV sink on stdout if None."""
+  if ofile is None or ofile=="-":
+    return TSVSink(sys.stdout, batch_size=batch_size)
+  fmt = fmt if fmt else Format(ofile)
+  logging.debug(f"Output sink ({fmt}): {ofile}")
+  if fmt=="tsv": return TSVSink(ofile, batch_size=batch_size)
+  elif fmt=="tsv.gz": return TSVSink(ofile, compress=True, batch_size=batch_size)
+  elif fmt=="csv": return TSVSink(ofile, delimiter=",", batch_size=batch_size)
+  elif fmt=="csv.gz": return TSVSink(ofile, compress=True, delimiter=",", batch_size=batch_size)
+  elif fmt=="jsonl": return JSONLSink(ofile, batch_size=batch_size)
+  elif fmt=="parquet": return ParquetSink(ofile, batch_size=batch_size)
+  else: raise ValueError(f"Invalid sink format: {fmt} (allowed: {FORMATS})")
+
+#############################################################################
+def TSVValue(val):
+  """Value as TSV field: None to '', tabs and newlines (which would break
+rows) to spaces."""
+  if val is None: return ''
+  val = val if type(val) is str else str(val)
+  if '\t' in val or '\n' in val or '\r' in val:
+    val = val.replace('\t', ' ').replace('\r', ' ').replace('\n', ' ')
+  return val
+
+#############################################################################
+def Wrap(fout):
+  """Return fout if already a sink, else TSV sink on open file handle fout."""
+  if fout is None or isinstance(fout, RecordSink): return fout
+  return TSVSink(fout)
+
+#############################################################################
+class RecordSink(ABC):
+  """Abstract base class.  Subclasses implement write_frame() and optionally close()."""
+  BATCH_SIZE = 1000
+
+  def __init__(self, batch_size=None):
+    self.batch_size = batch_size if batch_size else self.BATCH_SIZE
+    self.dfb = FrameBuilder()
+    self.columns = None
+    self.n_out = 0
+    self.n_batch = 0
+    self.dropped = set()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
+
+  def write(self, data):
+    """Write DataFrame, record (dict) or list of records."""
+    if data is None: return
+    if isinstance(data, pd.DataFrame): self.dfb.append(data)
+    elif isinstance(data, dict): self.dfb.append_record(data)
+    else:
+      for record in data: self.dfb.append_record(record)
+    if len(self.dfb)>=self.batch_size: self.flush()
+
+  def write_record(self, record):
+    self.write(record)
+
+  def conform(self, df):
+    """Lock columns from first batch; conform later batches to them."""
+    if self.columns is None:
+      self.columns = list(df.columns)
+      return df
+    extra = [tag for tag in df.columns if tag not in self.columns and tag not in self.dropped]
+    if extra:
+      logging.warning(f"Columns not in locked schema, dropped: {extra}")
+      self.dropped.update(extra)
+    if list(df.columns)==self.columns: return df
+    return df.reindex(columns=self.columns)
+
+  def flush(self):
+    df = self.dfb.frame()
+    if df is None or df.shape[0]==0: return
+    df = self.conform(df)
+    self.write_frame(df)
+    self.n_out += df.shape[0]
+    self.n_batch += 1
+
+  @abstractmethod
+  def write_frame(self, df):
+    """Write one conformed batch (DataFrame)."""
+
+  def close(self):
+    self.flush()
+    logging.debug(f"Sink closed; n_batch: {self.n_batch}; n_out: {self.n_out}")
+
+#############################################################################
+class TSVSink(RecordSink):
+  """TSV (or CSV, with delimiter=",") to path (optionally gzipped) or open text file handle."""
+  def __init__(self, fout, compress=False, batch_size=None, delimiter="\t"):
+    super().__init__(batch_size)
+    self.delimiter = delimiter
+    self.owned = isinstance(fout, str)
+    if not self.owned: self.fout = fout
+    elif compress: self.fout = gzip.open(fout, "wt")
+    else: self.fout = open(fout, "w")
+
+  def write_frame(self, df):
+    df.to_csv(self.fout, sep=self.delimiter, index=False, header=bool(self.n_out==0))
+
+  def close(self):
+    super().close()
+    if self.owned: self.fout.close()
+    else: self.fout.flush()
+
+#############################################################################
+class JSONLSink(RecordSink):
+  """JSON Lines, one object per row, to path or open text file handle."""
+  def __init__(self, fout, batch_size=None):
+    super().__init__(batch_size)
+    self.owned = isinstance(fout, str)
+    self.fout = open(fout, "w") if self.owned else fout
+
+  def write_frame(self, df):
+    self.fout.write(df.to_json(orient="records", lines=True).rstrip("\n")+"\n")
+
+  def close(self):
+    super().close()
+    if self.owned: self.fout.close()
+    else: self.fout.flush()
+
+#############################################################################
+class ParquetSink(RecordSink):
+  """Parquet via pyarrow, one row group per batch.  Arrow schema inferred
+from the first batch (all-null columns as string); later batches are cast
+to it, safely (no truncation).  Since the file schema is fixed by then,
+values that do not convert (e.g. 4.7 or "x" to int64) are written as null,
+with a warning naming the column and the number of values lost; values to
+string columns are converted with str()."""
+  BATCH_SIZE = 10000
+
+  def __init__(self, ofile, batch_size=None):
+    super().__init__(batch_size)
+    try:
+      import pyarrow
+      import pyarrow.parquet
+    except ImportError as e:
+      logging.error(f"Parquet output requires pyarrow: {e}")
+      raise
+    self.pa = pyarrow
+    self.ofile = ofile
+    self.schema = None
+    self.writer = None
+
+  def arrow_table(self, df):
+    pa = self.pa
+    try:
+      return pa.Table.from_pandas(df, schema=self.schema, preserve_index=False, safe=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError) as e:
+      logging.debug(f"Coercing batch to schema: {e}")
+    df = df.copy()
+    for field in self.schema:
+      col,n_lost = self.conform_column(df[field.name], field.type)
+      df[field.name] = col
+      if n_lost:
+        logging.warning(f"Column '{field.name}': {n_lost} values not convertible to {field.type}, written as null")
+    return pa.Table.from_pandas(df, schema=self.schema, preserve_index=False, safe=True)
+
+  def conform_column(self, col, dtype):
+    """Column convertible to Arrow dtype, and number of values nulled."""
+    pa = self.pa
+    try:
+      pa.array(col, type=dtype, from_pandas=True, safe=True)
+      return col, 0
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+      pass
+    if pa.types.is_string(dtype) or pa.types.is_large_string(dtype):
+      return col.map(str, na_action="ignore").astype(object), 0
+    if pa.types.is_integer(dtype) or pa.types.is_floating(dtype):
+      vals = pd.to_numeric(col, errors="coerce")
+      if pa.types.is_integer(dtype):
+        info = np.iinfo(dtype.to_pandas_dtype())
+        vals = vals.where((vals%1==0)&(vals>=info.min)&(vals<=info.max))
+        vals = vals.astype("Int64")
+      ok = vals.notna()
+    else:
+      ok = col.map(lambda val: self.castable(val, dtype)).astype(bool)
+      vals = col.where(ok, None)
+    return vals, int((col.notna()&~ok).sum())
+
+  def castable(self, val, dtype):
+    pa = self.pa
+    try:
+      pa.array([val], type=dtype, from_pandas=True, safe=True)
+      return True
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError):
+      return False
+
+  def write_frame(self, df):
+    pa = self.pa
+    if self.schema is None:
+      schema = pa.Schema.from_pandas(df, preserve_index=False)
+      fields = [pa.field(f.name, pa.string()) if pa.types.is_null(f.type) else f for f in schema]
+      self.schema = pa.schema(fields)
+      self.writer = pa.parquet.ParquetWriter(self.ofile, self.schema)
+    self.writer.write_table(self.arrow_table(df))
+
+  def close(self):
+    super().close()
+    if self.writer is not None:
+      self.writer.close()
+      self.writer = None
+
+#############################################################################
@@ -0,0 +1,2 @@
+"""Streaming record writers (TSV, gzipped TSV, JSON Lines, Parquet)."""
+from .Utils import *
@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Sparql client benchmark, against a local endpoint.
+
+A synthetic fixture graph (DBpedia-like drugs, Wikidata-like drug-target
+and gene-disease statements, with labels), or an RDF file, is loaded into
+an in-process engine (pyoxigraph Store, or rdflib Graph) and served over
+HTTP (SPARQL protocol, JSON/CSV/TSV results) on localhost.  The canned
+queries (Drugname2Sparql(), wikidata RQ_*) are replayed via util.rest,
+timing separately the request (until the response is read), the parse
+(util.sparql.ParseResults()) and TSV serialization (WriteRowsTSV()).
+
+Queries are rewritten for local engines: the Wikidata label SERVICE is
+replaced by rdfs:label OPTIONALs, and prefixes predefined by the public
+endpoints are declared.  With --endpoint, queries are sent unchanged to
+that endpoint instead.
+"""
+import sys,os,io,re,time,random,argparse,logging,threading,statistics
+import urllib.parse
+from http.server import ThreadingHTTPServer,BaseHTTPRequestHandler
+
+from .. import rest
+from .. import parallel
+from .. import sparql as util_sparql
+from ... import wikidata
+#
+ENGINES = ["oxigraph", "rdflib"]
+BENCH_SCALE = 1000
+BENCH_NREP = 5
+PREFIXES = {
+	"rdf":"http://www.w3.org/1999/02/22-rdf-syntax-ns#",
+	"rdfs":"http://www.w3.org/2000/01/rdf-schema#",
+	"wd":"http://www.wikidata.org/entity/",
+	"wdt":"http://www.wikidata.org/prop/direct/",
+	"wikibase":"http://wikiba.se/ontology#",
+	"bd":"http://www.bigdata.com/rdf#",
+	"dbo":"http://dbpedia.org/ontology/",
+	"dbp":"http://dbpedia.org/property/",
+	"dbr":"http://dbpedia.org/resource/"
+	}
+LABEL_SERVICE_RE = re.compile(r'SERVICE\s+wikibase:label\s*\{[^{}]*\}', re.I)
+#
+#############################################################################
+def CannedQueries(drugname="metformin"):
+  return {
+	"dbpedia_drugname":util_sparql.Drugname2Sparql(drugname),
+	"wikidata_drugTargetPairs":wikidata.RQ_DRUG_TARGET_PAIRS,
+	"wikidata_geneDiseasePairs":wikidata.RQ_GENE_DISEASE_PAIRS,
+	"wikidata_test":wikidata.RQ_TEST
+	}
+
+def LocalizeQuery(rq):
+  """Wikidata label SERVICE to rdfs:label (en) OPTIONALs, for the ?xLabel
+variables; undeclared known prefixes declared."""
+  m = LABEL_SERVICE_RE.search(rq)
+  if m:
+    labelvars = list(dict.fromkeys(re.findall(r'\?(\w+)Label\b', rq[:m.start()])))
+    optionals = '\n  '.join([f'OPTIONAL {{ ?{var} rdfs:label ?{var}Label . FILTER(lang(?{var}Label)="en") }}' for var in labelvars])
+    rq = rq[:m.start()]+optionals+rq[m.end():]
+  declared = set(re.findall(r'PREFIX\s+([\w-]*):', rq, re.I))
+  used = set(re.findall(r'\b([A-Za-z][\w-]*):[A-Za-z_]', rq))
+  return ''.join([f"PREFIX {prefix}: <{PREFIXES[prefix]}>\n" for prefix in sorted(used-declared) if prefix in PREFIXES])+rq
+
+#############################################################################
+def FixtureNTriples(scale=BENCH_SCALE, drugname="metformin", seed=1):
+  """Generate N-Triples lines: scale drugs, gene products, genes and
+diseases, with labels; drug->target (P129) and gene->disease (P2293)
+statements, 1-3 per subject; DBpedia-like drug resources with tradename,
+licence and label properties, including drugname."""
+  rnd = random.Random(seed)
+  rdfs_label = f"<{PREFIXES['rdfs']}label>"
+  wd = PREFIXES["wd"]
+  for i in range(scale):
+    for qid,name in ((1000000+i, f"drug {i}"), (2000000+i, f"protein {i}"), (3000000+i, f"gene {i}"), (4000000+i, f"disease {i}")):
+      yield f'<{wd}Q{qid}> {rdfs_label} "{name}"@en .'
+    for j in rnd.sample(range(scale), rnd.randint(1, 3)):
+      yield f"<{wd}Q{1000000+i}> <{PREFIXES['wdt']}P129> <{wd}Q{2000000+j}> ."
+    for j in rnd.sample(range(scale), rnd.randint(1, 3)):
+      yield f"<{wd}Q{3000000+i}> <{PREFIXES['wdt']}P2293> <{wd}Q{4000000+j}> ."
+    if i%10==0:
+      yield f"<{wd}Q{4000000+i}> <{PREFIXES['wdt']}P279> <{wd}Q1049021> ."
+  for i in range(scale):
+    name = drugname if i==0 else f"drug{i}"
+    dbr = f"<{PREFIXES['dbr']}{name}>"
+    yield f"{dbr} <{PREFIXES['rdf']}type> <{PREFIXES['dbo']}Drug> ."
+    yield f'{dbr} {rdfs_label} "{name.capitalize()}"@en .'
+    yield f'{dbr} <{PREFIXES["dbp"]}tradename> "{name.capitalize()}ex" .'
+    yield f'{dbr} <{PREFIXES["dbp"]}licenceUs> "{name}" .'
+    yield f'{dbr} <{PREFIXES["dbo"]}abstract> "{name.capitalize()} is a drug. "@en .'
+
+#############################################################################
+class LocalEndpoint:
+  """SPARQL endpoint (GET or POST, JSON/CSV/TSV results) on localhost,
+over an in-process engine, served from a background thread."""
+  def __init__(self, engine="oxigraph", ifile=None, ifmt="application/n-triples", scale=BENCH_SCALE, drugname="metformin"):
+    self.engine = engine
+    t0 = time.time()
+    data = open(ifile, "rb").read() if ifile else ('\n'.join(FixtureNTriples(scale, drugname))+'\n').encode("utf8")
+    if engine=="oxigraph":
+      import pyoxigraph as ox
+      self.store = ox.Store()
+      self.store.bulk_load(input=data, format=ox.RdfFormat.from_media_type(ifmt))
+      self.size = len(self.store)
+      self.result_formats = {"JSON":ox.QueryResultsFormat.JSON, "CSV":ox.QueryResultsFormat.CSV, "TSV":ox.QueryResultsFormat.TSV}
+    else:
+      import rdflib
+      self.store = rdflib.Graph()
+      self.store.parse(data=data, format=ifmt)
+      self.size = len(self.store)
+      self.lock = threading.Lock() #rdflib query parsing not thread-safe.
+    logging.info(f"{engine} fixture loaded: {self.size} triples ({time.time()-t0:.1f}s)")
+    endpoint = self
+    class Handler(BaseHTTPRequestHandler):
+      def do_GET(self):
+        self.Respond(urllib.parse.parse_qs(urllib.parse.urlparse(self.path).query))
+      def do_POST(self):
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0))).decode("utf8")
+        self.Respond(urllib.parse.parse_qs(body))
+      def Respond(self, params):
+        fmt = {mime:fmt for fmt,mime in util_sparql.SPARQL_RESULT_TYPES.items()}.get(self.headers.get("Accept"), "JSON")
+        try:
+          content = endpoint.Query(params["query"][0], fmt)
+        except Exception as e:
+          self.send_error(400, str(e)[:200])
+          return
+        self.send_response(200)
+        self.send_header("Content-Type", util_sparql.SPARQL_RESULT_TYPES[fmt])
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+      def log_message(self, *args):
+        pass
+    self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    self.url = f"http://127.0.0.1:{self.server.server_address[1]}/sparql"
+    self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    self.thread.start()
+
+  def Query(self, rq, fmt):
+    """Results serialized (bytes), in SPARQL results format fmt."""
+    if self.engine=="oxigraph":
+      return self.store.query(rq).serialize(format=self.result_formats[fmt])
+    with self.lock:
+      result = self.store.query(rq)
+      if fmt!="TSV":
+        return result.serialize(format=fmt.lower())
+      lines = ['\t'.join([f"?{var}" for var in result.vars])]
+      for row in result:
+        lines.append('\t'.join([(val.n3() if val is not None else '') for val in row]))
+    return ('\n'.join(lines)+'\n').encode("utf8")
+
+  def Stop(self):
+    self.server.shutdown()
+    self.server.server_close()
+
+#############################################################################
+def TimeQuery(rq, rq_uri, fmt):
+  """Seconds for request (response read), parse and TSV serialization;
+rows and response bytes."""
+  t0 = time.perf_counter()
+  response = rest.GetSession().post(rq_uri, data={"query":rq}, headers={"Accept":util_sparql.SPARQL_RESULT_TYPES[fmt]}, timeout=util_sparql.SPARQL_TIMEOUT)
+  response.raise_for_status()
+  content = response.content
+  t1 = time.perf_counter()
+  variables,rows = util_sparql.ParseResults(io.StringIO(content.decode("utf8"), newline=""), fmt)
+  rows = list(rows)
+  t2 = time.perf_counter()
+  fout = io.StringIO()
+  fout.write(('\t'.join(variables))+"\n")
+  util_sparql.WriteRowsTSV(rows, fout)
+  t3 = time.perf_counter()
+  return t1-t0, t2-t1, t3-t2, len(rows), len(content)
+
+def Benchmark(queries, rq_uri, fout, fmts=["TSV"], nrep=BENCH_NREP, concurrency=1, label=""):
+  """For each query and results format, nrep requests, up to concurrency
+in flight.  Median times per request; throughput from elapsed time."""
+  cols = ["query", "label", "fmt", "nrep", "concurrency", "rows", "bytes", "request_s", "parse_s", "serialize_s", "elapsed_s", "queries_per_s", "rows_per_s"]
+  fout.write('\t'.join(cols)+'\n')
+  for name,rq in queries.items():
+    for fmt in fmts:
+      t0 = time.perf_counter()
+      times = [result for i,result in parallel.MapOrdered(lambda i: TimeQuery(rq, rq_uri, fmt), range(nrep), concurrency) if result is not None]
+      elapsed = time.perf_counter()-t0
+      if not times:
+        logging.error(f"{name} ({fmt}): all requests failed.")
+        continue
+      t_req,t_parse,t_ser,n_rows,n_bytes = [statistics.median(vals) for vals in zip(*times)]
+      vals = [name, label, fmt, len(times), concurrency, int(n_rows), int(n_bytes), f"{t_req:.4f}", f"{t_parse:.4f}", f"{t_ser:.4f}", f"{elapsed:.3f}", f"{len(times)/elapsed:.2f}", f"{n_rows*len(times)/elapsed:.0f}"]
+      fout.write('\t'.join([str(val) for val in vals])+'\n')
+      fout.flush()
+      logging.info(f"{name} ({fmt}): rows: {int(n_rows)}; request: {t_req:.4f}s; parse: {t_parse:.4f}s; serialize: {t_ser:.4f}s")
+
+#############################################################################
+if __name__=="__main__":
+  parser = argparse.ArgumentParser(description="Sparql client benchmark, against local endpoint", epilog=f"Queries: {', '.join(CannedQueries().keys())}")
+  parser.add_argument("--engine", choices=ENGINES, default="oxigraph", help="local endpoint engine")
+  parser.add_argument("--endpoint", help="remote endpoint, instead of local")
+  parser.add_argument("--i", dest="ifile", help="fixture RDF file, instead of synthetic")
+  parser.add_argument("--ifmt", default="application/n-triples", help="fixture RDF format")
+  parser.add_argument("--scale", type=int, default=BENCH_SCALE, help="synthetic fixture size (entities per type)")
+  parser.add_argument("--queries", help="queries (comma-separated) [all]")
+  parser.add_argument("--rqfile", help="additional query file")
+  parser.add_argument("--drugname", default="metformin", help="drugname for dbpedia_drugname query")
+  parser.add_argument("--fmts", default="TSV,CSV,JSON", help="results formats (comma-separated)")
+  parser.add_argument("--nrep", type=int, default=BENCH_NREP, help="requests per query and format")
+  parser.add_argument("--concurrency", type=int, default=1, help="requests in flight")
+  parser.add_argument("--o", dest="ofile", help="output (TSV)")
+  parser.add_argument("-v", "--verbose", action="count", default=0)
+  args = parser.parse_args()
+
+  logging.basicConfig(format="%(levelname)s:%(message)s", level=(logging.DEBUG if args.verbose>1 else logging.INFO))
+
+  queries = CannedQueries(args.drugname)
+  if args.queries:
+    names = re.split(r'\s*,\s*', args.queries.strip())
+    for name in names:
+      if name not in queries: parser.error(f"Unknown query: {name}")
+    queries = {name:queries[name] for name in names}
+  if args.rqfile:
+    queries[os.path.basename(args.rqfile)] = open(args.rqfile).read()
+  fmts = re.split(r'\s*,\s*', args.fmts.strip())
+  for fmt in fmts:
+    if fmt not in util_sparql.SPARQL_RESULT_TYPES: parser.error(f"Unknown results format: {fmt}")
+
+  fout = open(args.ofile, "w") if args.ofile else sys.stdout
+
+  if args.concurrency>rest.REST_POOL_MAXSIZE:
+    rest.ConfigureSession(pool_maxsize=args.concurrency)
+
+  if args.endpoint:
+    Benchmark(queries, args.endpoint, fout, fmts, args.nrep, args.concurrency, args.endpoint)
+  else:
+    endpoint = LocalEndpoint(args.engine, args.ifile, args.ifmt, args.scale, args.drugname)
+    queries = {name:LocalizeQuery(rq) for name,rq in queries.items()}
+    Benchmark(queries, endpoint.url, fout, fmts, args.nrep, args.concurrency, f"{args.engine}:{endpoint.size}")
+    endpoint.Stop()
+
+  fout.close()
@@ -8,6 +8,7 @@ import os,sys,json,argparse,re,time,logging
 import SPARQLWrapper
 
 from .. import sparql as util_sparql
+from .. import parallel
 
 FMTS={
 	'JSON':SPARQLWrapper.Wrapper.JSON,
@@ -26,15 +27,18 @@ if __name__=='__main__':
   epilog = f"SPARQLWRAPPERVERSION: {SPARQLWrapper.__version__}"
   parser = argparse.ArgumentParser(description='Sparql utilities', epilog=epilog)
   ENDPOINT="http://dbpedia.org/sparql"
-  OPERATIONS = ["query", "test", ]
-  parser.add_argument("op", help="OPERATION")
+  OPERATIONS = ["query", "query_tsv", "test", ]
+  parser.add_argument("op", choices=OPERATIONS, help="OPERATION")
   parser.add_argument("--rqfile", help="Sparql input file")
   parser.add_argument("--rq", help="Sparql input string")
   parser.add_argument("--o", dest="ofile", help="output results (TSV)")
   parser.add_argument("--endpoint", default=ENDPOINT, help=f"Sparql endpoint [{ENDPOINT}]")
   parser.add_argument("--defgraph", help="default graph URL")
-  parser.add_argument("--nmax", type=int, default=1000, help="max returned triples")
+  parser.add_argument("--nmax", type=int, default=1000, help="max returned rows (0: all)")
   parser.add_argument("--fmt", choices=FMTS.keys(), default='JSON', help="output format")
+  parser.add_argument("--result_fmt", choices=util_sparql.SPARQL_RESULT_TYPES.keys(), default="TSV", help="results format requested, for query_tsv")
+  parser.add_argument("--page_size", type=int, default=0, help=f"LIMIT/OFFSET page size, for query_tsv (0: unpaged; e.g. {util_sparql.SPARQL_PAGE_SIZE})")
+  parser.add_argument("--concurrency", type=int, default=1, help="pages in flight, for query_tsv")
   parser.add_argument("--test_drugname", default="metformin", help="test drugname query")
   parser.add_argument("-v", "--verbose", action="count", default=0)
   args = parser.parse_args()
@@ -50,7 +54,7 @@ if __name__=='__main__':
   if args.op== "test":
     util_sparql.Test(args.test_drugname, FMTS[args.fmt])
 
-  elif args.op== "query":
+  elif args.op in ("query", "query_tsv"):
     if args.rqfile:
       with open(args.rqfile) as fin:
         rqcode = fin.read()
@@ -59,7 +63,9 @@ if __name__=='__main__':
     else:
       parser.error("--rq or --rqfile required.")
 
-    if args.fmt=='XML':
+    if args.op=="query_tsv":
+      util_sparql.SparqlQueryTSV(rqcode, args.endpoint, fout, args.defgraph, args.result_fmt, args.page_size, args.concurrency, (args.nmax if args.nmax>0 else None))
+    elif args.fmt=='XML':
       results = util_sparql.SparqlRequest(rqcode, args.endpoint, args.defgraph, FMTS[args.fmt])
       results = results.convert()
       fout.write(f"{results.toxml()}\n")
@@ -73,10 +79,12 @@ if __name__=='__main__':
     elif args.fmt=='TSV':
       results = util_sparql.SparqlRequest(rqcode, args.endpoint, args.defgraph, FMTS['JSON'])
       results = results.convert()
-      util_sparql.Results2TSV(results, [], nmax, fout)
+      util_sparql.Results2TSV(results, [], args.nmax, fout)
     else:
       results = util_sparql.SparqlRequest(rqcode, args.endpoint, args.defgraph, None)
       fout.write(str(results)+"\n")
 
   else:
     parser.error(f"Unsupported operation: {args.op}")
+
+  if parallel.ReportFailures(): sys.exit(1)
@@ -1,12 +1,35 @@
 #!/usr/bin/env python3
 """
 Sparql endpoint client utility functions
+
+SparqlQueryTSV() streams results to TSV, via the shared util.rest session,
+requesting the SPARQL CSV or TSV results formats (cheaper to parse than
+JSON) or JSON.  With page_size, the query is paged by LIMIT/OFFSET, with
+up to concurrency pages in flight, written in order as they complete, so
+memory is bounded by concurrency*page_size rows.  Paged queries need
+ORDER BY for stable pages.
 """
 ###
-import os,sys,re,json,logging
+import os,sys,re,io,csv,json,itertools,logging
 
 import SPARQLWrapper
 
+from .. import rest
+from .. import parallel
+from .. import sink as util_sink
+#
+SPARQL_PAGE_SIZE=10000
+SPARQL_TIMEOUT=300
+SPARQL_RESULT_TYPES={
+	"JSON":"application/sparql-results+json",
+	"CSV":"text/csv",
+	"TSV":"text/tab-separated-values"
+	}
+SPARQL_LIMIT_RE = re.compile(r'\b(LIMIT|OFFSET)\s+\d+\s*$', re.I)
+SPARQL_ORDERBY_RE = re.compile(r'\bORDER\s+BY\b', re.I)
+SPARQL_ESCAPE_RE = re.compile(r'\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)')
+SPARQL_ESCAPES = {'t':'\t', 'n':'\n', 'r':'\r', 'b':'\b', 'f':'\f'}
+
 #############################################################################
 def SparqlRequest(rq_code, rq_uri, defgraph=None, fmt=None):
   rq_results = None
@@ -15,6 +38,8 @@ def SparqlRequest(rq_code, rq_uri, defgraph=None, fmt=None):
   try:
     sparql = SPARQLWrapper.SPARQLWrapper(rq_uri)
     sparql.setQuery(rq_code)
+    if defgraph:
+      sparql.addDefaultGraph(defgraph)
     if fmt:
       sparql.setReturnFormat(fmt)
     rq_results = sparql.query()
@@ -26,6 +51,107 @@ def SparqlRequest(rq_code, rq_uri, defgraph=None, fmt=None):
     logging.error(str(rq_code))
   return rq_results
 
+#############################################################################
+def BindingValue(binding, var):
+  """Value of JSON results binding, IRIs in <>, '' if unbound."""
+  if var not in binding: return ''
+  val = binding[var]["value"]
+  if binding[var]["type"]=='uri':
+    val = f"<{val}>"
+  return val
+
+def TermValue(term):
+  """Value of SPARQL TSV results term: literals unquoted and unescaped,
+without language tag or datatype; IRIs in <>, as BindingValue()."""
+  if term[:1]!='"': return term
+  k = term.rfind('"')
+  return SPARQL_ESCAPE_RE.sub(lambda m: UnescapeChar(m.group(1)), term[1:k])
+
+def UnescapeChar(esc):
+  if esc[0] in 'uU': return chr(int(esc[1:], 16))
+  return SPARQL_ESCAPES.get(esc, esc)
+
+#############################################################################
+def SparqlStream(rq_code, rq_uri, defgraph=None, fmt="TSV"):
+  """Variables, and iterator of rows (lists of values), parsed from the
+response stream.  fmt: JSON, CSV or TSV (SPARQL results formats).  CSV
+values are as returned (IRIs not in <>, since CSV does not distinguish)."""
+  logging.debug(f"URI: {rq_uri}")
+  logging.debug(rq_code)
+  data = {"query":rq_code}
+  if defgraph: data["default-graph-uri"] = defgraph
+  response = rest.GetSession().post(rq_uri, data=data, headers={"Accept":SPARQL_RESULT_TYPES[fmt]}, stream=True, timeout=SPARQL_TIMEOUT)
+  response.raise_for_status()
+  response.raw.decode_content = True
+  response.raw.auto_close = False #EOF must not close stream under TextIOWrapper buffer.
+  return ParseResults(io.TextIOWrapper(response.raw, encoding="utf8", newline=""), fmt)
+
+def ParseResults(fin, fmt="TSV"):
+  """Variables, and iterator of rows, from SPARQL results (text stream,
+opened with newline="" for CSV)."""
+  if fmt=="JSON":
+    results = json.load(fin)
+    variables = results["head"]["vars"]
+    return variables, ([BindingValue(binding, var) for var in variables] for binding in results["results"]["bindings"])
+  if fmt=="CSV":
+    reader = csv.reader(fin)
+    variables = next(reader, [])
+    return variables, reader
+  header = fin.readline().rstrip('\r\n')
+  variables = [var.lstrip('?$') for var in header.split('\t')] if header else []
+  return variables, ([TermValue(term) for term in line.rstrip('\r\n').split('\t')] for line in fin if line.strip())
+
+def WriteRowsTSV(rows, fout, nmax=None):
+  """Rows to TSV (no header), up to nmax; returns number written."""
+  n_row=0;
+  for row in rows:
+    fout.write(('\t'.join([util_sink.TSVValue(val) for val in row]))+"\n")
+    n_row+=1
+    if n_row==nmax: break
+  return n_row
+
+def SparqlPage(rq_code, rq_uri, defgraph, fmt, page_size, offset):
+  """Variables and rows (list) for one LIMIT/OFFSET page."""
+  variables,rows = SparqlStream(f"{rq_code.rstrip()}\nLIMIT {page_size}\nOFFSET {offset}", rq_uri, defgraph, fmt)
+  return variables, list(rows)
+
+#############################################################################
+def SparqlQueryTSV(rq_code, rq_uri, fout, defgraph=None, fmt="TSV", page_size=None, concurrency=parallel.CONCURRENCY, nmax=None):
+  """Results streamed to TSV, paged if page_size (query must not have
+LIMIT/OFFSET)."""
+  n_row=0;
+  if not page_size:
+    variables,rows = SparqlStream(rq_code, rq_uri, defgraph, fmt)
+    fout.write(('\t'.join(variables))+"\n")
+    n_row = WriteRowsTSV(rows, fout, nmax)
+    if n_row==nmax: logging.info(f"Output truncated at NMAX = {nmax}.")
+    logging.info(f"N = {n_row}")
+    return n_row
+  if SPARQL_LIMIT_RE.search(rq_code.rstrip()):
+    raise ValueError("Paged query must not have LIMIT or OFFSET.")
+  if not SPARQL_ORDERBY_RE.search(rq_code):
+    logging.warning("Paged query without ORDER BY: pages may be inconsistent.")
+  offsets = range(0, nmax, page_size) if nmax else itertools.count(0, page_size)
+  pages = parallel.MapOrdered(lambda offset: SparqlPage(rq_code, rq_uri, defgraph, fmt, page_size, offset), offsets, concurrency)
+  n_page=0;
+  for offset,page in pages:
+    if page is None:
+      logging.error(f"Page failed (OFFSET {offset}); output incomplete.")
+      break
+    variables,rows = page
+    if n_page==0:
+      fout.write(('\t'.join(variables))+"\n")
+    n_page+=1
+    n_row += WriteRowsTSV(rows, fout, (nmax-n_row if nmax else None))
+    logging.debug(f"page {n_page} (OFFSET {offset}): {len(rows)} rows")
+    if n_row==nmax:
+      logging.info(f"Output truncated at NMAX = {nmax}.")
+      break
+    if len(rows)<page_size: break
+  pages.close()
+  logging.info(f"pages: {n_page}; N = {n_row}")
+  return n_row
+
 #############################################################################
 def Results2TSV(results, variables, nmax, fout):
   if variables:
@@ -48,18 +174,7 @@ def Results2TSV(results, variables, nmax, fout):
     logging.debug(json.dumps(binding, indent=2))
     row_out=[]
     for var in variables:
-      if var in binding:
-        val = binding[var]["value"]
-        if binding[var]["type"]=='uri':
-          val=(f"<{val}>")
-      else:
-        val=''
-      try:
-        val=val.encode('utf8')
-      except:
-        logging.info(f"unicode error [{n_row}]")
-        val='error'
-      row_out.append(val)
+      row_out.append(util_sink.TSVValue(BindingValue(binding, var)))
     fout.write(('\t'.join(row_out))+"\n")
     n_row+=1
     if n_row==nmax:
@@ -91,18 +206,7 @@ def Results2List(results, variables, nmax):
     logging.debug(json.dumps(binding, indent=2))
     row_out=[]
     for var in variables:
-      if var in binding:
-        val = binding[var]['value']
-        if binding[var]['type']=='uri':
-          val=(f"<{val}>")
-      else:
-        val=''
-      try:
-        val=val.encode('utf8')
-      except:
-        logging.info(f"unicode error [{n_row}]")
-        val='error'
-      row_out.append(val)
+      row_out.append(BindingValue(binding, var))
     results_out.append(row_out)
     n_row+=1
     if n_row==nmax:
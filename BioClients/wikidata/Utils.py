@@ -11,10 +11,26 @@ PREFIX uniprotkb:<http://purl.uniprot.org/uniprot/>
 ###
 import sys,os,logging
 import pandas as pd
-from wikidataintegrator import wdi_core, wdi_login
-
+#
+RQ_DRUG_TARGET_PAIRS = """SELECT DISTINCT ?drug ?drugLabel ?gene_product ?gene_productLabel
+WHERE {
+  ?drug wdt:P129 ?gene_product . 
+  SERVICE wikibase:label { bd:serviceParam wikibase:language "en" . }
+}"""
+RQ_GENE_DISEASE_PAIRS = """SELECT DISTINCT ?gene ?geneLabel ?disease ?diseaseLabel
+WHERE {
+  ?gene wdt:P2293 ?disease . 
+  SERVICE wikibase:label { bd:serviceParam wikibase:language "en" . }
+}"""
+RQ_TEST = """SELECT ?item ?itemLabel
+WHERE {
+  ?item wdt:P279 wd:Q1049021 .
+  SERVICE wikibase:label { bd:serviceParam wikibase:language "en" . }
+}"""
+#
 #############################################################################
 def Rq2Df(rq):
+  from wikidataintegrator import wdi_core
   logging.debug(f"{rq}")
   r = wdi_core.WDItemEngine.execute_sparql_query(rq)['results']['bindings']
   df = pd.DataFrame([{k:v['value'] for k,v in item.items()} for item in r])
@@ -31,12 +47,7 @@ def Query(rq, fout=None):
 #############################################################################
 def ListDrugTargetPairs(fout=None):
   "List drugs with known targets."
-  rq = """SELECT DISTINCT ?drug ?drugLabel ?gene_product ?gene_productLabel
-WHERE {
-  ?drug wdt:P129 ?gene_product . 
-  SERVICE wikibase:label { bd:serviceParam wikibase:language "en" . }
-}"""
-  df = Rq2Df(rq)
+  df = Rq2Df(RQ_DRUG_TARGET_PAIRS)
   if fout is not None: df.to_csv(fout, '\t', index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
@@ -44,24 +55,14 @@ WHERE {
 #############################################################################
 def ListGeneDiseasePairs(fout=None):
   "List genes with associated diseases."
-  rq = """SELECT DISTINCT ?gene ?geneLabel ?disease ?diseaseLabel
-WHERE {
-  ?gene wdt:P2293 ?disease . 
-  SERVICE wikibase:label { bd:serviceParam wikibase:language "en" . }
-}"""
-  df = Rq2Df(rq)
+  df = Rq2Df(RQ_GENE_DISEASE_PAIRS)
   if fout is not None: df.to_csv(fout, '\t', index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
 
 #############################################################################
 def Test(fout=None):
-  rq = """SELECT ?item ?itemLabel
-WHERE {
-  ?item wdt:P279 wd:Q1049021 .
-  SERVICE wikibase:label { bd:serviceParam wikibase:language "en" . }
-}"""
-  df = Rq2Df(rq)
+  df = Rq2Df(RQ_TEST)
   if fout is not None: df.to_csv(fout, '\t', index=False)
   logging.info(f"n_out: {df.shape[0]}")
   return df
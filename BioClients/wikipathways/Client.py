@@ -7,6 +7,7 @@
 import sys,os,re,argparse,time,logging
 #
 from .. import wikipathways
+from ..util import rest
 #
 ##############################################################################
 if __name__=='__main__':
@@ -29,11 +30,15 @@ if __name__=='__main__':
   parser.add_argument("--human", action="store_true", help="human only")
   parser.add_argument("--api_host", default=API_HOST)
   parser.add_argument("--api_base_path", default=API_BASE_PATH)
+  parser.add_argument("--cache", help="cache directory for HTTP responses")
+  parser.add_argument("--cache_ttl", type=int, help="cache time-to-live (seconds)")
   parser.add_argument("-v","--verbose", action="count", default=0)
   args = parser.parse_args()
 
   logging.basicConfig(format='%(levelname)s:%(message)s', level=(logging.DEBUG if args.verbose>1 else logging.INFO))
 
+  if args.cache: rest.EnableCache(args.cache, args.cache_ttl)
+
   fout = open(args.ofile, 'w') if args.ofile else sys.stdout
 
   ids=[]